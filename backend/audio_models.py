@@ -0,0 +1,58 @@
+"""
+VAD and end-of-turn analyzers backed by models loaded once per process.
+
+SileroVADAnalyzer and LocalSmartTurnAnalyzerV3 create an ONNX inference
+session every time they are constructed, which costs each call ~130 ms and
+~17 MB. ONNX sessions are safe to run from several threads, and each
+analyzer already runs inference on its own executor thread, so the
+analyzers here share one session per model and keep everything that
+belongs to an audio stream (recurrent VAD state, audio buffers, speech
+tracking) per instance.
+
+Imported lazily by bot.py, like the pipecat analyzers it wraps.
+"""
+
+import copy
+import functools
+
+from pipecat.audio.turn.smart_turn.base_smart_turn import BaseSmartTurn, SmartTurnParams
+from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
+from pipecat.audio.vad.silero import SileroOnnxModel, SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+
+@functools.lru_cache(maxsize=None)
+def _silero_model() -> SileroOnnxModel:
+    return SileroVADAnalyzer()._model
+
+
+@functools.lru_cache(maxsize=None)
+def _smart_turn_model() -> LocalSmartTurnAnalyzerV3:
+    return LocalSmartTurnAnalyzerV3()
+
+
+def load_models():
+    """Load the shared models now (e.g. at worker start) instead of on the first call."""
+    _silero_model()
+    _smart_turn_model()
+
+
+class SharedSileroVADAnalyzer(SileroVADAnalyzer):
+    """SileroVADAnalyzer using the process-wide Silero session."""
+
+    def __init__(self, *, sample_rate=None, params: VADParams = None):
+        VADAnalyzer.__init__(self, sample_rate=sample_rate, params=params)
+        # Same session, own recurrent state
+        self._model = copy.copy(_silero_model())
+        self._model.reset_states()
+        self._last_reset_time = 0
+
+
+class SharedSmartTurnAnalyzer(LocalSmartTurnAnalyzerV3):
+    """LocalSmartTurnAnalyzerV3 using the process-wide smart-turn session."""
+
+    def __init__(self, *, sample_rate=None, params: SmartTurnParams = None):
+        BaseSmartTurn.__init__(self, sample_rate=sample_rate, params=params)
+        model = _smart_turn_model()
+        self._feature_extractor = model._feature_extractor
+        self._session = model._session
@@ -0,0 +1,2 @@
+# Benchmarks for Samora AI
+# Run from the backend directory, e.g. `python -m benchmarks.chat_logger_bench`
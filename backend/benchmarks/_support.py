@@ -0,0 +1,88 @@
+"""
+Shared helpers for the benchmarks.
+
+The benchmarks talk to a real MongoDB through ``db.py``. Point them at a local
+mongod with, for example:
+
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false python -m benchmarks.<name>
+
+Every helper that writes data uses the database configured in ``db.py``, so
+never run the benchmarks against the production cluster.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+from pymongo import monitoring
+
+from benchmarks.dataset import ROOM_TYPES, DatasetSpec, build_rooms, iter_bookings, load
+
+
+class CommandCounter(monitoring.CommandListener):
+    """
+    Counts commands sent to the server.
+
+    Register it with ``monitoring.register()`` before importing ``db`` so the
+    shared client picks it up.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+@dataclass
+class FakeParams:
+    """Stand-in for FunctionCallParams that captures result_callback output."""
+
+    function_name: str = ""
+    tool_call_id: str = ""
+    arguments: dict = field(default_factory=dict)
+    llm: Any = None
+    context: Any = None
+    results: List[dict] = field(default_factory=list)
+    properties: List[Any] = field(default_factory=list)
+
+    async def result_callback(self, result, properties=None):
+        self.results.append(result)
+        self.properties.append(properties)
+
+    @property
+    def result(self) -> Optional[dict]:
+        return self.results[-1] if self.results else None
+
+
+async def call_tool(func, **kwargs) -> Optional[dict]:
+    """Invoke a direct function the way Pipecat does and return its result."""
+    params = FakeParams(function_name=func.__name__, arguments=kwargs)
+    await func(params, **kwargs)
+    return params.result
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def build_bookings(rooms: List[dict], num_bookings: int, seed: int = 42) -> List[dict]:
+    """Build non-overlapping bookings from today with the synthetic dataset's shapes."""
+    return list(iter_bookings(rooms, DatasetSpec(num_bookings=num_bookings, seed=seed)))
+
+
+async def seed_hotel(database, rooms_per_type: int = 20, num_bookings: int = 200, seed: int = 42):
+    """Replace the rooms and bookings collections with a synthetic hotel."""
+    rooms = build_rooms(rooms_per_type)
+    bookings = build_bookings(rooms, num_bookings, seed)
+    await load(database, rooms, bookings)
+    return rooms, bookings
@@ -0,0 +1,187 @@
+"""
+μ-law/PCM fast path benchmark and bit-exactness check for Twilio audio.
+
+Runs identical streams of 20 ms frames through pipecat's
+TwilioFrameSerializer and FastTwilioFrameSerializer in both directions and
+compares the frames and messages they produce. Exits non-zero on any
+difference beyond the resampler's own run-to-run jitter.
+
+Then reports throughput per core (CPU time) for decoding inbound media
+messages and encoding outbound audio, at the pipeline rates the bot uses.
+Both paths call the same audioop codec and soxr resampler, so the gain is
+only the copies and JSON work removed around them: about 1.05x inbound
+(8k -> 16k) and 1.35-1.4x outbound (24k -> 8k) in our runs.
+
+tests/test_twilio_serializer.py holds the serializers to the same bounds.
+
+Usage:
+    python -m benchmarks.audio_codec_bench --frames 20000
+"""
+
+import sys
+import time
+import base64
+import asyncio
+import argparse
+import warnings
+
+import numpy as np
+from pipecat.frames.frames import OutputAudioRawFrame, StartFrame
+from pipecat.serializers.twilio import TwilioFrameSerializer
+
+from utils.twilio_serializer import FastTwilioFrameSerializer
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import audioop
+
+TWILIO_RATE = 8000
+FRAME_MS = 20
+
+
+def speech_like(rate: int, frames: int, seed: int = 3) -> list:
+    """20 ms int16 PCM frames of a gliding tone plus noise, with some silence."""
+    rng = np.random.default_rng(seed)
+    size = rate * FRAME_MS // 1000
+    t = np.arange(size * frames) / rate
+    tone = 9000 * np.sin(2 * np.pi * (180 + 60 * np.sin(t)) * t)
+    audio = tone + rng.normal(0, 1500, len(t))
+    audio[: size * 5] = 0
+    audio = np.clip(audio, -32768, 32767).astype(np.int16)
+    return [audio[i * size : (i + 1) * size].tobytes() for i in range(frames)]
+
+
+def media_messages(frames: int) -> list:
+    """Inbound Twilio media events carrying 20 ms of μ-law each."""
+    pcm = speech_like(TWILIO_RATE, frames)
+    return [
+        '{"event": "media", "streamSid": "MZ00", "media": {"payload": "%s"}}'
+        % base64.b64encode(audioop.lin2ulaw(chunk, 2)).decode("ascii")
+        for chunk in pcm
+    ]
+
+
+async def make_serializer(cls, pipeline_rate: int):
+    serializer = cls(stream_sid="MZ00", call_sid="CA00", account_sid="AC00", auth_token="token")
+    await serializer.setup(StartFrame(audio_in_sample_rate=pipeline_rate))
+    return serializer
+
+
+# soxr's int16 output is not bit-reproducible between stream instances: two
+# pipecat serializers fed the same audio differ by up to 2 LSB after
+# resampling. Resampled paths are held to that bound (one μ-law step on the
+# way out); paths without resampling must be byte-identical.
+RESAMPLED_PCM_TOLERANCE = 2
+RESAMPLED_ULAW_TOLERANCE = 1
+
+# Position of each μ-law byte in order of the sample it decodes to (0x7F and
+# 0xFF both decode to 0 and share a position)
+ULAW_RANK = np.unique(
+    np.frombuffer(audioop.ulaw2lin(bytes(range(256)), 2), dtype=np.int16), return_inverse=True
+)[1]
+
+
+def payload_codes(message: str) -> np.ndarray:
+    payload = message.split('"payload": "')[1].split('"')[0]
+    return np.frombuffer(base64.b64decode(payload), dtype=np.uint8)
+
+
+def report(label: str, frames: int, mismatched: int, deviation: int, tolerance: int) -> int:
+    ok = deviation <= tolerance
+    print(
+        f"{label:<22}{frames - mismatched:>6}/{frames} identical, "
+        f"max deviation {deviation} (allowed {tolerance}){'' if ok else '  FAIL'}"
+    )
+    return 0 if ok else 1
+
+
+async def check_serializers(frames: int) -> int:
+    """Run both serializers over the same streams; return the number of failed paths."""
+    failures = 0
+    messages = media_messages(frames)
+    for pipeline_rate in (8000, 16000):
+        reference = await make_serializer(TwilioFrameSerializer, pipeline_rate)
+        fast = await make_serializer(FastTwilioFrameSerializer, pipeline_rate)
+        mismatched = deviation = 0
+        for message in messages:
+            expected = await reference.deserialize(message)
+            actual = await fast.deserialize(message)
+            if expected is None or actual is None:
+                mismatched += (expected is None) != (actual is None)
+                continue
+            if (expected.audio, expected.sample_rate) != (actual.audio, actual.sample_rate):
+                mismatched += 1
+                a = np.frombuffer(expected.audio, dtype=np.int16).astype(np.int32)
+                b = np.frombuffer(actual.audio, dtype=np.int16).astype(np.int32)
+                deviation = max(deviation, int(np.abs(a - b).max()) if len(a) == len(b) else 1 << 16)
+        tolerance = RESAMPLED_PCM_TOLERANCE if pipeline_rate != TWILIO_RATE else 0
+        failures += report(f"in  8000 -> {pipeline_rate}", frames, mismatched, deviation, tolerance)
+
+    for tts_rate in (8000, 16000, 24000):
+        reference = await make_serializer(TwilioFrameSerializer, 16000)
+        fast = await make_serializer(FastTwilioFrameSerializer, 16000)
+        mismatched = deviation = 0
+        for chunk in speech_like(tts_rate, frames):
+            frame = OutputAudioRawFrame(audio=chunk, sample_rate=tts_rate, num_channels=1)
+            expected = await reference.serialize(frame)
+            actual = await fast.serialize(frame)
+            if expected == actual:
+                continue
+            mismatched += 1
+            if expected is None or actual is None:
+                deviation = 1 << 16
+                continue
+            a, b = ULAW_RANK[payload_codes(expected)], ULAW_RANK[payload_codes(actual)]
+            deviation = max(deviation, int(np.abs(a - b).max()) if len(a) == len(b) else 1 << 16)
+        tolerance = RESAMPLED_ULAW_TOLERANCE if tts_rate != TWILIO_RATE else 0
+        failures += report(f"out {tts_rate} -> 8000", frames, mismatched, deviation, tolerance)
+    return failures
+
+
+async def throughput(cls, frames: int) -> dict:
+    """Frames per CPU second for inbound (8k -> 16k) and outbound (24k -> 8k) audio."""
+    messages = media_messages(frames)
+    outbound = [
+        OutputAudioRawFrame(audio=chunk, sample_rate=24000, num_channels=1)
+        for chunk in speech_like(24000, frames)
+    ]
+    serializer = await make_serializer(cls, 16000)
+
+    start = time.process_time()
+    for message in messages:
+        await serializer.deserialize(message)
+    inbound_secs = time.process_time() - start
+
+    start = time.process_time()
+    for frame in outbound:
+        await serializer.serialize(frame)
+    outbound_secs = time.process_time() - start
+
+    return {"inbound": frames / inbound_secs, "outbound": frames / outbound_secs}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=20_000, help="20 ms frames per direction")
+    parser.add_argument("--check-frames", type=int, default=2_000)
+    args = parser.parse_args()
+
+    errors = await check_serializers(args.check_frames)
+    if errors:
+        print(f"\n{errors} check(s) failed against the reference conversion")
+        sys.exit(1)
+
+    reference = await throughput(TwilioFrameSerializer, args.frames)
+    fast = await throughput(FastTwilioFrameSerializer, args.frames)
+
+    print(f"\n{'direction':<22}{'pipecat fps':>14}{'fast fps':>12}{'speedup':>9}{'calls/core':>12}")
+    for direction, label in (("inbound", "in  8k -> 16k"), ("outbound", "out 24k -> 8k")):
+        # A call streams 50 frames per second in each direction
+        print(
+            f"{label:<22}{reference[direction]:>14,.0f}{fast[direction]:>12,.0f}"
+            f"{fast[direction] / reference[direction]:>8.2f}x{fast[direction] / 50:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
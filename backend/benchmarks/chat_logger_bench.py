@@ -0,0 +1,142 @@
+"""
+Event-loop stall benchmark for chat history persistence.
+
+Compares the legacy ``save_chat_history`` (one blocking ``json.dump`` of the
+whole conversation) with the streaming ``ChatTranscriptWriter`` on a synthetic
+conversation, while a ticker coroutine measures how late the loop wakes up.
+
+Usage:
+    python -m benchmarks.chat_logger_bench --messages 500
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+
+from utils import save_chat_history, ChatTranscriptWriter
+
+TICK_SECS = 0.001
+
+
+def build_conversation(num_messages: int, seed: int = 7) -> list:
+    """Build a conversation shaped like LLMContext.messages, tool calls included."""
+    rng = random.Random(seed)
+    words = "room suite deluxe booking check in out night guest pool spa price".split()
+    messages = [{"role": "system", "content": "x" * 40_000}]
+    while len(messages) < num_messages:
+        turn = len(messages)
+        messages.append(
+            {"role": "user", "content": " ".join(rng.choices(words, k=rng.randint(5, 30)))}
+        )
+        if turn % 5 == 0:
+            call_id = f"call_{turn}"
+            messages.append(
+                {
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "id": call_id,
+                            "type": "function",
+                            "function": {
+                                "name": "check_availability",
+                                "arguments": '{"check_in_date": "2026-01-10", "check_out_date": "2026-01-12"}',
+                            },
+                        }
+                    ],
+                }
+            )
+            messages.append(
+                {
+                    "role": "tool",
+                    "tool_call_id": call_id,
+                    "content": '{"success": true, "available": true, "room_options": []}',
+                }
+            )
+        messages.append(
+            {"role": "assistant", "content": " ".join(rng.choices(words, k=rng.randint(10, 60)))}
+        )
+    return messages[:num_messages]
+
+
+class LoopLagMonitor:
+    """Measures event-loop wake-up lateness with a fixed-interval ticker."""
+
+    def __init__(self):
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.ticks = 0
+        self._task = None
+
+    async def _tick(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECS)
+            lag = time.perf_counter() - start - TICK_SECS
+            self.max_lag = max(self.max_lag, lag)
+            self.total_lag += max(lag, 0.0)
+            self.ticks += 1
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+    def report(self, label: str):
+        print(
+            f"{label:<34} max stall {self.max_lag * 1000:8.2f} ms   "
+            f"total stall {self.total_lag * 1000:8.2f} ms   ticks {self.ticks}"
+        )
+
+
+async def bench_legacy(messages: list, output_dir: str):
+    with LoopLagMonitor() as monitor:
+        await asyncio.sleep(0.01)
+        save_chat_history(messages, output_dir=output_dir)
+        await asyncio.sleep(0.01)
+    monitor.report("save_chat_history (end of call)")
+
+
+async def bench_legacy_per_turn(messages: list, output_dir: str):
+    # What it costs if the full history is re-saved after every assistant turn
+    with LoopLagMonitor() as monitor:
+        for i in range(1, len(messages) + 1):
+            if messages[i - 1]["role"] == "assistant":
+                save_chat_history(messages[:i], output_dir=output_dir)
+            await asyncio.sleep(0)
+    monitor.report("save_chat_history (every turn)")
+
+
+async def bench_streaming(messages: list, output_dir: str, compress: bool):
+    with LoopLagMonitor() as monitor:
+        writer = ChatTranscriptWriter(
+            output_dir=output_dir, compress=compress, max_bytes=256 * 1024
+        )
+        for i in range(1, len(messages) + 1):
+            writer.sync(messages[:i])
+            await asyncio.sleep(0)
+        await writer.aclose()
+    label = "ChatTranscriptWriter" + (" (gzip)" if compress else "")
+    monitor.report(label)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args()
+
+    messages = build_conversation(args.messages)
+    print(f"Conversation: {len(messages)} messages\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        await bench_legacy(messages, tmp)
+        await bench_legacy_per_turn(messages, tmp)
+        await bench_streaming(messages, tmp, compress=False)
+        await bench_streaming(messages, tmp, compress=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,213 @@
+"""
+Cache coherence between agent processes.
+
+This process plays one agent writing bookings: an insert, a date change and,
+for every third booking, a cancellation, spaced --interval seconds apart. A
+second agent process runs the CoherenceBus over its own OccupancyIndex and
+reports every invalidation it receives. Afterwards this reports:
+- the write -> other-agent invalidation lag (p50/p95/max) per operation,
+- writes the other agent never heard about,
+- whether the other agent's occupancy index matches one freshly built from
+  the database.
+
+--mode auto uses change streams, which need a replica set. A single local
+node is enough:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 &
+    mongosh --eval 'rs.initiate()'
+
+--mode poll measures the polling fallback (any mongod). Exits non-zero if
+the other agent missed a write or its index does not match the database.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017/?directConnection=true MONGODB_TLS=false \
+        python -m benchmarks.coherence_bench --mode auto --writes 60
+"""
+
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import subprocess
+from datetime import date, datetime, timedelta
+
+from bson import ObjectId
+from loguru import logger
+
+from db import db
+from inventory import OccupancyIndex, coherence_bus, occupancy_index
+from benchmarks._support import percentile, seed_hotel
+
+
+def index_digest(index: OccupancyIndex) -> str:
+    return hashlib.sha1(repr(index._room_numbers).encode() + index._occupied.tobytes()).hexdigest()
+
+
+# ============ OTHER AGENT ============
+
+
+class Reporter:
+    """Registered on the bus after the caches: prints each invalidation it delivers."""
+
+    def on_invalidation(self, event):
+        report = {
+            "kind": type(event).__name__,
+            "collection": event.collection,
+            "op": getattr(event, "operation", None),
+            "id": str(getattr(event, "document_id", None)),
+            "at": time.time(),
+        }
+        print(json.dumps(report), flush=True)
+
+
+async def agent(args):
+    coherence_bus.mode = args.mode
+    coherence_bus.poll_interval_secs = args.poll_secs
+    await occupancy_index.ensure_loaded(db)
+    coherence_bus.register(Reporter())
+    coherence_bus.start(db)
+
+    deadline = time.monotonic() + 10
+    while coherence_bus.active_mode is None and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    print("ready", flush=True)
+
+    await asyncio.get_running_loop().run_in_executor(None, sys.stdin.readline)
+    # What the next tool call would do after a reset
+    await occupancy_index.ensure_loaded(db)
+    print(json.dumps({"digest": index_digest(occupancy_index), **coherence_bus.stats()}), flush=True)
+    await coherence_bus.stop()
+
+
+# ============ WRITER ============
+
+
+async def write_bookings(args, rooms) -> list:
+    """Insert, move and cancel bookings; return (op, id, issued_at) per write."""
+    writes = []
+    today = date.today()
+
+    async def write(op, booking_id, coroutine):
+        issued = time.time()
+        await coroutine
+        writes.append((op, str(booking_id), issued))
+        await asyncio.sleep(args.interval)
+
+    for n in range(args.writes):
+        room = rooms[n % len(rooms)]
+        # Far enough out not to overlap the seeded bookings or each other
+        check_in = today + timedelta(days=300 + (n // len(rooms)) * 4)
+        now = datetime.utcnow()
+        booking = {
+            "_id": ObjectId(),
+            "confirmation_number": f"GV-COH-{n:06d}",
+            "guest_name": f"Coherence {n}",
+            "guest_phone": f"556{n:07d}",
+            "guest_email": f"coherence{n}@example.com",
+            "room_number": room["room_number"],
+            "room_type": room["room_type"],
+            "floor": room["floor"],
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+            "num_guests": 1,
+            "price_per_night": room["price_per_night"],
+            "total_price": room["price_per_night"] * 2,
+            "status": "confirmed",
+            "special_requests": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+        await write("insert", booking["_id"], db.bookings.insert_one(booking))
+
+        moved = {
+            "check_in_date": (check_in + timedelta(days=1)).isoformat(),
+            "check_out_date": (check_in + timedelta(days=3)).isoformat(),
+            "updated_at": datetime.utcnow(),
+        }
+        await write("update", booking["_id"], db.bookings.update_one({"_id": booking["_id"]}, {"$set": moved}))
+        if n % 3 == 0:
+            await write("delete", booking["_id"], db.bookings.delete_one({"_id": booking["_id"]}))
+    return writes
+
+
+def match(writes: list, events: list) -> dict:
+    """Pair each write with the first invalidation that covers it."""
+    lag = {"insert": [], "update": [], "delete": []}
+    missed = []
+    used = set()
+    for op, booking_id, issued in writes:
+        for i, event in enumerate(events):
+            if i in used or event["at"] < issued or event["collection"] != "bookings":
+                continue
+            exact = event["id"] == booking_id and event["op"] == op
+            # Polling sees cancellations only as a collection reset
+            reset = op == "delete" and event["kind"] == "CollectionReset"
+            if exact or reset:
+                used.add(i)
+                lag[op].append((event["at"] - issued) * 1000)
+                break
+        else:
+            missed.append((op, booking_id))
+    return {"lag": lag, "missed": missed}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=("auto", "change_stream", "poll"), default="auto")
+    parser.add_argument("--writes", type=int, default=60, help="Bookings to write")
+    parser.add_argument("--interval", type=float, default=0.25, help="Seconds between writes")
+    parser.add_argument("--poll-secs", type=float, default=2.0, help="Polling interval")
+    parser.add_argument("--agent", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    if args.agent:
+        await agent(args)
+        return
+
+    rooms, _ = await seed_hotel(db)
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.coherence_bench",
+        "--agent",
+        f"--mode={args.mode}",
+        f"--poll-secs={args.poll_secs}",
+    ]
+    other = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    if other.stdout.readline().strip() != "ready":
+        raise RuntimeError("agent process failed to start")
+
+    writes = await write_bookings(args, rooms)
+    # Let the last writes reach the other agent
+    await asyncio.sleep(args.poll_secs * 2 + 1)
+    lines = other.communicate("done\n")[0].strip().splitlines()
+    report = json.loads(lines[-1])
+    events = [json.loads(line) for line in lines[:-1]]
+
+    fresh = OccupancyIndex()
+    await fresh.ensure_loaded(db)
+    result = match(writes, events)
+
+    print(f"\nmode {report['mode']}: {len(writes)} writes, {len(events)} invalidations, "
+          f"{report['resets']} resets, {report['reconnects']} reconnects")
+    print(f"  {'op':<8} {'seen':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for op, samples in result["lag"].items():
+        if samples:
+            print(
+                f"  {op:<8} {len(samples):>6} {percentile(samples, 50):>8.1f} "
+                f"{percentile(samples, 95):>8.1f} {max(samples):>8.1f}"
+            )
+    print(f"  missed: {len(result['missed'])} {result['missed'][:5]}")
+    coherent = report["digest"] == index_digest(fresh)
+    print(f"  other agent's index matches the database: {coherent}")
+    if result["missed"] or not coherent:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
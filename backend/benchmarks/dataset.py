@@ -0,0 +1,578 @@
+"""
+Seeded synthetic hotel dataset: rooms, bookings and rate rules shaped like production.
+
+The same seed, size and start date always give the same documents, save
+for creation times capped at the time of generation. Bookings have the
+fields and types book_room writes and never overlap on a room:
+
+- occupancy follows the season (peaking mid-July) with busier Friday and
+  Saturday nights, and suites fill less than standard rooms
+- stays run from one night to two weeks, mostly two or three nights
+- about a quarter of the bookings come from returning guests, loyal ones
+  returning more often
+- names come from a skewed pool, so unrelated guests share full names
+- phones are written in a mix of formats, and returning guests do not
+  always give theirs the same way
+- prices are the rate calendar's quote for the stay, as book_room prices it
+
+Load straight into the database configured in db.py:
+
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.dataset load --bookings 1000000
+
+or export once and load the same files for every run:
+
+    python -m benchmarks.dataset export datasets/1m --bookings 1000000 --gzip
+    MONGODB_URI=... python -m benchmarks.dataset load --from datasets/1m
+
+Exported dates are moved forward by whole weeks on load so the stays start
+from today again with the same weekdays; --keep-dates loads them as written.
+Loading replaces the rooms, bookings and rate_rules collections.
+"""
+
+import gzip
+import math
+import time
+import heapq
+import random
+import asyncio
+import argparse
+from bisect import bisect
+from pathlib import Path
+from itertools import accumulate
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Iterable, Iterator, List, Optional
+
+import orjson
+
+from inventory.pricing import RateCalendar
+from inventory.coherence import bump_inventory_version
+from inventory.confirmation import sync_confirmation_counter
+
+
+ROOM_TYPES = {
+    "standard": {"price_per_night": 100, "capacity": 2},
+    "deluxe": {"price_per_night": 150, "capacity": 3},
+    "suite": {"price_per_night": 250, "capacity": 4},
+}
+
+AMENITIES = {
+    "standard": ["Queen bed", "Free Wi-Fi", "Smart TV", "Coffee maker"],
+    "deluxe": ["King bed", "Free Wi-Fi", "Smart TV", "Mini bar", "City view"],
+    "suite": [
+        "King bed",
+        "Separate living area",
+        "Free Wi-Fi",
+        "Smart TV",
+        "Mini bar",
+        "Soaking tub",
+        "Skyline view",
+    ],
+}
+
+# Share of the seasonal occupancy each room type reaches
+DEMAND = {"standard": 1.0, "deluxe": 0.92, "suite": 0.8}
+
+# Relative frequency of stays of 1, 2, ... 14 nights
+STAY_WEIGHTS = [22, 27, 19, 10, 6, 3, 6, 1, 1, 1, 1, 0.5, 0.5, 2]
+MEAN_NIGHTS = sum((n + 1) * w for n, w in enumerate(STAY_WEIGHTS)) / sum(STAY_WEIGHTS)
+
+# Most common first, so the first few full names recur across unrelated guests
+FIRST_NAMES = [
+    "James", "Maria", "John", "Jennifer", "Michael", "Linda", "David", "Sarah",
+    "Robert", "Emily", "William", "Jessica", "Daniel", "Ashley", "Carlos", "Priya",
+    "Wei", "Fatima", "Ahmed", "Olga", "Hiroshi", "Aisha", "Luis", "Anna",
+    "Mohammed", "Sofia", "Kevin", "Grace", "Thomas", "Chloe", "Jose", "Mei",
+    "Andre", "Nadia", "Patrick", "Elena", "Samuel", "Yuki", "Omar", "Rachel",
+    "Dmitri", "Leila", "Brian", "Hannah", "Raj", "Isabel", "Tariq", "Zoe",
+]
+LAST_NAMES = [
+    "Smith", "Garcia", "Johnson", "Nguyen", "Williams", "Brown", "Lee", "Martinez",
+    "Jones", "Patel", "Rodriguez", "Davis", "Kim", "Lopez", "Wilson", "Chen",
+    "Anderson", "Hernandez", "Taylor", "Khan", "Thomas", "Gonzalez", "Moore", "Singh",
+    "Jackson", "Ivanova", "White", "Tanaka", "Harris", "Rossi", "Clark", "Silva",
+    "Lewis", "Muller", "Walker", "Okafor", "Hall", "Cohen", "Young", "O'Brien",
+    "King", "Dubois", "Wright", "Sato", "Scott", "Novak", "Green", "Haddad",
+]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "icloud.com", "hotmail.com", "example.com"]
+AREA_CODES = ["520", "602", "480", "212", "415", "312", "305", "617", "206", "512", "303", "702"]
+
+# {a} area code, {e} exchange, {l} line number
+PHONE_FORMATS = [
+    "{a}-{e}-{l}",
+    "({a}) {e}-{l}",
+    "{a}{e}{l}",
+    "{a}.{e}.{l}",
+    "+1 {a}-{e}-{l}",
+    "+1{a}{e}{l}",
+    "{a} {e} {l}",
+]
+
+SPECIAL_REQUESTS = [
+    "late check-in",
+    "early check-in",
+    "extra pillows",
+    "high floor",
+    "quiet room away from the elevator",
+    "crib in the room",
+    "airport pickup",
+    "hypoallergenic bedding",
+    "anniversary, flowers in the room",
+    "late checkout",
+]
+
+
+def _cumulative_zipf(n: int, exponent: float = 0.7) -> List[float]:
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(n)))
+
+
+def _pick(rng: random.Random, values: list, cum_weights: List[float]):
+    """random.choices for a single value, without its per-call setup."""
+    return values[bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+
+@dataclass
+class DatasetSpec:
+    """Size and shape of a generated hotel."""
+
+    rooms_per_type: int = 20
+    num_bookings: int = 200
+    seed: int = 42
+    # First night bookings may start on; defaults to today
+    start: Optional[date] = None
+    low_occupancy: float = 0.45
+    peak_occupancy: float = 0.85
+    # Day of the year with the highest occupancy
+    peak_day: int = 196
+    weekend_boost: float = 0.08
+    repeat_share: float = 0.25
+    # Price summer and the holidays above base rates with rate_rules
+    seasonal_rates: bool = False
+
+    def __post_init__(self):
+        if self.start is None:
+            self.start = date.today()
+        elif isinstance(self.start, str):
+            self.start = date.fromisoformat(self.start)
+
+    def to_json(self) -> dict:
+        return {**asdict(self), "start": self.start.isoformat()}
+
+    @property
+    def mean_occupancy(self) -> float:
+        return (self.low_occupancy + self.peak_occupancy) / 2
+
+    def occupancy(self, day: date) -> float:
+        """Target share of rooms occupied on the night of ``day``."""
+        season = (1 + math.cos(2 * math.pi * (day.timetuple().tm_yday - self.peak_day) / 365.25)) / 2
+        target = self.low_occupancy + (self.peak_occupancy - self.low_occupancy) * season
+        if day.weekday() in (4, 5):
+            target += self.weekend_boost
+        return min(target, 0.97)
+
+
+def rooms_per_type_for(num_bookings: int, days: int = 365, minimum: int = 20) -> int:
+    """Rooms of each type needed to hold num_bookings over about ``days`` nights."""
+    spec = DatasetSpec()
+    per_room = days * spec.mean_occupancy * sum(DEMAND.values()) / len(DEMAND) / MEAN_NIGHTS
+    return max(minimum, math.ceil(num_bookings / per_room / len(ROOM_TYPES)))
+
+
+def build_rooms(rooms_per_type: int) -> List[dict]:
+    """Build room documents, a hundred rooms per floor."""
+    rooms = []
+    for room_type, info in ROOM_TYPES.items():
+        for _ in range(rooms_per_type):
+            floor = len(rooms) // 100 + 1
+            rooms.append(
+                {
+                    "room_number": f"{floor}{len(rooms) % 100:02d}",
+                    "room_type": room_type,
+                    "floor": floor,
+                    "price_per_night": info["price_per_night"],
+                    "capacity": info["capacity"],
+                    "amenities": AMENITIES[room_type],
+                }
+            )
+    return rooms
+
+
+def build_rate_rules(spec: DatasetSpec, days: int = 730) -> List[dict]:
+    """Summer and holiday rate rules covering ``days`` nights from the start."""
+    if not spec.seasonal_rates:
+        return []
+    rules = []
+    end = spec.start + timedelta(days=days)
+    for year in range(spec.start.year, end.year + 1):
+        rules.append(
+            {
+                "start_date": f"{year}-06-15",
+                "end_date": f"{year}-09-01",
+                "multiplier": 1.2,
+                "priority": 1,
+            }
+        )
+        rules.append(
+            {
+                "start_date": f"{year}-12-20",
+                "end_date": f"{year + 1}-01-03",
+                "multiplier": 1.35,
+                "priority": 2,
+            }
+        )
+    return rules
+
+
+class _Guests:
+    """Guest population: returning guests and new ones with colliding names."""
+
+    def __init__(self, rng: random.Random, repeat_share: float):
+        self._rng = rng
+        self._repeat_share = repeat_share
+        self._first_weights = _cumulative_zipf(len(FIRST_NAMES))
+        self._last_weights = _cumulative_zipf(len(LAST_NAMES))
+        self._name_counts = {}
+        self.guests = []
+
+    def next(self) -> dict:
+        rng = self._rng
+        if self.guests and rng.random() < self._repeat_share:
+            # Squaring favours the earliest guests: a few regulars come back often
+            return self.guests[int(len(self.guests) * rng.random() ** 2)]
+        first = _pick(rng, FIRST_NAMES, self._first_weights)
+        last = _pick(rng, LAST_NAMES, self._last_weights)
+        name = f"{first} {last}"
+        seen = self._name_counts.get(name, 0)
+        self._name_counts[name] = seen + 1
+        local = f"{first}.{last}".replace("'", "").lower()
+        guest = {
+            "name": name,
+            "email": f"{local}{seen or ''}@{EMAIL_DOMAINS[int(rng.random() * len(EMAIL_DOMAINS))]}",
+            "digits": (
+                AREA_CODES[int(rng.random() * len(AREA_CODES))],
+                str(200 + int(rng.random() * 800)),
+                f"{int(rng.random() * 10000):04d}",
+            ),
+            "phone_format": int(rng.random() * len(PHONE_FORMATS)),
+        }
+        self.guests.append(guest)
+        return guest
+
+    def phone(self, guest: dict) -> str:
+        """The guest's phone, usually as they gave it last time."""
+        fmt = guest["phone_format"] if self._rng.random() < 0.7 else int(self._rng.random() * len(PHONE_FORMATS))
+        a, e, l = guest["digits"]
+        return PHONE_FORMATS[fmt].format(a=a, e=e, l=l)
+
+
+def iter_bookings(
+    rooms: List[dict],
+    spec: DatasetSpec,
+    rate_rules: Optional[List[dict]] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[dict]:
+    """
+    Generate spec.num_bookings bookings over the given rooms.
+
+    Rooms are filled earliest free night first, so the bookings cover the
+    nights from the start evenly across rooms and extend as far as the
+    count requires. On each free night a room starts a stay with the
+    probability that keeps it at the seasonal occupancy for that night.
+    Creation times never pass ``now`` (UTC, default the current time), as
+    the polling coherence bus reads bookings from an ``updated_at`` watermark.
+    """
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    rng = random.Random(spec.seed)
+    calendar = RateCalendar()
+    calendar.load(
+        {t: info["price_per_night"] for t, info in ROOM_TYPES.items()},
+        rate_rules if rate_rules is not None else build_rate_rules(spec),
+        spec.start,
+    )
+    guests = _Guests(rng, spec.repeat_share)
+    stay_weights = list(accumulate(STAY_WEIGHTS))
+    nights_choices = list(range(1, len(STAY_WEIGHTS) + 1))
+    # Parties of 1, 2, 3 and 4 up to the room's capacity
+    party_weights = {capacity: list(accumulate([4, 5, 2, 1][:capacity])) for capacity in range(1, 5)}
+    midnight = datetime.combine(spec.start, dtime())
+
+    # A year holds a few thousand distinct days and stays; compute each once
+    days = {}
+    quotes = {}
+
+    def day(offset: int) -> str:
+        if offset not in days:
+            days[offset] = (spec.start + timedelta(days=offset)).isoformat()
+        return days[offset]
+
+    def quote(room_type: str, offset: int, nights: int) -> dict:
+        key = (room_type, offset, nights)
+        if key not in quotes:
+            quotes[key] = calendar.quote(room_type, day(offset), day(offset + nights))
+        return quotes[key]
+
+    # Start probability per night offset and room type, computed once per night
+    start_probability = {}
+
+    def starts_on(offset: int, room_type: str) -> float:
+        key = (offset, room_type)
+        if key not in start_probability:
+            target = spec.occupancy(spec.start + timedelta(days=offset)) * DEMAND[room_type]
+            # Free nights start a stay with probability q: occupancy = qL / (qL + 1 - q)
+            start_probability[key] = target / (MEAN_NIGHTS * (1 - target) + target)
+        return start_probability[key]
+
+    free = [(rng.randint(0, 6), i) for i in range(len(rooms))]
+    heapq.heapify(free)
+    for n in range(spec.num_bookings):
+        offset, index = heapq.heappop(free)
+        room = rooms[index]
+        room_type = room["room_type"]
+        while rng.random() >= starts_on(offset, room_type):
+            offset += 1
+        nights = _pick(rng, nights_choices, stay_weights)
+        heapq.heappush(free, (offset + nights, index))
+
+        price = quote(room_type, offset, nights)
+        guest = guests.next()
+        num_guests = _pick(rng, nights_choices, party_weights[room["capacity"]])
+        special_requests = []
+        if rng.random() < 0.12:
+            special_requests = rng.sample(SPECIAL_REQUESTS, rng.randint(1, 2))
+        # Booked a few weeks ahead on average, never after check-in nor
+        # after now
+        lead = min(rng.expovariate(1 / 21), 300)
+        created_at = min(midnight + timedelta(seconds=int((offset - lead) * 86400)), now)
+
+        yield {
+            "confirmation_number": f"GV-2025-{1001 + n:06d}",
+            "guest_name": guest["name"],
+            "guest_phone": guests.phone(guest),
+            "guest_email": guest["email"],
+            "room_number": room["room_number"],
+            "room_type": room_type,
+            "floor": room["floor"],
+            "check_in_date": day(offset),
+            "check_out_date": day(offset + nights),
+            "num_guests": num_guests,
+            "price_per_night": price["price_per_night"],
+            "total_price": price["total_price"],
+            "status": "confirmed",
+            "special_requests": special_requests,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def shift_booking(booking: dict, days: int, now: Optional[datetime] = None) -> dict:
+    """Move a booking's stay and timestamps by ``days``, keeping the timestamps up to ``now`` (UTC)."""
+    delta = timedelta(days=days)
+    now = now or datetime.utcnow()
+    created_at = min(booking["created_at"] + delta, now)
+    return {
+        **booking,
+        "check_in_date": (date.fromisoformat(booking["check_in_date"]) + delta).isoformat(),
+        "check_out_date": (date.fromisoformat(booking["check_out_date"]) + delta).isoformat(),
+        "created_at": created_at,
+        "updated_at": max(min(booking["updated_at"] + delta, now), created_at),
+    }
+
+
+def shift_rule(rule: dict, days: int) -> dict:
+    delta = timedelta(days=days)
+    return {
+        **rule,
+        "start_date": (date.fromisoformat(rule["start_date"]) + delta).isoformat(),
+        "end_date": (date.fromisoformat(rule["end_date"]) + delta).isoformat(),
+    }
+
+
+async def insert_batched(
+    collection, documents: Iterable[dict], batch_size: int = 10_000, concurrency: int = 4
+) -> int:
+    """
+    Insert documents in unordered batches, a few in flight at a time.
+
+    Only ``concurrency`` batches are held in memory, so a million bookings
+    stream from a generator or file without being materialized.
+    """
+    loaded = 0
+    pending = set()
+    batch = []
+
+    async def flush(docs: List[dict]):
+        nonlocal loaded
+        await collection.insert_many(docs, ordered=False)
+        loaded += len(docs)
+
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            pending.add(asyncio.create_task(flush(batch)))
+            batch = []
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+    if batch:
+        pending.add(asyncio.create_task(flush(batch)))
+    for task in pending:
+        await task
+    return loaded
+
+
+async def load(
+    database,
+    rooms: List[dict],
+    bookings: Iterable[dict],
+    rate_rules: Optional[List[dict]] = None,
+    batch_size: int = 10_000,
+) -> int:
+    """
+    Replace the hotel collections with a dataset; returns the bookings loaded.
+
+    rate_rules is left alone when None, replaced (possibly emptied) otherwise.
+    """
+    await database.rooms.drop()
+    await database.bookings.drop()
+    # insert_many adds an _id to each document; keep the caller's dicts as they were
+    await database.rooms.insert_many([dict(room) for room in rooms])
+    await bump_inventory_version(database, "rooms")
+    if rate_rules is not None:
+        await database.rate_rules.drop()
+        if rate_rules:
+            await database.rate_rules.insert_many([dict(rule) for rule in rate_rules])
+        await bump_inventory_version(database, "rate_rules")
+    loaded = await insert_batched(database.bookings, (dict(b) for b in bookings), batch_size)
+    # New bookings are numbered after the loaded ones
+    await sync_confirmation_counter(database)
+    return loaded
+
+
+def _open(path: Path, mode: str):
+    return gzip.open(path, mode) if path.suffix == ".gz" else open(path, mode)
+
+
+def _write_lines(path: Path, documents: Iterable[dict]) -> int:
+    count = 0
+    with _open(path, "wb") as f:
+        for document in documents:
+            f.write(orjson.dumps(document) + b"\n")
+            count += 1
+    return count
+
+
+def _read_lines(path: Path) -> Iterator[dict]:
+    with _open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def export(directory: Path, spec: DatasetSpec, compress: bool = False) -> dict:
+    """Write rooms, rate rules and bookings as JSON lines next to a manifest."""
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = ".jsonl.gz" if compress else ".jsonl"
+    rooms = build_rooms(spec.rooms_per_type)
+    rules = build_rate_rules(spec)
+    files = {name: f"{name}{suffix}" for name in ("rooms", "rate_rules", "bookings")}
+    counts = {
+        "rooms": _write_lines(directory / files["rooms"], rooms),
+        "rate_rules": _write_lines(directory / files["rate_rules"], rules),
+        "bookings": _write_lines(directory / files["bookings"], iter_bookings(rooms, spec, rules)),
+    }
+    manifest = {"spec": spec.to_json(), "files": files, "counts": counts}
+    (directory / "manifest.json").write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    return manifest
+
+
+def read_export(directory: Path, keep_dates: bool = False):
+    """
+    (manifest, rooms, rate rules, bookings iterator) of an exported dataset.
+
+    Unless keep_dates, dates move forward by whole weeks so the first stay
+    starts within a week from today on the weekday it was generated for.
+    """
+    manifest = orjson.loads((directory / "manifest.json").read_bytes())
+    files = manifest["files"]
+    start = date.fromisoformat(manifest["spec"]["start"])
+    shift = 0 if keep_dates else max(0, math.ceil((date.today() - start).days / 7) * 7)
+
+    rooms = list(_read_lines(directory / files["rooms"]))
+    rules = [shift_rule(rule, shift) for rule in _read_lines(directory / files["rate_rules"])]
+
+    def bookings() -> Iterator[dict]:
+        now = datetime.utcnow().replace(microsecond=0)
+        for booking in _read_lines(directory / files["bookings"]):
+            booking["created_at"] = datetime.fromisoformat(booking["created_at"])
+            booking["updated_at"] = datetime.fromisoformat(booking["updated_at"])
+            yield shift_booking(booking, shift, now) if shift else booking
+
+    return manifest, rooms, rules, bookings()
+
+
+def spec_from_args(args) -> DatasetSpec:
+    return DatasetSpec(
+        rooms_per_type=args.rooms_per_type or rooms_per_type_for(args.bookings),
+        num_bookings=args.bookings,
+        seed=args.seed,
+        start=args.start,
+        repeat_share=args.repeat_share,
+        seasonal_rates=args.seasonal_rates,
+    )
+
+
+async def load_command(args):
+    from db import db
+
+    started = time.perf_counter()
+    if args.source:
+        manifest, rooms, rules, bookings = read_export(args.source, args.keep_dates)
+        spec = manifest["spec"]
+    else:
+        spec = spec_from_args(args)
+        rooms = build_rooms(spec.rooms_per_type)
+        rules = build_rate_rules(spec)
+        bookings = iter_bookings(rooms, spec, rules)
+        spec = spec.to_json()
+    loaded = await load(db, rooms, bookings, rules, args.batch_size)
+    print(
+        f"Loaded {len(rooms)} rooms, {len(rules)} rate rules and {loaded} bookings "
+        f"(seed {spec['seed']}) in {time.perf_counter() - started:.1f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Write the dataset as JSON lines")
+    export_parser.add_argument("directory", type=Path)
+    export_parser.add_argument("--gzip", action="store_true", help="Compress the files")
+    load_parser = commands.add_parser("load", help="Replace rooms, bookings and rate_rules in Mongo")
+    load_parser.add_argument("--from", dest="source", type=Path, help="Load an exported dataset")
+    load_parser.add_argument("--keep-dates", action="store_true", help="Do not move exported dates to today")
+    load_parser.add_argument("--batch-size", type=int, default=10_000)
+    for sub in (export_parser, load_parser):
+        sub.add_argument("--bookings", type=int, default=10_000)
+        sub.add_argument("--rooms-per-type", type=int, help="Default: enough for a year of bookings")
+        sub.add_argument("--seed", type=int, default=42)
+        sub.add_argument("--start", help="First possible check-in (ISO date), default today")
+        sub.add_argument("--repeat-share", type=float, default=0.25)
+        sub.add_argument("--seasonal-rates", action="store_true", help="Add summer and holiday rate rules")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        started = time.perf_counter()
+        manifest = export(args.directory, spec_from_args(args), args.gzip)
+        counts = manifest["counts"]
+        print(
+            f"Wrote {counts['rooms']} rooms, {counts['rate_rules']} rate rules and {counts['bookings']} "
+            f"bookings to {args.directory} in {time.perf_counter() - started:.1f} s"
+        )
+    else:
+        asyncio.run(load_command(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Tool latency budgets against an artificially slow Mongo.
+
+Seeds the synthetic hotel, then slows every read command on the server with
+the failCommand fail point (blockConnection) and runs each read tool through
+a ToolRuntime with and without tool budgets, right after a caller's turn
+ended. Reports how long the caller waits for each tool's answer, and whether
+it was the real result or still_working.
+
+The fail point needs test commands enabled on a local mongod:
+
+    mongod --dbpath /tmp/bench-db --setParameter enableTestCommands=1
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.deadline_bench --slow-ms 0 800 3000
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+
+from loguru import logger
+from pymongo.errors import OperationFailure
+
+from db import db
+from inventory import occupancy_index, rate_calendar
+from db_functions import (
+    ToolRuntime,
+    get_pricing,
+    get_amenities,
+    lookup_booking,
+    check_availability,
+    find_available_dates,
+)
+from benchmarks._support import FakeParams, seed_hotel
+
+READ_COMMANDS = ["find", "aggregate", "getMore", "count", "distinct"]
+
+
+def scenarios(guest_name: str) -> list:
+    today = datetime.now().date()
+    check_in = (today + timedelta(days=20)).isoformat()
+    check_out = (today + timedelta(days=23)).isoformat()
+    return [
+        (get_pricing, {"room_type": "deluxe"}),
+        (get_amenities, {"room_type": "suite"}),
+        (lookup_booking, {"guest_name": guest_name}),
+        (check_availability, {"check_in_date": check_in, "check_out_date": check_out}),
+        (find_available_dates, {"nights": 3, "room_type": "suite"}),
+    ]
+
+
+async def slow_reads(block_ms: int):
+    """Block every read command for block_ms on the server (0 turns the fail point off)."""
+    if block_ms <= 0:
+        await db.client.admin.command({"configureFailPoint": "failCommand", "mode": "off"})
+        return
+    await db.client.admin.command(
+        {
+            "configureFailPoint": "failCommand",
+            "mode": "alwaysOn",
+            "data": {"failCommands": READ_COMMANDS, "blockConnection": True, "blockTimeMS": block_ms},
+        }
+    )
+
+
+async def run_tool(runtime: ToolRuntime, func, kwargs: dict):
+    runtime.turn_ended()
+    params = FakeParams(function_name=func.__name__, arguments=kwargs)
+    started = time.perf_counter()
+    await runtime.wrap(func)(params, **kwargs)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    result = params.result or {}
+    return elapsed_ms, result.get("status") or ("ok" if result.get("success", True) else "error")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slow-ms", type=int, nargs="+", default=[0, 800, 3000], help="Server delay per read command")
+    parser.add_argument("--rooms-per-type", type=int, default=20)
+    parser.add_argument("--bookings", type=int, default=2000)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    _, bookings = await seed_hotel(db, args.rooms_per_type, args.bookings)
+    # Warm the in-process caches first, as the bot does at startup
+    await occupancy_index.ensure_loaded(db)
+    await rate_calendar.ensure_loaded(db)
+
+    try:
+        await slow_reads(0)
+    except OperationFailure as e:
+        print(f"failCommand unavailable ({e}); start mongod with --setParameter enableTestCommands=1")
+        sys.exit(1)
+
+    print(f"\n{'tool':<22}{'slow ms':>8}{'no budget':>16}{'budget':>22}")
+    try:
+        for block_ms in args.slow_ms:
+            await slow_reads(block_ms)
+            for func, kwargs in scenarios(bookings[7]["guest_name"]):
+                unbounded_ms, unbounded = await run_tool(ToolRuntime(memo_ttl_secs=None, tool_budgets=None), func, kwargs)
+                runtime = ToolRuntime(memo_ttl_secs=None)
+                bounded_ms, bounded = await run_tool(runtime, func, kwargs)
+                print(
+                    f"{func.__name__:<22}{block_ms:>8}{unbounded_ms:>9.0f} ms {unbounded:<6}"
+                    f"{bounded_ms:>9.0f} ms {bounded:<13}"
+                )
+    finally:
+        await slow_reads(0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,222 @@
+"""
+Call density: one process hosting many calls vs one process per call.
+
+Every simulated call loops the soak test's booking conversation through
+``run_bot`` (replay transport and LLM, real tools against Mongo) and, like a
+real transport, runs a VAD analyzer on 20 ms of inbound audio in real time
+plus an end-of-turn prediction every --turn-every seconds, using the
+analyzers bot.py creates for each call. A call pauses --gap seconds between
+conversations, while its audio keeps flowing.
+
+host mode runs N calls concurrently inside this process, sharing models,
+Mongo client and caches. process mode starts N worker processes with one
+call each. For N in --levels it measures p95 turn latency (user stopped
+speaking -> bot response), CPU cores consumed and resident memory, and stops
+once p95 goes over --p95-ms. Models are loaded before measuring.
+Calls per core is the largest N within the target divided by the cores it
+consumed.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.density --levels 1,2,4,8,16 --duration 30 --p95-ms 250
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+from loguru import logger
+
+from bot import _audio_analyzers
+from audio_models import load_models
+from db import db
+from benchmarks._support import seed_hotel
+from benchmarks.replay import replay_conversation
+from benchmarks.soak import default_script
+
+SAMPLE_RATE = 16000
+FRAME_SECS = 0.02
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(samples: list, fraction: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+# ============ ONE CALL ============
+
+
+async def audio_load(deadline: float, turn_every: float):
+    """Feed a call's analyzers the way the transport input does."""
+    analyzers = _audio_analyzers()
+    vad, turn = analyzers["vad_analyzer"], analyzers["turn_analyzer"]
+    vad.set_sample_rate(SAMPLE_RATE)
+    turn.set_sample_rate(SAMPLE_RATE)
+
+    rng = np.random.default_rng()
+    frame = (rng.standard_normal(int(SAMPLE_RATE * FRAME_SECS)) * 1000).astype(np.int16).tobytes()
+    segment = rng.standard_normal(SAMPLE_RATE * 8).astype(np.float32) * 0.03
+    loop = asyncio.get_running_loop()
+
+    next_frame = next_turn = time.perf_counter()
+    while time.perf_counter() < deadline:
+        await vad.analyze_audio(frame)
+        if time.perf_counter() >= next_turn:
+            # What BaseSmartTurn runs on its executor when the user stops speaking
+            await loop.run_in_executor(turn._executor, turn._predict_endpoint, segment)
+            next_turn += turn_every
+        next_frame += FRAME_SECS
+        await asyncio.sleep(max(0.0, next_frame - time.perf_counter()))
+
+
+async def run_call(args) -> list:
+    """Run one call for --duration seconds; return its user turn latencies (ms)."""
+    turns = default_script()
+    config = {"end_call_delay_secs": 0.05}
+    deadline = time.perf_counter() + args.duration
+    audio = asyncio.create_task(audio_load(deadline, args.turn_every))
+    latencies = []
+    try:
+        while time.perf_counter() < deadline:
+            result = await replay_conversation(turns, args.turn_timeout, config=config)
+            latencies.extend(t["turn_ms"] for t in result["turns"] if t["kind"] == "user")
+            # The caller talking: no turns, only audio
+            await asyncio.sleep(max(0.0, min(args.gap, deadline - time.perf_counter())))
+    finally:
+        audio.cancel()
+    return latencies
+
+
+# ============ MODES ============
+
+
+async def run_host(calls: int, args) -> dict:
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    results = await asyncio.gather(*(run_call(args) for _ in range(calls)))
+    wall = time.perf_counter() - wall_start
+    return {
+        "turn_ms": [ms for latencies in results for ms in latencies],
+        "cores": (time.process_time() - cpu_start) / wall,
+        "rss_mb": rss_mb(),
+    }
+
+
+def run_processes(calls: int, args) -> dict:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.density",
+        "--worker",
+        f"--duration={args.duration}",
+        f"--gap={args.gap}",
+        f"--turn-every={args.turn_every}",
+        f"--turn-timeout={args.turn_timeout}",
+    ]
+    workers = [
+        subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(calls)
+    ]
+    # Imports and model loading are not measured: start every call together
+    for worker in workers:
+        if worker.stdout.readline().strip() != "ready":
+            raise RuntimeError("density worker failed to start")
+    for worker in workers:
+        worker.stdin.write("go\n")
+        worker.stdin.flush()
+
+    wall_start = time.perf_counter()
+    reports = [json.loads(worker.communicate()[0].strip().splitlines()[-1]) for worker in workers]
+    wall = time.perf_counter() - wall_start
+    return {
+        "turn_ms": [ms for report in reports for ms in report["turn_ms"]],
+        "cores": sum(report["cpu_s"] for report in reports) / wall,
+        "rss_mb": sum(report["rss_mb"] for report in reports),
+    }
+
+
+async def worker(args):
+    """One call in its own process, started by run_processes."""
+    load_models()
+    print("ready", flush=True)
+    await asyncio.get_running_loop().run_in_executor(None, sys.stdin.readline)
+    cpu_start = time.process_time()
+    latencies = await run_call(args)
+    report = {"turn_ms": latencies, "cpu_s": time.process_time() - cpu_start, "rss_mb": rss_mb()}
+    print(json.dumps(report), flush=True)
+
+
+async def measure(mode: str, args) -> dict:
+    print(f"\n{mode} mode")
+    print(f"  {'calls':>5}  {'turns':>6}  {'p50 ms':>8}  {'p95 ms':>8}  {'cores':>6}  {'MB/call':>8}")
+    best = None
+    for calls in args.levels:
+        if mode == "host":
+            result = await run_host(calls, args)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(None, run_processes, calls, args)
+        p95 = percentile(result["turn_ms"], 0.95)
+        print(
+            f"  {calls:>5}  {len(result['turn_ms']):>6}  {percentile(result['turn_ms'], 0.5):>8.1f}  "
+            f"{p95:>8.1f}  {result['cores']:>6.2f}  {result['rss_mb'] / calls:>8.1f}"
+        )
+        if p95 > args.p95_ms:
+            break
+        best = {"calls": calls, **result}
+    return best
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=("host", "process", "both"), default="both")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="Concurrent calls to try")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per level")
+    parser.add_argument("--gap", type=float, default=5.0, help="Pause between a call's conversations (s)")
+    parser.add_argument("--p95-ms", type=float, default=250.0, help="p95 turn latency target")
+    parser.add_argument("--turn-every", type=float, default=5.0, help="End-of-turn predictions (s)")
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.levels = [int(level) for level in args.levels.split(",")]
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    if args.worker:
+        await worker(args)
+        return
+
+    await seed_hotel(db)
+    load_models()
+    modes = ("host", "process") if args.mode == "both" else (args.mode,)
+    summary = {mode: await measure(mode, args) for mode in modes}
+
+    print(f"\nwithin p95 {args.p95_ms:.0f} ms:")
+    for mode, best in summary.items():
+        if best is None:
+            print(f"  {mode:<8} no level met the target")
+            continue
+        print(
+            f"  {mode:<8} {best['calls']} concurrent calls on {best['cores']:.2f} cores "
+            f"-> {best['calls'] / max(best['cores'], 0.01):.1f} calls/core, "
+            f"{best['rss_mb'] / best['calls']:.0f} MB/call"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+"""
+FAQ fast path: hit rate, accuracy and latency saved on labeled transcripts.
+
+Every transcript in TRANSCRIPTS is labeled with the FAQ topic that should
+answer it, or None when it needs the LLM (tools, call flow, or a question
+the prompt has no answer for, like pets or check-in time). The transcripts
+are held out: none repeats a FaqEntry question, so the numbers say how the
+matcher does on phrasings it was not built from. The FAQ index is built
+from SYSTEM_PROMPT as in a call, and each transcript is looked up the way
+FaqFastPathProcessor does.
+
+Reports the hit rate over all turns, precision (hits with the right topic),
+recall over the answerable turns, the lookup time, and the latency saved.
+The saving is an assumption, not a measurement: each hit skips an LLM
+generation over the full prompt, taken to cost --llm-ms to the first
+spoken sentence (default 800; take it from the LLM TTFB metrics in the
+call logs), minus the lookup time.
+
+Usage:
+    python -m benchmarks.faq_fast_path_bench --llm-ms 800
+"""
+
+import sys
+import time
+import argparse
+
+from loguru import logger
+
+from fast_path import FaqIndex
+from fast_path.faq import FAQ_ENTRIES
+from fast_path.matcher import tokenize
+from prompts import SYSTEM_PROMPT
+from benchmarks._support import percentile
+
+# Held out: none of these is one of the FaqEntry.questions the index is built
+# from (compared on content words, see held_out_overlap())
+TRANSCRIPTS = [
+    # Answerable from the HOTEL CONTEXT
+    ("Could you give me the street address?", "address"),
+    ("Sorry, where exactly are you guys?", "address"),
+    ("I need directions to your place.", "address"),
+    ("What's the address over there?", "address"),
+    ("Do you have a number I can reach you on?", "phone"),
+    ("What's the best phone number for the front desk?", "phone"),
+    ("Will I need to pay to park?", "parking"),
+    ("Is there somewhere to leave my car?", "parking"),
+    ("Do you guys offer free parking?", "parking"),
+    ("Is there a parking garage for guests?", "parking"),
+    ("Is there a pool I can use?", "pool"),
+    ("Can I swim at the hotel?", "pool"),
+    ("Is there a workout room?", "fitness"),
+    ("Do you have exercise equipment?", "fitness"),
+    ("Do you offer massages?", "spa"),
+    ("Are there spa treatments?", "spa"),
+    ("Is there anywhere to grab dinner in the building?", "dining"),
+    ("Does the hotel have a place to eat?", "dining"),
+    ("Is there a bar at the hotel?", "bar"),
+    ("Where could I grab a cocktail?", "bar"),
+    ("Is there a concierge desk?", "concierge"),
+    ("Could someone suggest things to see nearby?", "concierge"),
+    ("What facilities are there?", "amenities"),
+    ("What can I do at the hotel?", "amenities"),
+    ("What rooms do you offer?", "room_types"),
+    ("What sorts of rooms can I choose from?", "room_types"),
+    # Tools and call flow
+    ("Do you have rooms available on Friday?", None),
+    ("How much is the deluxe room?", None),
+    ("What amenities come with the suite?", None),
+    ("I'd like to book a room for two nights.", None),
+    ("I want to cancel my booking.", None),
+    ("Can you look up my reservation under Smith?", None),
+    ("Can you change my check-out to the 14th?", None),
+    ("Can you add a late checkout to my stay?", None),
+    ("Hold on a moment please.", None),
+    ("No, that's all, thank you. Bye!", None),
+    ("My email is john at gmail dot com.", None),
+    ("Yes, that's correct.", None),
+    ("Hello?", None),
+    ("Can you speak Spanish?", None),
+    # Not in the prompt: the LLM has to handle them
+    ("Do you allow pets?", None),
+    ("What time is check-in?", None),
+    ("Is breakfast included?", None),
+    ("What's the wifi password?", None),
+    ("What time does the pool open?", None),
+    ("Is the pool heated?", None),
+    ("Is the restaurant open late on weekends?", None),
+    ("Where is the nearest airport?", None),
+]
+
+
+def held_out_overlap() -> list:
+    """Transcripts with the same content words as one of the index's questions."""
+    questions = {tuple(tokenize(q)) for entry in FAQ_ENTRIES for q in entry.questions}
+    return [text for text, _ in TRANSCRIPTS if tuple(tokenize(text)) in questions]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--llm-ms", type=float, default=800.0, help="LLM time to first sentence (ms)")
+    parser.add_argument("--min-score", type=float, default=0.6)
+    parser.add_argument("--min-margin", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=200, help="Lookups per transcript for timing")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every transcript")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    overlap = held_out_overlap()
+    if overlap:
+        print(f"Transcripts must be held out from the FAQ questions: {overlap}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    index = FaqIndex(prompt=SYSTEM_PROMPT)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    hits = correct = answerable = 0
+    wrong = []
+    lookup_us = []
+    for text, expected in TRANSCRIPTS:
+        topic, score = index.lookup(text, args.min_score, args.min_margin)
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            index.lookup(text, args.min_score, args.min_margin)
+            lookup_us.append((time.perf_counter() - started) * 1e6)
+
+        answerable += expected is not None
+        if topic is not None:
+            hits += 1
+            correct += topic == expected
+        if topic != expected:
+            wrong.append((text, expected, topic, round(score, 2)))
+        if args.verbose:
+            print(f"  {str(topic):<11} {score:.2f}  {text}")
+
+    turns = len(TRANSCRIPTS)
+    saved_ms = args.llm_ms - percentile(lookup_us, 50) / 1000
+    print(f"\nFAQ index: {len(index.entries)} topics from the prompt, built in {build_ms:.1f} ms")
+    print(f"  held-out transcripts: {turns} ({answerable} answerable)")
+    print(f"  hit rate:  {hits}/{turns} turns ({hits / turns:.0%})")
+    print(f"  precision: {correct}/{hits} hits answered with the right topic")
+    print(f"  recall:    {correct}/{answerable} answerable turns")
+    print(f"  lookup:    p50 {percentile(lookup_us, 50):.0f} us, p95 {percentile(lookup_us, 95):.0f} us")
+    print(
+        f"  saved:     ~{saved_ms:.0f} ms per hit, {saved_ms * hits / turns:.0f} ms per turn on average, "
+        f"and a {len(SYSTEM_PROMPT) // 1000} KB prompt generation per hit"
+    )
+    print(f"             (assumes --llm-ms {args.llm_ms:.0f} ms of LLM time per hit; not measured here)")
+    for text, expected, topic, score in wrong:
+        print(f"  mismatch: {text!r} expected {expected}, got {topic} ({score})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Group booking benchmark: ten book_room calls vs one book_rooms call.
+
+Each round re-seeds the hotel, then books the same group of rooms through
+both paths and reports latency and Mongo round trips. The sequential path
+excludes LLM round trips between calls, so it is a lower bound on the real
+difference.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.group_booking_bench --rooms 10 --rounds 20
+"""
+
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from pymongo import monitoring
+
+from benchmarks._support import CommandCounter
+
+
+# Must be registered before db.py creates the client
+counter = CommandCounter()
+monitoring.register(counter)
+
+from db import db  # noqa: E402
+from db_functions import book_room, book_rooms  # noqa: E402
+from benchmarks._support import FakeParams, percentile, seed_hotel  # noqa: E402
+
+
+GUEST = {
+    "guest_name": "Acme Offsite",
+    "guest_phone": "555-010-2000",
+    "guest_email": "travel@acme.example",
+}
+
+
+def group(num_rooms: int) -> list:
+    types = ["standard", "deluxe", "suite"]
+    return [types[i % len(types)] for i in range(num_rooms)]
+
+
+async def sequential(room_types: list, check_in: str, check_out: str) -> bool:
+    for room_type in room_types:
+        params = FakeParams()
+        await book_room(
+            params,
+            room_type=room_type,
+            check_in_date=check_in,
+            check_out_date=check_out,
+            **GUEST,
+        )
+        if not params.result["success"]:
+            return False
+    return True
+
+
+async def grouped(room_types: list, check_in: str, check_out: str) -> bool:
+    params = FakeParams()
+    await book_rooms(
+        params,
+        room_types=room_types,
+        check_in_date=check_in,
+        check_out_date=check_out,
+        **GUEST,
+    )
+    return params.result["success"]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--rooms-per-type", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=5000)
+    args = parser.parse_args()
+
+    room_types = group(args.rooms)
+    results = {"book_room x N": [], "book_rooms": []}
+    round_trips = {"book_room x N": [], "book_rooms": []}
+
+    for round_index in range(args.rounds):
+        check_in = (datetime.now().date() + timedelta(days=40 + round_index)).isoformat()
+        check_out = (datetime.now().date() + timedelta(days=43 + round_index)).isoformat()
+        for label, fn in (("book_room x N", sequential), ("book_rooms", grouped)):
+            await seed_hotel(db, rooms_per_type=args.rooms_per_type, num_bookings=args.bookings)
+            before = counter.count
+            start = time.perf_counter()
+            ok = await fn(room_types, check_in, check_out)
+            results[label].append(time.perf_counter() - start)
+            round_trips[label].append(counter.count - before)
+            assert ok, f"{label} failed to book {args.rooms} rooms"
+
+    print(f"Booking {args.rooms} rooms, {args.rounds} rounds\n")
+    print(f"{'path':<16}{'p50':>12}{'p95':>12}{'round trips':>14}")
+    for label, timings in results.items():
+        print(
+            f"{label:<16}{percentile(timings, 50) * 1000:>9.2f} ms"
+            f"{percentile(timings, 95) * 1000:>9.2f} ms"
+            f"{max(round_trips[label]):>14}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Cold-start import budget for bot.py.
+
+Imports ``bot`` in fresh interpreters with ``-X importtime``, parses the
+report and prints the cumulative import time (best of --runs), the slowest
+modules imported directly or indirectly by bot, and the time per top-level
+package. Exits non-zero if the import takes longer than --budget-ms, or if
+any provider module that providers.py loads lazily was imported eagerly.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 python -m benchmarks.import_time --budget-ms 4000
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from collections import defaultdict
+from typing import List, NamedTuple
+
+from providers import LLM_PROVIDERS, STT_PROVIDERS, TTS_PROVIDERS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` lines (children are printed before their parent)."""
+    records = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            records.append(
+                ImportRecord(
+                    module=match[4],
+                    depth=len(match[3]) // 2,
+                    self_us=int(match[1]),
+                    cumulative_us=int(match[2]),
+                )
+            )
+    return records
+
+
+def import_module_records(module: str) -> List[ImportRecord]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def lazy_modules() -> set:
+    """Service modules that should only be imported when a call selects them."""
+    return {
+        module
+        for registry in (STT_PROVIDERS, LLM_PROVIDERS, TTS_PROVIDERS)
+        for provider in registry.values()
+        for module in provider.modules
+        if module.startswith("pipecat.services.")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="bot")
+    parser.add_argument("--budget-ms", type=float, default=4000.0)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters; the fastest counts")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_module_records(args.module) for _ in range(args.runs)]
+    totals = [
+        next(r.cumulative_us for r in records if r.module == args.module and r.depth == 0)
+        for records in runs
+    ]
+    best = min(range(len(runs)), key=lambda i: totals[i])
+    records = runs[best]
+    total_ms = totals[best] / 1000
+
+    print(f"import {args.module}: {total_ms:,.0f} ms (runs: {', '.join(f'{t / 1000:,.0f}' for t in totals)} ms)")
+
+    print("\nslowest imports (cumulative):")
+    nested = [r for r in records if r.depth > 0]
+    shown = 0
+    for record in sorted(nested, key=lambda r: r.cumulative_us, reverse=True):
+        # Top two levels only; deeper imports are counted in their parents
+        if record.depth > 2:
+            continue
+        print(f"  {record.cumulative_us / 1000:>9,.1f} ms  {record.module}")
+        shown += 1
+        if shown >= args.top:
+            break
+
+    by_package = defaultdict(int)
+    for record in records:
+        by_package[record.module.split(".")[0]] += record.self_us
+    print("\ntime by top-level package (self time):")
+    for package, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+        print(f"  {us / 1000:>9,.1f} ms  {package}")
+
+    eager = sorted(lazy_modules() & {r.module for r in records})
+    if eager:
+        print(f"\nprovider modules imported eagerly: {', '.join(eager)}")
+
+    over_budget = total_ms > args.budget_ms
+    print(f"\nbudget: {args.budget_ms:,.0f} ms -> {'OVER BUDGET' if over_budget else 'ok'}")
+    sys.exit(1 if over_budget or eager else 0)
+
+
+if __name__ == "__main__":
+    main()
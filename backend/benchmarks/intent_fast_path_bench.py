@@ -0,0 +1,153 @@
+"""
+Intent fast path: precision, recall and latency on labeled phrases.
+
+Every phrase in PHRASES is labeled with the call state it is heard in
+(talking, right after the assistant's closing "anything else I can help
+you with?" check, or on hold) and the action the fast path should take:
+put_on_hold, end_call, resume, or None when the LLM should decide. The
+phrases are held out: none repeats an INTENT_EXAMPLES entry. Each phrase goes through
+IntentClassifier and the state check, as in IntentFastPathProcessor.
+
+Reports precision and recall per intent (a wrong action is worse than a
+miss: the LLM handles misses as before), the classification time, and the
+latency saved per hit: the LLM round trip to the tool call (--llm-ms).
+
+Usage:
+    python -m benchmarks.intent_fast_path_bench --llm-ms 700
+"""
+
+import sys
+import time
+import argparse
+
+from loguru import logger
+
+from fast_path.intents import END_CALL, HOLD, INTENT_EXAMPLES, RESUME, IntentClassifier, allowed
+from fast_path.matcher import tokenize
+from benchmarks._support import percentile
+
+TALKING, FINAL_CHECK, ON_HOLD = "talking", "final_check", "on_hold"
+
+# Held out: none of these is one of the INTENT_EXAMPLES the model is built
+# from (compared on content words, see held_out_overlap())
+PHRASES = [
+    # Hold
+    ("Hang on one sec.", TALKING, HOLD),
+    ("Could you hold for a moment?", TALKING, HOLD),
+    ("Just a minute, please.", TALKING, HOLD),
+    ("Gimme a sec.", TALKING, HOLD),
+    ("Wait a sec, please.", TALKING, HOLD),
+    ("I need a minute.", TALKING, HOLD),
+    ("Let me think it over.", TALKING, HOLD),
+    ("Brb.", TALKING, HOLD),
+    ("Sorry, hang on a moment.", TALKING, HOLD),
+    ("Pause for a sec.", TALKING, HOLD),
+    ("Hold on while I find my wallet.", TALKING, None),
+    ("Just a moment, someone's at the door.", TALKING, None),
+    # Look-alikes that are not a hold
+    ("Hold on, I said two adults.", TALKING, None),
+    ("Could you hold the suite until Monday?", TALKING, None),
+    ("Wait, is parking free?", TALKING, None),
+    ("Hang on, that's the wrong date.", TALKING, None),
+    ("One moment of your time, can I ask something?", TALKING, None),
+    ("Give me the cheapest room.", TALKING, None),
+    ("Please hold my booking.", TALKING, None),
+    # Goodbyes after the final check
+    ("No, that's it.", FINAL_CHECK, END_CALL),
+    ("Nah, I'm good, thanks.", FINAL_CHECK, END_CALL),
+    ("We're all set, thank you so much.", FINAL_CHECK, END_CALL),
+    ("That's it for now. Bye bye!", FINAL_CHECK, END_CALL),
+    ("Have a good night.", FINAL_CHECK, END_CALL),
+    ("I gotta go, thanks.", FINAL_CHECK, END_CALL),
+    ("See you, bye.", FINAL_CHECK, END_CALL),
+    ("Nope, that's everything.", FINAL_CHECK, END_CALL),
+    ("I'm done, thanks. Talk to you later.", FINAL_CHECK, END_CALL),
+    # Not a goodbye, or too early for one
+    ("No, I'd like a suite instead.", FINAL_CHECK, None),
+    ("Actually, one more thing.", FINAL_CHECK, None),
+    ("Yeah.", FINAL_CHECK, None),
+    ("Sure.", FINAL_CHECK, None),
+    ("No.", TALKING, None),
+    ("Nope.", TALKING, None),
+    ("Okay, bye then.", TALKING, None),
+    ("I gotta run.", TALKING, None),
+    ("See you on the 14th.", TALKING, None),
+    ("Have a good night's sleep in the suite.", FINAL_CHECK, None),
+    # Resume
+    ("Alright, I'm back now.", ON_HOLD, RESUME),
+    ("Hello? Are you still there?", ON_HOLD, RESUME),
+    ("Okay, I'm ready now.", ON_HOLD, RESUME),
+    ("Samora, I'm back.", ON_HOLD, RESUME),
+    ("Hi Samora, sorry about the wait.", ON_HOLD, RESUME),
+    ("Okay, I'm done, let's go on.", ON_HOLD, RESUME),
+    ("Yep, go ahead.", ON_HOLD, RESUME),
+    ("Right, I'm free now.", ON_HOLD, RESUME),
+    ("Thanks for holding.", ON_HOLD, RESUME),
+    ("I'm back, what about a suite?", ON_HOLD, None),
+    ("Kids, be quiet please!", ON_HOLD, None),
+    ("One more minute.", ON_HOLD, None),
+    ("Are you there on Sundays?", TALKING, None),
+    ("I'm ready to pay.", TALKING, None),
+]
+
+
+def held_out_overlap() -> list:
+    """Phrases with the same content words as one of the model's examples."""
+    examples = {tuple(tokenize(e)) for phrases in INTENT_EXAMPLES.values() for e in phrases}
+    return [text for text, _, _ in PHRASES if tuple(tokenize(text)) in examples]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--llm-ms", type=float, default=700.0, help="LLM round trip to the tool call (ms)")
+    parser.add_argument("--min-score", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=200, help="Classifications per phrase for timing")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every phrase")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    overlap = held_out_overlap()
+    if overlap:
+        print(f"Phrases must be held out from the intent examples: {overlap}")
+        sys.exit(1)
+
+    classifier = IntentClassifier(min_score=args.min_score)
+    counts = {intent: {"tp": 0, "fp": 0, "fn": 0} for intent in (HOLD, END_CALL, RESUME)}
+    classify_us = []
+    mistakes = []
+    for text, state, expected in PHRASES:
+        intent, confidence, source = classifier.classify(text)
+        if intent is not None and not allowed(intent, state == ON_HOLD, state == FINAL_CHECK):
+            intent = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            classifier.classify(text)
+            classify_us.append((time.perf_counter() - started) * 1e6)
+
+        if intent is not None:
+            counts[intent]["tp" if intent == expected else "fp"] += 1
+        if expected is not None and intent != expected:
+            counts[expected]["fn"] += 1
+        if intent != expected:
+            mistakes.append((text, state, expected, intent))
+        if args.verbose:
+            print(f"  {str(intent):<12} {source:<5} {confidence:.2f}  [{state}] {text}")
+
+    print(f"\n{len(PHRASES)} held-out phrases")
+    print(f"  {'intent':<12} {'precision':>10} {'recall':>8}")
+    hits = 0
+    for intent, c in counts.items():
+        hits += c["tp"] + c["fp"]
+        precision = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else float("nan")
+        recall = c["tp"] / (c["tp"] + c["fn"]) if c["tp"] + c["fn"] else float("nan")
+        print(f"  {intent:<12} {precision:>10.2f} {recall:>8.2f}")
+    print(f"  classify: p50 {percentile(classify_us, 50):.0f} us, p95 {percentile(classify_us, 95):.0f} us")
+    print(f"  saved:    ~{args.llm_ms:.0f} ms per hit, {hits} hits (assumes --llm-ms; not measured here)")
+    for text, state, expected, intent in mistakes:
+        print(f"  mismatch: [{state}] {text!r} expected {expected}, got {intent}")
+
+
+if __name__ == "__main__":
+    main()
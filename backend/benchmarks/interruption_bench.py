@@ -0,0 +1,330 @@
+"""
+Barge-ins during tool calls: wasted work with and without ToolRuntime.
+
+A scripted LLM issues a slow read (check_availability's overlap scan, a
+cursor streamed in batches), a slow write (update_booking's lookup then
+update), or both, and the caller barges in at a random point while they
+run. The tools run against SlowMongo, an in-memory stand-in whose commands
+take a fixed round trip plus a per-document cost and finish even when the
+awaiting coroutine is cancelled, as pymongo's do on Motor's executor. It
+publishes the same command events as pymongo to the shared command monitor.
+
+Every trial runs in three setups:
+- cancel-all: Pipecat's default, every tool cancelled on interruption
+- writes-finish: writes not cancelled, nothing else changed
+- runtime: bot.py's setup, through ToolRuntime
+
+Reports, per setup: cursors left open on the server, documents streamed
+after the barge-in, writes dropped before reaching Mongo, writes applied
+but reported as cancelled to the LLM, and stale LLM runs started by a
+tool result after the caller interrupted.
+
+No Mongo is needed; the client in db.py is created but never used.
+
+Usage:
+    python -m benchmarks.interruption_bench --trials 30
+"""
+
+import os
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGODB_TLS", "false")
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import itertools
+from types import SimpleNamespace
+from typing import Dict, List
+
+from loguru import logger
+from pipecat.frames.frames import EndFrame, InterruptionFrame, LLMRunFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.services.llm_service import FunctionCallParams
+from pipecat.adapters.schemas.tools_schema import ToolsSchema
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.aggregators.llm_response_universal import LLMContextAggregatorPair
+
+from db_monitor import command_monitor
+from db_functions import WRITE_TOOLS, ToolRuntime
+from benchmarks.replay import ReplayLLMService, Response
+
+SETUPS = ("cancel-all", "writes-finish", "runtime")
+
+
+# ============ SLOW FAKE MONGO ============
+
+
+class SlowMongo:
+    """
+    In-memory bookings collection with slow, uncancellable commands.
+
+    Queries return every document (filters are ignored); the first batch
+    holds ``first_batch`` documents and each getMore ``batch_size``. Every
+    command takes ``rtt_ms`` plus ``doc_us`` per document returned.
+    """
+
+    def __init__(self, num_bookings: int, rtt_ms: float, doc_us: float, first_batch=101, batch_size=500):
+        self.documents = [
+            {"_id": i, "room_number": 100 + i % 60, "check_in_date": "2026-11-01", "check_out_date": "2026-11-04"}
+            for i in range(num_bookings)
+        ]
+        self.rtt_ms = rtt_ms
+        self.doc_us = doc_us
+        self.first_batch = first_batch
+        self.batch_size = batch_size
+        self.cursors: Dict[int, int] = {}  # cursor id -> position
+        self.streamed: List[tuple] = []  # (perf_counter, documents)
+        self.updates: List[int] = []  # booking ids updated
+        self._ids = itertools.count(1)
+        self._requests = itertools.count(1)
+
+    @property
+    def client(self):
+        return self
+
+    def __getitem__(self, name):
+        return self
+
+    @property
+    def bookings(self):
+        return self
+
+    async def _run(self, name: str, command: dict, execute) -> dict:
+        """Publish started, do the work, publish succeeded; survives cancellation."""
+        event = SimpleNamespace(
+            command_name=name,
+            command=command,
+            database_name="hotel_db",
+            connection_id=("fake", 27017),
+            request_id=next(self._requests),
+        )
+        command_monitor.started(event)
+        started = time.perf_counter()
+
+        async def server():
+            await asyncio.sleep(self.rtt_ms / 1000)
+            reply = execute()
+            documents = len(reply.get("cursor", {}).get("firstBatch", reply.get("cursor", {}).get("nextBatch", [])))
+            await asyncio.sleep(documents * self.doc_us / 1e6)
+            if documents:
+                self.streamed.append((time.perf_counter(), documents))
+            event.reply = reply
+            event.duration_micros = int((time.perf_counter() - started) * 1e6)
+            command_monitor.succeeded(event)
+            return reply
+
+        # Like a command on Motor's executor: cancelling the caller doesn't stop it
+        return await asyncio.shield(asyncio.ensure_future(server()))
+
+    def _batch(self, cursor_id: int, size: int, key: str) -> dict:
+        position = self.cursors.pop(cursor_id, 0)
+        batch = self.documents[position:position + size]
+        position += len(batch)
+        if position < len(self.documents):
+            self.cursors[cursor_id] = position
+        else:
+            cursor_id = 0
+        return {"cursor": {"id": cursor_id, "ns": "hotel_db.bookings", key: batch}, "ok": 1}
+
+    def find(self, query=None, **kwargs):
+        return SlowCursor(self)
+
+    async def find_one(self, query: dict, **kwargs):
+        def execute():
+            batch = [self.documents[query["_id"]]]
+            return {"cursor": {"id": 0, "ns": "hotel_db.bookings", "firstBatch": batch}, "ok": 1}
+
+        reply = await self._run("find", {"find": "bookings", "filter": query, "limit": 1}, execute)
+        return reply["cursor"]["firstBatch"][0]
+
+    async def find_one_and_update(self, query, update, **kwargs):
+        def execute():
+            self.updates.append(query["_id"])
+            return {"value": self.documents[query["_id"]], "ok": 1}
+
+        reply = await self._run("findAndModify", {"findAndModify": "bookings", "query": query}, execute)
+        return reply["value"]
+
+    async def command(self, command: dict):
+        def execute():
+            for cursor_id in command["cursors"]:
+                self.cursors.pop(cursor_id, None)
+            return {"cursorsKilled": command["cursors"], "ok": 1}
+
+        return await self._run("killCursors", command, execute)
+
+
+class SlowCursor:
+    """Async cursor over SlowMongo: a find, then getMores until exhausted."""
+
+    def __init__(self, mongo: SlowMongo):
+        self._mongo = mongo
+        self._id = None
+        self._buffer: List[dict] = []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        mongo = self._mongo
+        if not self._buffer:
+            if self._id is None:
+                cursor_id = next(mongo._ids)
+                reply = await mongo._run(
+                    "find", {"find": "bookings"}, lambda: mongo._batch(cursor_id, mongo.first_batch, "firstBatch")
+                )
+                self._buffer = reply["cursor"]["firstBatch"]
+            elif self._id:
+                reply = await mongo._run(
+                    "getMore",
+                    {"getMore": self._id, "collection": "bookings"},
+                    lambda: mongo._batch(self._id, mongo.batch_size, "nextBatch"),
+                )
+                self._buffer = reply["cursor"]["nextBatch"]
+            else:
+                raise StopAsyncIteration
+            self._id = reply["cursor"]["id"]
+        if not self._buffer:
+            raise StopAsyncIteration
+        return self._buffer.pop(0)
+
+
+# ============ TOOLS ============
+
+
+def make_tools(mongo: SlowMongo, delivered: dict):
+    """Tools with the Mongo access pattern of the real check_availability and update_booking."""
+
+    async def check_availability(params: FunctionCallParams, check_in_date: str, check_out_date: str):
+        """Check room availability.
+
+        Args:
+            check_in_date: Check-in date
+            check_out_date: Check-out date
+        """
+        booked = set()
+        async for booking in mongo.bookings.find({"check_in_date": {"$lt": check_out_date}}):
+            booked.add(booking["room_number"])
+        await params.result_callback({"success": True, "available": 60 - len(booked)})
+
+    async def update_booking(params: FunctionCallParams, booking_id: int):
+        """Update a booking.
+
+        Args:
+            booking_id: Booking to update
+        """
+        booking = await mongo.bookings.find_one({"_id": booking_id})
+        updated = await mongo.bookings.find_one_and_update({"_id": booking["_id"]}, {"$set": {"updated": True}})
+        delivered[booking_id] = True
+        await params.result_callback({"success": True, "booking_id": updated["_id"]})
+
+    return [check_availability, update_booking]
+
+
+# ============ TRIALS ============
+
+
+async def run_setup(setup: str, script: list, args) -> dict:
+    mongo = SlowMongo(args.bookings, args.rtt_ms, args.doc_us)
+    delivered: Dict[int, bool] = {}
+    tools = make_tools(mongo, delivered)
+    runtime = ToolRuntime(memo_ttl_secs=None, database=mongo)
+
+    llm = ReplayLLMService([])
+    for tool in tools:
+        is_write = tool.__name__ in WRITE_TOOLS
+        if setup == "runtime":
+            llm.register_direct_function(runtime.wrap(tool), cancel_on_interruption=not is_write)
+        else:
+            llm.register_direct_function(tool, cancel_on_interruption=setup == "cancel-all" or not is_write)
+
+    @llm.event_handler("on_before_process_frame")
+    async def on_llm_frame(llm_service, frame):
+        if isinstance(frame, InterruptionFrame):
+            runtime.interrupted()
+
+    context = LLMContext([{"role": "system", "content": "bench"}], tools=ToolsSchema(standard_tools=tools))
+    aggregators = LLMContextAggregatorPair(context)
+    task = PipelineTask(
+        Pipeline([aggregators.user(), llm, aggregators.assistant()]),
+        params=PipelineParams(allow_interruptions=True),
+        idle_timeout_secs=None,
+    )
+    runner_task = asyncio.create_task(PipelineRunner(handle_sigint=False).run(task))
+    await asyncio.sleep(0.1)
+
+    stale_runs = 0
+    streamed_after = 0
+    for trial, (calls, barge_in_ms) in enumerate(script):
+        tool_calls = []
+        for name in calls:
+            arguments = (
+                {"check_in_date": "2026-11-01", "check_out_date": "2026-11-04"}
+                if name == "check_availability"
+                else {"booking_id": trial}
+            )
+            tool_calls.append({"id": f"t{trial}-{name}", "function": {"name": name, "arguments": arguments}})
+        llm._responses.append(Response(tool_calls=tool_calls))
+
+        await task.queue_frame(LLMRunFrame())
+        await asyncio.sleep(barge_in_ms / 1000)
+        barge_in_at = time.perf_counter()
+        await task.queue_frame(InterruptionFrame())
+        # Let everything still running finish, and any follow-up run start
+        await asyncio.sleep(args.settle_ms / 1000)
+
+        stale_runs += sum(1 for at in llm.run_started_at if at > barge_in_at)
+        streamed_after += sum(n for at, n in mongo.streamed if at > barge_in_at)
+        mongo.streamed.clear()
+
+    await task.queue_frame(EndFrame())
+    await asyncio.wait_for(runner_task, timeout=10)
+
+    writes = [trial for trial, (calls, _) in enumerate(script) if "update_booking" in calls]
+    return {
+        "cursors_left_open": len(mongo.cursors),
+        "docs_after_barge_in": streamed_after,
+        "writes_dropped": sum(1 for t in writes if t not in mongo.updates),
+        "writes_torn": sum(1 for t in writes if t in mongo.updates and not delivered.get(t)),
+        "stale_llm_runs": stale_runs,
+        "runtime": runtime.interruption_stats() if setup == "runtime" else None,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument("--bookings", type=int, default=5000, help="Documents the read streams")
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="Round trip per command")
+    parser.add_argument("--doc-us", type=float, default=40.0, help="Server and transfer time per document")
+    parser.add_argument("--settle-ms", type=float, default=600.0, help="Wait after each barge-in")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    rng = random.Random(args.seed)
+    kinds = [["check_availability"], ["update_booking"], ["check_availability", "update_booking"]]
+    script = [(kinds[i % len(kinds)], rng.uniform(5, 3 * args.rtt_ms)) for i in range(args.trials)]
+
+    print(f"\n{args.trials} barge-ins, {args.bookings} documents per read, {args.rtt_ms:.0f} ms round trip")
+    print(f"  {'setup':<14} {'open cursors':>12} {'docs after':>11} {'writes dropped':>15} {'writes torn':>12} {'stale runs':>11}")
+    for setup in SETUPS:
+        command_monitor.reset()
+        result = await run_setup(setup, script, args)
+        print(
+            f"  {setup:<14} {result['cursors_left_open']:>12} {result['docs_after_barge_in']:>11} "
+            f"{result['writes_dropped']:>15} {result['writes_torn']:>12} {result['stale_llm_runs']:>11}"
+        )
+        if result["runtime"]:
+            print(f"  runtime stats: {result['runtime']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+"""
+Logging overhead per frame and event-loop lag with debug logging on and off.
+
+Part 1 times one per-frame debug line (HoldWakeProcessor's "On hold -
+received transcription") written the old way, an f-string through loguru,
+and through the utils.log facade, with DEBUG filtered out and enabled.
+
+Part 2 runs --calls simulated calls in one event loop, each handling a
+20 ms audio frame and logging a line per frame plus a transcription line
+every --transcript-every frames, while a probe task measures how late its
+10 ms sleeps wake up (event-loop lag). Logs go to a temporary file:
+synchronously from loguru, or queued to the facade's writer thread (every
+frame line, or one in ten sampled).
+
+Usage:
+    python -m benchmarks.logging_bench --calls 10 --seconds 5
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+from loguru import logger
+
+from utils.log import CallContext, configure_logging, get_logger
+from benchmarks._support import percentile
+
+TEXT = "Sorry, one second, my kid is asking me something"
+
+
+def time_per_call(func, repeat: int) -> float:
+    """Nanoseconds per call of func()."""
+    started = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - started) / repeat
+
+
+def micro_benchmark(path: str, repeat: int):
+    hold_log = get_logger("hold")
+
+    def fstring():
+        logger.debug(f"On hold - received transcription: '{TEXT}'")
+
+    def facade():
+        hold_log.debug("On hold - received transcription: {!r}", TEXT)
+
+    print(f"\nPer-frame debug line ({repeat} calls, to a file)")
+    print(f"  {'':<28}{'debug off':>12}{'debug on':>12}")
+    for name, func in (("loguru f-string, sync sink", fstring), ("facade, queued sink", facade)):
+        row = []
+        for level in ("INFO", "DEBUG"):
+            if func is fstring:
+                logger.remove()
+                logger.add(path, level=level)
+            else:
+                configure_logging(level=level, sink=path, rate_limits={"hold": 1e9}, force=True)
+            row.append(time_per_call(func, repeat))
+            logger.complete()
+        print(f"  {name:<28}{row[0]:>9.0f} ns{row[1]:>9.0f} ns")
+
+
+async def simulated_call(index: int, seconds: float, transcript_every: int, frame_log, transcript_log):
+    with CallContext(f"bench-{index}") as call:
+        frames = int(seconds / 0.02)
+        for n in range(frames):
+            frame_log(n)
+            if n % transcript_every == 0:
+                call.next_turn()
+                transcript_log()
+            # A little work per frame, as a frame processor would do
+            sum(range(200))
+            await asyncio.sleep(0.02)
+
+
+async def measure_lag(args, frame_log, transcript_log) -> list:
+    lags = []
+    stop = asyncio.Event()
+
+    async def probe():
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append((time.perf_counter() - started - 0.01) * 1000)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.gather(
+        *(
+            simulated_call(i, args.seconds, args.transcript_every, frame_log, transcript_log)
+            for i in range(args.calls)
+        )
+    )
+    stop.set()
+    await probe_task
+    return lags
+
+
+async def lag_benchmark(path: str, args):
+    frames_log = get_logger("frames")
+    hold_log = get_logger("hold")
+
+    def old_frame(n):
+        logger.debug(f"Processing frame {n} (AudioRawFrame, 320 bytes)")
+
+    def old_transcript():
+        logger.debug(f"On hold - received transcription: '{TEXT}'")
+
+    def new_frame(n):
+        frames_log.debug("Processing frame {} (AudioRawFrame, {} bytes)", n, 320)
+
+    def new_transcript():
+        hold_log.debug("On hold - received transcription: {!r}", TEXT)
+
+    setups = [
+        ("loguru, debug off", "INFO", False, None),
+        ("facade, debug off", "INFO", True, None),
+        ("loguru, debug on, sync", "DEBUG", False, None),
+        ("facade, debug on, queued", "DEBUG", True, None),
+        ("facade, debug on, sampled", "DEBUG", True, {"frames": 0.1}),
+    ]
+    print(f"\nEvent-loop lag: {args.calls} calls, {args.seconds:.0f} s, a log line per 20 ms frame")
+    print(f"  {'':<28}{'p50':>8}{'p99':>8}{'max':>8}")
+    for name, level, use_facade, sample_rates in setups:
+        if use_facade:
+            configure_logging(level=level, sink=path, sample_rates=sample_rates, force=True)
+            lags = await measure_lag(args, new_frame, new_transcript)
+        else:
+            logger.remove()
+            logger.add(path, level=level)
+            lags = await measure_lag(args, old_frame, old_transcript)
+        await logger.complete()
+        print(
+            f"  {name:<28}{percentile(lags, 50):>6.2f}ms{percentile(lags, 99):>6.2f}ms"
+            f"{max(lags):>6.2f}ms"
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--transcript-every", type=int, default=50, help="Frames between transcriptions")
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix=".log") as log_file:
+        micro_benchmark(log_file.name, args.repeat)
+        await lag_benchmark(log_file.name, args)
+
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
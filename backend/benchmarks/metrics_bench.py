@@ -0,0 +1,161 @@
+"""
+Cost of the in-process metrics, and a local scrape of the endpoint.
+
+Part 1 times CallMetrics.on_frame for the frames that reach the end of the
+pipeline (audio and text frames it ignores, MetricsFrames it records) and a
+tool-latency observation, per call on the event loop.
+
+Part 2 fills the registry the way a busy agent would (every tool and
+outcome, STT/LLM/TTS TTFB, turns, context sizes) and times rendering it.
+
+Part 3 starts the MetricsServer on a free port, scrapes /metrics over HTTP
+like Prometheus would, and prints the scrape time and the agent's series.
+
+Usage:
+    python -m benchmarks.metrics_bench --repeat 100000
+"""
+
+import time
+import random
+import asyncio
+import argparse
+
+from pipecat.frames.frames import (
+    MetricsFrame,
+    TextFrame,
+    OutputAudioRawFrame,
+    BotStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import (
+    LLMTokenUsage,
+    TTFBMetricsData,
+    LLMUsageMetricsData,
+    TTSUsageMetricsData,
+)
+
+from metrics import CallMetrics, MetricsServer, registry
+from metrics.agent import CONTEXT_MESSAGES, SUMMARIZATIONS, TOOL_LATENCY
+
+SERVICES = [
+    ("DeepgramSTTService#0", "nova-3"),
+    ("GoogleLLMService#0", "gemini-2.0-flash"),
+    ("CartesiaTTSService#0", "sonic-2"),
+]
+
+# The agent's tools (bot.DB_TOOLS, without importing the bot and its Mongo client)
+TOOLS = [
+    "get_pricing",
+    "get_amenities",
+    "lookup_booking",
+    "add_special_request",
+    "cancel_booking",
+    "check_availability",
+    "find_available_dates",
+    "book_room",
+    "book_rooms",
+    "update_booking",
+]
+
+
+def time_per_call(func, repeat: int) -> float:
+    """Nanoseconds per call of func()."""
+    started = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - started) / repeat
+
+
+def micro_benchmark(repeat: int):
+    call = CallMetrics()
+    audio = OutputAudioRawFrame(audio=b"\x00" * 320, sample_rate=8000, num_channels=1)
+    text = TextFrame("Your room is booked.")
+    ttfb = MetricsFrame(data=[TTFBMetricsData(processor="CartesiaTTSService#3", model="sonic-2", value=0.21)])
+    usage = MetricsFrame(
+        data=[
+            LLMUsageMetricsData(
+                processor="GoogleLLMService#3",
+                model="gemini-2.0-flash",
+                value=LLMTokenUsage(prompt_tokens=3200, completion_tokens=60, total_tokens=3260),
+            )
+        ]
+    )
+    stopped, started = UserStoppedSpeakingFrame(), BotStartedSpeakingFrame()
+
+    def turn():
+        call.on_frame(stopped)
+        call.on_frame(started)
+
+    rows = [
+        ("on_frame(audio), ignored", lambda: call.on_frame(audio)),
+        ("on_frame(text), ignored", lambda: call.on_frame(text)),
+        ("on_frame(TTFB metrics)", lambda: call.on_frame(ttfb)),
+        ("on_frame(LLM usage)", lambda: call.on_frame(usage)),
+        ("turn latency (2 frames)", turn),
+        ("tool latency observe", lambda: TOOL_LATENCY.labels("check_availability", "ok").observe(0.042)),
+    ]
+    print(f"\nPer update ({repeat} calls)")
+    for name, func in rows:
+        print(f"  {name:<28}{time_per_call(func, repeat):>8.0f} ns")
+
+
+def fill_registry(rng: random.Random, observations: int):
+    call = CallMetrics()
+    for _ in range(observations):
+        processor, model = rng.choice(SERVICES)
+        call.on_frame(MetricsFrame(data=[TTFBMetricsData(processor=processor, model=model, value=rng.uniform(0.05, 1.5))]))
+        call.on_frame(
+            MetricsFrame(data=[TTSUsageMetricsData(processor="CartesiaTTSService#0", model="sonic-2", value=rng.randint(10, 200))])
+        )
+        call.on_frame(UserStoppedSpeakingFrame())
+        call.on_frame(BotStartedSpeakingFrame())
+        tool = rng.choice(TOOLS)
+        TOOL_LATENCY.labels(tool, rng.choice(("ok", "ok", "ok", "still_working", "cancelled"))).observe(
+            rng.uniform(0.005, 2.0)
+        )
+        CONTEXT_MESSAGES.observe(rng.randint(3, 120))
+    SUMMARIZATIONS.labels("completed").inc()
+
+
+async def scrape(port: int, path: bytes = b"/metrics") -> tuple:
+    """Status line and body of a GET on the local endpoint."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET " + path + b" HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.decode().splitlines()[0], body.decode()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100000)
+    parser.add_argument("--observations", type=int, default=5000)
+    args = parser.parse_args()
+
+    micro_benchmark(args.repeat)
+
+    fill_registry(random.Random(7), args.observations)
+    render_ns = time_per_call(registry.render, 200)
+    text = registry.render()
+    series = sum(1 for line in text.splitlines() if line and not line.startswith("#"))
+    print(f"\nRender: {series} series, {len(text) / 1024:.1f} KiB, {render_ns / 1e6:.2f} ms")
+
+    server = MetricsServer(port=0, host="127.0.0.1")
+    await server.start()
+    try:
+        scraped_at = time.perf_counter()
+        status, body = await scrape(server.port)
+        scrape_ms = (time.perf_counter() - scraped_at) * 1000
+        not_found, _ = await scrape(server.port, b"/")
+    finally:
+        await server.stop()
+    print(f"\nScrape of 127.0.0.1:{server.port}/metrics: {status}, {scrape_ms:.2f} ms ({not_found} for /)")
+    for line in body.splitlines():
+        if line.startswith("# TYPE"):
+            print(f"  {line[7:]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+OccupancyIndex benchmark on a 5k-room x 365-night matrix.
+
+Builds the index from synthetic rooms and bookings (no database needed) and
+times the build, incremental updates, exact-date counts and flexible-date
+window searches.
+
+Usage:
+    python -m benchmarks.occupancy_bench --rooms 5000 --bookings 400000
+"""
+
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+from inventory import OccupancyIndex
+from benchmarks._support import ROOM_TYPES, build_rooms, build_bookings, percentile
+
+
+def timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: list):
+    print(
+        f"{label:<44} p50 {percentile(samples, 50) * 1e6:10.1f} us"
+        f"   p95 {percentile(samples, 95) * 1e6:10.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=5000)
+    parser.add_argument("--bookings", type=int, default=400_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rooms = build_rooms(args.rooms // len(ROOM_TYPES))
+    bookings = build_bookings(rooms, args.bookings)
+    today = date.today()
+
+    index = OccupancyIndex(horizon_days=365)
+    start = time.perf_counter()
+    index.load(rooms, bookings, today)
+    print(
+        f"Built {index.shape[0]} rooms x {index.shape[1]} nights from {len(bookings)} bookings "
+        f"in {(time.perf_counter() - start) * 1000:.1f} ms\n"
+    )
+
+    rng = random.Random(1)
+
+    def random_stay():
+        check_in = today + timedelta(days=rng.randint(0, 330))
+        return check_in, check_in + timedelta(days=rng.randint(1, 7))
+
+    def exact():
+        check_in, check_out = random_stay()
+        index.free_counts(check_in, check_out)
+
+    def nearest():
+        check_in, check_out = random_stay()
+        index.find_windows(
+            nights=(check_out - check_in).days,
+            earliest=check_in - timedelta(days=14),
+            latest=check_in + timedelta(days=14),
+            room_types=["deluxe"],
+            preferred=check_in,
+        )
+
+    def cheapest_next_month():
+        index.find_windows(
+            nights=rng.randint(2, 5),
+            earliest=today,
+            latest=today + timedelta(days=30),
+            sort_by="cheapest",
+        )
+
+    def apply_and_release():
+        check_in, check_out = random_stay()
+        booking = {
+            "room_number": rng.choice(rooms)["room_number"],
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": check_out.isoformat(),
+        }
+        index.apply_booking(booking)
+        index.release_booking(booking)
+
+    report("free_counts (exact dates, all types)", timed(exact, args.repeat))
+    report("find_windows (+-14 days, one type)", timed(nearest, args.repeat))
+    report("find_windows (cheapest, next 30 days)", timed(cheapest_next_month, args.repeat))
+    report("apply_booking + release_booking", timed(apply_and_release, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Rate calendar benchmark and cross-tool pricing consistency check.
+
+Quotes random stays against a calendar with seasonal and weekend rules and
+compares the time per quote with a night-by-night loop. With --consistency
+it also seeds a local Mongo and checks that check_availability,
+find_available_dates, book_room, update_booking and get_pricing all agree
+with the calendar, exiting non-zero on any mismatch.
+
+Usage:
+    python -m benchmarks.pricing_bench --quotes 100000
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.pricing_bench --consistency
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from datetime import date, timedelta
+
+from inventory import RateCalendar
+from benchmarks._support import ROOM_TYPES
+
+
+def sample_rules(today: date) -> list:
+    """A peak season, a shoulder discount and suite weekend pricing."""
+    return [
+        {
+            "start_date": (today + timedelta(days=60)).isoformat(),
+            "end_date": (today + timedelta(days=75)).isoformat(),
+            "multiplier": 1.3,
+        },
+        {
+            "start_date": (today + timedelta(days=120)).isoformat(),
+            "end_date": (today + timedelta(days=180)).isoformat(),
+            "multiplier": 0.85,
+        },
+        {
+            "room_type": "suite",
+            "start_date": today.isoformat(),
+            "end_date": (today + timedelta(days=730)).isoformat(),
+            "days_of_week": [4, 5],
+            "price_per_night": 320,
+        },
+    ]
+
+
+def random_stays(count: int, today: date, seed: int = 5, max_lead_days: int = 700) -> list:
+    rng = random.Random(seed)
+    types = list(ROOM_TYPES)
+    stays = []
+    for _ in range(count):
+        check_in = today + timedelta(days=rng.randint(0, max_lead_days))
+        stays.append(
+            (rng.choice(types), check_in, check_in + timedelta(days=rng.randint(1, 14)))
+        )
+    return stays
+
+
+def bench_quotes(count: int):
+    today = date.today()
+    calendar = RateCalendar()
+    calendar.load(
+        {t: info["price_per_night"] for t, info in ROOM_TYPES.items()},
+        sample_rules(today),
+        today,
+    )
+    stays = random_stays(count, today)
+
+    start = time.perf_counter()
+    totals = [calendar.stay_total(t, ci, co) for t, ci, co in stays]
+    prefix_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for (t, ci, co), total in zip(stays, totals):
+        nightly = sum(
+            calendar.nightly_rate(t, ci + timedelta(days=n)) for n in range((co - ci).days)
+        )
+        assert abs(nightly - total) < 1e-6, (t, ci, co, nightly, total)
+    loop_secs = time.perf_counter() - start
+
+    print(f"{count} quotes")
+    print(f"  prefix sums     {prefix_secs / count * 1e6:8.2f} us/quote")
+    print(f"  per-night loop  {loop_secs / count * 1e6:8.2f} us/quote (and totals match)")
+
+
+async def check_consistency(num_stays: int) -> int:
+    from db import db
+    from inventory import rate_calendar, occupancy_index
+    from db_functions import (
+        book_room,
+        get_pricing,
+        update_booking,
+        check_availability,
+        find_available_dates,
+    )
+    from benchmarks._support import call_tool, seed_hotel
+
+    today = date.today()
+    await seed_hotel(db, rooms_per_type=num_stays, num_bookings=0)
+    await db.rate_rules.drop()
+    await db.rate_rules.insert_many(sample_rules(today))
+    rate_calendar.invalidate()
+    occupancy_index.invalidate()
+
+    mismatches = []
+
+    def expect(label, actual, expected):
+        if actual != expected:
+            mismatches.append(f"{label}: got {actual}, expected {expected}")
+
+    pricing = await call_tool(get_pricing)
+    for entry in pricing["pricing"]:
+        expect(
+            f"get_pricing {entry['room_type']}",
+            entry["price_per_night"],
+            ROOM_TYPES[entry["room_type"]]["price_per_night"],
+        )
+
+    # Stay inside the occupancy index horizon so find_available_dates can answer
+    stays = random_stays(num_stays, today, seed=11, max_lead_days=330)
+    for i, (room_type, ci, co) in enumerate(stays):
+        ci_s, co_s = ci.isoformat(), co.isoformat()
+        quote = rate_calendar.quote(room_type, ci_s, co_s)
+
+        availability = await call_tool(
+            check_availability, check_in_date=ci_s, check_out_date=co_s, room_type=room_type
+        )
+        option = availability["room_options"][0]
+        expect(f"check_availability {room_type} {ci_s}", option["total_price"], quote["total_price"])
+
+        flexible = await call_tool(
+            find_available_dates,
+            nights=(co - ci).days,
+            preferred_check_in_date=ci_s,
+            flexibility_days=0,
+            room_type=room_type,
+        )
+        expect(f"find_available_dates {room_type} {ci_s}", flexible["options"][0]["total_price"], quote["total_price"])
+
+        booked = await call_tool(
+            book_room,
+            guest_name=f"Pricing {i}",
+            guest_phone="5550000000",
+            guest_email=f"pricing{i}@example.com",
+            room_type=room_type,
+            check_in_date=ci_s,
+            check_out_date=co_s,
+        )
+        expect(f"book_room {room_type} {ci_s}", booked["booking"]["total_price"], quote["total_price"])
+
+        new_ci, new_co = ci + timedelta(days=3), co + timedelta(days=5)
+        new_type = "suite" if room_type != "suite" else "standard"
+        updated = await call_tool(
+            update_booking,
+            confirmation_number=booked["booking"]["confirmation_number"],
+            new_check_in_date=new_ci.isoformat(),
+            new_check_out_date=new_co.isoformat(),
+            new_room_type=new_type,
+        )
+        expect(
+            f"update_booking {new_type} {new_ci}",
+            updated["updated_booking"]["total_price"],
+            rate_calendar.quote(new_type, new_ci, new_co)["total_price"],
+        )
+
+    await db.rate_rules.drop()
+    rate_calendar.invalidate()
+
+    for line in mismatches:
+        print(f"MISMATCH {line}")
+    print(f"Consistency: {num_stays} stays, {len(mismatches)} mismatches")
+    return 1 if mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quotes", type=int, default=100_000)
+    parser.add_argument("--consistency", action="store_true")
+    parser.add_argument("--stays", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.consistency:
+        sys.exit(asyncio.run(check_consistency(args.stays)))
+    bench_quotes(args.quotes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,578 @@
+"""
+Offline replay of saved conversations through the real bot pipeline.
+
+Reads conversations saved under logs/chats (legacy ``.json`` files from
+save_chat_history and ``.jsonl``/``.jsonl.gz`` transcripts from
+ChatTranscriptWriter), rebuilds the user turns and the recorded assistant
+responses, and drives them through ``run_bot`` with a fake transport,
+pass-through STT/TTS and a deterministic LLM that replays the recorded text
+and tool calls. Tools run for real against the Mongo configured in db.py,
+seeded with the synthetic hotel first.
+
+Recorded tool-call dates are shifted by the time since the recording, so a
+booking made for "next Friday" is still in the future when replayed and
+the tools run the paths the conversation took, not their date errors.
+
+Per-turn latency (user stopped speaking -> last LLM response of the turn
+leaving the pipeline) is compared with a stored baseline, so regressions in
+the tools, the context manager or the processors show up before deploy.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.replay logs/chats --save-baseline benchmarks/replay_baseline.json
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.replay logs/chats --baseline benchmarks/replay_baseline.json
+"""
+
+import re
+import sys
+import gzip
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+from types import SimpleNamespace
+from datetime import date, datetime, timedelta
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from loguru import logger
+from pipecat.frames.frames import (
+    Frame,
+    FunctionCallFromLLM,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMMessagesAppendFrame,
+    LLMTextFrame,
+    StartFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.services.llm_service import LLMService
+from pipecat.transports.base_transport import BaseTransport
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.aggregators.llm_response_universal import LLMUserAggregator
+
+from bot import run_bot
+from db import db
+from db_monitor import command_monitor
+from benchmarks._support import seed_hotel
+
+# Assistant messages written by the rolling summarizer, not by the LLM
+SUMMARY_PREFIX = "[Previous conversation summary:"
+
+# Tool arguments in this format are dates (see the tool schemas)
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+# ============ SAVED CONVERSATIONS ============
+
+
+@dataclass
+class Response:
+    """One recorded LLM run: spoken text and/or tool calls."""
+
+    text: str = ""
+    tool_calls: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class Turn:
+    """What triggered an LLM run in the recording, and what the LLM answered."""
+
+    kind: str  # "greeting", "user" or "system"
+    text: Optional[str]
+    responses: List[Response] = field(default_factory=list)
+
+
+def load_messages(path: Path) -> List[dict]:
+    """Load the messages of a legacy JSON conversation or a JSONL transcript."""
+    name = path.name
+    if name.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("messages", [])
+
+    opener = gzip.open if ".gz" in name else open
+    messages = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") == "message":
+                messages.append(record["message"])
+    return messages
+
+
+def recorded_at(path: Path) -> Optional[datetime]:
+    """When a conversation was recorded: the transcript header, the legacy save time or the file name."""
+    try:
+        if path.name.endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                return datetime.fromisoformat(json.load(f)["saved_at"])
+        opener = gzip.open if ".gz" in path.name else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+        return datetime.fromisoformat(header["started_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    match = re.search(r"_(\d{8}_\d{6})", path.name)
+    return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S") if match else None
+
+
+def find_conversations(paths: List[str]) -> List[Path]:
+    """Expand files and directories into conversation files, parts grouped together and in order."""
+    found = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            found.extend(
+                sorted(
+                    (
+                        f
+                        for f in p.iterdir()
+                        if f.name.endswith((".json", ".jsonl", ".jsonl.gz"))
+                    ),
+                    key=lambda f: (conversation_name(f), part_number(f)),
+                )
+            )
+        else:
+            found.append(p)
+    return found
+
+
+def _stem(path: Path) -> str:
+    name = path.name
+    for suffix in (".gz", ".jsonl", ".json"):
+        name = name.removesuffix(suffix)
+    return name
+
+
+def conversation_name(path: Path) -> str:
+    """Name shared by every part of a rotated transcript."""
+    return _stem(path).split(".part")[0]
+
+
+def part_number(path: Path) -> int:
+    """Position of a transcript part: the first has no suffix, then .part2, .part3..."""
+    _, _, part = _stem(path).partition(".part")
+    return int(part) if part.isdigit() else 1
+
+
+def shift_dates(turns: List[Turn], days: int) -> List[Turn]:
+    """Copies of the turns with every date in the recorded tool-call arguments moved by ``days``."""
+    if not days:
+        return turns
+
+    def shift(value):
+        if isinstance(value, str) and ISO_DATE.match(value):
+            try:
+                return (date.fromisoformat(value) + timedelta(days=days)).isoformat()
+            except ValueError:
+                return value
+        if isinstance(value, dict):
+            return {k: shift(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [shift(v) for v in value]
+        return value
+
+    def shift_call(call: dict) -> dict:
+        function = dict(call.get("function", {}))
+        arguments = function.get("arguments") or {}
+        if isinstance(arguments, str):
+            function["arguments"] = json.dumps(shift(json.loads(arguments or "{}")))
+        else:
+            function["arguments"] = shift(arguments)
+        return {**call, "function": function}
+
+    return [
+        Turn(
+            kind=turn.kind,
+            text=turn.text,
+            responses=[
+                Response(text=r.text, tool_calls=[shift_call(c) for c in r.tool_calls])
+                for r in turn.responses
+            ],
+        )
+        for turn in turns
+    ]
+
+
+def build_turns(messages: List[dict]) -> List[Turn]:
+    """Split recorded messages into turns, each with the LLM runs it triggered."""
+    turns = [Turn(kind="greeting", text=None)]
+    seen_system_prompt = False
+
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+        role = message.get("role")
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(
+                part.get("text", "") for part in content if isinstance(part, dict)
+            )
+
+        if role == "system":
+            if not seen_system_prompt:
+                seen_system_prompt = True
+                continue
+            # Idle nudges and similar mid-call instructions, which run the LLM
+            turns.append(Turn(kind="system", text=content or ""))
+        elif role == "user":
+            turns.append(Turn(kind="user", text=content or ""))
+        elif role == "assistant":
+            if isinstance(content, str) and content.startswith(SUMMARY_PREFIX):
+                continue
+            turns[-1].responses.append(
+                Response(text=content or "", tool_calls=message.get("tool_calls") or [])
+            )
+
+    # Every trigger runs the LLM at least once, even if nothing was recorded
+    for turn in turns:
+        if not turn.responses:
+            turn.responses.append(Response())
+    return turns
+
+
+# ============ FAKE SERVICES AND TRANSPORT ============
+
+
+class ReplayLLMService(LLMService):
+    """LLM that answers every run with the next recorded response."""
+
+    def __init__(self, responses: List[Response], **kwargs):
+        super().__init__(**kwargs)
+        self._responses = list(responses)
+        self._position = 0
+        self._call_counter = 0
+        self.unscripted_runs = 0
+        # perf_counter() at which each run's context arrived
+        self.run_started_at: List[float] = []
+
+        self._register_event_handler("on_llm_started")
+        self._register_event_handler("on_llm_stopped")
+
+    async def run_inference(self, context) -> Optional[str]:
+        """Summaries for the rolling summarizer."""
+        return "The guest and the concierge discussed a reservation."
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMContextFrame):
+            self.run_started_at.append(time.perf_counter())
+            await self._respond(frame.context)
+        else:
+            await self.push_frame(frame, direction)
+
+    async def _respond(self, context):
+        if self._position < len(self._responses):
+            response = self._responses[self._position]
+            self._position += 1
+        else:
+            response = Response()
+            self.unscripted_runs += 1
+
+        await self._call_event_handler("on_llm_started")
+        await self.push_frame(LLMFullResponseStartFrame())
+        if response.text:
+            await self.push_frame(LLMTextFrame(response.text))
+
+        calls = []
+        for call in response.tool_calls:
+            function = call.get("function", {})
+            arguments = function.get("arguments") or {}
+            if isinstance(arguments, str):
+                arguments = json.loads(arguments or "{}")
+            self._call_counter += 1
+            calls.append(
+                FunctionCallFromLLM(
+                    function_name=function.get("name"),
+                    tool_call_id=f"{call.get('id') or 'call'}-{self._call_counter}",
+                    arguments=arguments,
+                    context=context,
+                )
+            )
+        if calls:
+            await self.run_function_calls(calls)
+
+        await self.push_frame(LLMFullResponseEndFrame())
+        await self._call_event_handler("on_llm_stopped")
+
+
+class PassthroughService(FrameProcessor):
+    """Stands in for STT and TTS; frames pass through untouched."""
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+
+class ReplayInput(FrameProcessor):
+    """Transport input: announces the client and injects recorded turns."""
+
+    def __init__(self, transport: "ReplayTransport", **kwargs):
+        super().__init__(**kwargs)
+        self._transport = transport
+        self._transcription_aggregated = asyncio.Event()
+        self._watching_aggregator = False
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+        if isinstance(frame, StartFrame):
+            await self._transport.client_connected()
+
+    def _watch_user_aggregator(self):
+        """Get notified when the user aggregator has taken a transcription."""
+        processor = self.next
+        while processor and not isinstance(processor, LLMUserAggregator):
+            processor = processor.next
+        if processor is None:
+            return
+
+        @processor.event_handler("on_after_process_frame")
+        async def on_after_process_frame(aggregator, frame):
+            if isinstance(frame, TranscriptionFrame):
+                self._transcription_aggregated.set()
+
+        self._watching_aggregator = True
+
+    async def user_turn(self, text: str, timeout: float) -> float:
+        """
+        Speak a user turn; return when the user stopped speaking (perf_counter).
+
+        VAD frames are system frames and overtake the transcription, which
+        would leave the aggregator waiting out its late-transcription
+        timeout. As with a real STT, the stop is sent once the transcription
+        has reached the aggregator.
+        """
+        if not self._watching_aggregator:
+            self._watch_user_aggregator()
+        self._transcription_aggregated.clear()
+
+        await self.push_frame(UserStartedSpeakingFrame())
+        await self.push_frame(
+            TranscriptionFrame(text=text, user_id="replay", timestamp=str(time.time()))
+        )
+        if self._watching_aggregator:
+            await asyncio.wait_for(self._transcription_aggregated.wait(), timeout)
+        stopped_at = time.perf_counter()
+        await self.push_frame(UserStoppedSpeakingFrame())
+        return stopped_at
+
+    async def system_turn(self, text: str) -> float:
+        """Append a system message and run the LLM; return when it was sent."""
+        sent_at = time.perf_counter()
+        await self.push_frame(
+            LLMMessagesAppendFrame([{"role": "system", "content": text}], run_llm=True)
+        )
+        return sent_at
+
+    async def end(self):
+        await self._transport.client_disconnected()
+
+
+class ReplayOutput(FrameProcessor):
+    """Transport output: counts completed LLM responses."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.responses = 0
+        self._changed = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, LLMFullResponseEndFrame):
+            self.responses += 1
+            self._changed.set()
+        await self.push_frame(frame, direction)
+
+    async def wait_for_responses(self, count: int, timeout: float):
+        while self.responses < count:
+            self._changed.clear()
+            await asyncio.wait_for(self._changed.wait(), timeout)
+
+
+class ReplayTransport(BaseTransport):
+    """In-process transport for replaying text turns."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._input = ReplayInput(self, name="replay-input")
+        self._output = ReplayOutput(name="replay-output")
+        self._register_event_handler("on_client_connected")
+        self._register_event_handler("on_client_disconnected")
+
+    def input(self) -> ReplayInput:
+        return self._input
+
+    def output(self) -> ReplayOutput:
+        return self._output
+
+    async def client_connected(self):
+        await self._call_event_handler("on_client_connected", "replay")
+
+    async def client_disconnected(self):
+        await self._call_event_handler("on_client_disconnected", "replay")
+
+
+# ============ REPLAY ============
+
+
+async def replay_conversation(
+    turns: List[Turn], turn_timeout: float, config: Optional[dict] = None
+) -> dict:
+    """
+    Drive one conversation through run_bot and time every turn.
+
+    Args:
+        turns: Turns from build_turns()
+        turn_timeout: Seconds to wait for a turn's responses
+        config: Bot config; chat history, DB metrics and the fast paths
+            (which would answer recorded LLM turns themselves) are off by default
+    """
+    transport = ReplayTransport()
+    llm = ReplayLLMService([r for turn in turns for r in turn.responses])
+    services = (PassthroughService(name="replay-stt"), llm, PassthroughService(name="replay-tts"))
+    config = {
+        "save_chat_history": False,
+        "save_db_metrics": False,
+        "faq_fast_path": False,
+        "intent_fast_path": False,
+        **(config or {}),
+    }
+    runner_args = SimpleNamespace(pipeline_idle_timeout_secs=None, handle_sigint=False)
+
+    bot_task = asyncio.create_task(run_bot(transport, runner_args, config, services=services))
+    output = transport.output()
+    expected = 0
+    timings = []
+
+    def db_commands() -> int:
+        return sum(s["count"] for s in command_monitor.tool_stats().values())
+
+    try:
+        for turn in turns:
+            first_run = expected
+            expected += len(turn.responses)
+            commands_before = db_commands()
+            if turn.kind == "user":
+                start = await transport.input().user_turn(turn.text, turn_timeout)
+            elif turn.kind == "system":
+                start = await transport.input().system_turn(turn.text)
+            await output.wait_for_responses(expected, turn_timeout)
+            if turn.kind == "greeting":
+                # Triggered by the client connecting; timed from the LLM run
+                start = llm.run_started_at[first_run]
+            timings.append(
+                {
+                    "kind": turn.kind,
+                    "text": turn.text,
+                    "tools": [
+                        c.get("function", {}).get("name")
+                        for r in turn.responses
+                        for c in r.tool_calls
+                    ],
+                    "turn_ms": (time.perf_counter() - start) * 1000,
+                    "db_commands": db_commands() - commands_before,
+                }
+            )
+    finally:
+        if not bot_task.done():
+            await transport.input().end()
+        try:
+            await asyncio.wait_for(bot_task, timeout=turn_timeout)
+        except asyncio.TimeoutError:
+            bot_task.cancel()
+
+    return {"turns": timings, "unscripted_runs": llm.unscripted_runs}
+
+
+def compare(name: str, turns: List[dict], baseline: Optional[dict], tolerance: float, slack_ms: float) -> int:
+    """Print the per-turn report and return the number of regressions."""
+    base_turns = (baseline or {}).get(name, {}).get("turns_ms", [])
+    regressions = 0
+    print(f"\n{name}")
+    print(f"  {'#':>3} {'kind':<9}{'turn ms':>10}{'baseline':>10}{'db':>5}  tools / text")
+    for i, turn in enumerate(turns):
+        base = base_turns[i] if i < len(base_turns) else None
+        flag = ""
+        if base is not None and turn["turn_ms"] > base * (1 + tolerance) + slack_ms:
+            regressions += 1
+            flag = "  REGRESSION"
+        label = ", ".join(turn["tools"]) or (turn["text"] or "")[:40]
+        base_text = f"{base:>10.1f}" if base is not None else f"{'-':>10}"
+        print(
+            f"  {i:>3} {turn['kind']:<9}{turn['turn_ms']:>10.1f}{base_text}"
+            f"{turn['db_commands']:>5}  {label}{flag}"
+        )
+    return regressions
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", help="Conversation files or directories")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per conversation (median is reported)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", help="Write the measured turn latencies here")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown per turn")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Allowed absolute slowdown per turn")
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--no-seed", action="store_true", help="Use the database as is")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+
+    conversations = {}
+    recorded = {}
+    for path in find_conversations(args.paths):
+        name = conversation_name(path)
+        conversations.setdefault(name, []).extend(load_messages(path))
+        recorded.setdefault(name, recorded_at(path))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["conversations"]
+
+    measured = {}
+    regressions = 0
+    for name, messages in conversations.items():
+        turns = build_turns(messages)
+        if recorded[name]:
+            turns = shift_dates(turns, (date.today() - recorded[name].date()).days)
+        runs = []
+        for _ in range(args.repeat):
+            if not args.no_seed:
+                await seed_hotel(db)
+            runs.append(await replay_conversation(turns, args.turn_timeout))
+
+        report = [
+            {**turn, "turn_ms": statistics.median(r["turns"][i]["turn_ms"] for r in runs)}
+            for i, turn in enumerate(runs[0]["turns"])
+        ]
+        measured[name] = {"turns_ms": [round(t["turn_ms"], 3) for t in report]}
+        regressions += compare(name, report, baseline, args.tolerance, args.slack_ms)
+        if runs[0]["unscripted_runs"]:
+            print(f"  note: the LLM ran {runs[0]['unscripted_runs']} more time(s) than recorded")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "conversations": measured}, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if baseline is not None:
+        print(f"\n{regressions} turn(s) slower than the baseline")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Room assignment simulation: random.choice vs fragmentation-aware best fit.
+
+Replays a year of synthetic booking requests (seasonal demand, lead times,
+1-7 night stays) against an in-memory hotel under both strategies and
+reports occupancy, rejected requests and CPU time per assignment. No
+database is needed.
+
+Usage:
+    python -m benchmarks.room_assignment_sim --rooms 60 --requests 9000
+"""
+
+import math
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+from inventory.assignment import choose_room, is_free
+
+
+def synthetic_requests(num_requests: int, days: int, seed: int) -> list:
+    """Booking requests as (request_day, check_in, check_out), in arrival order."""
+    rng = random.Random(seed)
+    start = date(2026, 1, 1)
+    requests = []
+    for _ in range(num_requests):
+        # Seasonal demand: busier in summer and around the new year
+        while True:
+            day = rng.randrange(days)
+            season = 0.65 + 0.35 * math.cos(2 * math.pi * (day - 190) / 365)
+            if rng.random() < season:
+                break
+        nights = min(7, max(1, int(rng.expovariate(1 / 2.5)) + 1))
+        lead = min(day, int(rng.expovariate(1 / 20)))
+        check_in = start + timedelta(days=day)
+        requests.append((day - lead, check_in, check_in + timedelta(days=nights)))
+    requests.sort(key=lambda r: r[0])
+    return requests
+
+
+def choose_random(rooms, intervals, check_in, check_out, rng):
+    free = [r for r in rooms if is_free(intervals[r["room_number"]], check_in, check_out)]
+    return rng.choice(free) if free else None
+
+
+def choose_best_fit(rooms, intervals, check_in, check_out, rng):
+    return choose_room(rooms, intervals, check_in, check_out)
+
+
+def simulate(strategy, rooms: list, requests: list, days: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    intervals = {r["room_number"]: [] for r in rooms}
+    accepted = rejected = 0
+    booked_nights = 0
+    cpu = 0.0
+    for _, check_in, check_out in requests:
+        started = time.process_time()
+        room = strategy(rooms, intervals, check_in, check_out, rng)
+        cpu += time.process_time() - started
+        if room is None:
+            rejected += 1
+            continue
+        intervals[room["room_number"]].append((check_in, check_out))
+        accepted += 1
+        booked_nights += (check_out - check_in).days
+
+    return {
+        "occupancy": booked_nights / (len(rooms) * days),
+        "accepted": accepted,
+        "rejected": rejected,
+        "cpu_us_per_request": cpu / len(requests) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=9000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rooms = [{"room_number": f"{100 + i}"} for i in range(args.rooms)]
+    requests = synthetic_requests(args.requests, args.days, args.seed)
+
+    print(f"{args.rooms} rooms, {len(requests)} requests over {args.days} days\n")
+    print(f"{'strategy':<12}{'occupancy':>11}{'accepted':>10}{'rejected':>10}{'cpu/request':>15}")
+    for label, strategy in (("random", choose_random), ("best-fit", choose_best_fit)):
+        result = simulate(strategy, rooms, requests, args.days, args.seed)
+        print(
+            f"{label:<12}{result['occupancy']:>10.1%}{result['accepted']:>10}"
+            f"{result['rejected']:>10}{result['cpu_us_per_request']:>12.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
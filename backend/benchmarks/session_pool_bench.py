@@ -0,0 +1,182 @@
+"""
+Call start latency with and without the provider session pool.
+
+Starts local websocket stand-ins for Deepgram live transcription and
+Cartesia TTS (with an artificial handshake delay standing in for DNS, TLS
+and the upgrade round trips to the real APIs), then runs calls through
+``run_bot`` with the replay transport and LLM from benchmarks/replay.py and
+the real Deepgram/Cartesia services pointed at the stand-ins. For every call
+it measures connect -> first bot audio: from the call starting to the first
+TTS audio frame of the greeting reaching the transport output.
+
+Calls run one after the other, ``--gap-ms`` apart, first with the stock
+services and then with the pooled ones; a warm-up call in each mode is not
+measured. Pool stats (hits, misses, recycled streams) are printed at the end.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.session_pool_bench --calls 20 --handshake-ms 150
+"""
+
+import sys
+import json
+import time
+import base64
+import asyncio
+import argparse
+import statistics
+from types import SimpleNamespace
+
+from deepgram import LiveOptions
+from loguru import logger
+from pipecat.frames.frames import Frame, TTSAudioRawFrame
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.services.cartesia.tts import CartesiaTTSService
+from pipecat.services.deepgram.stt import DeepgramSTTService
+from websockets.asyncio.server import serve
+
+from bot import run_bot
+from session_pool import session_pool
+from session_pool.cartesia import PooledCartesiaTTSService
+from session_pool.deepgram import PooledDeepgramSTTService
+from benchmarks.replay import ReplayLLMService, ReplayOutput, ReplayTransport, Response
+
+GREETING = "Welcome to the Grand Vista, how can I help?"
+
+# 20 ms of silence per chunk at 24 kHz, 16-bit mono
+CHUNK = base64.b64encode(bytes(960)).decode("ascii")
+
+
+# ============ PROVIDER STAND-INS ============
+
+
+def delayed_handshake(delay_secs: float):
+    async def process_request(connection, request):
+        await asyncio.sleep(delay_secs)
+        return None
+
+    return process_request
+
+
+async def cartesia_handler(websocket):
+    """Answer every transcript with a chunk of audio, and a done message at the end."""
+    async for message in websocket:
+        msg = json.loads(message)
+        if msg.get("cancel"):
+            continue
+        context_id = msg["context_id"]
+        if msg.get("transcript"):
+            await websocket.send(
+                json.dumps({"type": "chunk", "context_id": context_id, "data": CHUNK})
+            )
+        if not msg.get("continue", True):
+            await websocket.send(json.dumps({"type": "done", "context_id": context_id}))
+
+
+async def deepgram_handler(websocket):
+    """Swallow audio and keepalives until the client closes the stream."""
+    async for message in websocket:
+        if isinstance(message, str) and json.loads(message).get("type") == "CloseStream":
+            break
+    await websocket.close()
+
+
+# ============ CALLS ============
+
+
+class AudioOutput(ReplayOutput):
+    """Replay output that records when the first bot audio arrives."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.first_audio_at = None
+        self.first_audio = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        if isinstance(frame, TTSAudioRawFrame) and self.first_audio_at is None:
+            self.first_audio_at = time.perf_counter()
+            self.first_audio.set()
+        await super().process_frame(frame, direction)
+
+
+def create_services(pooled: bool, deepgram_url: str, cartesia_url: str):
+    stt_class = PooledDeepgramSTTService if pooled else DeepgramSTTService
+    tts_class = PooledCartesiaTTSService if pooled else CartesiaTTSService
+    stt = stt_class(
+        api_key="bench",
+        base_url=deepgram_url,
+        live_options=LiveOptions(model="nova-3", language="multi", interim_results=False),
+    )
+    llm = ReplayLLMService([Response(text=GREETING)])
+    tts = tts_class(api_key="bench", url=cartesia_url, voice_id="bench-voice")
+    return stt, llm, tts
+
+
+async def run_call(pooled: bool, deepgram_url: str, cartesia_url: str, timeout: float) -> float:
+    """Run one call until its first bot audio, hang up; return connect -> audio in ms."""
+    transport = ReplayTransport()
+    transport._output = AudioOutput(name="replay-output")
+    services = create_services(pooled, deepgram_url, cartesia_url)
+    config = {"save_chat_history": False, "save_db_metrics": False}
+    runner_args = SimpleNamespace(pipeline_idle_timeout_secs=None, handle_sigint=False)
+
+    started_at = time.perf_counter()
+    bot_task = asyncio.create_task(run_bot(transport, runner_args, config, services=services))
+    try:
+        await asyncio.wait_for(transport.output().first_audio.wait(), timeout)
+        return (transport.output().first_audio_at - started_at) * 1000
+    finally:
+        await transport.input().end()
+        try:
+            await asyncio.wait_for(bot_task, timeout)
+        except asyncio.TimeoutError:
+            bot_task.cancel()
+
+
+async def run_mode(label: str, pooled: bool, args, deepgram_url: str, cartesia_url: str) -> list:
+    await run_call(pooled, deepgram_url, cartesia_url, args.timeout)
+    samples = []
+    for _ in range(args.calls):
+        await asyncio.sleep(args.gap_ms / 1000)
+        samples.append(await run_call(pooled, deepgram_url, cartesia_url, args.timeout))
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"{label:<8} connect -> first audio: p50 {statistics.median(samples):7.1f} ms  "
+        f"p95 {p95:7.1f} ms  max {samples[-1]:7.1f} ms"
+    )
+    return samples
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20, help="Measured calls per mode")
+    parser.add_argument("--handshake-ms", type=float, default=150.0, help="Stand-in connect delay")
+    parser.add_argument("--gap-ms", type=float, default=200.0, help="Pause between calls")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    delay = args.handshake_ms / 1000
+    async with (
+        serve(deepgram_handler, "127.0.0.1", 0, process_request=delayed_handshake(delay)) as deepgram,
+        serve(cartesia_handler, "127.0.0.1", 0, process_request=delayed_handshake(delay)) as cartesia,
+    ):
+        deepgram_url = f"http://127.0.0.1:{deepgram.sockets[0].getsockname()[1]}"
+        cartesia_url = f"ws://127.0.0.1:{cartesia.sockets[0].getsockname()[1]}/tts/websocket"
+        print(f"{args.calls} calls per mode, {args.handshake_ms:.0f} ms handshakes\n")
+
+        unpooled = await run_mode("unpooled", False, args, deepgram_url, cartesia_url)
+        pooled = await run_mode("pooled", True, args, deepgram_url, cartesia_url)
+        stats = session_pool.stats()
+        await session_pool.close()
+
+    saved = statistics.median(unpooled) - statistics.median(pooled)
+    print(f"\np50 saved per call: {saved:.1f} ms")
+    print("pool: " + ", ".join(f"{key} {value}" for key, value in stats.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""
+Soak test: per-call memory retention across thousands of calls.
+
+Runs simulated calls through ``run_bot`` with the fake transport, STT, TTS
+and LLM from benchmarks/replay.py, sequentially and in overlapping batches.
+Every call checks availability, prices and looks up through the real tools
+and ends with end_call, so its event handlers, tool runtime, pending end-call
+task and pipeline are all created and torn down.
+
+After a warm-up (caches, lazy imports, connection pools) it snapshots
+tracemalloc and live object counts, runs the rest of the calls, forces a
+collection and measures what was retained. Exits non-zero if retained
+memory per call or leftover asyncio tasks go over the limits, and prints
+the allocation sites and object types that grew.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.soak --calls 1000 --concurrency 8
+"""
+
+import gc
+import sys
+import time
+import asyncio
+import argparse
+import resource
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+
+from loguru import logger
+
+from db import db
+from benchmarks._support import seed_hotel
+from benchmarks.replay import (
+    Response,
+    Turn,
+    build_turns,
+    find_conversations,
+    load_messages,
+    replay_conversation,
+)
+
+# Allocations from these files are bookkeeping, not the bot
+IGNORED_FILES = ("<frozen importlib._bootstrap>", "<unknown>", tracemalloc.__file__)
+
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+def tool_call(name: str, **arguments) -> dict:
+    return {"id": name, "function": {"name": name, "arguments": arguments}}
+
+
+def default_script() -> list:
+    """A short booking call that ends with end_call."""
+    return [
+        Turn("greeting", None, [Response(text="Welcome to the Grand Vista, how can I help?")]),
+        Turn(
+            "user",
+            "Do you have a room at the end of the month?",
+            [
+                Response(
+                    tool_calls=[
+                        tool_call("check_availability", check_in_date=day(30), check_out_date=day(32)),
+                        tool_call("get_pricing", room_type="deluxe"),
+                    ]
+                ),
+                Response(text="Yes, a deluxe room is available for those nights."),
+            ],
+        ),
+        Turn(
+            "user",
+            "Can you check my existing booking too?",
+            [
+                Response(tool_calls=[tool_call("lookup_booking", confirmation_number="GV-2025-001011")]),
+                Response(text="I found your booking."),
+            ],
+        ),
+        Turn(
+            "user",
+            "That's all, thanks!",
+            [Response(text="Goodbye!", tool_calls=[tool_call("end_call")])],
+        ),
+    ]
+
+
+def object_counts() -> Counter:
+    return Counter(type(o).__qualname__ for o in gc.get_objects())
+
+
+def live_tasks() -> int:
+    return len([t for t in asyncio.all_tasks() if t is not asyncio.current_task()])
+
+
+async def run_calls(turns: list, calls: int, concurrency: int, turn_timeout: float, config: dict):
+    """Run ``calls`` calls, ``concurrency`` at a time."""
+    done = 0
+    while done < calls:
+        batch = min(concurrency, calls - done)
+        await asyncio.gather(
+            *(replay_conversation(turns, turn_timeout, config=config) for _ in range(batch))
+        )
+        done += batch
+
+
+def settle():
+    for _ in range(3):
+        gc.collect()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="*", help="Saved conversations to use instead of the built-in call")
+    parser.add_argument("--calls", type=int, default=1000, help="Measured calls per phase")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight in the overlapping phase")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--max-kb-per-call", type=float, default=2.0, help="Retained memory allowed per call")
+    parser.add_argument("--max-leftover-tasks", type=int, default=0)
+    parser.add_argument("--end-call-delay", type=float, default=0.05, help="end_call's goodbye delay (s)")
+    parser.add_argument("--traceback-frames", type=int, default=1)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    if args.paths:
+        messages = []
+        for path in find_conversations(args.paths):
+            messages.extend(load_messages(path))
+        turns = build_turns(messages)
+    else:
+        turns = default_script()
+
+    config = {
+        "save_chat_history": False,
+        "save_db_metrics": False,
+        "end_call_delay_secs": args.end_call_delay,
+    }
+    await seed_hotel(db)
+
+    await run_calls(turns, args.warmup, args.concurrency, args.turn_timeout, config)
+    settle()
+    tracemalloc.start(args.traceback_frames)
+    baseline = tracemalloc.take_snapshot()
+    objects_before = object_counts()
+    tasks_before = live_tasks()
+
+    phases = (("sequential", 1), ("overlapping", args.concurrency))
+    started = time.perf_counter()
+    for label, concurrency in phases:
+        phase_start = time.perf_counter()
+        await run_calls(turns, args.calls, concurrency, args.turn_timeout, config)
+        print(f"{label:<12} {args.calls} calls in {time.perf_counter() - phase_start:.1f} s")
+    elapsed = time.perf_counter() - started
+
+    # Let cancelled tasks finish unwinding before measuring
+    await asyncio.sleep(args.end_call_delay + 0.1)
+    settle()
+    growth = object_counts() - objects_before
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total_calls = args.calls * len(phases)
+
+    filters = [tracemalloc.Filter(False, name) for name in IGNORED_FILES]
+    diff = snapshot.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+    retained = sum(stat.size_diff for stat in diff)
+    per_call_kb = retained / total_calls / 1024
+    leftover_tasks = live_tasks() - tasks_before
+
+    print(f"\n{total_calls} calls in {elapsed:.1f} s ({total_calls / elapsed:.1f} calls/s)")
+    print(f"retained: {retained / 1024:,.1f} KB ({per_call_kb:.2f} KB/call, limit {args.max_kb_per_call})")
+    print(f"leftover asyncio tasks: {leftover_tasks} (limit {args.max_leftover_tasks})")
+    print(f"max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MB")
+
+    print(f"\ntop {args.top} allocation sites still alive after teardown:")
+    for stat in sorted(diff, key=lambda s: s.size_diff, reverse=True)[: args.top]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        print(
+            f"  {stat.size_diff / 1024:>10,.1f} KB {stat.count_diff:>+8} blocks  "
+            f"{frame.filename}:{frame.lineno}"
+        )
+
+    print(f"\ntop {args.top} object types that grew:")
+    for name, count in growth.most_common(args.top):
+        print(f"  {count:>+8}  {name}")
+
+    failed = per_call_kb > args.max_kb_per_call or leftover_tasks > args.max_leftover_tasks
+    if failed:
+        print("\nFAIL: memory or tasks retained across calls")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Multi-tool LLM turn benchmark: sequential dispatch vs ToolRuntime.
+
+A fake LLM replays scripted responses that each contain several function
+calls. Every response is executed twice against a local Mongo: once awaiting
+the calls one after another, and once the way Pipecat dispatches them (one
+task per call) through ToolRuntime, which runs reads concurrently and
+serializes writes.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.tool_concurrency_bench --rounds 50
+"""
+
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+
+from db import db
+from db_functions import (
+    ToolRuntime,
+    book_room,
+    get_pricing,
+    get_amenities,
+    lookup_booking,
+    check_availability,
+    add_special_request,
+)
+from benchmarks._support import FakeParams, percentile, seed_hotel
+
+TOOLS = {
+    f.__name__: f
+    for f in (
+        book_room,
+        get_pricing,
+        get_amenities,
+        lookup_booking,
+        check_availability,
+        add_special_request,
+    )
+}
+
+
+def scripted_responses(round_index: int, guests: list) -> list:
+    """Multi-tool LLM responses, as lists of (function_name, arguments)."""
+    today = datetime.now().date()
+    check_in = (today + timedelta(days=30 + round_index % 60)).isoformat()
+    check_out = (today + timedelta(days=33 + round_index % 60)).isoformat()
+    guest = guests[round_index % len(guests)]
+    return [
+        [
+            ("get_pricing", {}),
+            ("get_amenities", {"room_type": "suite"}),
+        ],
+        [
+            ("lookup_booking", {"guest_name": guest}),
+            ("check_availability", {"check_in_date": check_in, "check_out_date": check_out}),
+        ],
+        [
+            ("check_availability", {"check_in_date": check_in, "check_out_date": check_out, "room_type": "deluxe"}),
+            ("get_pricing", {"room_type": "deluxe"}),
+            ("get_amenities", {"room_type": "deluxe"}),
+        ],
+        [
+            ("lookup_booking", {"guest_name": guest}),
+            ("add_special_request", {"guest_name": guest, "request": f"extra pillows {round_index}"}),
+            ("lookup_booking", {"guest_name": guest}),
+        ],
+    ]
+
+
+async def run_sequential(calls: list) -> list:
+    results = []
+    for name, args in calls:
+        params = FakeParams(function_name=name, arguments=args)
+        await TOOLS[name](params, **args)
+        results.append(params.result)
+    return results
+
+
+async def run_runtime(runtime: ToolRuntime, calls: list) -> list:
+    # Pipecat creates one task per function call, in the order the LLM emitted them
+    params_list = [FakeParams(function_name=name, arguments=args) for name, args in calls]
+    tasks = [
+        asyncio.create_task(runtime.wrap(TOOLS[name])(params, **args))
+        for (name, args), params in zip(calls, params_list)
+    ]
+    await asyncio.gather(*tasks)
+    return [params.result for params in params_list]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--rooms-per-type", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=2000)
+    args = parser.parse_args()
+
+    _, bookings = await seed_hotel(db, rooms_per_type=args.rooms_per_type, num_bookings=args.bookings)
+    guests = [booking["guest_name"] for booking in bookings[:100]]
+
+    timings = {"sequential": {}, "runtime": {}}
+    for round_index in range(args.rounds):
+        runtime = ToolRuntime(call_id=f"bench-{round_index}")
+        for turn, calls in enumerate(scripted_responses(round_index, guests)):
+            for mode in ("sequential", "runtime"):
+                start = time.perf_counter()
+                if mode == "sequential":
+                    results = await run_sequential(calls)
+                else:
+                    results = await run_runtime(runtime, calls)
+                elapsed = time.perf_counter() - start
+                timings[mode].setdefault(turn, []).append(elapsed)
+                assert len(results) == len(calls)
+
+    print(f"{'turn':<6}{'tools':<50}{'sequential p50':>16}{'runtime p50':>14}{'speedup':>10}")
+    for turn, calls in enumerate(scripted_responses(0, guests)):
+        seq = percentile(timings["sequential"][turn], 50)
+        rt = percentile(timings["runtime"][turn], 50)
+        names = ", ".join(name for name, _ in calls)
+        print(
+            f"{turn:<6}{names:<50}{seq * 1000:>13.2f} ms{rt * 1000:>11.2f} ms{seq / rt:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
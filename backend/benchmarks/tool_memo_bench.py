@@ -0,0 +1,156 @@
+"""
+Per-call memo benchmark: Mongo round trips per scripted conversation.
+
+Replays typical tool sequences from real calls (look a booking up, then
+change it; shop around dates and room types) through a ToolRuntime with and
+without the per-call memo, and reports the commands each one sent to Mongo.
+Tool results must be identical in both modes.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.tool_memo_bench
+"""
+
+import sys
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from pymongo import monitoring
+
+from benchmarks._support import CommandCounter
+
+
+# Must be registered before db.py creates the client
+counter = CommandCounter()
+monitoring.register(counter)
+
+from db import db  # noqa: E402
+from inventory import occupancy_index, rate_calendar  # noqa: E402
+from db_functions import (  # noqa: E402
+    ToolRuntime,
+    book_room,
+    get_pricing,
+    get_amenities,
+    lookup_booking,
+    cancel_booking,
+    update_booking,
+    check_availability,
+    add_special_request,
+    find_available_dates,
+)
+from benchmarks._support import FakeParams, seed_hotel  # noqa: E402
+
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+def scripts(bookings: list) -> dict:
+    """Tool sequences as (tool, kwargs), modelled on recorded conversations."""
+    confirmation = "GV-2025-001011"
+    name = bookings[150]["guest_name"]
+    email = bookings[42]["guest_email"]
+    return {
+        "modify booking": [
+            (lookup_booking, {"confirmation_number": confirmation}),
+            (check_availability, {"check_in_date": day(90), "check_out_date": day(93)}),
+            (lookup_booking, {"confirmation_number": confirmation.lower()}),
+            (
+                update_booking,
+                {
+                    "confirmation_number": confirmation,
+                    "new_check_in_date": day(90),
+                    "new_check_out_date": day(93),
+                },
+            ),
+            (lookup_booking, {"confirmation_number": confirmation}),
+        ],
+        "cancel by name": [
+            (lookup_booking, {"guest_name": name}),
+            (lookup_booking, {"guest_name": name.lower()}),
+            (cancel_booking, {"guest_name": name}),
+        ],
+        "special requests": [
+            (lookup_booking, {"guest_email": email}),
+            (
+                add_special_request,
+                {"guest_email": email, "request": "late check-in"},
+            ),
+            (lookup_booking, {"guest_email": email}),
+            (
+                add_special_request,
+                {"guest_email": email, "request": "extra pillows"},
+            ),
+        ],
+        "shopping around": [
+            (get_pricing, {}),
+            (check_availability, {"check_in_date": day(30), "check_out_date": day(33)}),
+            (get_amenities, {"room_type": "suite"}),
+            (
+                check_availability,
+                {"check_in_date": day(30), "check_out_date": day(33), "num_guests": None},
+            ),
+            (get_pricing, {"room_type": "suite"}),
+            (find_available_dates, {"nights": 3, "preferred_check_in_date": day(30)}),
+            (get_amenities, {"room_type": "Suite"}),
+            (check_availability, {"check_in_date": day(30), "check_out_date": day(33)}),
+            (
+                book_room,
+                {
+                    "guest_name": "Dana Whitfield",
+                    "guest_phone": "520-555-0188",
+                    "guest_email": "dana@example.com",
+                    "room_type": "suite",
+                    "check_in_date": day(30),
+                    "check_out_date": day(33),
+                },
+            ),
+            (check_availability, {"check_in_date": day(30), "check_out_date": day(33)}),
+        ],
+    }
+
+
+async def replay(script: list, memo_ttl_secs, rooms_per_type: int, num_bookings: int):
+    """Run a script on a freshly seeded hotel; return (round trips, results)."""
+    await seed_hotel(db, rooms_per_type=rooms_per_type, num_bookings=num_bookings)
+    occupancy_index.invalidate()
+    rate_calendar.invalidate()
+    await occupancy_index.ensure_loaded(db)
+    await rate_calendar.ensure_loaded(db)
+
+    runtime = ToolRuntime(memo_ttl_secs=memo_ttl_secs)
+    results = []
+    before = counter.count
+    for tool, kwargs in script:
+        params = FakeParams(function_name=tool.__name__, arguments=kwargs)
+        await runtime.wrap(tool)(params, **kwargs)
+        results.append(params.result)
+    return counter.count - before, results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms-per-type", type=int, default=20)
+    parser.add_argument("--bookings", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'script':<20}{'tools':>7}{'no memo':>10}{'memo':>8}{'saved':>8}")
+    failures = 0
+    # The scripts refer to seeded guests; every replay reseeds the same hotel
+    _, bookings = await seed_hotel(db, rooms_per_type=args.rooms_per_type, num_bookings=args.bookings)
+    for name, script in scripts(bookings).items():
+        without, expected = await replay(script, None, args.rooms_per_type, args.bookings)
+        with_memo, actual = await replay(script, 30.0, args.rooms_per_type, args.bookings)
+        print(
+            f"{name:<20}{len(script):>7}{without:>10}{with_memo:>8}"
+            f"{without - with_memo:>8}"
+        )
+        if actual != expected:
+            failures += 1
+            print(f"  results differ with the memo enabled in '{name}'")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,301 @@
+"""
+Latency and round-trip baseline for every DB tool at several dataset scales.
+
+For each scale (100, 10k and 1M bookings by default) seeds a synthetic
+hotel (benchmarks.dataset) with enough rooms to hold the bookings over
+roughly a year, warms the occupancy index and rate calendar as a running
+agent would, then calls every tool in bot.DB_TOOLS --iterations times with
+a FakeParams capturing result_callback. Tools run without ToolRuntime, so each number is the cold
+path of the tool itself. Write tools get a fresh target every iteration
+(a new stay, another confirmation number).
+
+Per tool and scale the run records p50/p95/p99/max latency, Mongo commands
+per call (pymongo command monitoring) and failed calls, and compares them
+with the previous baseline. A tool regresses when its p50 or p95 grows by
+more than --tolerance (and at least --min-delta-ms), or when it sends more
+commands than before. The run is saved as the new baseline unless it
+regressed (--update saves it anyway); exits non-zero on regressions.
+
+Baselines are only comparable on the same machine and mongod. Create the
+first one with:
+
+    MONGODB_URI=mongodb://localhost:27017 MONGODB_TLS=false \
+        python -m benchmarks.tool_suite --scales 100 10000 1000000
+
+then rerun the same command after a change to diff against it. The same
+scenarios run under pytest (tests/test_tool_suite.py), where a regression
+against this baseline fails the test of that tool and scale.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import orjson
+from loguru import logger
+from pymongo import monitoring
+
+from benchmarks._support import CommandCounter
+
+# Must be registered before db.py creates the client
+counter = CommandCounter()
+monitoring.register(counter)
+
+from db import db  # noqa: E402
+from inventory import occupancy_index, rate_calendar  # noqa: E402
+from db_functions import (  # noqa: E402
+    book_room,
+    book_rooms,
+    get_pricing,
+    get_amenities,
+    lookup_booking,
+    cancel_booking,
+    update_booking,
+    check_availability,
+    add_special_request,
+    find_available_dates,
+)
+from benchmarks._support import FakeParams, percentile  # noqa: E402
+from benchmarks.dataset import DatasetSpec, build_rooms, iter_bookings, load, rooms_per_type_for  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "tool_suite.json"
+
+GUEST = {
+    "guest_name": "Dana Whitfield",
+    "guest_phone": "520-555-0188",
+    "guest_email": "dana@example.com",
+}
+
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+def confirmation(n: int) -> str:
+    """Confirmation number of the n-th seeded booking."""
+    return f"GV-2025-{1001 + n:06d}"
+
+
+def scenarios(num_bookings: int, names: List[str]) -> List[Tuple[str, Callable, Callable[[int], dict]]]:
+    """(label, tool, kwargs of iteration i) for every tool, given guest names from the dataset."""
+    n = max(num_bookings, 1)
+    names = names or ["Dana Whitfield"]
+    # Seeded stays end within about a year (two weeks at most later); new bookings go after them
+    free_from = 400
+    return [
+        ("get_pricing", get_pricing, lambda i: {}),
+        ("get_amenities", get_amenities, lambda i: {"room_type": ("standard", "deluxe", "suite")[i % 3]}),
+        ("lookup_booking (number)", lookup_booking, lambda i: {"confirmation_number": confirmation(i * 7919 % n)}),
+        ("lookup_booking (name)", lookup_booking, lambda i: {"guest_name": names[i % len(names)]}),
+        (
+            "check_availability",
+            check_availability,
+            lambda i: {"check_in_date": day(20 + i % 200), "check_out_date": day(23 + i % 200)},
+        ),
+        (
+            "find_available_dates",
+            find_available_dates,
+            lambda i: {"nights": 3, "preferred_check_in_date": day(30 + i % 180), "room_type": "suite"},
+        ),
+        (
+            "book_room",
+            book_room,
+            lambda i: {
+                **GUEST,
+                "room_type": ("standard", "deluxe", "suite")[i % 3],
+                "check_in_date": day(free_from + 3 * i),
+                "check_out_date": day(free_from + 3 * i + 2),
+            },
+        ),
+        (
+            "book_rooms",
+            book_rooms,
+            lambda i: {
+                **GUEST,
+                "room_types": ["standard", "standard", "suite"],
+                "check_in_date": day(free_from + 3 * i + 1),
+                "check_out_date": day(free_from + 3 * i + 3),
+            },
+        ),
+        (
+            "update_booking",
+            update_booking,
+            lambda i: {"confirmation_number": confirmation(i * 31 % n), "new_num_guests": 1 + i % 2},
+        ),
+        (
+            "add_special_request",
+            add_special_request,
+            lambda i: {"confirmation_number": confirmation(i * 37 % n), "request": "late check-in"},
+        ),
+        # Last, from the end of the seeded range, so no other scenario targets a cancelled booking
+        ("cancel_booking", cancel_booking, lambda i: {"confirmation_number": confirmation(n - 1 - i)}),
+    ]
+
+
+async def seed(num_bookings: int) -> Tuple[int, List[str]]:
+    """Seed the hotel for a scale; returns the number of rooms and some guest names."""
+    spec = DatasetSpec(rooms_per_type=rooms_per_type_for(num_bookings), num_bookings=num_bookings)
+    rooms = build_rooms(spec.rooms_per_type)
+    names = []
+    step = max(1, num_bookings // 200)
+
+    def sampled(bookings):
+        for n, booking in enumerate(bookings):
+            if n % step == 0:
+                names.append(booking["guest_name"])
+            yield booking
+
+    await load(db, rooms, sampled(iter_bookings(rooms, spec)))
+
+    occupancy_index.invalidate()
+    rate_calendar.invalidate()
+    await occupancy_index.ensure_loaded(db)
+    await rate_calendar.ensure_loaded(db)
+    return len(rooms), names
+
+
+async def measure(
+    tool, make_kwargs: Callable[[int], dict], iterations: int, warmup: int, commands: CommandCounter = counter
+) -> dict:
+    latencies_ms = []
+    round_trips = []
+    failed = 0
+    for i in range(warmup + iterations):
+        kwargs = make_kwargs(i)
+        params = FakeParams(function_name=tool.__name__, arguments=kwargs)
+        before = commands.count
+        started = time.perf_counter()
+        await tool(params, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if i < warmup:
+            continue
+        latencies_ms.append(elapsed_ms)
+        round_trips.append(commands.count - before)
+        result = params.result or {}
+        failed += result.get("success") is False
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "max_ms": round(max(latencies_ms), 3),
+        "round_trips": round(sum(round_trips) / len(round_trips), 2),
+        "failed": failed,
+    }
+
+
+def compare(previous: dict, current: dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Regressions of the current run against the previous baseline."""
+    regressions = []
+    for scale, tools in current["scales"].items():
+        before_tools = previous.get("scales", {}).get(scale, {})
+        for label, now in tools.items():
+            before = before_tools.get(label)
+            if not before:
+                continue
+            for key in ("p50_ms", "p95_ms"):
+                delta = now[key] - before[key]
+                if delta > min_delta_ms and now[key] > before[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{scale} bookings, {label}: {key} {before[key]:.2f} -> {now[key]:.2f} ms"
+                    )
+            if now["round_trips"] > before["round_trips"]:
+                regressions.append(
+                    f"{scale} bookings, {label}: round trips {before['round_trips']} -> {now['round_trips']}"
+                )
+            if now["failed"] > before["failed"]:
+                regressions.append(f"{scale} bookings, {label}: failed calls {before['failed']} -> {now['failed']}")
+    return regressions
+
+
+def delta(now: float, before: Optional[float]) -> str:
+    if not before:
+        return ""
+    return f"{(now - before) / before:+.0%}"
+
+
+async def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    server = await db.client.server_info()
+    return {
+        "backend": "mongomock" if server.get("sysInfo") == "Mock" else "mongod",
+        "commit": commit,
+        "mongod": server.get("version"),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 10_000, 1_000_000], help="Bookings per run")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative growth of p50/p95")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore latency changes below this")
+    parser.add_argument("--update", action="store_true", help="Save this run as the baseline even if it regressed")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    previous = orjson.loads(args.baseline.read_bytes()) if args.baseline.exists() else None
+    current = {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": await environment(),
+        "iterations": args.iterations,
+        "scales": {},
+    }
+
+    for scale in args.scales:
+        started = time.perf_counter()
+        rooms, names = await seed(scale)
+        print(f"\n{scale} bookings, {rooms} rooms (seeded in {time.perf_counter() - started:.1f} s)")
+        print(f"{'tool':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'trips':>7}{'failed':>7}{'p95 vs base':>13}")
+        results: Dict[str, dict] = {}
+        for label, tool, make_kwargs in scenarios(scale, names):
+            result = results[label] = await measure(tool, make_kwargs, args.iterations, args.warmup)
+            before = (previous or {}).get("scales", {}).get(str(scale), {}).get(label, {})
+            print(
+                f"{label:<26}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['max_ms']:>9.2f}{result['round_trips']:>7}{result['failed']:>7}"
+                f"{delta(result['p95_ms'], before.get('p95_ms')):>13}"
+            )
+        current["scales"][str(scale)] = results
+
+    regressions = compare(previous, current, args.tolerance, args.min_delta_ms) if previous else []
+    if previous:
+        print(f"\nCompared with the baseline of {previous['recorded_at']} ({previous['environment'].get('commit')})")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+    elif previous:
+        print("No regressions")
+
+    if args.update or not regressions:
+        # Keep scales this run skipped from the previous baseline
+        merged = {**(previous or {}).get("scales", {}), **current["scales"]}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_bytes(orjson.dumps({**current, "scales": merged}, option=orjson.OPT_INDENT_2))
+        print(f"Baseline saved to {args.baseline}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
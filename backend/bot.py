@@ -1,36 +1,30 @@
 import os
 import re
 import asyncio
-from loguru import logger
+import functools
 from dotenv import load_dotenv
-from deepgram import LiveOptions
-from utils import save_chat_history
+from utils import ChatTranscriptWriter, use_fast_twilio_serializer
+from utils.log import CallContext, configure_logging, get_logger
+from db_monitor import command_monitor
+from metrics import CallMetrics, start_metrics
+from usage import GREETING, IDLE_NUDGE, UsageLedger, usage_store
+from providers import create_services, prewarm_sessions, warm_up
+from session_host import SessionCapacityError, session_host
+from db import db
+from inventory import coherence_bus
+from fast_path import FaqFastPathProcessor, IntentFastPathProcessor
 from pipecat.pipeline.pipeline import Pipeline
 from prompts import SYSTEM_PROMPT, WAKE_PROMPTS
 from pipecat.runner.utils import create_transport
 from pipecat.pipeline.runner import PipelineRunner
-from pipecat.audio.vad.vad_analyzer import VADParams
-from pipecat.services.groq.llm import GroqLLMService
-from pipecat.audio.vad.silero import SileroVADAnalyzer
-from pipecat.services.google.llm import GoogleLLMService
-from pipecat.services.openai.llm import OpenAILLMService
-from pipecat.transports.daily.transport import DailyParams
 from pipecat.services.llm_service import FunctionCallParams
-from pipecat.services.cerebras.llm import CerebrasLLMService
-from pipecat.services.cartesia.tts import CartesiaTTSService
-from pipecat.services.deepgram.stt import DeepgramSTTService
-from pipecat.services.deepgram.tts import DeepgramTTSService
 from pipecat.adapters.schemas.tools_schema import ToolsSchema
 from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat.processors.aggregators.llm_context import LLMContext
 from pipecat.processors.user_idle_processor import UserIdleProcessor
-from pipecat.transports.websocket.fastapi import FastAPIWebsocketParams
-from pipecat.services.elevenlabs.stt import ElevenLabsRealtimeSTTService
-from pipecat.audio.turn.smart_turn.base_smart_turn import SmartTurnParams
 from pipecat.transports.base_transport import BaseTransport, TransportParams
 from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
 from rolling_summarizer_context_manager import RollingSummarizerContextManager
-from pipecat.audio.turn.smart_turn.local_smart_turn_v3 import LocalSmartTurnAnalyzerV3
 from pipecat.processors.aggregators.llm_response_universal import (
     LLMContextAggregatorPair,
 )
@@ -40,7 +34,10 @@ from pipecat.frames.frames import (
     EndTaskFrame,
     LLMRunFrame,
     TTSSpeakFrame,
+    LLMContextFrame,
+    InterruptionFrame,
     TranscriptionFrame,
+    UserStoppedSpeakingFrame,
     LLMMessagesAppendFrame,
     FunctionCallResultProperties,
 )
@@ -49,7 +46,10 @@ from prompts.function_schemas import (
     end_call_function,
 )
 from db_functions import (
+    WRITE_TOOLS,
+    ToolRuntime,
     book_room,
+    book_rooms,
     get_pricing,
     get_amenities,
     lookup_booking,
@@ -57,11 +57,22 @@ from db_functions import (
     update_booking,
     check_availability,
     add_special_request,
+    find_available_dates,
 )
 
 
 load_dotenv(override=True)
 
+log = get_logger("call")
+hold_log = get_logger("hold")
+
+# Optionally pay for the provider imports at worker start instead of on the first call
+if os.getenv("SAMORA_WARM_UP_PROVIDERS", "").lower() in ("1", "true", "yes"):
+    warm_up()
+
+# Connects the default STT/TTS sessions once per process (see bot())
+_session_prewarm = None
+
 
 class HoldWakeProcessor(FrameProcessor):
     """Filters transcriptions when on hold, passes wake prompts to resume."""
@@ -78,9 +89,9 @@ class HoldWakeProcessor(FrameProcessor):
         """Set the hold state."""
         self.is_on_hold = on_hold
         if on_hold:
-            logger.info("Hold mode ACTIVATED - waiting for wake phrase")
+            hold_log.info("Hold mode ACTIVATED - waiting for wake phrase")
         else:
-            logger.info("Hold mode DEACTIVATED - resuming conversation")
+            hold_log.info("Hold mode DEACTIVATED - resuming conversation")
 
     def _contains_wake_phrase(self, text: str) -> bool:
         """Check if text contains any wake phrase."""
@@ -101,136 +112,124 @@ class HoldWakeProcessor(FrameProcessor):
         # When on hold, check transcriptions for wake phrases
         if isinstance(frame, TranscriptionFrame):
             text = frame.text
-            logger.debug(f"On hold - received transcription: '{text}'")
+            hold_log.debug("On hold - received transcription: {!r}", text)
 
             if self._contains_wake_phrase(text):
-                logger.info(f"Wake phrase detected: '{text}'")
+                hold_log.info("Wake phrase detected: {!r}", text)
                 self.is_on_hold = False
                 # Pass the frame through so LLM can respond
                 await self.push_frame(frame, direction)
             else:
                 # Silently drop the transcription
-                logger.debug(f"Dropping transcription (on hold): '{text}'")
+                hold_log.debug("Dropping transcription (on hold): {!r}", text)
         else:
             # Pass through non-transcription frames
             await self.push_frame(frame, direction)
 
 
-transport_params = {
-    "daily": lambda: DailyParams(
-        audio_in_enabled=True,
-        audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.8, min_volume=0.45)),
-        turn_analyzer=LocalSmartTurnAnalyzerV3(params=SmartTurnParams()),
-    ),
-    "webrtc": lambda: TransportParams(
-        audio_in_enabled=True,
-        audio_out_enabled=True,
-        vad_analyzer=SileroVADAnalyzer(
-            params=VADParams(stop_secs=0.8, min_volume=0.45)
-        ),  # Increased stop_secs from 0.3 to reduce split transcriptions
-        turn_analyzer=LocalSmartTurnAnalyzerV3(params=SmartTurnParams()),
-    ),
-    "twilio": lambda: FastAPIWebsocketParams(
+class ChatTranscriptProcessor(FrameProcessor):
+    """Streams new context messages to a ChatTranscriptWriter on every LLM run."""
+
+    def __init__(self, writer: ChatTranscriptWriter, **kwargs):
+        super().__init__(**kwargs)
+        self._writer = writer
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        """Sync the transcript whenever the context is sent to the LLM."""
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMContextFrame):
+            self._writer.sync(frame.context.messages)
+
+        await self.push_frame(frame, direction)
+
+
+def _audio_analyzers() -> dict:
+    """
+    Per-call VAD and end-of-turn analyzers over models shared by the process.
+
+    Imported on first use, they are slow to load.
+    """
+    from pipecat.audio.vad.vad_analyzer import VADParams
+    from pipecat.audio.turn.smart_turn.base_smart_turn import SmartTurnParams
+    from audio_models import SharedSileroVADAnalyzer, SharedSmartTurnAnalyzer
+
+    return {
+        # Increased stop_secs from 0.3 to reduce split transcriptions
+        "vad_analyzer": SharedSileroVADAnalyzer(params=VADParams(stop_secs=0.8, min_volume=0.45)),
+        "turn_analyzer": SharedSmartTurnAnalyzer(params=SmartTurnParams()),
+    }
+
+
+def _daily_params():
+    from pipecat.transports.daily.transport import DailyParams
+
+    return DailyParams(audio_in_enabled=True, audio_out_enabled=True, **_audio_analyzers())
+
+
+def _twilio_params():
+    from pipecat.transports.websocket.fastapi import FastAPIWebsocketParams
+
+    return FastAPIWebsocketParams(
         audio_in_enabled=True,
         audio_out_enabled=True,
         add_wav_header=False,
-        vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.8, min_volume=0.45)),
-        turn_analyzer=LocalSmartTurnAnalyzerV3(params=SmartTurnParams()),
-    ),
-}
+        **_audio_analyzers(),
+    )
 
 
-async def run_bot(transport: BaseTransport, runner_args, config: dict):
-    logger.info("Starting Samora AI bot...")
+# Database tools, in the order the LLM sees them
+DB_TOOLS = (
+    get_pricing,
+    get_amenities,
+    lookup_booking,
+    add_special_request,
+    cancel_booking,
+    check_availability,
+    find_available_dates,
+    book_room,
+    book_rooms,
+    update_booking,
+)
 
-    # ============ PROVIDER CONFIG ============
-    llm_provider = config.get("llm_provider", "google")
-    stt_provider = config.get("stt_provider", "deepgram")
-    tts_provider = config.get("tts_provider", "cartesia")
 
-    logger.info(
-        f"Using providers - LLM: {llm_provider}, STT: {stt_provider}, TTS: {tts_provider}"
-    )
+@functools.lru_cache(maxsize=None)
+def _tools_schema() -> ToolsSchema:
+    """
+    Tool schemas for the LLM, built once per process and shared by every call.
 
-    # ============ STT ============
-    if stt_provider == "deepgram":
-        deepgram_key = config.get("deepgram_api_key") or os.getenv(
-            "DEEPGRAM_API_KEY", ""
-        )
-        stt = DeepgramSTTService(
-            api_key=deepgram_key,
-            live_options=LiveOptions(
-                model="nova-3",
-                language="multi",
-                interim_results=False,
-                vad_events=False,
-                diarize=False,
-                filler_words=True,
-            ),
-        )
-        logger.info("STT: Deepgram Nova-3")
-    else:  # elevenlabs
-        elevenlabs_key = config.get("elevenlabs_api_key") or os.getenv(
-            "ELEVENLABS_API_KEY", ""
-        )
-        stt = ElevenLabsRealtimeSTTService(
-            api_key=elevenlabs_key,
-            model="scribe_v2_realtime",
-        )
-        logger.info("STT: ElevenLabs Scribe v2")
-
-    # ============ LLM ============
-    if llm_provider == "openai":
-        openai_key = config.get("openai_api_key") or os.getenv("OPENAI_API_KEY", "")
-        llm = OpenAILLMService(
-            api_key=openai_key,
-            model="gpt-4o-mini",
-        )
-        logger.info("LLM: OpenAI GPT-4o-mini")
-    elif llm_provider == "cerebras":
-        cerebras_key = config.get("cerebras_api_key") or os.getenv(
-            "CEREBRAS_API_KEY", ""
-        )
-        llm = CerebrasLLMService(
-            api_key=cerebras_key,
-            model="llama-3.3-70b",
-        )
-        logger.info("LLM: Cerebras Llama-3.3-70B")
-    elif llm_provider == "groq":
-        groq_key = config.get("groq_api_key") or os.getenv("GROQ_API_KEY", "")
-        llm = GroqLLMService(
-            api_key=groq_key,
-            model="llama-3.3-70b-versatile",
-        )
-        logger.info("LLM: Groq Llama-3.3-70B")
-    else:  # google (default)
-        google_key = config.get("google_api_key") or os.getenv("GOOGLE_API_KEY", "")
-        llm = GoogleLLMService(
-            api_key=google_key,
-            model="gemini-2.5-flash",
-        )
-        logger.info("LLM: Google Gemini 2.5 Flash")
+    Parsed from the unwrapped tools: ToolRuntime.wrap keeps their name,
+    docstring and signature, so the schemas are the same.
+    """
+    return ToolsSchema(standard_tools=[hold_function, end_call_function, *DB_TOOLS])
 
-    # ============ TTS ============
-    if tts_provider == "deepgram":
-        deepgram_key = config.get("deepgram_api_key") or os.getenv(
-            "DEEPGRAM_API_KEY", ""
-        )
-        tts = DeepgramTTSService(
-            api_key=deepgram_key,
-            voice="aura-2-theia-en",  # Australian, feminine, expressive, polite, sincere
-        )
-        logger.info("TTS: Deepgram Aura-2 Theia")
-    else:  # cartesia
-        cartesia_key = config.get("cartesia_api_key") or os.getenv(
-            "CARTESIA_API_KEY", ""
-        )
-        tts = CartesiaTTSService(
-            api_key=cartesia_key,
-            voice_id="248be419-c632-4f23-adf1-5324ed7dbf1d",
-        )
-        logger.info("TTS: Cartesia")
+
+# Transport modules are only imported for the transport a call uses
+transport_params = {
+    "daily": _daily_params,
+    "webrtc": lambda: TransportParams(
+        audio_in_enabled=True, audio_out_enabled=True, **_audio_analyzers()
+    ),
+    "twilio": _twilio_params,
+}
+
+
+async def run_bot(
+    transport: BaseTransport, runner_args, config: dict, services: tuple = None
+):
+    """
+    Build the voice pipeline on a transport and run it until the call ends.
+
+    Args:
+        transport: Transport carrying the call audio
+        runner_args: Runner arguments (idle timeout, signal handling)
+        config: Bot configuration (providers, API keys, feature settings)
+        services: Optional prebuilt (stt, llm, tts), e.g. fakes for offline replay.
+            Created from the config when omitted.
+    """
+    log.info("Starting Samora AI bot...")
+
+    stt, llm, tts = services or create_services(config)
 
     # Track LLM response state to prevent idle interrupts during generation
     # Note: This uses event handlers which may not fire for all LLM providers
@@ -247,6 +246,11 @@ async def run_bot(transport: BaseTransport, runner_args, config: dict):
     # ============ PROCESSORS ============
     hold_wake_processor = HoldWakeProcessor()
 
+    # Static hotel questions are answered from the prompt's facts without the LLM
+    faq_fast_path = None
+    if config.get("faq_fast_path", False):
+        faq_fast_path = FaqFastPathProcessor(min_score=config.get("faq_min_score", 0.6))
+
     async def handle_user_idle(processor: UserIdleProcessor, retry_count: int) -> bool:
         """Handle user idle - prompts user up to 3 times then ends call."""
         if _llm_responding_tracker["is_responding"]:
@@ -256,23 +260,25 @@ async def run_bot(transport: BaseTransport, runner_args, config: dict):
             return True
 
         if retry_count == 1:
-            logger.info(f"User idle (attempt {retry_count}/3)")
+            log.info("User idle (attempt {}/3)", retry_count)
             message = {
                 "role": "system",
                 "content": "The user has been quiet for a moment. Gently and briefly ask if they're still there. Keep it natural and warm, like 'Hey, just checking - are you still with me?'",
             }
+            usage_ledger.next_response_stage(IDLE_NUDGE)
             await processor.push_frame(LLMMessagesAppendFrame([message], run_llm=True))
             return True
         elif retry_count == 2:
-            logger.info(f"User idle (attempt {retry_count}/3)")
+            log.info("User idle (attempt {}/3)", retry_count)
             message = {
                 "role": "system",
                 "content": "The user is still quiet. Politely ask if they'd like to continue or if they need more time. Be warm but brief.",
             }
+            usage_ledger.next_response_stage(IDLE_NUDGE)
             await processor.push_frame(LLMMessagesAppendFrame([message], run_llm=True))
             return True
         else:
-            logger.info(f"User idle (attempt {retry_count}/3) - ending call")
+            log.info("User idle (attempt {}/3) - ending call", retry_count)
             await processor.push_frame(
                 TTSSpeakFrame(
                     "It looks like you might be busy right now. Feel free to call back anytime - we're always here to help. Take care!"
@@ -286,62 +292,117 @@ async def run_bot(transport: BaseTransport, runner_args, config: dict):
         timeout=10.0,
     )
 
-    async def put_on_hold(params: FunctionCallParams):
-        logger.info("Putting conversation on HOLD")
+    # Hold and end-call actions, run by the tools and by the intent fast path.
+    # processor is where the spoken confirmation is pushed from
+    async def hold_call(processor: FrameProcessor) -> dict:
+        log.info("Putting conversation on HOLD")
         hold_wake_processor.set_hold(True)
-        await params.llm.push_frame(
+        await processor.push_frame(
             TTSSpeakFrame(
                 "No problem! I'll wait right here. Just say I'm back when you're ready to continue."
             )
         )
+        return {"status": "on_hold"}
+
+    async def put_on_hold(params: FunctionCallParams):
+        result = await hold_call(params.llm)
         properties = FunctionCallResultProperties(run_llm=False)
-        await params.result_callback({"status": "on_hold"}, properties=properties)
+        await params.result_callback(result, properties=properties)
 
-    async def end_call(params: FunctionCallParams):
-        logger.info("Ending call gracefully")
-        await task.queue_frame(
-            TTSSpeakFrame(
-                "It was great talking with you! Feel free to reach out anytime. Take care!"
-            )
-        )
-        await asyncio.sleep(7)
+    # Ends the pipeline once the goodbye has been spoken. Tracked so it can be
+    # cancelled if the call tears down first (e.g. the caller hangs up)
+    end_call_delay_secs = config.get("end_call_delay_secs", 7.0)
+    pending_end_call = []
+
+    async def end_after_goodbye():
+        await asyncio.sleep(end_call_delay_secs)
         await task.queue_frame(EndFrame())
+
+    async def finish_call(processor: FrameProcessor = None) -> dict:
+        log.info("Ending call gracefully")
+        if not pending_end_call:
+            await task.queue_frame(
+                TTSSpeakFrame(
+                    "It was great talking with you! Feel free to reach out anytime. Take care!"
+                )
+            )
+            pending_end_call.append(asyncio.create_task(end_after_goodbye()))
+        return {"status": "call_ended"}
+
+    async def end_call(params: FunctionCallParams):
+        result = await finish_call()
         properties = FunctionCallResultProperties(run_llm=False)
-        await params.result_callback({"status": "call_ended"}, properties=properties)
+        await params.result_callback(result, properties=properties)
 
     llm.register_function("put_on_hold", put_on_hold)
     llm.register_function("end_call", end_call)
 
     # ============ REGISTER DB FUNCTIONS (Direct Functions) ============
-    llm.register_direct_function(get_pricing)
-    llm.register_direct_function(get_amenities)
-    llm.register_direct_function(lookup_booking)
-    llm.register_direct_function(add_special_request)
-    llm.register_direct_function(cancel_booking)
-    llm.register_direct_function(check_availability)
-    llm.register_direct_function(book_room)
-    llm.register_direct_function(update_booking)
+    # Read-only tools from one LLM response run concurrently, writes are serialized,
+    # and repeated reads within the call are answered from a memo until the next write.
+    # A barge-in cancels the reads (and kills their cursors); writes always finish,
+    # without an LLM run if the caller interrupted them
+    tool_runtime = ToolRuntime(
+        memo_ttl_secs=config.get("tool_memo_ttl_secs", 30.0),
+        turn_budget_secs=config.get("turn_budget_secs", 6.0),
+    )
+    db_tools = [tool_runtime.wrap(tool) for tool in DB_TOOLS]
+    for tool in db_tools:
+        llm.register_direct_function(
+            tool, cancel_on_interruption=tool.__name__ not in WRITE_TOOLS
+        )
+
+    @llm.event_handler("on_before_process_frame")
+    async def on_llm_frame(llm_service, frame):
+        if isinstance(frame, InterruptionFrame):
+            tool_runtime.interrupted()
 
     # ============ CONTEXT & PIPELINE ============
-    tools = ToolsSchema(
-        standard_tools=[
-            hold_function,
-            end_call_function,
-            get_pricing,
-            get_amenities,
-            lookup_booking,
-            add_special_request,
-            cancel_booking,
-            check_availability,
-            book_room,
-            update_booking,
-        ]
-    )
+    tools = _tools_schema()
 
     messages = [{"role": "system", "content": SYSTEM_PROMPT}]
     context = LLMContext(messages, tools=tools)
     context_aggregator = LLMContextAggregatorPair(context)
 
+    # Every record logged during the call (Pipecat's included) carries its id and turn
+    call_log = CallContext(tool_runtime.call_id)
+
+    # The turn's latency budget starts when the caller stops speaking; tools
+    # called while answering it get what is left of it
+    @context_aggregator.user().event_handler("on_before_process_frame")
+    async def on_user_frame(aggregator, frame):
+        if isinstance(frame, UserStoppedSpeakingFrame):
+            tool_runtime.turn_ended()
+            call_log.next_turn()
+
+    # Turn latency, provider TTFB and token usage for the process's /metrics endpoint;
+    # every downstream frame reaches the last processor once
+    call_metrics = CallMetrics()
+
+    # LLM tokens, TTS characters and STT seconds of the call, by stage; saved at call end
+    usage_ledger = UsageLedger(
+        tool_runtime.call_id, stt_service=stt.name, stt_model=getattr(stt, "model_name", "")
+    )
+
+    @context_aggregator.assistant().event_handler("on_before_process_frame")
+    async def on_tail_frame(aggregator, frame):
+        call_metrics.on_frame(frame)
+        usage_ledger.on_frame(frame)
+
+    @stt.event_handler("on_before_process_frame")
+    async def on_stt_frame(stt_service, frame):
+        usage_ledger.on_audio(frame)
+
+    # Streams the conversation to logs/chats as JSONL while the call runs
+    transcript_writer = None
+    if config.get("save_chat_history", True):
+        transcript_writer = ChatTranscriptWriter(
+            call_id=tool_runtime.call_id,
+            compress=config.get("chat_history_compress", False),
+            max_bytes=config.get("chat_history_max_bytes"),
+            max_age_secs=config.get("chat_history_max_age_secs"),
+        )
+
     context_threshold = config.get("context_threshold", 100)
     context_keep_recent = config.get("context_keep_recent", 20)
 
@@ -350,15 +411,36 @@ async def run_bot(transport: BaseTransport, runner_args, config: dict):
         llm_service=llm,
         threshold=context_threshold,
         keep_recent=context_keep_recent,
+        usage_ledger=usage_ledger,
+    )
+
+    transcript_processors = (
+        [ChatTranscriptProcessor(transcript_writer)] if transcript_writer else []
     )
+    faq_processors = [faq_fast_path] if faq_fast_path else []
+
+    # Clear hold, resume and goodbye turns run their action without the LLM
+    intent_fast_path = None
+    if config.get("intent_fast_path", True):
+        intent_fast_path = IntentFastPathProcessor(
+            context,
+            actions={"put_on_hold": hold_call, "end_call": finish_call},
+            is_on_hold=lambda: hold_wake_processor.is_on_hold,
+            resume=lambda: hold_wake_processor.set_hold(False),
+            write_tools=WRITE_TOOLS,
+        )
+    intent_processors = [intent_fast_path] if intent_fast_path else []
 
     # user_idle_processor placed after LLM to auto-pause during function calls
     pipeline = Pipeline(
         [
             transport.input(),
             stt,
+            *intent_processors,
             hold_wake_processor,
+            *faq_processors,
             context_aggregator.user(),
+            *transcript_processors,
             llm,
             context_manager,
             user_idle_processor,
@@ -380,12 +462,13 @@ async def run_bot(transport: BaseTransport, runner_args, config: dict):
 
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
-        logger.info("Client connected")
+        log.info("Client connected")
+        usage_ledger.next_response_stage(GREETING)
         await task.queue_frames([LLMRunFrame()])
 
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
-        logger.info("Client disconnected")
+        log.info("Client disconnected")
         await task.cancel()
 
     runner = PipelineRunner(
@@ -393,14 +476,54 @@ async def run_bot(transport: BaseTransport, runner_args, config: dict):
         if hasattr(runner_args, "handle_sigint")
         else False
     )
-    await runner.run(task)
-
-    # Save chat history after pipeline finishes
-    # save_chat_history(context.messages)
+    with call_log:
+        try:
+            await runner.run(task)
+        finally:
+            for pending in pending_end_call:
+                pending.cancel()
+
+            # Flush the remaining messages and finalize the transcript off the event loop
+            if transcript_writer:
+                transcript_writer.sync(context.messages)
+                await transcript_writer.aclose()
+
+            # Per-tool Mongo latency for this call; always exported so records don't pile up
+            db_summary = await command_monitor.aexport_call(
+                tool_runtime.call_id,
+                output_dir="logs/db" if config.get("save_db_metrics", True) else None,
+            )
+            log.info(
+                "Call {}: {} Mongo commands, {:.0f} ms total",
+                tool_runtime.call_id, db_summary["commands"], db_summary["total_ms"],
+            )
+            usage = usage_ledger.summary()
+            if config.get("save_usage", True):
+                usage_store.add(usage)
+            log.info(
+                "Call {}: usage ${:.4f} (LLM {:.4f}, TTS {:.4f}, STT {:.4f}) by stage {}",
+                tool_runtime.call_id, usage["cost_usd"]["total"], usage["cost_usd"]["llm"],
+                usage["cost_usd"]["tts"], usage["cost_usd"]["stt"], usage["cost_usd"]["by_stage"],
+            )
+            log.info("Call {}: interruptions {}", tool_runtime.call_id, tool_runtime.interruption_stats())
+            log.info("Call {}: tool budgets {}", tool_runtime.call_id, tool_runtime.deadline_stats())
+            if faq_fast_path:
+                log.info("Call {}: FAQ fast path {}", tool_runtime.call_id, faq_fast_path.stats())
+            if intent_fast_path:
+                log.info("Call {}: intent fast path {}", tool_runtime.call_id, intent_fast_path.stats())
 
 
 async def bot(runner_args):
     """Main bot entry point for Pipecat Cloud."""
+    # Queued, sampled logging instead of the runner's synchronous stderr sink
+    configure_logging()
+    # Scrape endpoint for the process (SAMORA_METRICS_PORT), started by the first call
+    await start_metrics()
+    # Default Deepgram and Cartesia sessions, connected while the first transport is set up
+    global _session_prewarm
+    if _session_prewarm is None:
+        _session_prewarm = asyncio.create_task(prewarm_sessions())
+
     # Extract config from runner_args.body (sent from frontend)
     body = getattr(runner_args, "body", None) or {}
 
@@ -420,14 +543,56 @@ async def bot(runner_args):
         # Context management settings
         "context_threshold": body.get("context_threshold", 100),
         "context_keep_recent": body.get("context_keep_recent", 20),
+        # Chat history settings
+        "save_chat_history": body.get("save_chat_history", True),
+        "chat_history_compress": body.get("chat_history_compress", False),
+        "chat_history_max_bytes": body.get("chat_history_max_bytes"),
+        "chat_history_max_age_secs": body.get("chat_history_max_age_secs"),
+        # Tool settings (None disables the per-call memo)
+        "tool_memo_ttl_secs": body.get("tool_memo_ttl_secs", 30.0),
+        # Latency budget of a caller's turn; tools get at most what is left of it
+        "turn_budget_secs": body.get("turn_budget_secs", 6.0),
+        "save_db_metrics": body.get("save_db_metrics", True),
+        # Per-call token, character and audio usage (SAMORA_USAGE_SINKS picks file and/or Mongo)
+        "save_usage": body.get("save_usage", True),
+        # Audio settings
+        "fast_audio_codec": body.get("fast_audio_codec", True),
+        # Lease pre-connected STT/TTS sessions from the worker's pool
+        "provider_session_pool": body.get("provider_session_pool", True),
+        # Answer static hotel questions without an LLM round trip. Off by default:
+        # it answers 4 of 26 held-out paraphrases at zero wrong answers
+        # (benchmarks.faq_fast_path_bench), too few to be worth it yet
+        "faq_fast_path": body.get("faq_fast_path", False),
+        "faq_min_score": body.get("faq_min_score", 0.6),
+        # Run clear hold, resume and goodbye turns without the LLM
+        "intent_fast_path": body.get("intent_fast_path", True),
     }
 
-    logger.info(
-        f"Bot config received: LLM={config['llm_provider']}, STT={config['stt_provider']}, TTS={config['tts_provider']}"
+    log.info(
+        "Bot config received: LLM={}, STT={}, TTS={}",
+        config["llm_provider"], config["stt_provider"], config["tts_provider"],
     )
 
-    transport = await create_transport(runner_args, transport_params)
-    await run_bot(transport, runner_args, config)
+    # Keep this process's inventory caches in step with the other agents
+    coherence_bus.start(db)
+
+    # Several calls can share this process (SAMORA_MAX_SESSIONS caps them)
+    try:
+        async with session_host.session():
+            transport = await create_transport(runner_args, transport_params)
+            if config["fast_audio_codec"]:
+                use_fast_twilio_serializer(transport)
+            try:
+                await asyncio.shield(_session_prewarm)
+            except Exception as e:
+                log.warning("Provider sessions not prewarmed: {}", e)
+            await run_bot(transport, runner_args, config)
+    except SessionCapacityError as e:
+        log.warning("Call rejected: {}", e)
+
+    # Usage summaries are batched across calls; write them out once the process is idle
+    if session_host.active == 0:
+        await usage_store.flush()
 
 
 if __name__ == "__main__":
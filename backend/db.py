@@ -1,18 +1,21 @@
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
+from db_monitor import command_monitor
 
 load_dotenv()
 
 # Connect to MongoDB with SSL fix for compatibility
 mongodb_uri = os.getenv("MONGODB_URI")
-# Add TLS options if not already present
-if "?" in mongodb_uri:
-    mongodb_uri += "&tls=true&tlsAllowInvalidCertificates=true"
-else:
-    mongodb_uri += "?tls=true&tlsAllowInvalidCertificates=true"
+# Add TLS options if not already present (MONGODB_TLS=false for a local mongod)
+if os.getenv("MONGODB_TLS", "true").lower() != "false":
+    if "?" in mongodb_uri:
+        mongodb_uri += "&tls=true&tlsAllowInvalidCertificates=true"
+    else:
+        mongodb_uri += "?tls=true&tlsAllowInvalidCertificates=true"
 
-client = AsyncIOMotorClient(mongodb_uri)
+# Every command is timed and attributed to the call and tool that issued it
+client = AsyncIOMotorClient(mongodb_uri, event_listeners=[command_monitor])
 
-# Get the hotel_db database
-db = client["hotel_db"]
+# Get the hotel_db database (MONGODB_DATABASE overrides it, e.g. for tests)
+db = client[os.getenv("MONGODB_DATABASE", "hotel_db")]
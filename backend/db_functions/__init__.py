@@ -4,8 +4,13 @@ from .lookup_booking import lookup_booking
 from .add_special_request import add_special_request
 from .cancel_booking import cancel_booking
 from .check_availability import check_availability
+from .find_available_dates import find_available_dates
 from .book_room import book_room
+from .book_rooms import book_rooms
 from .update_booking import update_booking
+from .call_memo import CallMemo
+from .tool_runtime import ToolRuntime, WRITE_TOOLS, current_runtime, current_memo
+from .turn_deadline import TOOL_BUDGETS_SECS, TurnDeadline, current_deadline
 
 __all__ = [
     "get_pricing",
@@ -14,6 +19,16 @@ __all__ = [
     "add_special_request",
     "cancel_booking",
     "check_availability",
+    "find_available_dates",
     "book_room",
+    "book_rooms",
     "update_booking",
+    "ToolRuntime",
+    "WRITE_TOOLS",
+    "current_runtime",
+    "current_memo",
+    "CallMemo",
+    "TurnDeadline",
+    "TOOL_BUDGETS_SECS",
+    "current_deadline",
 ]
@@ -1,5 +1,7 @@
 from datetime import datetime
 from db import db
+from .tool_runtime import current_memo
+from pymongo import ReturnDocument
 from pipecat.services.llm_service import FunctionCallParams
 
 
@@ -54,8 +56,41 @@ async def add_special_request(
         )
         return
 
-    # Find the booking first
-    booking = await db.bookings.find_one(query)
+    # Target the booking already fetched in this call, if there is one
+    memo = current_memo()
+    cached = memo.lookup(confirmation_number, guest_email, guest_name) if memo else None
+    if cached is not None:
+        query = {"_id": cached["_id"]}
+
+    # Append the request in one round trip, unless it is already on the booking
+    # (compared case-insensitively). The pre-update document tells us which.
+    existing = {"$ifNull": ["$special_requests", []]}
+    already_noted = {
+        "$in": [
+            {"$literal": request.lower()},
+            {"$map": {"input": existing, "as": "r", "in": {"$toLower": "$$r"}}},
+        ]
+    }
+    booking = await db.bookings.find_one_and_update(
+        query,
+        [
+            {
+                "$set": {
+                    "special_requests": {
+                        "$cond": [
+                            already_noted,
+                            existing,
+                            {"$concatArrays": [existing, {"$literal": [request]}]},
+                        ]
+                    },
+                    "updated_at": {
+                        "$cond": [already_noted, "$updated_at", datetime.utcnow()]
+                    },
+                }
+            }
+        ],
+        return_document=ReturnDocument.BEFORE,
+    )
 
     if not booking:
         await params.result_callback(
@@ -66,7 +101,7 @@ async def add_special_request(
         )
         return
 
-    # Check if request already exists
+    # If the request was already there, the update left the booking unchanged
     existing_requests = booking.get("special_requests", [])
     if request.lower() in [r.lower() for r in existing_requests]:
         await params.result_callback(
@@ -80,30 +115,13 @@ async def add_special_request(
         )
         return
 
-    # Add the special request
-    update_result = await db.bookings.update_one(
-        {"_id": booking["_id"]},
+    updated_requests = existing_requests + [request]
+    await params.result_callback(
         {
-            "$push": {"special_requests": request},
-            "$set": {"updated_at": datetime.utcnow()},
-        },
+            "success": True,
+            "message": f"I've added '{request}' to your reservation.",
+            "confirmation_number": booking["confirmation_number"],
+            "guest_name": booking["guest_name"],
+            "all_requests": updated_requests,
+        }
     )
-
-    if update_result.modified_count > 0:
-        updated_requests = existing_requests + [request]
-        await params.result_callback(
-            {
-                "success": True,
-                "message": f"I've added '{request}' to your reservation.",
-                "confirmation_number": booking["confirmation_number"],
-                "guest_name": booking["guest_name"],
-                "all_requests": updated_requests,
-            }
-        )
-    else:
-        await params.result_callback(
-            {
-                "success": False,
-                "error": "Something went wrong while updating the booking. Please try again.",
-            }
-        )
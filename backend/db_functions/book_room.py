@@ -1,8 +1,12 @@
-import random
-from datetime import datetime
+from datetime import datetime, timedelta
+from loguru import logger
 from db import db
+from inventory import occupancy_index, quote_stay
+from inventory.assignment import ASSIGNMENT_WINDOW_DAYS, booked_intervals, choose_room
 from pipecat.services.llm_service import FunctionCallParams
 
+from .booking_insert import RoomsTaken, insert_bookings
+
 
 async def book_room(
     params: FunctionCallParams,
@@ -92,27 +96,27 @@ async def book_room(
         )
         return
 
-    # Find rooms that are already booked during the requested period
-    booked_rooms_cursor = bookings.find(
+    # Find bookings around the requested period; the overlapping ones make a
+    # room unavailable, the neighbouring ones decide which free room fits best
+    window_start = (check_in - timedelta(days=ASSIGNMENT_WINDOW_DAYS)).strftime("%Y-%m-%d")
+    window_end = (check_out + timedelta(days=ASSIGNMENT_WINDOW_DAYS)).strftime("%Y-%m-%d")
+    nearby_bookings = await bookings.find(
         {
             "room_type": room_type,
             "$and": [
-                {"check_in_date": {"$lt": check_out_date}},
-                {"check_out_date": {"$gt": check_in_date}},
+                {"check_in_date": {"$lt": window_end}},
+                {"check_out_date": {"$gt": window_start}},
             ],
-        }
-    )
+        },
+        projection={"room_number": 1, "check_in_date": 1, "check_out_date": 1},
+    ).to_list(length=None)
 
-    booked_room_numbers = set()
-    async for booking in booked_rooms_cursor:
-        booked_room_numbers.add(booking["room_number"])
-
-    # Find available rooms
-    available_rooms = [
-        r for r in all_rooms if r["room_number"] not in booked_room_numbers
-    ]
+    # Select the free room that leaves the fewest unsellable gaps
+    selected_room = choose_room(
+        all_rooms, booked_intervals(nearby_bookings), check_in.date(), check_out.date()
+    )
 
-    if not available_rooms:
+    if not selected_room:
         await params.result_callback(
             {
                 "success": False,
@@ -121,32 +125,20 @@ async def book_room(
         )
         return
 
-    # Select a random available room
-    selected_room = random.choice(available_rooms)
-
-    # Calculate pricing
-    nights = (check_out - check_in).days
-    price_per_night = selected_room["price_per_night"]
-    total_price = price_per_night * nights
-
-    # Generate confirmation number
-    # Get the highest existing confirmation number to increment
-    last_booking = await bookings.find_one(
-        {"confirmation_number": {"$regex": "^GV-2025-"}},
-        sort=[("confirmation_number", -1)],
-    )
-
-    if last_booking:
-        last_num = int(last_booking["confirmation_number"].split("-")[-1])
-        new_num = last_num + 1
-    else:
-        new_num = 1001
+    # Calculate pricing from the rate calendar
+    quote = await quote_stay(db, room_type, check_in_date, check_out_date)
+    if not quote:
+        await params.result_callback(
+            {"success": False, "error": f"Pricing is unavailable for {room_type} rooms."}
+        )
+        return
 
-    confirmation_number = f"GV-2025-{new_num:06d}"
+    nights = quote["nights"]
+    price_per_night = quote["price_per_night"]
+    total_price = quote["total_price"]
 
     # Create the booking document
     booking_doc = {
-        "confirmation_number": confirmation_number,
         "guest_name": guest_name,
         "guest_phone": guest_phone,
         "guest_email": guest_email.lower(),
@@ -164,31 +156,44 @@ async def book_room(
         "updated_at": datetime.utcnow(),
     }
 
-    # Insert the booking
-    insert_result = await bookings.insert_one(booking_doc)
-
-    if insert_result.inserted_id:
+    # Number and insert the booking, re-checking the room as it lands (see
+    # insert_bookings; group bookings take the same lock)
+    try:
+        await insert_bookings(bookings, [booking_doc])
+    except RoomsTaken:
+        logger.info(f"Booking lost room {selected_room['room_number']} to a concurrent booking")
         await params.result_callback(
             {
-                "success": True,
-                "message": "Booking confirmed successfully!",
-                "booking": {
-                    "confirmation_number": confirmation_number,
-                    "guest_name": guest_name,
-                    "room_type": room_type,
-                    "room_number": selected_room["room_number"],
-                    "floor": selected_room["floor"],
-                    "check_in_date": check_in_date,
-                    "check_out_date": check_out_date,
-                    "nights": nights,
-                    "num_guests": num_guests,
-                    "price_per_night": price_per_night,
-                    "total_price": total_price,
-                    "special_requests": special_requests or [],
-                },
+                "success": False,
+                "error": "Sorry, that room was just booked by another guest and is no longer available. Nothing was booked. Please check availability again.",
             }
         )
-    else:
+        return
+    except Exception as e:
+        logger.error(f"Booking failed: {e}")
         await params.result_callback(
             {"success": False, "error": "Failed to create booking. Please try again."}
         )
+        return
+
+    occupancy_index.apply_booking(booking_doc)
+    await params.result_callback(
+        {
+            "success": True,
+            "message": "Booking confirmed successfully!",
+            "booking": {
+                "confirmation_number": booking_doc["confirmation_number"],
+                "guest_name": guest_name,
+                "room_type": room_type,
+                "room_number": selected_room["room_number"],
+                "floor": selected_room["floor"],
+                "check_in_date": check_in_date,
+                "check_out_date": check_out_date,
+                "nights": nights,
+                "num_guests": num_guests,
+                "price_per_night": price_per_night,
+                "total_price": total_price,
+                "special_requests": special_requests or [],
+            },
+        }
+    )
@@ -0,0 +1,256 @@
+from datetime import datetime, timedelta
+from loguru import logger
+from db import db
+from inventory import occupancy_index, quote_stay
+from inventory.pricing import money
+from inventory.assignment import (
+    ASSIGNMENT_WINDOW_DAYS,
+    booked_intervals,
+    choose_room,
+    is_free,
+)
+from pipecat.services.llm_service import FunctionCallParams
+
+from .booking_insert import RoomsTaken, insert_bookings
+
+
+async def book_rooms(
+    params: FunctionCallParams,
+    guest_name: str,
+    guest_phone: str,
+    guest_email: str,
+    room_types: list[str],
+    check_in_date: str,
+    check_out_date: str,
+    guests_per_room: list[int] = None,
+    special_requests: list[str] = None,
+):
+    """Reserve several rooms at once for a group, family or corporate booking.
+
+    Use this instead of calling book_room repeatedly when the guest wants more than one room
+    for the same dates. Either every room is booked or none are. Only call this after confirming
+    all details with the guest: name, phone, email, the room types, dates, and guests per room.
+
+    Args:
+        guest_name: Full name of the guest making the group booking.
+        guest_phone: Guest's phone number.
+        guest_email: Guest's email address.
+        room_types: One entry per room to book (standard, deluxe, suite), e.g. ["suite", "standard", "standard"].
+        check_in_date: Check-in date in YYYY-MM-DD format.
+        check_out_date: Check-out date in YYYY-MM-DD format.
+        guests_per_room: Optional number of guests for each room, in the same order as room_types.
+        special_requests: Optional list of special requests applied to every room.
+    """
+    rooms = db["rooms"]
+    bookings = db["bookings"]
+
+    if not room_types:
+        await params.result_callback(
+            {"success": False, "error": "Please specify at least one room to book."}
+        )
+        return
+
+    # Validate room types
+    room_types = [rt.lower() for rt in room_types]
+    invalid = [rt for rt in room_types if rt not in ["standard", "deluxe", "suite"]]
+    if invalid:
+        await params.result_callback(
+            {
+                "success": False,
+                "error": f"Invalid room type '{invalid[0]}'. Choose from: standard, deluxe, or suite.",
+            }
+        )
+        return
+
+    guests_per_room = list(guests_per_room or [])
+    if len(guests_per_room) > len(room_types):
+        await params.result_callback(
+            {
+                "success": False,
+                "error": f"Got guest counts for {len(guests_per_room)} rooms but only {len(room_types)} rooms were requested.",
+            }
+        )
+        return
+    guests_per_room += [1] * (len(room_types) - len(guests_per_room))
+
+    # Validate dates
+    try:
+        check_in = datetime.strptime(check_in_date, "%Y-%m-%d")
+        check_out = datetime.strptime(check_out_date, "%Y-%m-%d")
+    except ValueError:
+        await params.result_callback(
+            {
+                "success": False,
+                "error": "Invalid date format. Please use YYYY-MM-DD format.",
+            }
+        )
+        return
+
+    if check_in >= check_out:
+        await params.result_callback(
+            {"success": False, "error": "Check-out date must be after check-in date."}
+        )
+        return
+
+    if check_in.date() < datetime.now().date():
+        await params.result_callback(
+            {"success": False, "error": "Check-in date cannot be in the past."}
+        )
+        return
+
+    # Room capacity check
+    room_capacity = {"standard": 2, "deluxe": 3, "suite": 4}
+    for room_type, num_guests in zip(room_types, guests_per_room):
+        max_guests = room_capacity.get(room_type, 2)
+        if num_guests > max_guests:
+            await params.result_callback(
+                {
+                    "success": False,
+                    "error": f"A {room_type} room can only accommodate {max_guests} guests. You requested {num_guests}.",
+                }
+            )
+            return
+
+    # Check availability for every requested type in one pass
+    requested_types = sorted(set(room_types))
+    all_rooms = await rooms.find({"room_type": {"$in": requested_types}}).to_list(
+        length=None
+    )
+
+    # One query returns both the overlapping bookings and their neighbours
+    window_start = (check_in - timedelta(days=ASSIGNMENT_WINDOW_DAYS)).strftime("%Y-%m-%d")
+    window_end = (check_out + timedelta(days=ASSIGNMENT_WINDOW_DAYS)).strftime("%Y-%m-%d")
+    nearby_bookings = await bookings.find(
+        {
+            "room_type": {"$in": requested_types},
+            "$and": [
+                {"check_in_date": {"$lt": window_end}},
+                {"check_out_date": {"$gt": window_start}},
+            ],
+        },
+        projection={"room_number": 1, "check_in_date": 1, "check_out_date": 1},
+    ).to_list(length=None)
+    intervals = booked_intervals(nearby_bookings)
+
+    available_by_type = {room_type: [] for room_type in requested_types}
+    for room in all_rooms:
+        if is_free(intervals.get(room["room_number"], []), check_in.date(), check_out.date()):
+            available_by_type[room["room_type"]].append(room)
+
+    # Every request must be satisfiable before anything is written
+    shortages = []
+    for room_type in requested_types:
+        wanted = room_types.count(room_type)
+        free = len(available_by_type[room_type])
+        if free < wanted:
+            shortages.append(
+                {"room_type": room_type, "requested": wanted, "available": free}
+            )
+
+    if shortages:
+        await params.result_callback(
+            {
+                "success": False,
+                "error": "Sorry, there aren't enough rooms available for those dates. No rooms were booked.",
+                "shortages": shortages,
+            }
+        )
+        return
+
+    # Allocate rooms one at a time, best fit first, so the group packs together
+    selected_rooms = []
+    for room_type in room_types:
+        candidates = available_by_type[room_type]
+        room = choose_room(candidates, intervals, check_in.date(), check_out.date())
+        candidates.remove(room)
+        intervals.setdefault(room["room_number"], []).append(
+            (check_in.date(), check_out.date())
+        )
+        selected_rooms.append(room)
+
+    # Price each room type once from the rate calendar
+    quotes = {}
+    for room_type in requested_types:
+        quotes[room_type] = await quote_stay(db, room_type, check_in_date, check_out_date)
+        if not quotes[room_type]:
+            await params.result_callback(
+                {"success": False, "error": f"Pricing is unavailable for {room_type} rooms."}
+            )
+            return
+
+    nights = (check_out - check_in).days
+    now = datetime.utcnow()
+    booking_docs = []
+    for room, num_guests in zip(selected_rooms, guests_per_room):
+        quote = quotes[room["room_type"]]
+        booking_docs.append(
+            {
+                "guest_name": guest_name,
+                "guest_phone": guest_phone,
+                "guest_email": guest_email.lower(),
+                "room_number": room["room_number"],
+                "room_type": room["room_type"],
+                "floor": room["floor"],
+                "check_in_date": check_in_date,
+                "check_out_date": check_out_date,
+                "num_guests": num_guests,
+                "price_per_night": quote["price_per_night"],
+                "total_price": quote["total_price"],
+                "status": "confirmed",
+                "special_requests": list(special_requests or []),
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+    # Insert every booking or none of them, numbered and re-checked as they land
+    try:
+        await insert_bookings(bookings, booking_docs)
+    except RoomsTaken:
+        logger.info(f"Group booking lost a room to a concurrent booking for {check_in_date} to {check_out_date}")
+        await params.result_callback(
+            {
+                "success": False,
+                "error": "Sorry, one of those rooms was just booked by another guest and is no longer available. No rooms were booked. Please check availability again.",
+            }
+        )
+        return
+    except Exception as e:
+        logger.error(f"Group booking failed: {e}")
+        await params.result_callback(
+            {
+                "success": False,
+                "error": "Failed to create the group booking. No rooms were booked. Please try again.",
+            }
+        )
+        return
+
+    for doc in booking_docs:
+        occupancy_index.apply_booking(doc)
+
+    booked = [
+        {
+            "confirmation_number": doc["confirmation_number"],
+            "room_type": doc["room_type"],
+            "room_number": doc["room_number"],
+            "floor": doc["floor"],
+            "num_guests": doc["num_guests"],
+            "price_per_night": doc["price_per_night"],
+            "total_price": doc["total_price"],
+        }
+        for doc in booking_docs
+    ]
+
+    await params.result_callback(
+        {
+            "success": True,
+            "message": f"All {len(booked)} rooms are confirmed!",
+            "guest_name": guest_name,
+            "check_in_date": check_in_date,
+            "check_out_date": check_out_date,
+            "nights": nights,
+            "bookings": booked,
+            "group_total_price": money(sum(doc["total_price"] for doc in booking_docs)),
+            "special_requests": list(special_requests or []),
+        }
+    )
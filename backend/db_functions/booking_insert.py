@@ -0,0 +1,85 @@
+from loguru import logger
+from pymongo.errors import OperationFailure, BulkWriteError
+from db import client
+from inventory import allocate_confirmation_numbers
+
+# Every booking transaction writes one document here, so concurrent ones
+# (single and group) conflict instead of each booking a room the other
+# just took
+BOOKING_LOCKS = "booking_locks"
+
+
+class RoomsTaken(Exception):
+    """A selected room was taken by a concurrent booking."""
+
+
+async def insert_bookings(bookings, booking_docs: list):
+    """
+    Number and insert bookings for one stay all-or-nothing, re-checking their rooms.
+
+    The rooms were chosen from reads outside the transaction, so it first
+    writes the shared lock document (concurrent bookings conflict on it and
+    the later one retries once the other commits), then allocates the
+    confirmation numbers and checks no booking took a selected room.
+    Raises RoomsTaken if one did.
+
+    Standalone mongod deployments don't support transactions, so fall back to
+    an ordered insert_many, then check for bookings that landed on the same
+    rooms meanwhile; on a conflict or a partial insert, delete whatever was
+    inserted.
+    """
+
+    async def insert(session):
+        for doc in booking_docs:
+            doc.pop("_id", None)
+        await bookings.database[BOOKING_LOCKS].update_one(
+            {"_id": "bookings"}, {"$inc": {"writes": 1}}, upsert=True, session=session
+        )
+        await _number(bookings, booking_docs, session)
+        if await bookings.find_one(_conflicts(booking_docs), projection={"_id": 1}, session=session):
+            raise RoomsTaken()
+        await bookings.insert_many(booking_docs, session=session)
+
+    try:
+        async with await client.start_session() as session:
+            await session.with_transaction(insert)
+        return
+    except OperationFailure as e:
+        # IllegalOperation: "Transaction numbers are only allowed on a replica set member or mongos"
+        if e.code != 20:
+            raise
+        logger.warning("Transactions unavailable, using compensating booking insert")
+
+    for doc in booking_docs:
+        doc.pop("_id", None)
+    await _number(bookings, booking_docs)
+
+    try:
+        await bookings.insert_many(booking_docs, ordered=True)
+        ours = [doc["_id"] for doc in booking_docs]
+        if await bookings.find_one(
+            {**_conflicts(booking_docs), "_id": {"$nin": ours}}, projection={"_id": 1}
+        ):
+            raise RoomsTaken()
+    except (BulkWriteError, RoomsTaken):
+        inserted_ids = [doc["_id"] for doc in booking_docs if "_id" in doc]
+        if inserted_ids:
+            await bookings.delete_many({"_id": {"$in": inserted_ids}})
+        raise
+
+
+async def _number(bookings, booking_docs: list, session=None):
+    """Give the bookings consecutive numbers from the shared counter."""
+    numbers = await allocate_confirmation_numbers(bookings.database, len(booking_docs), session)
+    for doc, number in zip(booking_docs, numbers):
+        doc["confirmation_number"] = number
+
+
+def _conflicts(booking_docs: list) -> dict:
+    """Query for bookings on the same rooms and nights."""
+    stay = booking_docs[0]
+    return {
+        "room_number": {"$in": [doc["room_number"] for doc in booking_docs]},
+        "check_in_date": {"$lt": stay["check_out_date"]},
+        "check_out_date": {"$gt": stay["check_in_date"]},
+    }
@@ -0,0 +1,153 @@
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+# Lookup fields a mutation tool may resolve from the working set
+BOOKING_ALIAS_FIELDS = ("guest_email", "guest_name", "guest_phone")
+
+
+def normalize_value(value):
+    """
+    Normalize a tool argument so equivalent calls share a memo key.
+
+    Strings are only lowercased: every read tool matches room types, names,
+    emails and confirmation numbers case-insensitively, but whitespace can
+    change what a regex lookup matches.
+    """
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_value(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_value(v)) for k, v in value.items()))
+    return value
+
+
+def memo_key(tool_name: str, kwargs: dict) -> Tuple:
+    """Memo key of a tool call: its name plus normalized, non-empty arguments."""
+    args = tuple(
+        sorted(
+            (name, normalize_value(value))
+            for name, value in kwargs.items()
+            if value is not None
+        )
+    )
+    return (tool_name, args)
+
+
+class CallMemo:
+    """
+    Per-call memo of read-tool results and fetched booking documents.
+
+    Within one conversation the LLM tends to repeat reads: it looks a booking
+    up and then updates or cancels it, or re-checks dates it already checked.
+    The memo keeps:
+    - Read-tool results keyed by tool name and normalized arguments
+    - A working set of booking documents fetched during the call, so
+      mutation tools can skip their own lookup
+
+    Entries expire after ``ttl_secs`` so changes made outside the call are
+    picked up, and ``clear()`` is called after every write in the call.
+    """
+
+    def __init__(self, ttl_secs: float = 30.0):
+        """
+        Initialize an empty memo.
+
+        Args:
+            ttl_secs: How long a result or booking document stays valid
+        """
+        self.ttl_secs = ttl_secs
+
+        self._results: Dict[Tuple, Tuple[float, dict]] = {}
+        self._bookings: Dict[str, Tuple[float, dict]] = {}
+        self._aliases: Dict[Tuple[str, str], str] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, stored_at: float) -> bool:
+        return time.monotonic() - stored_at <= self.ttl_secs
+
+    def clear(self):
+        """Drop everything. Called after any write in the call."""
+        self._results.clear()
+        self._bookings.clear()
+        self._aliases.clear()
+
+    # ============ READ-TOOL RESULTS ============
+
+    def get_result(self, key: Tuple) -> Optional[dict]:
+        entry = self._results.get(key)
+        if entry and self._fresh(entry[0]):
+            self.hits += 1
+            return entry[1]
+        self._results.pop(key, None)
+        self.misses += 1
+        return None
+
+    def put_result(self, key: Tuple, result: dict):
+        self._results[key] = (time.monotonic(), result)
+
+    # ============ BOOKING WORKING SET ============
+
+    def remember_bookings(
+        self,
+        bookings: Iterable[dict],
+        field: Optional[str] = None,
+        value: Optional[str] = None,
+    ):
+        """
+        Add fetched booking documents to the working set.
+
+        Args:
+            bookings: Booking documents as returned by Mongo
+            field: Lookup field the documents were found by, if any
+            value: Lookup value; recorded as an alias when it matched
+                exactly one booking, so the same lookup can be answered
+                from the working set
+        """
+        bookings = list(bookings)
+        now = time.monotonic()
+        for booking in bookings:
+            self._bookings[booking["confirmation_number"].upper()] = (now, booking)
+        if field in BOOKING_ALIAS_FIELDS and value and len(bookings) == 1:
+            self._aliases[(field, normalize_value(value))] = bookings[0][
+                "confirmation_number"
+            ].upper()
+
+    def booking(self, field: str, value: str) -> Optional[dict]:
+        """
+        Return a fetched booking matching a lookup, or None on a miss.
+
+        Confirmation numbers are matched exactly. Email, name and phone
+        lookups only hit when the identical lookup matched a single booking
+        earlier in the call.
+        """
+        if not value:
+            return None
+        if field == "confirmation_number":
+            number = value.strip().upper()
+        else:
+            number = self._aliases.get((field, normalize_value(value)))
+        entry = self._bookings.get(number) if number else None
+        if entry and self._fresh(entry[0]):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def lookup(
+        self,
+        confirmation_number: Optional[str] = None,
+        guest_email: Optional[str] = None,
+        guest_name: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Resolve a mutation tool's lookup arguments, in the tools' precedence order."""
+        if confirmation_number:
+            return self.booking("confirmation_number", confirmation_number)
+        if guest_email:
+            return self.booking("guest_email", guest_email)
+        if guest_name:
+            return self.booking("guest_name", guest_name)
+        return None
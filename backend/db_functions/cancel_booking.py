@@ -1,5 +1,7 @@
 from datetime import datetime
 from db import db
+from .tool_runtime import current_memo
+from inventory import occupancy_index
 from pipecat.services.llm_service import FunctionCallParams
 
 
@@ -40,56 +42,58 @@ async def cancel_booking(
         )
         return
 
-    # Find the booking first
-    booking = await bookings.find_one(query)
+    # Target the booking already fetched in this call, if there is one
+    memo = current_memo()
+    cached = memo.lookup(confirmation_number, guest_email, guest_name) if memo else None
+    if cached is not None:
+        query = {"_id": cached["_id"]}
 
-    if not booking:
-        await params.result_callback(
-            {
-                "success": False,
-                "error": "No booking found with the provided information.",
-            }
-        )
-        return
+    # Delete in one round trip; the filter leaves past bookings alone
+    today = datetime.now().date().isoformat()
+    booking = await bookings.find_one_and_delete(
+        {**query, "check_in_date": {"$gte": today}}
+    )
 
-    # Check if it's a past booking
-    check_in_date = datetime.strptime(booking["check_in_date"], "%Y-%m-%d")
-    if check_in_date.date() < datetime.now().date():
-        await params.result_callback(
-            {
-                "success": False,
-                "error": "Cannot cancel a booking for a past date.",
-                "booking": {
-                    "confirmation_number": booking["confirmation_number"],
-                    "check_in_date": booking["check_in_date"],
-                    "status": booking["status"],
-                },
-            }
-        )
+    if not booking:
+        # Nothing was deleted: tell a missing booking apart from a past one
+        existing = await bookings.find_one(query)
+        if not existing:
+            await params.result_callback(
+                {
+                    "success": False,
+                    "error": "No booking found with the provided information.",
+                }
+            )
+        elif existing["check_in_date"] < today:
+            await params.result_callback(
+                {
+                    "success": False,
+                    "error": "Cannot cancel a booking for a past date.",
+                    "booking": {
+                        "confirmation_number": existing["confirmation_number"],
+                        "check_in_date": existing["check_in_date"],
+                        "status": existing["status"],
+                    },
+                }
+            )
+        else:
+            await params.result_callback(
+                {"success": False, "error": "Failed to cancel booking. Please try again."}
+            )
         return
 
-    # Store booking details before deletion
-    cancelled_booking = {
-        "confirmation_number": booking["confirmation_number"],
-        "guest_name": booking["guest_name"],
-        "room_number": booking["room_number"],
-        "room_type": booking["room_type"],
-        "check_in_date": booking["check_in_date"],
-        "check_out_date": booking["check_out_date"],
-    }
-
-    # Delete the booking
-    delete_result = await bookings.delete_one({"_id": booking["_id"]})
-
-    if delete_result.deleted_count == 1:
-        await params.result_callback(
-            {
-                "success": True,
-                "message": "Booking has been successfully cancelled and removed.",
-                "cancelled_booking": cancelled_booking,
-            }
-        )
-    else:
-        await params.result_callback(
-            {"success": False, "error": "Failed to cancel booking. Please try again."}
-        )
+    occupancy_index.release_booking(booking)
+    await params.result_callback(
+        {
+            "success": True,
+            "message": "Booking has been successfully cancelled and removed.",
+            "cancelled_booking": {
+                "confirmation_number": booking["confirmation_number"],
+                "guest_name": booking["guest_name"],
+                "room_number": booking["room_number"],
+                "room_type": booking["room_type"],
+                "check_in_date": booking["check_in_date"],
+                "check_out_date": booking["check_out_date"],
+            },
+        }
+    )
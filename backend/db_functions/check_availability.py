@@ -1,5 +1,6 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from db import db
+from inventory import occupancy_index, rate_calendar
 from pipecat.services.llm_service import FunctionCallParams
 
 
@@ -115,6 +116,22 @@ async def check_availability(
     ]
 
     if not available_rooms:
+        # Suggest the nearest stays of the same length so the LLM doesn't probe date by date
+        nights = (check_out - check_in).days
+        await occupancy_index.ensure_loaded(db)
+        await rate_calendar.ensure_loaded(db)
+        alternatives = occupancy_index.find_windows(
+            nights=nights,
+            earliest=max(
+                check_in.date() - timedelta(days=14), datetime.now().date()
+            ),
+            latest=check_in.date() + timedelta(days=14),
+            room_types=sorted({r["room_type"] for r in all_rooms}),
+            preferred=check_in.date(),
+            exclude=check_in.date(),
+            limit=3,
+            rates=rate_calendar,
+        )
         await params.result_callback(
             {
                 "success": True,
@@ -122,7 +139,8 @@ async def check_availability(
                 "message": f"Sorry, no rooms are available from {check_in_date} to {check_out_date}.",
                 "check_in_date": check_in_date,
                 "check_out_date": check_out_date,
-                "nights": (check_out - check_in).days,
+                "nights": nights,
+                "alternatives": alternatives,
             }
         )
         return
@@ -134,24 +152,26 @@ async def check_availability(
         if rtype not in availability_by_type:
             availability_by_type[rtype] = {
                 "count": 0,
-                "price_per_night": room["price_per_night"],
                 "max_guests": room_capacity.get(rtype, 2),
             }
         availability_by_type[rtype]["count"] += 1
 
-    # Calculate nights and totals
+    # Calculate nights and totals from the rate calendar
     nights = (check_out - check_in).days
+    await rate_calendar.ensure_loaded(db)
 
     # Build summary
     summary = []
     for rtype, info in availability_by_type.items():
-        total = info["price_per_night"] * nights
+        quote = rate_calendar.quote(rtype, check_in_date, check_out_date)
+        if not quote:
+            continue
         summary.append(
             {
                 "room_type": rtype,
                 "available_count": info["count"],
-                "price_per_night": info["price_per_night"],
-                "total_price": total,
+                "price_per_night": quote["price_per_night"],
+                "total_price": quote["total_price"],
                 "max_guests": info["max_guests"],
             }
         )
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from db import db
+from inventory import occupancy_index, rate_calendar
+from pipecat.services.llm_service import FunctionCallParams
+
+
+async def find_available_dates(
+    params: FunctionCallParams,
+    nights: int,
+    preferred_check_in_date: str = None,
+    flexibility_days: int = 14,
+    room_type: str = None,
+    num_guests: int = None,
+    num_rooms: int = 1,
+    sort_by: str = "closest",
+):
+    """Search a range of dates for stays of a given length in one call.
+
+    Use when the caller's dates are flexible, when check_availability says their dates are full,
+    or when they ask for the cheapest or nearest possible stay (e.g. "the cheapest 3 nights next
+    month", "any weekend in the next two weeks"). Do NOT call check_availability date by date.
+
+    Args:
+        nights: Number of nights the guest wants to stay.
+        preferred_check_in_date: Preferred check-in date in YYYY-MM-DD format. Defaults to today.
+        flexibility_days: How many days before or after the preferred date to search (default 14).
+        room_type: Optional - filter by specific room type (standard, deluxe, suite).
+        num_guests: Optional - number of guests per room.
+        num_rooms: Number of rooms needed for the same dates (default 1).
+        sort_by: "closest" to the preferred date (default) or "cheapest" total price.
+    """
+    if not nights or nights < 1:
+        await params.result_callback(
+            {"success": False, "error": "Please specify how many nights to stay."}
+        )
+        return
+
+    today = datetime.now().date()
+    if preferred_check_in_date:
+        try:
+            preferred = datetime.strptime(preferred_check_in_date, "%Y-%m-%d").date()
+        except ValueError:
+            await params.result_callback(
+                {
+                    "success": False,
+                    "error": "Invalid date format. Please use YYYY-MM-DD format.",
+                }
+            )
+            return
+    else:
+        preferred = today
+
+    # Room capacity by type
+    room_capacity = {"standard": 2, "deluxe": 3, "suite": 4}
+
+    room_types = list(room_capacity)
+    if room_type:
+        if room_type.lower() not in room_capacity:
+            await params.result_callback(
+                {
+                    "success": False,
+                    "error": f"Invalid room type '{room_type}'. Choose from: standard, deluxe, or suite.",
+                }
+            )
+            return
+        room_types = [room_type.lower()]
+
+    if num_guests:
+        room_types = [t for t in room_types if room_capacity[t] >= num_guests]
+        if not room_types:
+            await params.result_callback(
+                {
+                    "success": False,
+                    "error": f"No suitable room type can accommodate {num_guests} guests. Maximum capacity is 4 guests (suite).",
+                }
+            )
+            return
+
+    flexibility_days = max(0, flexibility_days or 0)
+    earliest = max(preferred - timedelta(days=flexibility_days), today)
+    latest = preferred + timedelta(days=flexibility_days)
+
+    await occupancy_index.ensure_loaded(db)
+    await rate_calendar.ensure_loaded(db)
+    options = occupancy_index.find_windows(
+        nights=nights,
+        earliest=earliest,
+        latest=latest,
+        room_types=room_types,
+        num_rooms=max(1, num_rooms or 1),
+        preferred=preferred,
+        sort_by="cheapest" if sort_by == "cheapest" else "closest",
+        rates=rate_calendar,
+    )
+
+    if not options:
+        await params.result_callback(
+            {
+                "success": True,
+                "available": False,
+                "message": f"Sorry, there are no {nights}-night stays available between {earliest.isoformat()} and {latest.isoformat()}.",
+            }
+        )
+        return
+
+    await params.result_callback(
+        {
+            "success": True,
+            "available": True,
+            "searched_from": earliest.isoformat(),
+            "searched_to": latest.isoformat(),
+            "options": options,
+        }
+    )
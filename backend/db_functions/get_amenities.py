@@ -14,7 +14,7 @@ async def get_amenities(params: FunctionCallParams, room_type: str):
     if not room_type:
         result = {"error": "Please specify a room type: standard, deluxe, or suite"}
     else:
-        room = await db.rooms.find_one({"room_type": room_type})
+        room = await db.rooms.find_one({"room_type": room_type.lower()})
 
         if room:
             result = {"room_type": room["room_type"], "amenities": room["amenities"]}
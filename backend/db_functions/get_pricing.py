@@ -1,4 +1,5 @@
 from db import db
+from inventory import rate_calendar
 from pipecat.services.llm_service import FunctionCallParams
 
 
@@ -11,37 +12,31 @@ async def get_pricing(params: FunctionCallParams, room_type: str = None):
     Args:
         room_type: The room type to get pricing for (standard, deluxe, suite). Optional - omit to get all room prices.
     """
+    # Base nightly rates come from the shared rate calendar
+    await rate_calendar.ensure_loaded(db)
+
     if room_type:
         # Get price for specific room type
-        room = await db.rooms.find_one({"room_type": room_type})
-        if room:
+        room_type = room_type.lower()
+        price_per_night = rate_calendar.base_rate(room_type)
+        if price_per_night is not None:
             result = {
-                "room_type": room["room_type"],
-                "price_per_night": room["price_per_night"],
-                "capacity": room["capacity"],
+                "room_type": room_type,
+                "price_per_night": price_per_night,
+                "capacity": rate_calendar.capacity(room_type),
             }
         else:
             result = {"error": f"Room type '{room_type}' not found"}
     else:
         # Get all room types with prices
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$room_type",
-                    "price_per_night": {"$first": "$price_per_night"},
-                    "capacity": {"$first": "$capacity"},
-                }
-            }
-        ]
-        rooms = await db.rooms.aggregate(pipeline).to_list(10)
         result = {
             "pricing": [
                 {
-                    "room_type": r["_id"],
-                    "price_per_night": r["price_per_night"],
-                    "capacity": r["capacity"],
+                    "room_type": rtype,
+                    "price_per_night": rate_calendar.base_rate(rtype),
+                    "capacity": rate_calendar.capacity(rtype),
                 }
-                for r in rooms
+                for rtype in rate_calendar.room_types
             ]
         }
 
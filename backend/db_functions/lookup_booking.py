@@ -1,4 +1,5 @@
 from db import db
+from .tool_runtime import current_memo
 from pipecat.services.llm_service import FunctionCallParams
 
 
@@ -23,13 +24,16 @@ async def lookup_booking(
     """
     # Build query based on provided parameters
     query = {}
+    lookup_field, lookup_value = None, None
 
     if confirmation_number:
         # Exact match for confirmation number (case-insensitive)
         query["confirmation_number"] = {"$regex": confirmation_number, "$options": "i"}
+        lookup_field, lookup_value = "confirmation_number", confirmation_number
     elif guest_email:
         # Exact match for email (case-insensitive)
         query["guest_email"] = {"$regex": f"^{guest_email}$", "$options": "i"}
+        lookup_field, lookup_value = "guest_email", guest_email
     elif guest_phone:
         # Partial match for phone (in case formatting differs)
         # Remove common phone formatting characters for matching
@@ -41,9 +45,11 @@ async def lookup_booking(
             .replace("+", "")
         )
         query["guest_phone"] = {"$regex": clean_phone}
+        lookup_field, lookup_value = "guest_phone", guest_phone
     elif guest_name:
         # Partial match for guest name (case-insensitive)
         query["guest_name"] = {"$regex": guest_name, "$options": "i"}
+        lookup_field, lookup_value = "guest_name", guest_name
     else:
         await params.result_callback(
             {
@@ -55,6 +61,11 @@ async def lookup_booking(
     # Find matching bookings
     bookings_list = await db.bookings.find(query).to_list(10)
 
+    # Keep the documents so a follow-up update or cancel can skip its own lookup
+    memo = current_memo()
+    if memo is not None:
+        memo.remember_bookings(bookings_list, lookup_field, lookup_value)
+
     if not bookings_list:
         await params.result_callback(
             {
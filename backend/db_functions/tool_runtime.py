@@ -0,0 +1,371 @@
+import copy
+import time
+import asyncio
+import functools
+import dataclasses
+from uuid import uuid4
+from contextvars import ContextVar
+from typing import Dict, Optional, Set
+import pymongo
+from loguru import logger
+from pymongo.errors import PyMongoError
+from pipecat.frames.frames import FunctionCallResultProperties
+from pipecat.services.llm_service import FunctionCallParams
+
+from db import db
+from db_monitor import CursorScope, attribute_commands, track_cursors
+from utils.log import tool_context
+from metrics.agent import TOOL_LATENCY
+
+from .call_memo import CallMemo, memo_key
+from .turn_deadline import (
+    TOOL_BUDGETS_SECS,
+    TURN_BUDGET_SECS,
+    DEFAULT_TOOL_BUDGET_SECS,
+    TurnDeadline,
+    _current_deadline,
+    still_working_result,
+)
+
+
+# Tools that modify the bookings collection. Everything else is read-only.
+WRITE_TOOLS = frozenset(
+    {
+        "book_room",
+        "book_rooms",
+        "cancel_booking",
+        "update_booking",
+        "add_special_request",
+    }
+)
+
+_current_runtime: ContextVar[Optional["ToolRuntime"]] = ContextVar(
+    "tool_runtime", default=None
+)
+
+# Mongo gets the tool's deadline; the asyncio guard only fires this much later,
+# for time spent outside Mongo (barriers, executor queueing)
+DEADLINE_GRACE_SECS = 0.25
+
+
+def current_runtime() -> Optional["ToolRuntime"]:
+    """Return the ToolRuntime of the tool call currently executing, if any."""
+    return _current_runtime.get()
+
+
+def current_memo() -> Optional[CallMemo]:
+    """Return the CallMemo of the tool call currently executing, if memoizing."""
+    runtime = _current_runtime.get()
+    return runtime.memo if runtime else None
+
+
+class ToolRuntime:
+    """
+    Per-call execution layer for the direct-function DB tools.
+
+    Pipecat dispatches every function call in an LLM response as its own task,
+    so several tools can be in flight at once. The runtime wraps each tool so
+    that:
+    - Read-only tools run concurrently with each other
+    - Write tools run one at a time, after every tool issued before them
+    - Tools issued after a write wait for that write, so reads see its result
+
+    Ordering follows the order the LLM emitted the calls. Results are still
+    delivered through each call's own result_callback, which Pipecat matches
+    to the tool_call_id, so the LLM sees them in the original order.
+
+    Successful read results are memoized per call (see CallMemo); a repeated
+    read with the same normalized arguments is answered without touching
+    Mongo. Every write clears the memo once it finishes; reads issued after
+    it wait for it, so they never see results from before the write.
+
+    When the caller barges in, ``interrupted()`` is called. Pipecat cancels
+    the read tools (registered with cancel_on_interruption), and the runtime
+    kills the server-side cursors they left open. Writes are registered
+    without it and always finish, but a write interrupted while running
+    returns its result with run_llm=False: the result lands in the context
+    for the next turn instead of starting a response nobody is waiting for.
+    ``interruption_stats()`` reports the work avoided.
+
+    Every tool runs against a deadline (see turn_deadline): its own budget,
+    capped by what is left of the caller's turn once ``turn_ended()`` has
+    started one. For reads the deadline is applied to each Mongo operation
+    with pymongo.timeout (maxTimeMS on the server), and a read that
+    overruns it returns still_working_result() instead of leaving the
+    caller in silence. Writes are only measured against their budget: they
+    finish for the same reason they survive interruptions, and a rollback
+    must not be cut short. ``deadline_stats()`` reports the overruns.
+    """
+
+    def __init__(
+        self,
+        call_id: Optional[str] = None,
+        memo_ttl_secs: Optional[float] = 30.0,
+        database=None,
+        turn_budget_secs: float = TURN_BUDGET_SECS,
+        tool_budgets: Optional[Dict[str, float]] = TOOL_BUDGETS_SECS,
+    ):
+        """
+        Initialize the runtime for a single call.
+
+        Args:
+            call_id: Identifier of the call (generated if not provided)
+            memo_ttl_secs: Lifetime of memoized results, or None to disable
+                memoization
+            database: Database whose client kills the cursors of cancelled
+                reads (defaults to the shared one in db.py)
+            turn_budget_secs: Budget of a caller's turn, tool calls included
+            tool_budgets: Budget per tool name, or None to run tools without
+                deadlines
+        """
+        self.call_id = call_id or uuid4().hex[:12]
+        self._database = database if database is not None else db
+        self.memo = CallMemo(memo_ttl_secs) if memo_ttl_secs is not None else None
+
+        # Barrier state: the last issued write, and reads issued since it
+        self._last_write: Optional[asyncio.Future] = None
+        self._reads_since_write: Set[asyncio.Future] = set()
+
+        # Interruption state: a counter that in-flight tools compare against
+        self._interruptions = 0
+        self._closing: Set[asyncio.Task] = set()
+        self.reads_cancelled = 0
+        self.cancelled_read_ms = 0.0
+        self.cursors_closed = 0
+        self.writes_finished_after_interruption = 0
+        self.llm_runs_suppressed = 0
+
+        # Deadline state: the current turn, and tools that ran out of budget
+        self.turn_budget_secs = turn_budget_secs
+        self.tool_budgets = tool_budgets
+        self.turn_deadline: Optional[TurnDeadline] = None
+        self.turns = 0
+        self.tool_calls = 0
+        self.overruns: Dict[str, int] = {}
+        self.overrun_ms: Dict[str, float] = {}
+
+    def turn_ended(self):
+        """Start the budget of a caller's turn; called on every UserStoppedSpeakingFrame."""
+        self.turns += 1
+        self.turn_deadline = TurnDeadline(self.turn_budget_secs)
+
+    def deadline_stats(self) -> dict:
+        """Tool calls that ran out of budget during this call."""
+        return {
+            "turns": self.turns,
+            "tool_calls": self.tool_calls,
+            "overruns": dict(self.overruns),
+            "overrun_ms": {tool: round(ms, 1) for tool, ms in self.overrun_ms.items()},
+        }
+
+    def _tool_deadline(self, tool: str) -> Optional[TurnDeadline]:
+        if self.tool_budgets is None:
+            return None
+        if self.turn_deadline is None:
+            return TurnDeadline(self.tool_budgets.get(tool, DEFAULT_TOOL_BUDGET_SECS))
+        return self.turn_deadline.for_tool(tool, self.tool_budgets)
+
+    def interrupted(self):
+        """Record that the caller interrupted; called on every InterruptionFrame."""
+        self._interruptions += 1
+
+    def interruption_stats(self) -> dict:
+        """Work avoided by interruptions during this call."""
+        return {
+            "interruptions": self._interruptions,
+            "reads_cancelled": self.reads_cancelled,
+            "cancelled_read_ms": round(self.cancelled_read_ms, 1),
+            "cursors_closed": self.cursors_closed,
+            "writes_finished_after_interruption": self.writes_finished_after_interruption,
+            "llm_runs_suppressed": self.llm_runs_suppressed,
+        }
+
+    def wrap(self, func):
+        """
+        Wrap a direct function so it runs under this runtime.
+
+        The wrapper keeps the name, docstring and signature of ``func`` so
+        Pipecat builds the same tool schema from it.
+        """
+        is_write = func.__name__ in WRITE_TOOLS
+
+        @functools.wraps(func)
+        async def wrapper(params: FunctionCallParams, **kwargs):
+            self.tool_calls += 1
+            started = time.perf_counter()
+            outcome = "error"
+            deadline = self._tool_deadline(func.__name__)
+            done = asyncio.get_running_loop().create_future()
+            barriers = self._enter(done, is_write)
+            delivery = _ResultDelivery(self, params.result_callback, quiet=is_write)
+            params = copy.copy(params)
+            params.result_callback = delivery
+            try:
+                run = self._run(func, params, kwargs, is_write, barriers, deadline)
+                if deadline is None:
+                    result = await run
+                elif is_write:
+                    # Writes always finish (an abandoned write could be half done); only measured
+                    try:
+                        result = await run
+                    finally:
+                        if deadline.expired():
+                            self._record_overrun(func.__name__, deadline)
+                else:
+                    try:
+                        result = await asyncio.wait_for(run, deadline.remaining() + DEADLINE_GRACE_SECS)
+                    except (asyncio.TimeoutError, PyMongoError) as e:
+                        if isinstance(e, PyMongoError) and not e.timeout:
+                            raise
+                        self._record_overrun(func.__name__, deadline)
+                        outcome = "still_working"
+                        if not delivery.delivered:
+                            await delivery(still_working_result(func.__name__))
+                        return None
+                outcome = "ok"
+                return result
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                done.set_result(None)
+                self._reads_since_write.discard(done)
+                TOOL_LATENCY.labels(func.__name__, outcome).observe(time.perf_counter() - started)
+
+        return wrapper
+
+    async def _run(self, func, params, kwargs: dict, is_write: bool, barriers: list, deadline):
+        """Run a tool after its barriers, under its deadline, attribution and memo."""
+        started = time.perf_counter()
+        interruptions = self._interruptions
+        if barriers:
+            await asyncio.wait(barriers)
+        runtime_token = _current_runtime.set(self)
+        deadline_token = _current_deadline.set(deadline)
+        # Every Mongo operation of a read gets the remaining budget as maxTimeMS;
+        # pymongo.timeout(None) leaves them unbounded
+        timeout = max(deadline.remaining(), 0.001) if deadline and not is_write else None
+        try:
+            with pymongo.timeout(timeout), track_cursors() as cursors:
+                with attribute_commands(self.call_id, func.__name__), tool_context(func.__name__):
+                    if self.memo is None:
+                        return await func(params, **kwargs)
+                    if is_write:
+                        try:
+                            return await func(params, **kwargs)
+                        finally:
+                            self.memo.clear()
+                    return await self._memoized(func, params, kwargs)
+        except asyncio.CancelledError:
+            if not is_write and self._interruptions != interruptions:
+                self.reads_cancelled += 1
+                self.cancelled_read_ms += (time.perf_counter() - started) * 1000
+            logger.debug(f"[{self.call_id}] {func.__name__} cancelled")
+            # Killing cursors takes a round trip; don't hold up the interruption for it
+            task = asyncio.create_task(self._close_cursors(cursors))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+            raise
+        finally:
+            _current_deadline.reset(deadline_token)
+            _current_runtime.reset(runtime_token)
+
+    def _record_overrun(self, tool: str, deadline: TurnDeadline):
+        elapsed_ms = deadline.elapsed_ms()
+        self.overruns[tool] = self.overruns.get(tool, 0) + 1
+        self.overrun_ms[tool] = self.overrun_ms.get(tool, 0.0) + elapsed_ms
+        logger.warning(
+            f"[{self.call_id}] {tool} ran over its {deadline.budget_secs:.1f} s budget "
+            f"({elapsed_ms:.0f} ms)"
+        )
+
+    async def _close_cursors(self, scope: CursorScope, timeout_secs: float = 5.0):
+        """Kill the cursors a cancelled read left open on the server."""
+        # A command already handed to Motor's executor still completes; wait
+        # for it so the cursor it opens is killed too
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_secs
+        while scope.in_flight and loop.time() < deadline:
+            await asyncio.sleep(0.01)
+
+        for namespace, cursor_ids in scope.take().items():
+            database, _, collection = namespace.partition(".")
+            try:
+                await self._database.client[database].command(
+                    {"killCursors": collection, "cursors": cursor_ids}
+                )
+                self.cursors_closed += len(cursor_ids)
+            except PyMongoError as e:
+                logger.warning(f"[{self.call_id}] Failed to kill cursors on {namespace}: {e}")
+
+    async def _memoized(self, func, params: FunctionCallParams, kwargs: dict):
+        """Run a read tool, answering from the memo when possible."""
+        key = memo_key(func.__name__, kwargs)
+        cached = self.memo.get_result(key)
+        if cached is not None:
+            logger.debug(f"[{self.call_id}] {func.__name__} answered from call memo")
+            await params.result_callback(cached)
+            return
+
+        callback = params.result_callback
+
+        async def remember(result, *args, **kw):
+            # Only successful results are kept; errors are cheap to recompute
+            if (
+                isinstance(result, dict)
+                and "error" not in result
+                and result.get("success", True)
+            ):
+                self.memo.put_result(key, result)
+            await callback(result, *args, **kw)
+
+        params = copy.copy(params)
+        params.result_callback = remember
+        return await func(params, **kwargs)
+
+    def _enter(self, done: asyncio.Future, is_write: bool) -> list:
+        """Register a tool invocation and return the futures it must wait for."""
+        if is_write:
+            barriers = [f for f in self._reads_since_write if not f.done()]
+            if self._last_write is not None and not self._last_write.done():
+                barriers.append(self._last_write)
+            self._last_write = done
+            self._reads_since_write = set()
+            if barriers:
+                logger.debug(
+                    f"[{self.call_id}] write waiting for {len(barriers)} earlier tool(s)"
+                )
+            return barriers
+
+        self._reads_since_write.add(done)
+        if self._last_write is not None and not self._last_write.done():
+            return [self._last_write]
+        return []
+
+
+class _ResultDelivery:
+    """
+    result_callback of a wrapped tool.
+
+    Records whether the tool delivered a result, and for writes the caller
+    interrupted while they ran, delivers it with run_llm=False.
+    """
+
+    def __init__(self, runtime: ToolRuntime, callback, quiet: bool):
+        self._runtime = runtime
+        self._callback = callback
+        self._quiet = quiet
+        self._issued_at = runtime._interruptions
+        self.delivered = False
+
+    async def __call__(self, result, *, properties: Optional[FunctionCallResultProperties] = None):
+        runtime = self._runtime
+        if self._quiet and runtime._interruptions != self._issued_at:
+            runtime.writes_finished_after_interruption += 1
+            if not properties or properties.run_llm is not False:
+                runtime.llm_runs_suppressed += 1
+            properties = dataclasses.replace(
+                properties or FunctionCallResultProperties(), run_llm=False
+            )
+        self.delivered = True
+        await self._callback(result, properties=properties)
@@ -0,0 +1,86 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+# Time from the caller's last word to the answer, tool calls included
+TURN_BUDGET_SECS = 6.0
+
+# Per-tool budgets. Reads should answer well within a second against an
+# indexed bookings collection; writes are never cut off, so theirs only
+# mark an overrun
+TOOL_BUDGETS_SECS: Dict[str, float] = {
+    "get_pricing": 1.0,
+    "get_amenities": 1.0,
+    "lookup_booking": 1.5,
+    "check_availability": 2.0,
+    "find_available_dates": 2.5,
+    "add_special_request": 3.0,
+    "cancel_booking": 3.0,
+    "update_booking": 4.0,
+    "book_room": 4.0,
+    "book_rooms": 5.0,
+}
+DEFAULT_TOOL_BUDGET_SECS = 2.0
+
+# A tool chained late in a slow turn still gets this long
+MIN_TOOL_BUDGET_SECS = 0.5
+
+_current_deadline: ContextVar[Optional["TurnDeadline"]] = ContextVar(
+    "turn_deadline", default=None
+)
+
+
+def current_deadline() -> Optional["TurnDeadline"]:
+    """Return the deadline of the tool call currently executing, if any."""
+    return _current_deadline.get()
+
+
+class TurnDeadline:
+    """
+    A point in time by which an answer is due.
+
+    Created when the caller stops speaking (the turn) and narrowed per tool
+    call with ``for_tool()``; ToolRuntime carries the tool's deadline in a
+    contextvar and applies it to every Mongo operation the tool issues.
+    """
+
+    def __init__(self, budget_secs: float, started_at: Optional[float] = None):
+        """
+        Args:
+            budget_secs: Seconds until the deadline
+            started_at: time.monotonic() the budget counts from (now if omitted)
+        """
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.budget_secs = budget_secs
+        self.expires_at = self.started_at + budget_secs
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started_at) * 1000
+
+    def for_tool(
+        self, tool: str, budgets: Dict[str, float] = TOOL_BUDGETS_SECS
+    ) -> "TurnDeadline":
+        """Deadline for a tool starting now: its own budget, capped by what is left of the turn."""
+        budget = budgets.get(tool, DEFAULT_TOOL_BUDGET_SECS)
+        return TurnDeadline(min(budget, max(self.remaining(), MIN_TOOL_BUDGET_SECS)))
+
+
+def still_working_result(tool: str) -> dict:
+    """Result a read tool returns when it runs out of budget."""
+    return {
+        "success": False,
+        "status": "still_working",
+        "retry": True,
+        "error": (
+            f"{tool} is taking longer than usual. Tell the caller you're still checking, "
+            "then call it again."
+        ),
+    }
@@ -1,5 +1,14 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from db import db
+from .tool_runtime import current_memo
+from inventory import occupancy_index, quote_stay
+from inventory.assignment import (
+    ASSIGNMENT_WINDOW_DAYS,
+    booked_intervals,
+    choose_room,
+    is_free,
+)
+from pymongo import ReturnDocument
 from pipecat.services.llm_service import FunctionCallParams
 
 
@@ -47,8 +56,13 @@ async def update_booking(
         )
         return
 
-    # Find the booking
-    booking = await bookings.find_one(query)
+    # Find the booking, reusing a document already fetched in this call
+    memo = current_memo()
+    booking = (
+        memo.lookup(confirmation_number, guest_email, guest_name) if memo else None
+    )
+    if booking is None:
+        booking = await bookings.find_one(query)
 
     if not booking:
         await params.result_callback(
@@ -75,7 +89,6 @@ async def update_booking(
 
     # Room capacity by type
     room_capacity = {"standard": 2, "deluxe": 3, "suite": 4}
-    room_prices = {"standard": 100, "deluxe": 150, "suite": 250}
 
     # Determine the room type to use for validation
     target_room_type = new_room_type.lower() if new_room_type else booking["room_type"]
@@ -92,7 +105,6 @@ async def update_booking(
             )
             return
         updates["room_type"] = new_room_type
-        updates["price_per_night"] = room_prices[new_room_type]
 
     # Validate new number of guests
     if new_num_guests:
@@ -158,65 +170,87 @@ async def update_booking(
 
     # Check room availability if dates or room type changed
     if new_check_in_date or new_check_out_date or new_room_type:
-        # Find rooms that are booked during the new period (excluding current booking)
-        booked_rooms_cursor = bookings.find(
+        # Find bookings around the new period (excluding current booking)
+        stay_start = datetime.strptime(check_in_date, "%Y-%m-%d")
+        stay_end = datetime.strptime(check_out_date, "%Y-%m-%d")
+        window_start = (stay_start - timedelta(days=ASSIGNMENT_WINDOW_DAYS)).strftime("%Y-%m-%d")
+        window_end = (stay_end + timedelta(days=ASSIGNMENT_WINDOW_DAYS)).strftime("%Y-%m-%d")
+        nearby_bookings = await bookings.find(
             {
                 "confirmation_number": {"$ne": booking["confirmation_number"]},
                 "room_type": target_room_type,
                 "$and": [
-                    {"check_in_date": {"$lt": check_out_date}},
-                    {"check_out_date": {"$gt": check_in_date}},
+                    {"check_in_date": {"$lt": window_end}},
+                    {"check_out_date": {"$gt": window_start}},
                 ],
-            }
-        )
+            },
+            projection={"room_number": 1, "check_in_date": 1, "check_out_date": 1},
+        ).to_list(length=None)
+        intervals = booked_intervals(nearby_bookings)
 
-        booked_room_numbers = set()
-        async for b in booked_rooms_cursor:
-            booked_room_numbers.add(b["room_number"])
-
-        # Get all rooms of the target type
-        all_rooms = await rooms.find({"room_type": target_room_type}).to_list(
-            length=None
+        # Keep the current room if it is still free, otherwise pick the best fit
+        keeps_room = target_room_type == booking["room_type"] and is_free(
+            intervals.get(booking["room_number"], []), stay_start.date(), stay_end.date()
         )
-        available_rooms = [
-            r for r in all_rooms if r["room_number"] not in booked_room_numbers
-        ]
-
-        if not available_rooms:
-            await params.result_callback(
-                {
-                    "success": False,
-                    "error": f"Sorry, no {target_room_type} rooms are available for the new dates. Please try different dates.",
-                }
+        if not keeps_room:
+            # Get all rooms of the target type
+            all_rooms = await rooms.find({"room_type": target_room_type}).to_list(
+                length=None
+            )
+            new_room = choose_room(
+                all_rooms, intervals, stay_start.date(), stay_end.date()
             )
-            return
 
-        # If changing room type, assign a new room
-        if new_room_type and new_room_type != booking["room_type"]:
-            import random
+            if not new_room:
+                await params.result_callback(
+                    {
+                        "success": False,
+                        "error": f"Sorry, no {target_room_type} rooms are available for the new dates. Please try different dates.",
+                    }
+                )
+                return
 
-            new_room = random.choice(available_rooms)
             updates["room_number"] = new_room["room_number"]
             updates["floor"] = new_room["floor"]
 
-    # Recalculate total price
+    # Re-price the stay from the rate calendar if the dates or room type changed
     final_check_in = datetime.strptime(check_in_date, "%Y-%m-%d")
     final_check_out = datetime.strptime(check_out_date, "%Y-%m-%d")
     nights = (final_check_out - final_check_in).days
-    price_per_night = updates.get("price_per_night", booking["price_per_night"])
-    updates["total_price"] = price_per_night * nights
+    if new_check_in_date or new_check_out_date or new_room_type:
+        quote = await quote_stay(db, target_room_type, check_in_date, check_out_date)
+        if not quote:
+            await params.result_callback(
+                {
+                    "success": False,
+                    "error": f"Pricing is unavailable for {target_room_type} rooms.",
+                }
+            )
+            return
+        updates["price_per_night"] = quote["price_per_night"]
+        updates["total_price"] = quote["total_price"]
 
     # Add timestamp
     updates["updated_at"] = datetime.utcnow()
 
-    # Perform the update
-    update_result = await bookings.update_one(
-        {"_id": booking["_id"]}, {"$set": updates}
+    # Update and read back in one round trip. The filter only matches if the
+    # dates and room checked above are still current, so a booking changed
+    # in the meantime (or a stale copy from the call memo) is not overwritten.
+    updated_booking = await bookings.find_one_and_update(
+        {
+            "_id": booking["_id"],
+            "room_type": booking["room_type"],
+            "room_number": booking["room_number"],
+            "check_in_date": booking["check_in_date"],
+            "check_out_date": booking["check_out_date"],
+        },
+        {"$set": updates},
+        return_document=ReturnDocument.AFTER,
     )
 
-    if update_result.modified_count == 1:
-        # Get the updated booking
-        updated_booking = await bookings.find_one({"_id": booking["_id"]})
+    if updated_booking:
+        occupancy_index.release_booking(booking)
+        occupancy_index.apply_booking(updated_booking)
 
         await params.result_callback(
             {
@@ -239,5 +273,8 @@ async def update_booking(
         )
     else:
         await params.result_callback(
-            {"success": False, "error": "Failed to update booking. Please try again."}
+            {
+                "success": False,
+                "error": "The booking changed while it was being updated. Please look it up again and retry.",
+            }
         )
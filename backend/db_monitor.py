@@ -0,0 +1,408 @@
+import os
+import time
+import asyncio
+import threading
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+import bson
+import orjson
+from loguru import logger
+from pymongo import monitoring
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Tool name used for commands issued outside a tool (loaders, summarizer, ...)
+UNATTRIBUTED = "-"
+
+_attribution: ContextVar[Tuple[Optional[str], Optional[str]]] = ContextVar(
+    "db_command_attribution", default=(None, None)
+)
+
+
+@contextmanager
+def attribute_commands(call_id: Optional[str], tool: Optional[str]):
+    """
+    Attribute every Mongo command issued inside the block to a call and tool.
+
+    Motor runs pymongo on an executor with a copy of the caller's context,
+    so the attribution reaches the listener callbacks.
+    """
+    token = _attribution.set((call_id, tool))
+    try:
+        yield
+    finally:
+        _attribution.reset(token)
+
+
+def current_attribution() -> Tuple[Optional[str], Optional[str]]:
+    """Return the (call_id, tool) commands are currently attributed to."""
+    return _attribution.get()
+
+
+class CursorScope:
+    """
+    Server-side cursors opened inside a ``track_cursors()`` block.
+
+    A find or aggregate whose first batch does not exhaust the result leaves
+    a cursor open on the server until a getMore drains it or it is killed.
+    The listener adds those cursors here and removes them once exhausted, so
+    a tool cancelled mid-stream knows exactly which cursors to kill. Commands
+    still running on Motor's executor are counted in ``in_flight``; their
+    cursors show up once they complete.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: Dict[int, str] = {}
+        self.in_flight = 0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, event, reply: Optional[dict]):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if not reply:
+                return
+            command = event.command
+            if event.command_name == "killCursors":
+                for cursor_id in command.get("cursors", []):
+                    self._open.pop(cursor_id, None)
+                return
+            cursor = reply.get("cursor")
+            if not isinstance(cursor, dict):
+                return
+            if event.command_name == "getMore":
+                if not cursor.get("id"):
+                    self._open.pop(command.get("getMore"), None)
+            elif cursor.get("id"):
+                self._open[cursor["id"]] = cursor.get("ns", "")
+
+    def take(self) -> Dict[str, List[int]]:
+        """Remove and return the open cursors, grouped by namespace."""
+        with self._lock:
+            cursors, self._open = self._open, {}
+        by_namespace: Dict[str, List[int]] = {}
+        for cursor_id, namespace in cursors.items():
+            by_namespace.setdefault(namespace, []).append(cursor_id)
+        return by_namespace
+
+
+_cursor_scope: ContextVar[Optional[CursorScope]] = ContextVar(
+    "db_cursor_scope", default=None
+)
+
+
+@contextmanager
+def track_cursors():
+    """Track the server-side cursors opened inside the block (see CursorScope)."""
+    scope = CursorScope()
+    token = _cursor_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _cursor_scope.reset(token)
+
+
+@dataclass
+class CommandRecord:
+    """One completed Mongo command."""
+
+    call_id: Optional[str]
+    tool: str
+    command: str
+    database: str
+    started_at: float
+    duration_ms: float
+    documents: int
+    request_bytes: int
+    reply_bytes: int
+    ok: bool
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count and sum."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.documents = 0
+        self.bytes = 0
+
+    def observe(self, record: CommandRecord):
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if record.duration_ms <= bound:
+                index = i
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += record.duration_ms
+        self.documents += record.documents
+        self.bytes += record.request_bytes + record.reply_bytes
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        bounds = [str(b) for b in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "buckets_ms": dict(zip(bounds, self.buckets)),
+        }
+
+
+class _CallCommands:
+    """Commands recorded for one call."""
+
+    def __init__(self):
+        self.records: List[CommandRecord] = []
+        self.dropped = 0
+        self.by_tool: Dict[str, LatencyHistogram] = {}
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    pymongo command listener that attributes commands to calls and tools.
+
+    Registered on the shared client in ``db.py``. For each command it records
+    latency, documents returned (or written) and, with ``measure_bytes``,
+    request/reply size, then:
+    - Logs commands slower than ``slow_ms`` as slow queries
+    - Adds them to per-tool latency histograms for the whole process
+    - Keeps per-call records until ``export_call()`` is called at call end
+
+    Everything can be queried in-process (``tool_stats()``, ``records()``,
+    ``slow_queries()``), which is what the load tests use.
+    """
+
+    def __init__(
+        self,
+        slow_ms: float = 100.0,
+        measure_bytes: bool = False,
+        max_records_per_call: int = 5000,
+        max_calls: int = 1000,
+        max_slow_queries: int = 500,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            slow_ms: Commands slower than this are logged as slow queries
+            measure_bytes: Measure request and reply sizes. Re-encodes the BSON
+                of every command and reply, so it is off unless asked for
+            max_records_per_call: Records kept per call; later ones are only counted
+            max_calls: Calls kept before the oldest un-exported call is dropped
+            max_slow_queries: Slow queries kept for ``slow_queries()``
+        """
+        self.slow_ms = slow_ms
+        self.measure_bytes = measure_bytes
+        self._max_records_per_call = max_records_per_call
+        self._max_calls = max_calls
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple, tuple] = {}
+        self._calls: "OrderedDict[str, _CallCommands]" = OrderedDict()
+        self._tools: Dict[str, LatencyHistogram] = {}
+        self._slow: deque = deque(maxlen=max_slow_queries)
+
+    # ============ LISTENER CALLBACKS ============
+
+    def started(self, event):
+        call_id, tool = _attribution.get()
+        request_bytes = len(bson.encode(event.command)) if self.measure_bytes else 0
+        key = (event.connection_id, event.request_id)
+        scope = _cursor_scope.get()
+        if scope is not None:
+            scope.started()
+        with self._lock:
+            self._pending[key] = (call_id, tool, time.time(), request_bytes, scope)
+
+    def succeeded(self, event):
+        self._finish(event, ok=True, reply=event.reply)
+
+    def failed(self, event):
+        self._finish(event, ok=False, reply=None)
+
+    def _finish(self, event, ok: bool, reply: Optional[dict]):
+        key = (event.connection_id, event.request_id)
+        with self._lock:
+            pending = self._pending.pop(key, None)
+        if pending is None:
+            call_id, tool = _attribution.get()
+            started_at, request_bytes, scope = time.time(), 0, None
+        else:
+            call_id, tool, started_at, request_bytes, scope = pending
+        if scope is not None:
+            scope.finished(event, reply)
+
+        record = CommandRecord(
+            call_id=call_id,
+            tool=tool or UNATTRIBUTED,
+            command=event.command_name,
+            database=event.database_name,
+            started_at=started_at,
+            duration_ms=event.duration_micros / 1000,
+            documents=_documents(reply) if reply else 0,
+            request_bytes=request_bytes,
+            reply_bytes=len(bson.encode(reply)) if reply and self.measure_bytes else 0,
+            ok=ok,
+        )
+        self.record(record)
+
+    # ============ AGGREGATION ============
+
+    def record(self, record: CommandRecord):
+        """Add a completed command to the histograms and its call."""
+        with self._lock:
+            self._tools.setdefault(record.tool, LatencyHistogram()).observe(record)
+
+            if record.call_id is not None:
+                calls = self._calls.get(record.call_id)
+                if calls is None:
+                    calls = self._calls[record.call_id] = _CallCommands()
+                    while len(self._calls) > self._max_calls:
+                        self._calls.popitem(last=False)
+                calls.by_tool.setdefault(record.tool, LatencyHistogram()).observe(record)
+                if len(calls.records) < self._max_records_per_call:
+                    calls.records.append(record)
+                else:
+                    calls.dropped += 1
+
+            slow = record.duration_ms >= self.slow_ms
+            if slow:
+                self._slow.append(record)
+
+        if slow:
+            logger.warning(
+                f"Slow Mongo command: {record.command} took {record.duration_ms:.1f} ms "
+                f"(call={record.call_id}, tool={record.tool}, docs={record.documents})"
+            )
+
+    def tool_stats(self) -> Dict[str, dict]:
+        """Process-wide per-tool histograms."""
+        with self._lock:
+            return {tool: h.to_dict() for tool, h in self._tools.items()}
+
+    def records(
+        self, call_id: Optional[str] = None, tool: Optional[str] = None
+    ) -> List[CommandRecord]:
+        """Records of calls not yet exported, optionally filtered."""
+        with self._lock:
+            if call_id is not None:
+                calls = self._calls.get(call_id)
+                found = list(calls.records) if calls else []
+            else:
+                found = [r for c in self._calls.values() for r in c.records]
+        if tool is not None:
+            found = [r for r in found if r.tool == tool]
+        return found
+
+    def slow_queries(self, limit: Optional[int] = None) -> List[CommandRecord]:
+        with self._lock:
+            slow = list(self._slow)
+        return slow[-limit:] if limit else slow
+
+    def reset(self):
+        """Drop all records and histograms."""
+        with self._lock:
+            self._pending.clear()
+            self._calls.clear()
+            self._tools.clear()
+            self._slow.clear()
+
+    def export_call(self, call_id: str, output_dir: Optional[str] = None) -> dict:
+        """
+        Remove a call's records and return its summary.
+
+        Writes the file on the calling thread; on the event loop use
+        ``aexport_call()``.
+
+        Args:
+            call_id: Call to export
+            output_dir: If given, also write the summary there as JSON
+
+        Returns:
+            Per-tool histograms, slow commands and every recorded command.
+        """
+        with self._lock:
+            calls = self._calls.pop(call_id, None) or _CallCommands()
+
+        summary = {
+            "call_id": call_id,
+            "exported_at": datetime.now().isoformat(),
+            "commands": sum(h.count for h in calls.by_tool.values()),
+            "total_ms": round(sum(h.total_ms for h in calls.by_tool.values()), 3),
+            "dropped_records": calls.dropped,
+            "by_tool": {tool: h.to_dict() for tool, h in calls.by_tool.items()},
+            "slow": [asdict(r) for r in calls.records if r.duration_ms >= self.slow_ms],
+            "records": [asdict(r) for r in calls.records],
+        }
+
+        if output_dir:
+            self._write_summary(summary, output_dir)
+        return summary
+
+    async def aexport_call(self, call_id: str, output_dir: Optional[str] = None) -> dict:
+        """
+        ``export_call()`` for the event loop: the summary is built in-loop and
+        the file is encoded and written on a worker thread, so the other
+        calls in the process are not held up.
+        """
+        summary = self.export_call(call_id)
+        if output_dir:
+            await asyncio.to_thread(self._write_summary, summary, output_dir)
+        return summary
+
+    def _write_summary(self, summary: dict, output_dir: str):
+        try:
+            path = Path(output_dir)
+            path.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filepath = path / f"db_commands_{timestamp}_{summary['call_id']}.json"
+            filepath.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+            logger.info(f"DB command metrics saved to {filepath} ({summary['commands']} commands)")
+        except Exception as e:
+            logger.error(f"Failed to save DB command metrics: {e}")
+
+
+def _documents(reply: dict) -> int:
+    """Documents returned by a query, or written by a write command."""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if "value" in reply:
+        return 1 if reply["value"] else 0
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+# Registered on the shared client in db.py
+command_monitor = CommandMonitor(
+    slow_ms=float(os.getenv("DB_SLOW_QUERY_MS", "100")),
+    measure_bytes=os.getenv("DB_MEASURE_BYTES", "").lower() in ("1", "true", "yes"),
+)
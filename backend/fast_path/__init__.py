@@ -0,0 +1,15 @@
+# Turns answered locally, without an LLM round trip
+
+from fast_path.matcher import TfidfMatcher
+from fast_path.faq import FaqEntry, FaqIndex, FaqFastPathProcessor, faq_index
+from fast_path.intents import IntentClassifier, IntentFastPathProcessor
+
+__all__ = [
+    "TfidfMatcher",
+    "FaqEntry",
+    "FaqIndex",
+    "FaqFastPathProcessor",
+    "faq_index",
+    "IntentClassifier",
+    "IntentFastPathProcessor",
+]
@@ -0,0 +1,337 @@
+"""
+Answers to static hotel questions without an LLM round trip.
+
+A caller asking where the hotel is or whether parking is free still costs a
+full generation over the whole system prompt. The facts those answers come
+from are all in the prompt's HOTEL CONTEXT section, so they are extracted
+into a small FAQ index at startup and matched against each final
+transcription with a TF-IDF matcher. On a confident match the canned answer
+is spoken with TTSSpeakFrame and both sides are appended to the LLMContext
+(without running the LLM), so the conversation reads as if the LLM had
+answered. Everything else passes through untouched.
+"""
+
+import re
+import time
+import functools
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from pipecat.frames.frames import (
+    Frame,
+    LLMMessagesAppendFrame,
+    TranscriptionFrame,
+    TTSSpeakFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from fast_path.matcher import TfidfMatcher
+from prompts import SYSTEM_PROMPT
+
+HOTEL_CONTEXT_HEADER = "{ 5. HOTEL CONTEXT }"
+
+
+@dataclass(frozen=True)
+class FaqEntry:
+    """
+    One static question the fast path may answer.
+
+    ``answer`` may use ``{Field}`` placeholders for HOTEL CONTEXT fields
+    (e.g. ``{Address}``). The entry is only kept while every phrase in
+    ``requires`` still appears in the HOTEL CONTEXT, so the fast path never
+    states a fact the prompt no longer gives the LLM.
+    """
+
+    topic: str
+    questions: Tuple[str, ...]
+    answer: str
+    requires: Tuple[str, ...] = ()
+
+
+FAQ_ENTRIES = (
+    FaqEntry(
+        topic="address",
+        questions=(
+            "where is the hotel",
+            "what is your address",
+            "where are you located",
+            "what's the hotel's address",
+            "how do I get to the hotel",
+            "which street is the hotel on",
+        ),
+        answer="We're at {Address}.",
+    ),
+    FaqEntry(
+        topic="phone",
+        questions=(
+            "what is your phone number",
+            "what number can I call",
+            "how can I contact the hotel",
+            "can I get the hotel's contact number",
+            "what's the number for the hotel",
+        ),
+        answer="You can reach us at {Contact Number}.",
+    ),
+    FaqEntry(
+        topic="parking",
+        questions=(
+            "do you have parking",
+            "is parking free",
+            "can I park my car at the hotel",
+            "is there a parking lot",
+            "do you charge for parking",
+        ),
+        answer="Yes, parking is complimentary for all our guests, so that's one less thing to think about.",
+        requires=("complimentary parking",),
+    ),
+    FaqEntry(
+        topic="pool",
+        questions=(
+            "do you have a pool",
+            "is there a swimming pool",
+            "can I go swimming at the hotel",
+        ),
+        answer="We do! There's a tranquil pool where you can cool off or simply unwind.",
+        requires=("pool",),
+    ),
+    FaqEntry(
+        topic="spa",
+        questions=(
+            "do you have a spa",
+            "can I get a massage at the hotel",
+            "is there a spa at the hotel",
+        ),
+        answer="Yes, we have an inviting spa, perfect for a massage and a little rejuvenation.",
+        requires=("spa", "massages"),
+    ),
+    FaqEntry(
+        topic="fitness",
+        questions=(
+            "do you have a gym",
+            "is there a fitness center",
+            "can I work out at the hotel",
+        ),
+        answer="We do. There's a full fitness center if you'd like to stay active during your stay.",
+        requires=("fitness center",),
+    ),
+    FaqEntry(
+        topic="dining",
+        questions=(
+            "do you have a restaurant",
+            "is there a restaurant at the hotel",
+            "where can I eat at the hotel",
+            "do you serve food",
+        ),
+        answer="Yes, our signature restaurant and bar serves all-day dining, so you're covered from breakfast to a late bite.",
+        requires=("restaurant", "all-day dining"),
+    ),
+    FaqEntry(
+        topic="bar",
+        questions=(
+            "do you have a bar",
+            "is there a rooftop bar",
+            "where can I get a drink",
+        ),
+        answer="We do, and our rooftop bar comes with sweeping city views. It's a lovely spot in the evening.",
+        requires=("rooftop bar",),
+    ),
+    FaqEntry(
+        topic="concierge",
+        questions=(
+            "do you have a concierge",
+            "can someone help me plan my trip",
+            "can you recommend things to do",
+        ),
+        answer="Yes, our concierge is always happy to help with special plans or recommendations.",
+        requires=("concierge",),
+    ),
+    FaqEntry(
+        topic="amenities",
+        questions=(
+            "what amenities do you have",
+            "what facilities does the hotel have",
+            "what does the hotel offer",
+        ),
+        answer=(
+            "Whether you'd like to unwind by the pool, treat yourself at the spa, or get a workout in at "
+            "our fitness center, we've got you covered. There's also our signature restaurant and bar with "
+            "all-day dining, a concierge for any special plans, and complimentary parking for all our guests."
+        ),
+        requires=("pool", "spa", "fitness center", "restaurant", "concierge", "complimentary parking"),
+    ),
+    FaqEntry(
+        topic="room_types",
+        questions=(
+            "what kind of rooms do you have",
+            "what room types are there",
+            "what types of rooms do you offer",
+        ),
+        answer=(
+            "We have three kinds of rooms. The Standard Room is perfect for two, the Deluxe Room comfortably "
+            "fits up to three guests, and our Suites offer a spacious layout with little touches of luxury throughout."
+        ),
+        requires=("standard room", "deluxe room", "suites"),
+    ),
+)
+
+# Turns that need a tool, the call flow or the LLM's judgement. Room types
+# are here too: their amenities and prices come from the tools
+NEEDS_LLM = re.compile(
+    r"\d|\b(book\w*|reserv\w*|available|availability|vacanc\w*|cancel\w*|price\w*|pricing|"
+    r"cost\w*|how much|rates?|cheap\w*|expensive|nights?|tonight|tomorrow|today|weekend|week|month|"
+    r"dates?|confirmation|change|update|modify|standard|deluxe|suites?|hold|wait|moment|bye|goodbye|"
+    r"any rooms?|a room|january|february|march|april|june|july|august|september|october|"
+    r"november|december|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    re.IGNORECASE,
+)
+
+# The canned answers are English: once the caller asks for another language
+# the rest of the call goes through the LLM
+LANGUAGE_REQUEST = re.compile(
+    r"\b(spanish|french|german|italian|portuguese|hindi|japanese|chinese|mandarin|cantonese|"
+    r"korean|arabic|russian|dutch|turkish|vietnamese|thai|polish|language|español|français)\b",
+    re.IGNORECASE,
+)
+
+
+def hotel_facts(prompt: str = SYSTEM_PROMPT) -> Dict[str, object]:
+    """
+    Fields of the prompt's HOTEL CONTEXT section.
+
+    ``• Key: value`` lines become strings; ``• Key:`` followed by indented
+    lines becomes the list of those lines. The whole section's text is kept
+    under ``"_text"``.
+    """
+    start = prompt.find(HOTEL_CONTEXT_HEADER)
+    if start < 0:
+        return {"_text": ""}
+    section = prompt[start + len(HOTEL_CONTEXT_HEADER):].split("=====", 1)[0]
+
+    facts: Dict[str, object] = {"_text": section}
+    current: Optional[List[str]] = None
+    for line in section.splitlines():
+        line = line.strip()
+        if line.startswith("•"):
+            key, _, value = line[1:].partition(":")
+            if value.strip():
+                facts[key.strip()] = value.strip()
+                current = None
+            else:
+                current = facts.setdefault(key.strip(), [])
+        elif line and current is not None:
+            current.append(line.lstrip("–- ").strip())
+    return facts
+
+
+class FaqIndex:
+    """The FAQ entries the prompt supports, with their matcher."""
+
+    def __init__(self, entries=FAQ_ENTRIES, prompt: str = SYSTEM_PROMPT):
+        facts = hotel_facts(prompt)
+        context = " ".join(facts["_text"].lower().split())
+        fields = {key: value for key, value in facts.items() if isinstance(value, str)}
+
+        self.answers: Dict[str, str] = {}
+        for entry in entries:
+            if not all(phrase in context for phrase in entry.requires):
+                logger.debug(f"FAQ entry '{entry.topic}' dropped: not in the hotel context")
+                continue
+            try:
+                self.answers[entry.topic] = entry.answer.format(**fields)
+            except KeyError as e:
+                logger.debug(f"FAQ entry '{entry.topic}' dropped: no {e} in the hotel context")
+
+        self.entries = [entry for entry in entries if entry.topic in self.answers]
+        self.matcher = TfidfMatcher(
+            (entry.topic, question) for entry in self.entries for question in entry.questions
+        )
+
+    def lookup(
+        self, text: str, min_score: float = 0.6, min_margin: float = 0.1, max_words: int = 16
+    ) -> Tuple[Optional[str], float]:
+        """
+        Topic and score of a caller's turn, or (None, score) when the turn
+        should go to the LLM.
+        """
+        if len(text.split()) > max_words or NEEDS_LLM.search(text):
+            return None, 0.0
+        topic, score, runner_up = self.matcher.match(text)
+        if topic is None or score < min_score or score - runner_up < min_margin:
+            return None, score
+        return topic, score
+
+
+@functools.lru_cache(maxsize=None)
+def faq_index() -> FaqIndex:
+    """The FAQ index for SYSTEM_PROMPT, built once per process and shared by every call."""
+    return FaqIndex()
+
+
+class FaqFastPathProcessor(FrameProcessor):
+    """
+    Answers static hotel questions locally; sits before the user context aggregator.
+
+    A matched TranscriptionFrame is consumed: the user's words and the canned
+    answer are appended to the context with run_llm=False and the answer is
+    spoken, so the LLM never runs for that turn. Turns that need tools or
+    judgement, long turns and everything after a language switch go to the LLM.
+    """
+
+    def __init__(self, index: FaqIndex = None, min_score: float = 0.6, min_margin: float = 0.1, **kwargs):
+        super().__init__(**kwargs)
+        self._index = index or faq_index()
+        self._min_score = min_score
+        self._min_margin = min_margin
+        self._enabled = True
+
+        self.turns = 0
+        self.hits = 0
+        self.topics: Dict[str, int] = {}
+
+    def _english(self, frame: TranscriptionFrame) -> bool:
+        if frame.language is not None and not str(frame.language.value).startswith("en"):
+            return False
+        return not LANGUAGE_REQUEST.search(frame.text) and frame.text.isascii()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if not isinstance(frame, TranscriptionFrame) or not frame.text.strip():
+            await self.push_frame(frame, direction)
+            return
+
+        self.turns += 1
+        if self._enabled and not self._english(frame):
+            self._enabled = False
+            logger.info("FAQ fast path off for this call: non-English turn")
+
+        topic = None
+        if self._enabled:
+            started = time.perf_counter()
+            topic, score = self._index.lookup(frame.text, self._min_score, self._min_margin)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if topic is None:
+            await self.push_frame(frame, direction)
+            return
+
+        answer = self._index.answers[topic]
+        self.hits += 1
+        self.topics[topic] = self.topics.get(topic, 0) + 1
+        logger.info(f"FAQ fast path: '{topic}' (score {score:.2f}, {elapsed_ms:.2f} ms) for '{frame.text}'")
+
+        messages = [
+            {"role": "user", "content": frame.text},
+            {"role": "assistant", "content": answer},
+        ]
+        await self.push_frame(LLMMessagesAppendFrame(messages, run_llm=False), direction)
+        await self.push_frame(TTSSpeakFrame(answer), direction)
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.turns,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.turns, 3) if self.turns else 0.0,
+            "topics": dict(self.topics),
+        }
@@ -0,0 +1,385 @@
+"""
+Hold, resume and end-call handled without an LLM round trip.
+
+"Hold on a sec" today waits for the LLM to decide to call put_on_hold
+before "No problem, I'll wait" is spoken, and a clear goodbye after the
+final check waits for it to call end_call. IntentClassifier recognizes the
+unambiguous phrasings with rules (the whole turn must be hold, goodbye or
+wake phrases) checked by a tiny nearest-example TF-IDF model that also
+knows the look-alikes ("hold on, that's wrong", "can you hold a room").
+IntentFastPathProcessor runs the same actions as the tools and records a
+synthetic tool call in the context, so the LLM sees what happened. Anything
+it is not sure about goes to the LLM as before.
+"""
+
+import re
+import json
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+from pipecat.frames.frames import (
+    Frame,
+    LLMMessagesAppendFrame,
+    TranscriptionFrame,
+    TTSSpeakFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from fast_path.matcher import TfidfMatcher
+from prompts import WAKE_PROMPTS
+
+HOLD = "put_on_hold"
+END_CALL = "end_call"
+RESUME = "resume"
+OTHER = "other"
+
+RESUME_MESSAGE = "Welcome back! I'm right here."
+
+_FILLERS = r"(?:oh|um+|uh+|hmm+|okay|ok|alright|all right|yeah|yes|sorry|so|well|hey|hi)"
+_POLITE = r"(?:please|thanks|thank you|thank you so much|samora)"
+
+_HOLD_PHRASES = (
+    r"hold on",
+    r"hold please",
+    r"please hold",
+    r"(?:can|could) you hold",
+    r"hang on",
+    r"(?:just )?(?:one|a) (?:moment|sec|second|minute)",
+    r"(?:give|gimme) me (?:a|one|just a) (?:moment|sec|second|minute)",
+    r"gimme a (?:sec|second|minute)",
+    r"wait a (?:moment|sec|second|minute)",
+    r"let me think(?: about it)?",
+    r"i need (?:a moment|a minute|a second|to think)",
+    r"(?:i'll )?be right back",
+    r"brb",
+    r"(?:can you |could you |please )?stay on the line",
+    r"i'm talking to someone(?: else)?",
+    r"pause",
+)
+
+# A bare "no" answers whatever was asked last, so a negation only counts
+# as a goodbye in front of one of these
+_NEGATION = r"(?:no|nope|nah)"
+
+_END_PHRASES = (
+    r"(?:that's|thats|that is) (?:all|it|everything)(?: for now)?",
+    r"(?:i'm|i am|we're|we are) (?:all set|good|fine|done)(?: for now)?",
+    r"nothing else",
+    r"bye(?: bye)?",
+    r"goodbye",
+    r"take care",
+    r"talk (?:to you )?later",
+    r"see you",
+    r"have a (?:good|nice|great) (?:day|night|evening|one)",
+    r"i (?:have to|got to|gotta|need to) go(?: now)?",
+    r"i'll call (?:you )?back(?: later)?",
+)
+
+_RESUME_PHRASES = tuple(re.escape(phrase) for phrase in WAKE_PROMPTS) + (
+    r"(?:i'm|i am) (?:back|ready|here)(?: now| again)?",
+    r"(?:i'm|i am) done(?: now)?",
+    r"(?:hello )?(?:are )?you still there",
+    r"(?:sorry )?(?:about|for) the wait",
+    r"thanks for waiting",
+    r"(?:let's|lets) (?:continue|go on|carry on|keep going)",
+    r"where were we",
+)
+
+
+def _sequence(phrases, lead: str = None) -> re.Pattern:
+    """
+    Whole turns made only of these phrases, with fillers and politeness around them.
+
+    ``lead`` may open the turn but never makes it on its own.
+    """
+    phrase = "(?:" + "|".join(phrases) + ")"
+    extra = f"(?:{_FILLERS}|{_POLITE})"
+    opening = f"(?:{lead} (?:{extra} )*)?" if lead else ""
+    return re.compile(rf"^(?:{extra} )*{opening}{phrase}(?: (?:{extra} )*{phrase})*(?: {extra})*$")
+
+
+INTENT_RULES = {
+    HOLD: _sequence(_HOLD_PHRASES),
+    END_CALL: _sequence(_END_PHRASES, lead=_NEGATION),
+    RESUME: _sequence(_RESUME_PHRASES),
+}
+
+# Examples for the model, look-alikes included under "other"
+INTENT_EXAMPLES = {
+    HOLD: (
+        "hold on",
+        "hold on a second",
+        "one moment please",
+        "give me a minute",
+        "give me a second",
+        "just a moment",
+        "let me think",
+        "i need to think about it",
+        "hang on",
+        "be right back",
+        "can you hold please",
+        "stay on the line",
+        "i'm talking to someone else",
+        "wait a minute",
+    ),
+    END_CALL: (
+        "no that's all",
+        "nope i'm good",
+        "no thanks",
+        "that's everything",
+        "i'm all set",
+        "nothing else",
+        "thanks bye",
+        "goodbye",
+        "take care",
+        "talk later",
+        "i have to go now",
+        "i'll call back later",
+        "no that's it thank you",
+    ),
+    RESUME: tuple(WAKE_PROMPTS) + ("okay i'm back", "sorry about that i'm back"),
+    OTHER: (
+        "hold on that's not right",
+        "wait what's the price",
+        "can you hold a room for me",
+        "hold the room until friday",
+        "one moment of your time",
+        "give me a room with a view",
+        "okay",
+        "alright",
+        "yes",
+        "no i wanted the deluxe room",
+        "no the fourteenth",
+        "actually can you check the spa",
+        "thanks for the info",
+        "take care of the booking",
+        "i need to change my booking",
+        "i'm back in town next week",
+        "are you there on weekends",
+        "i'm ready to book",
+        "goodbye is not what i meant",
+        "can i talk to someone else",
+    ),
+}
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().replace("’", "'")
+    return " ".join(re.sub(r"[^a-z' ]+", " ", text).split())
+
+
+class IntentClassifier:
+    """
+    Rules plus a nearest-example model over INTENT_EXAMPLES.
+
+    A rule hit stands unless the model is confident the turn is one of the
+    look-alikes. Without a rule hit the model alone must be confident and
+    clear of every other label, on a short turn.
+    """
+
+    def __init__(
+        self,
+        rules=INTENT_RULES,
+        examples=INTENT_EXAMPLES,
+        min_score: float = 0.8,
+        min_margin: float = 0.25,
+        max_words: int = 8,
+    ):
+        self._rules = rules
+        self._model = TfidfMatcher(
+            (label, _normalize(example)) for label, phrases in examples.items() for example in phrases
+        )
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.max_words = max_words
+
+    def classify(self, text: str) -> Tuple[Optional[str], float, str]:
+        """
+        Returns:
+            (intent, confidence, source): intent is None when unsure; source
+            is "rule" or "model"
+        """
+        normalized = _normalize(text)
+        if not normalized:
+            return None, 0.0, ""
+        label, score, runner_up = self._model.match(normalized)
+
+        for intent, rule in self._rules.items():
+            if rule.match(normalized):
+                if label == OTHER and score >= self.min_score:
+                    return None, score, "rule"
+                return intent, max(score, self.min_score), "rule"
+
+        if (
+            label not in (None, OTHER)
+            and len(normalized.split()) <= self.max_words
+            and score >= self.min_score
+            and score - runner_up >= self.min_margin
+        ):
+            return label, score, "model"
+        return None, score, "model"
+
+
+# The assistant's final check before ending a call (prompt section 5). Only
+# the closing question counts: "anything else you'd like to add to the
+# booking?" is asked mid-flow
+FINAL_CHECK = re.compile(
+    r"anything else (?:i|we) can (?:help|assist|do for) (?:you )?(?:with )?"
+    r"|help(?: you)? with (?:anything|something) else",
+    re.IGNORECASE,
+)
+
+# The assistant offering a write it has not made yet
+WRITE_OFFER = re.compile(
+    r"\b(?:shall|should|can|may) i (?:go ahead|book|reserve|confirm|cancel|change|update|make)\b"
+    r"|\b(?:want|like) me to\b"
+    r"|\bbefore i (?:book|confirm|reserve|cancel|change|update|make)\b",
+    re.IGNORECASE,
+)
+
+
+def allowed(intent: str, on_hold: bool, final_check_asked: bool) -> bool:
+    """
+    Whether an intent may be acted on in the call's current state.
+
+    Resuming only makes sense on hold and holding only off it. Ending the
+    call keeps the prompt's two-step rule: only once the assistant has asked
+    the final check; a goodbye before that goes to the LLM, which asks it.
+    """
+    if intent == RESUME:
+        return on_hold
+    if on_hold:
+        return False
+    if intent == END_CALL:
+        return final_check_asked
+    return intent == HOLD
+
+
+def last_assistant_text(messages) -> str:
+    for message in reversed(messages):
+        if isinstance(message, dict) and message.get("role") == "assistant" and message.get("content"):
+            content = message["content"]
+            return content if isinstance(content, str) else json.dumps(content)
+    return ""
+
+
+def pending_writes(messages, write_tools) -> list:
+    """Names of write tools the LLM called whose results are not in the context yet."""
+    calls = {}
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+        for call in message.get("tool_calls") or ():
+            name = call.get("function", {}).get("name")
+            if name in write_tools:
+                calls[call.get("id")] = name
+        if message.get("role") == "tool":
+            calls.pop(message.get("tool_call_id"), None)
+    return list(calls.values())
+
+
+def final_check_asked(messages, write_tools=()) -> bool:
+    """
+    Whether the assistant's last words were the closing check, with no
+    write offered and waiting on the answer, or still running.
+    """
+    text = last_assistant_text(messages)
+    return bool(
+        FINAL_CHECK.search(text)
+        and not WRITE_OFFER.search(text)
+        and not pending_writes(messages, write_tools)
+    )
+
+
+class IntentFastPathProcessor(FrameProcessor):
+    """
+    Runs hold, resume and end-call locally; sits before the hold filter.
+
+    ``actions`` maps put_on_hold and end_call to the coroutines the tools
+    run, called with this processor and returning the tool result. On a hit
+    the TranscriptionFrame is consumed, the action runs and the user turn,
+    a synthetic tool call and its result are appended to the context
+    (run_llm=False). A resume is answered with RESUME_MESSAGE. While on
+    hold, turns that are not a resume pass on to the hold filter.
+
+    ``write_tools`` names the tools that change bookings; a goodbye is left
+    to the LLM while one of them is still running.
+    """
+
+    def __init__(
+        self,
+        context,
+        actions: Dict[str, Callable[["IntentFastPathProcessor"], Awaitable[dict]]],
+        is_on_hold: Callable[[], bool],
+        resume: Callable[[], None],
+        classifier: IntentClassifier = None,
+        write_tools=(),
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._context = context
+        self._actions = actions
+        self._is_on_hold = is_on_hold
+        self._resume = resume
+        self._classifier = classifier or IntentClassifier()
+        self._write_tools = frozenset(write_tools)
+
+        self.turns = 0
+        self.hits: Dict[str, int] = {}
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if not isinstance(frame, TranscriptionFrame) or not frame.text.strip():
+            await self.push_frame(frame, direction)
+            return
+
+        self.turns += 1
+        started = time.perf_counter()
+        intent, confidence, source = self._classifier.classify(frame.text)
+        on_hold = self._is_on_hold()
+        final_check = final_check_asked(self._context.get_messages(), self._write_tools)
+        if intent is None or not allowed(intent, on_hold, final_check) or (
+            intent != RESUME and intent not in self._actions
+        ):
+            await self.push_frame(frame, direction)
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.hits[intent] = self.hits.get(intent, 0) + 1
+        logger.info(
+            f"Intent fast path: {intent} ({source} {confidence:.2f}, {elapsed_ms:.2f} ms) for '{frame.text}'"
+        )
+
+        messages = [{"role": "user", "content": frame.text}]
+        if intent == RESUME:
+            self._resume()
+            await self.push_frame(TTSSpeakFrame(RESUME_MESSAGE), direction)
+            messages.append({"role": "assistant", "content": RESUME_MESSAGE})
+        else:
+            result = await self._actions[intent](self)
+            tool_call_id = f"local-{uuid.uuid4().hex[:12]}"
+            messages.append(
+                {
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "id": tool_call_id,
+                            "function": {"name": intent, "arguments": "{}"},
+                            "type": "function",
+                        }
+                    ],
+                }
+            )
+            messages.append({"role": "tool", "content": json.dumps(result), "tool_call_id": tool_call_id})
+        await self.push_frame(LLMMessagesAppendFrame(messages, run_llm=False), direction)
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        return {
+            "turns": self.turns,
+            "hits": dict(self.hits),
+            "hit_rate": round(hits / self.turns, 3) if self.turns else 0.0,
+        }
@@ -0,0 +1,115 @@
+import re
+import math
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Words that carry no topic in a spoken question
+STOP_WORDS = frozenset(
+    """
+    a an the is are was were be am do does did you your yours i me my we our us
+    it its this that there here to of for in on at by with and or so can could
+    would will should may might please tell know about what what's whats which
+    just like any some have has had get got hey hi hello ok okay um uh oh well
+    also too really much one guys ya y'all
+    """.split()
+)
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content words with plural endings trimmed."""
+    words = []
+    for word in _WORD.findall(text.lower()):
+        word = word.strip("'")
+        if word.endswith("'s"):
+            word = word[:-2]
+        if not word or word in STOP_WORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def terms(text: str) -> List[str]:
+    """Unigrams and bigrams of a text's content words."""
+    words = tokenize(text)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class TfidfMatcher:
+    """
+    Nearest-phrase matcher over TF-IDF vectors (word unigrams and bigrams).
+
+    Built once from (key, phrase) pairs; several phrases may share a key. A
+    query is scored against every phrase by cosine similarity and each key
+    keeps its best phrase. Terms the phrases never use still count in the
+    query's norm (at the highest IDF), so a long or off-topic query scores
+    low even if it shares a word with a phrase.
+
+    Pure numpy, no model to load: building takes well under a millisecond
+    per phrase and a match a few tens of microseconds.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[Hashable, str]]):
+        phrases = list(phrases)
+        self._keys = [key for key, _ in phrases]
+        documents = [Counter(terms(text)) for _, text in phrases]
+
+        vocabulary: Dict[str, int] = {}
+        for document in documents:
+            for term in document:
+                vocabulary.setdefault(term, len(vocabulary))
+        document_frequency = np.zeros(len(vocabulary))
+        for document in documents:
+            for term in document:
+                document_frequency[vocabulary[term]] += 1
+
+        self._vocabulary = vocabulary
+        self._idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        self._unknown_idf = math.log(1 + len(documents)) + 1
+
+        matrix = np.zeros((len(documents), len(vocabulary)))
+        for row, document in enumerate(documents):
+            for term, count in document.items():
+                matrix[row, vocabulary[term]] = count
+        matrix *= self._idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._matrix = matrix / np.where(norms == 0, 1, norms)
+
+    def scores(self, text: str) -> Dict[Hashable, float]:
+        """Best cosine similarity per key."""
+        query = np.zeros(len(self._vocabulary))
+        unknown = 0.0
+        for term, count in Counter(terms(text)).items():
+            column = self._vocabulary.get(term)
+            if column is None:
+                unknown += (count * self._unknown_idf) ** 2
+            else:
+                query[column] = count * self._idf[column]
+        norm = math.sqrt(float(query @ query) + unknown)
+        best: Dict[Hashable, float] = {}
+        if norm == 0:
+            return best
+        for key, score in zip(self._keys, self._matrix @ query / norm):
+            if score > best.get(key, 0.0):
+                best[key] = float(score)
+        return best
+
+    def match(self, text: str) -> Tuple[Optional[Hashable], float, float]:
+        """
+        Best key for a text.
+
+        Returns:
+            (key, score, runner-up score): key is None when nothing overlaps
+        """
+        ranked = sorted(self.scores(text).items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return None, 0.0, 0.0
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        return ranked[0][0], ranked[0][1], runner_up
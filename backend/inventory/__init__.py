@@ -0,0 +1,22 @@
+# Inventory engines shared by the booking tools
+
+from inventory.occupancy import OccupancyIndex, occupancy_index
+from inventory.pricing import RateCalendar, rate_calendar, quote_stay
+from inventory.events import Invalidation, DocumentChanged, CollectionReset
+from inventory.coherence import CoherenceBus, coherence_bus
+from inventory.confirmation import allocate_confirmation_numbers, sync_confirmation_counter
+
+__all__ = [
+    "OccupancyIndex",
+    "occupancy_index",
+    "RateCalendar",
+    "rate_calendar",
+    "quote_stay",
+    "Invalidation",
+    "DocumentChanged",
+    "CollectionReset",
+    "CoherenceBus",
+    "coherence_bus",
+    "allocate_confirmation_numbers",
+    "sync_confirmation_counter",
+]
@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# How far around a stay to look for neighbouring bookings when scoring rooms
+ASSIGNMENT_WINDOW_DAYS = 14
+
+# Gaps shorter than this are unlikely to sell and count as orphan nights
+MIN_SELLABLE_GAP = 2
+
+Interval = Tuple[date, date]
+
+
+def _as_date(value) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def booked_intervals(bookings: Iterable[dict]) -> Dict[str, List[Interval]]:
+    """Group booking documents into (check_in, check_out) intervals per room number."""
+    intervals: Dict[str, List[Interval]] = {}
+    for booking in bookings:
+        intervals.setdefault(booking["room_number"], []).append(
+            (_as_date(booking["check_in_date"]), _as_date(booking["check_out_date"]))
+        )
+    return intervals
+
+
+def is_free(intervals: List[Interval], check_in: date, check_out: date) -> bool:
+    """True if no interval overlaps the stay."""
+    return all(end <= check_in or start >= check_out for start, end in intervals)
+
+
+def fit_score(
+    intervals: List[Interval],
+    check_in: date,
+    check_out: date,
+    window_days: int = ASSIGNMENT_WINDOW_DAYS,
+    min_gap: int = MIN_SELLABLE_GAP,
+) -> Tuple[int, int]:
+    """
+    Score how tightly a stay fits into a room's existing bookings (lower is better).
+
+    Returns ``(orphan_nights, slack_nights)``: orphan nights are gaps left before
+    or after the stay that are shorter than ``min_gap`` and will likely never
+    sell; slack nights are the remaining gap to the neighbouring bookings,
+    capped at ``window_days`` on each side.
+    """
+    window_start = check_in - timedelta(days=window_days)
+    window_end = check_out + timedelta(days=window_days)
+    previous_end = window_start
+    next_start = window_end
+    for start, end in intervals:
+        if end <= check_in and end > previous_end:
+            previous_end = end
+        if start >= check_out and start < next_start:
+            next_start = start
+
+    orphan = 0
+    slack = 0
+    for gap, bounded in (
+        ((check_in - previous_end).days, previous_end > window_start),
+        ((next_start - check_out).days, next_start < window_end),
+    ):
+        if bounded and 0 < gap < min_gap:
+            orphan += gap
+        else:
+            slack += gap
+    return orphan, slack
+
+
+def choose_room(
+    candidates: List[dict],
+    intervals: Dict[str, List[Interval]],
+    check_in,
+    check_out,
+) -> Optional[dict]:
+    """
+    Pick the free room whose bookings fit most tightly around the stay.
+
+    Rooms are ranked by orphan nights created, then by slack to the nearest
+    bookings, then by room number so assignment is deterministic.
+
+    Args:
+        candidates: Room documents of the requested type
+        intervals: Booked intervals per room number around the stay
+        check_in: Check-in date (date or YYYY-MM-DD)
+        check_out: Check-out date (date or YYYY-MM-DD)
+
+    Returns:
+        The chosen room document, or None if no candidate is free.
+    """
+    check_in = _as_date(check_in)
+    check_out = _as_date(check_out)
+
+    best = None
+    best_key = None
+    for room in candidates:
+        room_intervals = intervals.get(room["room_number"], [])
+        if not is_free(room_intervals, check_in, check_out):
+            continue
+        key = (*fit_score(room_intervals, check_in, check_out), room["room_number"])
+        if best_key is None or key < best_key:
+            best, best_key = room, key
+    return best
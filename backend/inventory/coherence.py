@@ -0,0 +1,316 @@
+import os
+import asyncio
+import contextvars
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from loguru import logger
+from pymongo.errors import OperationFailure, PyMongoError
+
+from inventory.confirmation import COUNTERS
+from inventory.events import CollectionReset, DocumentChanged, Invalidation
+from inventory.occupancy import occupancy_index
+from inventory.pricing import rate_calendar
+
+# Collections the inventory caches are built from
+WATCHED_COLLECTIONS = ("rooms", "bookings", "rate_rules")
+
+# Server errors meaning change streams are unavailable (standalone mongod)
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324}
+
+# Server errors meaning the stream cannot resume from our token
+RESUME_TOKEN_LOST = {260, 280, 286}
+
+# Collections polled by version (see bump_inventory_version) instead of by content
+VERSIONED_COLLECTIONS = ("rooms", "rate_rules")
+
+
+async def bump_inventory_version(database, collection: str):
+    """
+    Tell polling agents that ``collection`` (rooms or rate_rules) changed.
+
+    Writers of those collections call this after writing; without it, the
+    change reaches polling agents when their caches expire.
+    """
+    await database[COUNTERS].update_one(
+        {"_id": f"version:{collection}"}, {"$inc": {"seq": 1}}, upsert=True
+    )
+
+
+class CoherenceBus:
+    """
+    Keeps the in-process inventory caches coherent with writes from other agents.
+
+    Each agent process caches rooms, rates and occupancy (OccupancyIndex,
+    RateCalendar). A booking cancelled on one agent frees a room the others
+    still hold as booked until their cache ages out. The bus watches the
+    collections those caches are built from and publishes typed
+    Invalidation events to every registered cache in the process:
+    - "change_stream": one database change stream filtered to the watched
+      collections. The resume token is kept, so a reconnect replays what
+      happened while disconnected. If the token can no longer be resumed,
+      every collection is reset.
+    - "poll": for deployments without a replica set. Bookings are read by
+      ``updated_at`` (indexed when polling starts) and their estimated count
+      is checked for deletes; rooms and rate rules by a version document
+      their writers bump (``bump_inventory_version``). A poll with nothing
+      new costs three small commands.
+    - "auto" (default): change streams, falling back to polling when the
+      server does not support them.
+
+    The lag between a write's commit and its publication is recorded.
+    """
+
+    def __init__(
+        self,
+        mode: str = "auto",
+        poll_interval_secs: float = 2.0,
+        reconnect_delay_secs: float = 1.0,
+    ):
+        """
+        Initialize a stopped bus.
+
+        Args:
+            mode: "auto", "change_stream", "poll" or "off"
+            poll_interval_secs: Interval between polls in polling mode
+            reconnect_delay_secs: First delay before reconnecting a stream
+                (doubled up to 30 s while failing)
+        """
+        self.mode = mode
+        self.poll_interval_secs = poll_interval_secs
+        self.reconnect_delay_secs = reconnect_delay_secs
+
+        self._caches: List[Any] = []
+        self._task: Optional[asyncio.Task] = None
+        self.active_mode: Optional[str] = None
+        self.resume_token: Optional[dict] = None
+
+        self.events = 0
+        self.resets = 0
+        self.reconnects = 0
+        self.handler_errors = 0
+        self.lag_ms: Deque[float] = deque(maxlen=10_000)
+
+    def register(self, cache):
+        """Deliver invalidations to ``cache.on_invalidation(event)``."""
+        if cache not in self._caches:
+            self._caches.append(cache)
+
+    def unregister(self, cache):
+        if cache in self._caches:
+            self._caches.remove(cache)
+
+    def publish(self, event: Invalidation):
+        """Deliver an event to every registered cache."""
+        self.events += 1
+        if isinstance(event, CollectionReset):
+            self.resets += 1
+        if event.committed_at is not None:
+            lag = datetime.now(timezone.utc) - event.committed_at
+            self.lag_ms.append(max(lag.total_seconds() * 1000, 0.0))
+        for cache in list(self._caches):
+            try:
+                cache.on_invalidation(event)
+            except Exception as e:
+                self.handler_errors += 1
+                logger.exception(f"Coherence bus: {type(cache).__name__} failed on {event}: {e}")
+
+    def reset_all(self, source: str):
+        for collection in WATCHED_COLLECTIONS:
+            self.publish(CollectionReset(collection=collection, source=source))
+
+    # ============ LIFECYCLE ============
+
+    def start(self, database):
+        """Start watching in the background (idempotent)."""
+        if self.mode == "off" or (self._task and not self._task.done()):
+            return
+        # A fresh context, so the bus does not inherit the starting call's log
+        # fields or command attribution
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(database), context=contextvars.Context()
+        )
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.active_mode = None
+
+    async def _run(self, database):
+        try:
+            if self.mode in ("auto", "change_stream"):
+                try:
+                    await self._watch(database)
+                    return
+                except (NotImplementedError, OperationFailure) as e:
+                    if self.mode == "change_stream":
+                        logger.error(f"Coherence bus: change streams unavailable: {e}")
+                        return
+                    logger.info(f"Coherence bus: change streams unavailable ({e}); polling")
+            await self._poll(database)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Coherence bus stopped: {e}")
+
+    # ============ CHANGE STREAMS ============
+
+    async def _watch(self, database):
+        """Publish change events until cancelled; raise if change streams are unsupported."""
+        delay = self.reconnect_delay_secs
+        pipeline = [{"$match": {"ns.coll": {"$in": list(WATCHED_COLLECTIONS)}}}]
+        while True:
+            try:
+                async with database.watch(
+                    pipeline, full_document="updateLookup", resume_after=self.resume_token
+                ) as stream:
+                    while stream.alive:
+                        change = await stream.try_next()
+                        if self.active_mode != "change_stream":
+                            self.active_mode = "change_stream"
+                            delay = self.reconnect_delay_secs
+                            logger.info("Coherence bus: watching change streams")
+                        if change is not None:
+                            self.publish(self._to_event(change))
+                        # Also advances on empty batches
+                        self.resume_token = stream.resume_token
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    raise
+                if e.code in RESUME_TOKEN_LOST and self.resume_token is not None:
+                    logger.warning(f"Coherence bus: cannot resume ({e}); resetting caches")
+                    self.resume_token = None
+                    self.reset_all("change_stream")
+                    continue
+                logger.warning(f"Coherence bus: change stream failed: {e}")
+            except PyMongoError as e:
+                logger.warning(f"Coherence bus: change stream failed: {e}")
+            self.active_mode = None
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def _to_event(self, change: dict) -> Invalidation:
+        collection = change["ns"]["coll"]
+        operation = change["operationType"]
+        committed_at = change.get("wallTime")
+        if committed_at is None and change.get("clusterTime") is not None:
+            committed_at = datetime.fromtimestamp(change["clusterTime"].time, timezone.utc)
+        elif committed_at is not None and committed_at.tzinfo is None:
+            committed_at = committed_at.replace(tzinfo=timezone.utc)
+
+        if operation in ("insert", "update", "replace", "delete"):
+            return DocumentChanged(
+                collection=collection,
+                committed_at=committed_at,
+                operation=operation,
+                document_id=change["documentKey"]["_id"],
+                document=change.get("fullDocument"),
+            )
+        # drop, rename, invalidate...
+        return CollectionReset(collection=collection, committed_at=committed_at)
+
+    # ============ POLLING ============
+
+    async def _poll(self, database):
+        self.active_mode = "poll"
+        await database.bookings.create_index("updated_at")
+        watermark = datetime.utcnow()
+        # Writers stamp updated_at before committing, so a write can land
+        # behind the watermark; re-read this far back and skip what was seen
+        overlap = timedelta(seconds=max(self.poll_interval_secs, 1.0))
+        seen: Dict[Any, datetime] = {
+            booking["_id"]: booking["updated_at"]
+            async for booking in database.bookings.find(
+                {"updated_at": {"$gt": watermark - overlap}}, projection={"updated_at": 1}
+            )
+        }
+        booking_count = await database.bookings.estimated_document_count()
+        versions = await self._versions(database)
+
+        while True:
+            await asyncio.sleep(self.poll_interval_secs)
+            since = watermark
+            try:
+                changed = await database.bookings.find(
+                    {"updated_at": {"$gt": since - overlap}}
+                ).sort("updated_at", 1).to_list(length=None)
+                count = await database.bookings.estimated_document_count()
+            except PyMongoError as e:
+                logger.warning(f"Coherence bus: poll failed: {e}")
+                continue
+
+            inserted = 0
+            for booking in changed:
+                updated_at = booking["updated_at"]
+                previous = seen.get(booking["_id"])
+                if previous == updated_at:
+                    continue
+                seen[booking["_id"]] = updated_at
+                watermark = max(watermark, updated_at)
+                is_new = previous is None and booking.get("created_at", updated_at) > since - overlap
+                inserted += is_new
+                self.publish(
+                    DocumentChanged(
+                        collection="bookings",
+                        committed_at=updated_at.replace(tzinfo=timezone.utc),
+                        source="poll",
+                        operation="insert" if is_new else "update",
+                        document_id=booking["_id"],
+                        document=booking,
+                    )
+                )
+            horizon = watermark - overlap
+            seen = {key: at for key, at in seen.items() if at > horizon}
+
+            # Deletes leave nothing to read: a count short of the inserts means
+            # bookings were cancelled
+            if count != booking_count + inserted:
+                self.publish(CollectionReset(collection="bookings", source="poll"))
+            booking_count = count
+
+            try:
+                latest = await self._versions(database)
+            except PyMongoError as e:
+                logger.warning(f"Coherence bus: poll failed: {e}")
+                continue
+            for name in VERSIONED_COLLECTIONS:
+                if latest.get(name) != versions.get(name):
+                    self.publish(CollectionReset(collection=name, source="poll"))
+            versions = latest
+
+    async def _versions(self, database) -> Dict[str, int]:
+        ids = [f"version:{name}" for name in VERSIONED_COLLECTIONS]
+        return {
+            counter["_id"].split(":", 1)[1]: counter["seq"]
+            async for counter in database[COUNTERS].find({"_id": {"$in": ids}})
+        }
+
+    def stats(self) -> dict:
+        lag = sorted(self.lag_ms)
+
+        def percentile(fraction: float) -> Optional[float]:
+            return round(lag[min(len(lag) - 1, int(len(lag) * fraction))], 1) if lag else None
+
+        return {
+            "mode": self.active_mode,
+            "events": self.events,
+            "resets": self.resets,
+            "reconnects": self.reconnects,
+            "handler_errors": self.handler_errors,
+            "lag_p50_ms": percentile(0.5),
+            "lag_p95_ms": percentile(0.95),
+            "lag_max_ms": round(lag[-1], 1) if lag else None,
+        }
+
+
+# One per process, feeding the shared inventory caches
+coherence_bus = CoherenceBus(
+    mode=os.getenv("SAMORA_CACHE_COHERENCE", "auto"),
+    poll_interval_secs=float(os.getenv("SAMORA_CACHE_POLL_SECS", "2")),
+)
+coherence_bus.register(occupancy_index)
+coherence_bus.register(rate_calendar)
@@ -0,0 +1,56 @@
+from pymongo import ReturnDocument
+
+# Sequence documents ({"_id": name, "seq": n}) incremented atomically
+COUNTERS = "counters"
+CONFIRMATION_COUNTER = "confirmation_number"
+CONFIRMATION_PREFIX = "GV-2025-"
+FIRST_CONFIRMATION = 1001
+
+# Databases whose counter has been moved past the numbers already issued
+_synced = set()
+
+
+def confirmation_number(n: int) -> str:
+    return f"{CONFIRMATION_PREFIX}{n:06d}"
+
+
+async def sync_confirmation_counter(database):
+    """
+    Move the counter past the highest confirmation number on a booking.
+
+    Needed once for bookings numbered without the counter (bulk loads, or a
+    database that predates it). ``$max`` keeps it idempotent and safe to run
+    from several agents at once.
+    """
+    last = await database.bookings.find_one(
+        {"confirmation_number": {"$regex": f"^{CONFIRMATION_PREFIX}"}},
+        sort=[("confirmation_number", -1)],
+        projection={"confirmation_number": 1},
+    )
+    issued = int(last["confirmation_number"].split("-")[-1]) if last else FIRST_CONFIRMATION - 1
+    await database[COUNTERS].update_one(
+        {"_id": CONFIRMATION_COUNTER}, {"$max": {"seq": issued}}, upsert=True
+    )
+    _synced.add(database.name)
+
+
+async def allocate_confirmation_numbers(database, count: int = 1, session=None) -> list:
+    """
+    Reserve ``count`` consecutive confirmation numbers in one round trip.
+
+    The counter is incremented with find_one_and_update, so concurrent
+    bookings never get the same number. Inside a transaction (``session``)
+    the numbers are given back if it aborts; otherwise an unused number is
+    simply skipped.
+    """
+    if database.name not in _synced:
+        await sync_confirmation_counter(database)
+    counter = await database[COUNTERS].find_one_and_update(
+        {"_id": CONFIRMATION_COUNTER},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+        session=session,
+    )
+    last = counter["seq"]
+    return [confirmation_number(n) for n in range(last - count + 1, last + 1)]
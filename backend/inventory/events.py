@@ -0,0 +1,39 @@
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    """
+    Something changed in a collection the inventory caches are built from.
+
+    Published by the CoherenceBus to every registered cache, whichever agent
+    process made the write (including this one).
+    """
+
+    collection: str
+    # When the write was committed, if known (used for the invalidation lag)
+    committed_at: Optional[datetime] = None
+    # "change_stream" or "poll"
+    source: str = "change_stream"
+
+
+@dataclass(frozen=True)
+class DocumentChanged(Invalidation):
+    """One document was inserted, updated, replaced or deleted."""
+
+    operation: str = "update"
+    document_id: Any = None
+    # The document after the write; None for deletes
+    document: Optional[dict] = None
+
+
+@dataclass(frozen=True)
+class CollectionReset(Invalidation):
+    """
+    Any document may have changed; caches built from it must reload.
+
+    Sent when changes may have been missed (resume token lost, deletes seen
+    by polling) and when polling sees a small collection change.
+    """
@@ -0,0 +1,293 @@
+import time
+import asyncio
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from inventory.events import CollectionReset, DocumentChanged, Invalidation
+from inventory.pricing import money
+
+
+class OccupancyIndex:
+    """
+    In-memory rooms x nights occupancy matrix for flexible-date searches.
+
+    Row ``r`` is a room and column ``d`` is the night starting ``start + d``
+    days. A cell is True when the room is booked that night. The matrix is
+    built from the ``rooms`` and ``bookings`` collections, kept current by the
+    booking tools through ``apply_booking()`` / ``release_booking()`` and by
+    the CoherenceBus for writes from other agents (``on_invalidation()``),
+    and rebuilt once it is older than ``max_age_secs`` or the day rolls over.
+
+    Window queries are vectorized: a cumulative sum along the nights axis
+    gives the booked-night count of every (room, start) window in one pass.
+    """
+
+    def __init__(self, horizon_days: int = 365, max_age_secs: float = 60.0):
+        """
+        Initialize an empty index.
+
+        Args:
+            horizon_days: Number of nights from today covered by the matrix
+            max_age_secs: Rebuild from the database after this many seconds
+        """
+        self._horizon_days = horizon_days
+        self._max_age_secs = max_age_secs
+
+        self._start: Optional[date] = None
+        self._loaded_at = 0.0
+        self._load_lock = asyncio.Lock()
+
+        self._occupied = np.zeros((0, horizon_days), dtype=bool)
+        self._room_numbers: List[str] = []
+        self._row_by_room: Dict[str, int] = {}
+        self._room_types = np.array([], dtype=object)
+        self._prices = np.zeros(0, dtype=np.float64)
+        self._rows_by_type: Dict[str, np.ndarray] = {}
+        # Nights each booking holds, so a change event naming only the
+        # booking (e.g. a delete) can free them
+        self._held: Dict[Any, dict] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._start is not None
+
+    @property
+    def start(self) -> Optional[date]:
+        return self._start
+
+    @property
+    def shape(self) -> tuple:
+        return self._occupied.shape
+
+    def is_stale(self) -> bool:
+        """True if the index has never been loaded, is too old or starts before today."""
+        if self._start is None:
+            return True
+        if self._start != date.today():
+            return True
+        return time.monotonic() - self._loaded_at > self._max_age_secs
+
+    def invalidate(self):
+        """Force a rebuild on the next ``ensure_loaded()``."""
+        self._loaded_at = 0.0
+
+    async def ensure_loaded(self, database):
+        """Build the index from the database if it is missing or stale."""
+        if not self.is_stale():
+            return
+        async with self._load_lock:
+            if not self.is_stale():
+                return
+            started = time.perf_counter()
+            start = date.today()
+            end = start + timedelta(days=self._horizon_days)
+            rooms = await database.rooms.find(
+                {},
+                projection={"room_number": 1, "room_type": 1, "price_per_night": 1},
+            ).to_list(length=None)
+            bookings = await database.bookings.find(
+                {
+                    "check_in_date": {"$lt": end.isoformat()},
+                    "check_out_date": {"$gt": start.isoformat()},
+                },
+                projection={"room_number": 1, "check_in_date": 1, "check_out_date": 1},
+            ).to_list(length=None)
+            self.load(rooms, bookings, start)
+            logger.info(
+                f"Occupancy index built: {len(rooms)} rooms x {self._horizon_days} nights, "
+                f"{len(bookings)} bookings in {(time.perf_counter() - started) * 1000:.1f}ms"
+            )
+
+    def load(self, rooms: Iterable[dict], bookings: Iterable[dict], start: date):
+        """Build the matrix from room and booking documents."""
+        rooms = list(rooms)
+        self._start = start
+        self._room_numbers = [r["room_number"] for r in rooms]
+        self._row_by_room = {num: i for i, num in enumerate(self._room_numbers)}
+        self._room_types = np.array([r["room_type"] for r in rooms], dtype=object)
+        self._prices = np.array(
+            [r.get("price_per_night", 0) for r in rooms], dtype=np.float64
+        )
+        self._rows_by_type = {
+            room_type: np.flatnonzero(self._room_types == room_type)
+            for room_type in set(self._room_types.tolist())
+        }
+        self._occupied = np.zeros((len(rooms), self._horizon_days), dtype=bool)
+        self._held = {}
+        for booking in bookings:
+            self._mark(booking, True)
+        self._loaded_at = time.monotonic()
+
+    def apply_booking(self, booking: dict):
+        """Mark a new or updated booking's nights as occupied."""
+        if self.loaded:
+            self._mark(booking, True)
+
+    def release_booking(self, booking: dict):
+        """Free the nights of a cancelled booking (or the old dates of an update)."""
+        if self.loaded:
+            self._mark(booking, False)
+
+    def on_invalidation(self, event: Invalidation):
+        """Apply a booking change made by any agent; rebuild for anything else."""
+        if not self.loaded:
+            return
+        if event.collection == "rooms" or (
+            event.collection == "bookings" and isinstance(event, CollectionReset)
+        ):
+            self.invalidate()
+        elif event.collection == "bookings" and isinstance(event, DocumentChanged):
+            held = self._held.get(event.document_id)
+            if held is not None:
+                self._mark(held, False)
+            if event.document is not None:
+                self._mark(event.document, True)
+
+    def _mark(self, booking: dict, occupied: bool):
+        booking_id = booking.get("_id")
+        if booking_id is not None:
+            if occupied:
+                self._held[booking_id] = {
+                    "room_number": booking.get("room_number"),
+                    "check_in_date": booking["check_in_date"],
+                    "check_out_date": booking["check_out_date"],
+                }
+            else:
+                self._held.pop(booking_id, None)
+        row = self._row_by_room.get(booking.get("room_number"))
+        if row is None:
+            return
+        first = self._day_index(booking["check_in_date"])
+        last = self._day_index(booking["check_out_date"])
+        first = max(first, 0)
+        last = min(last, self._horizon_days)
+        if first < last:
+            self._occupied[row, first:last] = occupied
+
+    def _day_index(self, day) -> int:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        return (day - self._start).days
+
+    def free_counts(
+        self, check_in: date, check_out: date, room_types: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """Number of rooms of each type free for every night of the stay."""
+        first = max(self._day_index(check_in), 0)
+        last = min(self._day_index(check_out), self._horizon_days)
+        counts = {}
+        for room_type in room_types or sorted(self._rows_by_type):
+            rows = self._rows_by_type.get(room_type)
+            if rows is None or first >= last:
+                counts[room_type] = 0
+                continue
+            booked = self._occupied[rows, first:last].any(axis=1)
+            counts[room_type] = int((~booked).sum())
+        return counts
+
+    def find_windows(
+        self,
+        nights: int,
+        earliest: date,
+        latest: date,
+        room_types: Optional[List[str]] = None,
+        num_rooms: int = 1,
+        preferred: Optional[date] = None,
+        sort_by: str = "closest",
+        limit: int = 5,
+        exclude: Optional[date] = None,
+        rates=None,
+    ) -> List[dict]:
+        """
+        Find stays of ``nights`` nights starting between ``earliest`` and ``latest``.
+
+        Args:
+            nights: Length of the stay
+            earliest: First acceptable check-in date
+            latest: Last acceptable check-in date
+            room_types: Room types to consider (all types if omitted)
+            num_rooms: Minimum number of free rooms of the type
+            preferred: Check-in date the caller asked for, used by "closest"
+            sort_by: "closest" to ``preferred`` or "cheapest" total price
+            limit: Maximum number of options returned
+            exclude: Check-in date to leave out (the one already known to be full)
+            rates: Loaded RateCalendar used for stay totals (room prices if omitted)
+
+        Returns:
+            Options with room type, dates, free room count and lowest total price.
+        """
+        if nights <= 0 or not self.loaded:
+            return []
+
+        first_start = max(self._day_index(earliest), 0)
+        last_start = min(self._day_index(latest), self._horizon_days - nights)
+        if first_start > last_start:
+            return []
+
+        preferred_index = self._day_index(preferred or earliest)
+        exclude_index = self._day_index(exclude) if exclude else None
+
+        options = []
+        for room_type in room_types or sorted(self._rows_by_type):
+            rows = self._rows_by_type.get(room_type)
+            if rows is None or len(rows) == 0:
+                continue
+
+            # Booked nights of every (room, start) window via a prefix sum
+            block = self._occupied[rows, first_start : last_start + nights]
+            prefix = np.zeros((len(rows), block.shape[1] + 1), dtype=np.int32)
+            np.cumsum(block, axis=1, dtype=np.int32, out=prefix[:, 1:])
+            booked_nights = prefix[:, nights:] - prefix[:, :-nights]
+            free = booked_nights == 0
+
+            free_count = free.sum(axis=0)
+            if rates is not None and rates.base_rate(room_type) is not None:
+                totals = rates.window_totals(
+                    room_type,
+                    self._start + timedelta(days=first_start),
+                    len(free_count),
+                    nights,
+                )
+            else:
+                prices = np.where(free, self._prices[rows][:, None], np.inf)
+                totals = prices.min(axis=0) * nights
+
+            for offset in np.flatnonzero(free_count >= num_rooms):
+                start_index = first_start + int(offset)
+                if start_index == exclude_index:
+                    continue
+                check_in = self._start + timedelta(days=start_index)
+                total = float(totals[offset])
+                options.append(
+                    {
+                        "room_type": room_type,
+                        "check_in_date": check_in.isoformat(),
+                        "check_out_date": (check_in + timedelta(days=nights)).isoformat(),
+                        "nights": nights,
+                        "available_count": int(free_count[offset]),
+                        "price_per_night": money(total / nights),
+                        "total_price": money(total),
+                        "days_from_requested": start_index - preferred_index,
+                    }
+                )
+
+        if sort_by == "cheapest":
+            options.sort(
+                key=lambda o: (o["total_price"], abs(o["days_from_requested"]))
+            )
+        else:
+            options.sort(
+                key=lambda o: (
+                    abs(o["days_from_requested"]),
+                    o["days_from_requested"] < 0,
+                    o["total_price"],
+                )
+            )
+        return options[:limit]
+
+
+# Shared by every tool call in the process
+occupancy_index = OccupancyIndex()
@@ -0,0 +1,271 @@
+import time
+import asyncio
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from inventory.events import Invalidation
+
+
+# Nights priced as weekend nights (Monday is 0): Friday and Saturday
+WEEKEND_NIGHTS = (4, 5)
+
+# Applied to weekend nights unless a rate rule overrides them
+WEEKEND_MULTIPLIER = 1.0
+
+
+def money(amount: float):
+    """Round to cents, returning an int for whole amounts."""
+    amount = round(float(amount), 2)
+    return int(amount) if amount.is_integer() else amount
+
+
+class RateCalendar:
+    """
+    Nightly rate calendar per room type with O(1) stay quotes.
+
+    Base rates come from the ``rooms`` collection. Seasonal and weekend
+    adjustments come from optional ``rate_rules`` documents::
+
+        {"room_type": "suite",            # optional, all types if omitted
+         "start_date": "2026-12-20",      # first night, inclusive
+         "end_date": "2027-01-03",        # last night, exclusive
+         "days_of_week": [4, 5],          # optional, Monday is 0
+         "multiplier": 1.25}              # or "price_per_night": 320
+
+    Rules are applied in ``priority`` order (then insertion order), later
+    rules overriding earlier ones. For each room type the calendar keeps a
+    prefix sum over the nightly rates, so the total of any stay inside the
+    horizon is one subtraction.
+    """
+
+    def __init__(self, horizon_days: int = 730, max_age_secs: float = 300.0):
+        """
+        Initialize an empty calendar.
+
+        Args:
+            horizon_days: Number of nights from today with precomputed rates
+            max_age_secs: Reload rooms and rules after this many seconds
+        """
+        self._horizon_days = horizon_days
+        self._max_age_secs = max_age_secs
+
+        self._start: Optional[date] = None
+        self._loaded_at = 0.0
+        self._load_lock = asyncio.Lock()
+
+        self._base_rates: Dict[str, float] = {}
+        self._capacity: Dict[str, int] = {}
+        self._rates: Dict[str, np.ndarray] = {}
+        self._prefix: Dict[str, np.ndarray] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._start is not None
+
+    @property
+    def room_types(self) -> List[str]:
+        return sorted(self._base_rates)
+
+    def base_rate(self, room_type: str) -> Optional[float]:
+        return self._base_rates.get(room_type)
+
+    def capacity(self, room_type: str) -> Optional[int]:
+        return self._capacity.get(room_type)
+
+    def is_stale(self) -> bool:
+        if self._start is None or self._start != date.today():
+            return True
+        return time.monotonic() - self._loaded_at > self._max_age_secs
+
+    def invalidate(self):
+        """Force a reload on the next ``ensure_loaded()``."""
+        self._loaded_at = 0.0
+
+    def on_invalidation(self, event: Invalidation):
+        """Reload after any change to room rates or rate rules."""
+        if event.collection in ("rooms", "rate_rules"):
+            self.invalidate()
+
+    async def ensure_loaded(self, database):
+        """Load base rates and rate rules from the database if missing or stale."""
+        if not self.is_stale():
+            return
+        async with self._load_lock:
+            if not self.is_stale():
+                return
+            rooms = await database.rooms.aggregate(
+                [
+                    {
+                        "$group": {
+                            "_id": "$room_type",
+                            "price_per_night": {"$first": "$price_per_night"},
+                            "capacity": {"$first": "$capacity"},
+                        }
+                    }
+                ]
+            ).to_list(length=None)
+            rules = await database.rate_rules.find({}).sort("priority", 1).to_list(
+                length=None
+            )
+            self.load(
+                {r["_id"]: r["price_per_night"] for r in rooms},
+                rules,
+                date.today(),
+                capacity={r["_id"]: r.get("capacity") for r in rooms},
+            )
+            logger.info(
+                f"Rate calendar loaded: {len(rooms)} room types, {len(rules)} rate rules"
+            )
+
+    def load(
+        self,
+        base_rates: Dict[str, float],
+        rules: Iterable[dict],
+        start: date,
+        capacity: Optional[Dict[str, int]] = None,
+    ):
+        """Build nightly rates and prefix sums from base rates and rate rules."""
+        rules = list(rules)
+        self._start = start
+        self._base_rates = dict(base_rates)
+        self._capacity = dict(capacity or {})
+
+        weekdays = (np.arange(self._horizon_days) + start.weekday()) % 7
+        weekend = np.isin(weekdays, WEEKEND_NIGHTS)
+
+        self._rates = {}
+        self._prefix = {}
+        for room_type, base in self._base_rates.items():
+            rates = np.full(self._horizon_days, float(base))
+            rates[weekend] *= WEEKEND_MULTIPLIER
+
+            for rule in rules:
+                if rule.get("room_type") not in (None, room_type):
+                    continue
+                first = max(self._day_index(rule["start_date"]), 0)
+                last = min(self._day_index(rule["end_date"]), self._horizon_days)
+                if first >= last:
+                    continue
+                mask = np.zeros(self._horizon_days, dtype=bool)
+                mask[first:last] = True
+                if rule.get("days_of_week"):
+                    mask &= np.isin(weekdays, rule["days_of_week"])
+                if "price_per_night" in rule:
+                    rates[mask] = float(rule["price_per_night"])
+                elif "multiplier" in rule:
+                    rates[mask] = base * float(rule["multiplier"])
+
+            prefix = np.zeros(self._horizon_days + 1)
+            np.cumsum(rates, out=prefix[1:])
+            self._rates[room_type] = rates
+            self._prefix[room_type] = prefix
+
+        self._loaded_at = time.monotonic()
+
+    def _day_index(self, day) -> int:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        return (day - self._start).days
+
+    def nightly_rate(self, room_type: str, night) -> Optional[float]:
+        """Rate of a single night, or None for an unknown room type."""
+        rates = self._rates.get(room_type)
+        if rates is None:
+            return None
+        index = self._day_index(night)
+        if 0 <= index < self._horizon_days:
+            return float(rates[index])
+        return self._fallback_rate(room_type, night)
+
+    def stay_total(self, room_type: str, check_in, check_out) -> Optional[float]:
+        """Total price of the nights from check_in up to check_out."""
+        prefix = self._prefix.get(room_type)
+        if prefix is None:
+            return None
+        first = self._day_index(check_in)
+        last = self._day_index(check_out)
+        if first >= last:
+            return 0.0
+
+        inside_first = min(max(first, 0), self._horizon_days)
+        inside_last = min(max(last, 0), self._horizon_days)
+        total = float(prefix[inside_last] - prefix[inside_first])
+
+        # Nights outside the precomputed horizon get the base and weekend rate
+        before = range(first, min(last, 0))
+        after = range(max(first, self._horizon_days), last)
+        for index in list(before) + list(after):
+            total += self._fallback_rate(
+                room_type, self._start + timedelta(days=index)
+            )
+        return total
+
+    def quote(self, room_type: str, check_in, check_out) -> Optional[dict]:
+        """
+        Price a stay.
+
+        Returns:
+            ``{"nights", "price_per_night", "total_price"}`` where
+            price_per_night is the average nightly rate, or None for an
+            unknown room type.
+        """
+        total = self.stay_total(room_type, check_in, check_out)
+        if total is None:
+            return None
+        nights = self._day_index(check_out) - self._day_index(check_in)
+        return {
+            "nights": nights,
+            "price_per_night": money(total / nights) if nights > 0 else 0,
+            "total_price": money(total),
+        }
+
+    def window_totals(
+        self, room_type: str, first_check_in, num_starts: int, nights: int
+    ) -> np.ndarray:
+        """Stay totals for ``num_starts`` consecutive check-in dates, vectorized."""
+        first = self._day_index(first_check_in)
+        if (
+            room_type in self._prefix
+            and first >= 0
+            and first + num_starts - 1 + nights <= self._horizon_days
+        ):
+            prefix = self._prefix[room_type]
+            starts = np.arange(first, first + num_starts)
+            return prefix[starts + nights] - prefix[starts]
+        return np.array(
+            [
+                self.stay_total(
+                    room_type,
+                    self._start + timedelta(days=first + i),
+                    self._start + timedelta(days=first + i + nights),
+                )
+                or 0.0
+                for i in range(num_starts)
+            ]
+        )
+
+    def _fallback_rate(self, room_type: str, night) -> float:
+        if isinstance(night, str):
+            night = date.fromisoformat(night)
+        base = float(self._base_rates[room_type])
+        if night.weekday() in WEEKEND_NIGHTS:
+            return base * WEEKEND_MULTIPLIER
+        return base
+
+
+# Shared by every tool call in the process
+rate_calendar = RateCalendar()
+
+
+async def quote_stay(database, room_type: str, check_in, check_out) -> Optional[dict]:
+    """Quote a stay from the shared calendar, reloading once for unknown room types."""
+    await rate_calendar.ensure_loaded(database)
+    quote = rate_calendar.quote(room_type, check_in, check_out)
+    if quote is None:
+        rate_calendar.invalidate()
+        await rate_calendar.ensure_loaded(database)
+        quote = rate_calendar.quote(room_type, check_in, check_out)
+    return quote
@@ -0,0 +1,19 @@
+# In-process metrics for agent capacity and latency, scraped over HTTP.
+# The agent's metric families are defined in metrics.agent; fed by each
+# call's CallMetrics and by ToolRuntime and the rolling summarizer.
+
+from metrics.registry import Counter, Gauge, Histogram, Registry, registry
+from metrics.agent import CallMetrics, LoopLagMonitor
+from metrics.server import MetricsServer, start_metrics
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "registry",
+    "CallMetrics",
+    "LoopLagMonitor",
+    "MetricsServer",
+    "start_metrics",
+]
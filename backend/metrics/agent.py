@@ -0,0 +1,152 @@
+import time
+import asyncio
+from typing import Optional
+
+from pipecat.frames.frames import (
+    Frame,
+    MetricsFrame,
+    BotStartedSpeakingFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import (
+    TTFBMetricsData,
+    LLMUsageMetricsData,
+    TTSUsageMetricsData,
+    ProcessingMetricsData,
+)
+
+from session_host import session_host
+from metrics.registry import registry
+
+# Sizes of the LLM context, in messages and prompt tokens
+MESSAGE_BUCKETS = (5, 10, 20, 40, 60, 80, 100, 150, 200)
+TOKEN_BUCKETS = (500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+# Event-loop lag is sampled this often by LoopLagMonitor
+LOOP_LAG_INTERVAL_SECS = 0.5
+LOOP_LAG_BUCKETS_SECS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# ============ CAPACITY ============
+ACTIVE_SESSIONS = registry.gauge("samora_active_sessions", "Calls running in this process")
+ACTIVE_SESSIONS.set_function(lambda: session_host.active)
+MAX_SESSIONS = registry.gauge("samora_max_sessions", "Calls this process may run at once (0 = uncapped)")
+MAX_SESSIONS.set_function(lambda: session_host.max_sessions)
+SESSIONS_SERVED = registry.counter("samora_sessions_served_total", "Calls finished by this process")
+SESSIONS_SERVED.set_function(lambda: session_host.served)
+SESSIONS_REJECTED = registry.counter("samora_sessions_rejected_total", "Calls rejected for lack of a slot")
+SESSIONS_REJECTED.set_function(lambda: session_host.rejected)
+LOOP_LAG = registry.histogram(
+    "samora_event_loop_lag_seconds",
+    "How late a periodic timer wakes up on the event loop",
+    buckets=LOOP_LAG_BUCKETS_SECS,
+)
+
+# ============ LATENCY ============
+TURN_LATENCY = registry.histogram(
+    "samora_turn_latency_seconds", "Time from the caller's last word to the bot's first audio"
+)
+TTFB = registry.histogram(
+    "samora_ttfb_seconds", "Time to first byte of a provider response", ["service", "model"]
+)
+PROCESSING = registry.histogram(
+    "samora_processing_seconds", "Time a service took to process a request", ["service", "model"]
+)
+TOOL_LATENCY = registry.histogram(
+    "samora_tool_latency_seconds", "Duration of a tool call, as the LLM waited for it", ["tool", "outcome"]
+)
+
+# ============ CONTEXT & USAGE ============
+CONTEXT_MESSAGES = registry.histogram(
+    "samora_context_messages", "Messages in the LLM context after each response", buckets=MESSAGE_BUCKETS
+)
+CONTEXT_TOKENS = registry.histogram(
+    "samora_context_tokens", "Prompt tokens of each LLM request", ["service", "model"], buckets=TOKEN_BUCKETS
+)
+LLM_TOKENS = registry.counter(
+    "samora_llm_tokens_total", "LLM tokens used", ["service", "model", "kind"]
+)
+TTS_CHARACTERS = registry.counter(
+    "samora_tts_characters_total", "Characters sent to TTS", ["service", "model"]
+)
+SUMMARIZATIONS = registry.counter(
+    "samora_summarizations_total", "Rolling context summarizations run", ["outcome"]
+)
+
+
+def _service(processor: str) -> str:
+    """Service class of a processor name; drops the per-instance "#n" so labels stay bounded."""
+    return processor.partition("#")[0]
+
+
+class CallMetrics:
+    """
+    Feeds the process registry from one call's pipeline.
+
+    ``on_frame()`` is attached to the last processor of the pipeline, which
+    every downstream frame reaches once: MetricsFrames from STT, LLM and
+    TTS (TTFB, processing time, token and character usage), and the
+    speaking frames that bound a turn. A Pipecat observer would see the
+    same frames, but once per hop between processors, through a queue.
+    """
+
+    def __init__(self):
+        self._user_stopped_at: Optional[float] = None
+        self.turns = 0
+
+    def on_frame(self, frame: Frame):
+        if isinstance(frame, MetricsFrame):
+            for data in frame.data:
+                self._record(data)
+        elif isinstance(frame, UserStoppedSpeakingFrame):
+            self._user_stopped_at = time.monotonic()
+        elif isinstance(frame, UserStartedSpeakingFrame):
+            self._user_stopped_at = None
+        elif isinstance(frame, BotStartedSpeakingFrame) and self._user_stopped_at is not None:
+            TURN_LATENCY.observe(time.monotonic() - self._user_stopped_at)
+            self._user_stopped_at = None
+            self.turns += 1
+
+    def _record(self, data):
+        service, model = _service(data.processor), data.model or ""
+        if isinstance(data, TTFBMetricsData):
+            # Pipecat reports a zero TTFB when a measurement is stopped before it started
+            if data.value > 0:
+                TTFB.labels(service, model).observe(data.value)
+        elif isinstance(data, ProcessingMetricsData):
+            PROCESSING.labels(service, model).observe(data.value)
+        elif isinstance(data, LLMUsageMetricsData):
+            usage = data.value
+            CONTEXT_TOKENS.labels(service, model).observe(usage.prompt_tokens)
+            LLM_TOKENS.labels(service, model, "prompt").inc(usage.prompt_tokens)
+            LLM_TOKENS.labels(service, model, "completion").inc(usage.completion_tokens)
+        elif isinstance(data, TTSUsageMetricsData):
+            TTS_CHARACTERS.labels(service, model).inc(data.value)
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag: how late a sleep of ``interval_secs`` returns."""
+
+    def __init__(self, interval_secs: float = LOOP_LAG_INTERVAL_SECS):
+        self.interval_secs = interval_secs
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval_secs)
+            LOOP_LAG.observe(max(0.0, loop.time() - started - self.interval_secs))
@@ -0,0 +1,109 @@
+import os
+import asyncio
+from typing import Optional
+
+from loguru import logger
+
+from metrics.registry import Registry, registry
+from metrics.agent import LoopLagMonitor
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Port of the scrape endpoint; 0 turns it off
+DEFAULT_PORT = 9464
+
+
+class MetricsServer:
+    """
+    Minimal HTTP endpoint serving a Registry at ``GET /metrics``.
+
+    Runs on the bot's event loop with asyncio streams, so it needs no web
+    framework or thread. A scrape renders the registry in one pass; the
+    agent's few hundred series (histogram buckets included) take a
+    millisecond or two, once per scrape interval.
+    """
+
+    def __init__(self, registry: Registry = registry, host: str = "0.0.0.0", port: int = DEFAULT_PORT):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 binds an ephemeral port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5.0)
+            # Headers are not needed; read them so the client isn't reset
+            while (await asyncio.wait_for(reader.readline(), 5.0)) not in (b"\r\n", b"\n", b""):
+                pass
+            method, _, rest = request_line.decode("latin-1").partition(" ")
+            path = rest.split(" ", 1)[0].split("?", 1)[0]
+            if method != "GET":
+                await self._respond(writer, "405 Method Not Allowed", "text/plain", b"")
+            elif path != "/metrics":
+                await self._respond(writer, "404 Not Found", "text/plain", b"")
+            else:
+                self.scrapes += 1
+                await self._respond(writer, "200 OK", CONTENT_TYPE, self.registry.render().encode())
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, content_type: str, body: bytes):
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+
+_server: Optional[MetricsServer] = None
+_loop_lag: Optional[LoopLagMonitor] = None
+# Set once the endpoint has been tried, whether it bound or not
+_attempted = False
+
+
+async def start_metrics(port: Optional[int] = None) -> Optional[MetricsServer]:
+    """
+    Start the process's loop-lag probe and scrape endpoint, once.
+
+    Called at the start of every call; later calls return the running
+    server, or None without trying again. The port comes from
+    SAMORA_METRICS_PORT (9464 by default, 0 disables). If the port is
+    taken, calls carry on without the endpoint. The probe runs either way.
+    """
+    global _server, _loop_lag, _attempted
+    if _loop_lag is None:
+        _loop_lag = LoopLagMonitor()
+    _loop_lag.start()
+    if _attempted:
+        return _server
+    _attempted = True
+
+    if port is None:
+        port = int(os.getenv("SAMORA_METRICS_PORT", str(DEFAULT_PORT)))
+    if port <= 0:
+        return None
+
+    server = MetricsServer(port=port)
+    try:
+        await server.start()
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on port {port}: {e}")
+        return None
+    _server = server
+    logger.info(f"Metrics endpoint listening on :{server.port}/metrics")
+    return server
@@ -361,7 +361,12 @@ SYSTEM_PROMPT = """
       Retrieves amenities associated with a room type.
 
   – check_availability  
-      Checks room availability for the caller’s requested dates.
+      Checks room availability for the caller’s requested dates. When those
+      dates are full it also returns the nearest alternative stays.
+
+  – find_available_dates  
+      Searches a whole range of dates at once for flexible callers, e.g. the
+      nearest or cheapest stay of a given length. Never probe dates one by one.
 
   – lookup_booking  
       Searches for an existing reservation.
@@ -369,6 +374,10 @@ SYSTEM_PROMPT = """
   – book_room  
       Creates a new reservation once all required information is collected.
 
+  – book_rooms  
+      Books several rooms for the same dates in one step (families, groups,
+      corporate stays). Either every room is booked or none are.
+
   – update_booking  
       Modifies an existing reservation.
 
@@ -398,10 +407,12 @@ SYSTEM_PROMPT = """
 
 • You must call a tool whenever the caller asks for:
     – Room availability → check_availability
+    – Flexible dates, nearest or cheapest stay → find_available_dates
     – Room pricing → get_pricing
     – Room amenities → get_amenities
     – Details of an existing reservation → lookup_booking
     – Creating a reservation → book_room
+    – Reserving more than one room for the same dates → book_rooms
     – Changing a reservation → update_booking
     – Canceling a reservation → cancel_booking
     – Adding special instructions → add_special_request
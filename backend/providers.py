@@ -0,0 +1,240 @@
+import os
+import time
+import asyncio
+import importlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class Provider:
+    """A selectable service: the modules it needs and how to build it from the config."""
+
+    modules: Tuple[str, ...]
+    create: Callable[[dict], object]
+    label: str
+
+
+def _api_key(config: dict, name: str) -> str:
+    return config.get(f"{name}_api_key") or os.getenv(f"{name.upper()}_API_KEY", "")
+
+
+# ============ STT ============
+
+
+def _deepgram_stt(config: dict):
+    from deepgram import LiveOptions
+
+    if config.get("provider_session_pool", True):
+        from session_pool.deepgram import PooledDeepgramSTTService as DeepgramSTTService
+    else:
+        from pipecat.services.deepgram.stt import DeepgramSTTService
+
+    return DeepgramSTTService(
+        api_key=_api_key(config, "deepgram"),
+        live_options=LiveOptions(
+            model="nova-3",
+            language="multi",
+            interim_results=False,
+            vad_events=False,
+            diarize=False,
+            filler_words=True,
+        ),
+    )
+
+
+def _elevenlabs_stt(config: dict):
+    from pipecat.services.elevenlabs.stt import ElevenLabsRealtimeSTTService
+
+    return ElevenLabsRealtimeSTTService(
+        api_key=_api_key(config, "elevenlabs"),
+        model="scribe_v2_realtime",
+    )
+
+
+# ============ LLM ============
+
+
+def _openai_llm(config: dict):
+    from pipecat.services.openai.llm import OpenAILLMService
+
+    return OpenAILLMService(api_key=_api_key(config, "openai"), model="gpt-4o-mini")
+
+
+def _cerebras_llm(config: dict):
+    from pipecat.services.cerebras.llm import CerebrasLLMService
+
+    return CerebrasLLMService(api_key=_api_key(config, "cerebras"), model="llama-3.3-70b")
+
+
+def _groq_llm(config: dict):
+    from pipecat.services.groq.llm import GroqLLMService
+
+    return GroqLLMService(api_key=_api_key(config, "groq"), model="llama-3.3-70b-versatile")
+
+
+def _google_llm(config: dict):
+    from pipecat.services.google.llm import GoogleLLMService
+
+    return GoogleLLMService(api_key=_api_key(config, "google"), model="gemini-2.5-flash")
+
+
+# ============ TTS ============
+
+
+def _deepgram_tts(config: dict):
+    from pipecat.services.deepgram.tts import DeepgramTTSService
+
+    return DeepgramTTSService(
+        api_key=_api_key(config, "deepgram"),
+        voice="aura-2-theia-en",  # Australian, feminine, expressive, polite, sincere
+    )
+
+
+def _cartesia_tts(config: dict):
+    if config.get("provider_session_pool", True):
+        from session_pool.cartesia import PooledCartesiaTTSService as CartesiaTTSService
+    else:
+        from pipecat.services.cartesia.tts import CartesiaTTSService
+
+    return CartesiaTTSService(
+        api_key=_api_key(config, "cartesia"),
+        voice_id="248be419-c632-4f23-adf1-5324ed7dbf1d",
+    )
+
+
+STT_PROVIDERS: Dict[str, Provider] = {
+    "deepgram": Provider(
+        ("deepgram", "pipecat.services.deepgram.stt", "session_pool.deepgram"),
+        _deepgram_stt,
+        "Deepgram Nova-3",
+    ),
+    "elevenlabs": Provider(("pipecat.services.elevenlabs.stt",), _elevenlabs_stt, "ElevenLabs Scribe v2"),
+}
+LLM_PROVIDERS: Dict[str, Provider] = {
+    "google": Provider(("pipecat.services.google.llm",), _google_llm, "Google Gemini 2.5 Flash"),
+    "openai": Provider(("pipecat.services.openai.llm",), _openai_llm, "OpenAI GPT-4o-mini"),
+    "cerebras": Provider(("pipecat.services.cerebras.llm",), _cerebras_llm, "Cerebras Llama-3.3-70B"),
+    "groq": Provider(("pipecat.services.groq.llm",), _groq_llm, "Groq Llama-3.3-70B"),
+}
+TTS_PROVIDERS: Dict[str, Provider] = {
+    "cartesia": Provider(
+        ("pipecat.services.cartesia.tts", "session_pool.cartesia"), _cartesia_tts, "Cartesia"
+    ),
+    "deepgram": Provider(("pipecat.services.deepgram.tts",), _deepgram_tts, "Deepgram Aura-2 Theia"),
+}
+
+# (registry, provider when the config has none, provider for unknown names)
+_SELECTION = {
+    "stt_provider": (STT_PROVIDERS, "deepgram", "elevenlabs"),
+    "llm_provider": (LLM_PROVIDERS, "google", "google"),
+    "tts_provider": (TTS_PROVIDERS, "cartesia", "cartesia"),
+}
+
+# Needed by every transport (VAD and end-of-turn detection)
+AUDIO_ANALYZER_MODULES = (
+    "pipecat.audio.vad.silero",
+    "pipecat.audio.turn.smart_turn.local_smart_turn_v3",
+    "audio_models",
+)
+
+
+def get_provider(config: dict, key: str) -> Provider:
+    """The provider a config selects for ``stt_provider``, ``llm_provider`` or ``tts_provider``."""
+    registry, default, fallback = _SELECTION[key]
+    return registry.get(config.get(key, default)) or registry[fallback]
+
+
+def selected_providers(config: dict) -> Tuple[Provider, Provider, Provider]:
+    """The (stt, llm, tts) providers a config selects."""
+    return (
+        get_provider(config, "stt_provider"),
+        get_provider(config, "llm_provider"),
+        get_provider(config, "tts_provider"),
+    )
+
+
+def create_services(config: dict):
+    """
+    Create the STT, LLM and TTS services selected in the config.
+
+    Only the selected providers' modules are imported.
+
+    Returns:
+        A (stt, llm, tts) tuple.
+    """
+    stt_provider, llm_provider, tts_provider = selected_providers(config)
+    logger.info(
+        f"Using providers - LLM: {llm_provider.label}, STT: {stt_provider.label}, "
+        f"TTS: {tts_provider.label}"
+    )
+    stt = stt_provider.create(config)
+    llm = llm_provider.create(config)
+    tts = tts_provider.create(config)
+    return stt, llm, tts
+
+
+def preload(modules: Iterable[str]) -> float:
+    """Import modules ahead of use; return the seconds it took."""
+    start = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    return time.perf_counter() - start
+
+
+def warm_up(config: Optional[dict] = None) -> float:
+    """
+    Pre-import the providers a config selects, plus the audio analyzers,
+    and load the analyzers' shared models.
+
+    Call at worker start so the first call does not pay for the imports.
+    Without a config, the default providers are loaded.
+
+    Returns:
+        Seconds spent importing and loading.
+    """
+    modules = [m for p in selected_providers(config or {}) for m in p.modules]
+    start = time.perf_counter()
+    preload([*modules, *AUDIO_ANALYZER_MODULES])
+    importlib.import_module("audio_models").load_models()
+    elapsed = time.perf_counter() - start
+    logger.info(f"Providers warmed up in {elapsed * 1000:.0f} ms")
+    return elapsed
+
+
+async def prewarm_sessions(config: Optional[dict] = None) -> int:
+    """
+    Connect the session pool's STT and TTS sessions for a config now.
+
+    Builds the selected services the way a call does (API keys from the
+    config or the environment) and prewarms the spec each one leases, so
+    the first call after warm-up gets a pooled session instead of
+    connecting while the caller waits. Providers without pooled sessions
+    or without an API key are skipped. Without a config, the default
+    providers are prewarmed.
+
+    Returns:
+        Number of specs prewarmed.
+    """
+    config = config or {}
+    if not config.get("provider_session_pool", True):
+        return 0
+    from session_pool import session_pool
+
+    specs = []
+    for key in ("stt_provider", "tts_provider"):
+        registry, default, _ = _SELECTION[key]
+        name = config.get(key, default)
+        if name not in registry or not _api_key(config, name):
+            continue
+        service = registry[name].create(config)
+        if hasattr(service, "_session_spec"):
+            specs.append(service._session_spec())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session_pool.prewarm(spec) for spec in specs))
+    if specs:
+        logger.info(f"Prewarmed {len(specs)} provider sessions in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return len(specs)
@@ -1,9 +1,12 @@
 import asyncio
-from loguru import logger
+from utils.log import get_logger
+from metrics.agent import CONTEXT_MESSAGES, SUMMARIZATIONS
+from usage.ledger import SUMMARIZER
 from typing import Optional, List
 from pipecat.frames.frames import Frame, LLMFullResponseEndFrame
 from pipecat.processors.frame_processor import FrameProcessor, FrameDirection
 
+log = get_logger("context")
 
 # Default prompt for summarization
 DEFAULT_SUMMARY_PROMPT = """Please provide a concise summary of the following conversation. 
@@ -37,6 +40,7 @@ class RollingSummarizerContextManager(FrameProcessor):
         threshold: int = 100,
         keep_recent: int = 20,
         summary_prompt: Optional[str] = None,
+        usage_ledger=None,
         **kwargs,
     ):
         """
@@ -48,6 +52,7 @@ class RollingSummarizerContextManager(FrameProcessor):
             threshold: Trigger summarization when message count >= this value
             keep_recent: Number of recent messages to keep (not summarized)
             summary_prompt: Custom prompt for summarization (optional)
+            usage_ledger: UsageLedger the summaries' tokens are recorded in (optional)
         """
         super().__init__(**kwargs)
 
@@ -56,15 +61,17 @@ class RollingSummarizerContextManager(FrameProcessor):
         self._threshold = threshold
         self._keep_recent = keep_recent
         self._summary_prompt = summary_prompt or DEFAULT_SUMMARY_PROMPT
+        self._usage_ledger = usage_ledger
 
         # State for pending merge
         self._pending_merge: Optional[List[dict]] = None
         self._snapshot_len: Optional[int] = None
         self._summarization_task: Optional[asyncio.Task] = None
 
-        logger.info(
-            f"RollingSummarizerContextManager initialized: "
-            f"threshold={threshold}, keep_recent={keep_recent}"
+        log.info(
+            "RollingSummarizerContextManager initialized: threshold={}, keep_recent={}",
+            threshold,
+            keep_recent,
         )
 
     async def check_and_summarize(self):
@@ -82,8 +89,10 @@ class RollingSummarizerContextManager(FrameProcessor):
         if current_len >= self._threshold:
             # Only start if not already running
             if self._summarization_task is None or self._summarization_task.done():
-                logger.info(
-                    f"Context threshold reached ({current_len} >= {self._threshold}). Starting summarization..."
+                log.info(
+                    "Context threshold reached ({} >= {}). Starting summarization...",
+                    current_len,
+                    self._threshold,
                 )
                 await self._run_summarization()
                 if self._pending_merge is not None:
@@ -101,10 +110,13 @@ class RollingSummarizerContextManager(FrameProcessor):
 
             # Step 2: Check if we need to start new summarization
             current_len = len(self._context.messages)
+            CONTEXT_MESSAGES.observe(current_len)
             if current_len >= self._threshold:
                 if self._summarization_task is None or self._summarization_task.done():
-                    logger.info(
-                        f"Context threshold reached ({current_len} >= {self._threshold}). Starting summarization..."
+                    log.info(
+                        "Context threshold reached ({} >= {}). Starting summarization...",
+                        current_len,
+                        self._threshold,
                     )
                     await self._run_summarization()
                     if self._pending_merge is not None:
@@ -140,7 +152,8 @@ class RollingSummarizerContextManager(FrameProcessor):
 
             # Need at least some messages to summarize
             if summarize_end_idx <= 1:
-                logger.debug("Not enough messages to summarize, skipping")
+                log.debug("Not enough messages to summarize, skipping")
+                SUMMARIZATIONS.labels("skipped").inc()
                 self._pending_merge = None
                 self._snapshot_len = None
                 return
@@ -148,8 +161,10 @@ class RollingSummarizerContextManager(FrameProcessor):
             messages_to_summarize = messages[1:summarize_end_idx]
             messages_to_keep = messages[summarize_end_idx : self._snapshot_len]
 
-            logger.info(
-                f"Summarizing {len(messages_to_summarize)} messages, keeping {len(messages_to_keep)} recent"
+            log.info(
+                "Summarizing {} messages, keeping {} recent",
+                len(messages_to_summarize),
+                len(messages_to_keep),
             )
 
             # Build conversation text for summarization
@@ -159,7 +174,8 @@ class RollingSummarizerContextManager(FrameProcessor):
             summary_text = await self._call_summarizer_llm(conversation_text)
 
             if not summary_text:
-                logger.warning("Summarization returned empty result")
+                log.warning("Summarization returned empty result")
+                SUMMARIZATIONS.labels("empty").inc()
                 self._pending_merge = None
                 self._snapshot_len = None
                 return
@@ -175,18 +191,22 @@ class RollingSummarizerContextManager(FrameProcessor):
                 messages_to_keep
             )
 
-            logger.info(
-                f"Summarization complete. Will reduce from {self._snapshot_len} to {len(self._pending_merge)} messages"
+            SUMMARIZATIONS.labels("completed").inc()
+            log.info(
+                "Summarization complete. Will reduce from {} to {} messages",
+                self._snapshot_len,
+                len(self._pending_merge),
             )
 
         except asyncio.CancelledError:
-            logger.debug("Summarization task cancelled")
+            log.debug("Summarization task cancelled")
             self._pending_merge = None
             self._snapshot_len = None
             raise
 
         except Exception as e:
-            logger.error(f"Summarization failed: {e}")
+            log.error("Summarization failed: {}", e)
+            SUMMARIZATIONS.labels("failed").inc()
             self._pending_merge = None
             self._snapshot_len = None
 
@@ -214,12 +234,14 @@ class RollingSummarizerContextManager(FrameProcessor):
             # Apply using set_messages (in-place replacement)
             self._context.set_messages(final_messages)
 
-            logger.info(
-                f"Context merged: {len(final_messages)} messages (+{len(new_messages_since_snapshot)} during summarization)"
+            log.info(
+                "Context merged: {} messages (+{} during summarization)",
+                len(final_messages),
+                len(new_messages_since_snapshot),
             )
 
         except Exception as e:
-            logger.error(f"Failed to apply pending merge: {e}")
+            log.error("Failed to apply pending merge: {}", e)
 
         finally:
             # Clear state regardless of success/failure
@@ -278,17 +300,27 @@ class RollingSummarizerContextManager(FrameProcessor):
             # Use the LLM service's run_inference method
             result = await self._llm_service.run_inference(summary_context)
 
+            # run_inference returns only text; its tokens are estimated from it
+            if self._usage_ledger is not None:
+                self._usage_ledger.record_text_llm(
+                    SUMMARIZER,
+                    self._llm_service.name,
+                    self._llm_service.model_name,
+                    "".join(m["content"] for m in summary_messages),
+                    result or "",
+                )
+
             if result:
                 return result.strip()
             else:
-                logger.warning("run_inference returned None")
+                log.warning("run_inference returned None")
                 return None
 
         except NotImplementedError:
-            logger.warning(
-                f"run_inference not implemented for {type(self._llm_service).__name__}"
+            log.warning(
+                "run_inference not implemented for {}", type(self._llm_service).__name__
             )
             return None
         except Exception as e:
-            logger.error(f"Error calling summarizer LLM: {e}")
+            log.error("Error calling summarizer LLM: {}", e)
             return None
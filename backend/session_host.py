@@ -0,0 +1,106 @@
+import os
+import time
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from loguru import logger
+
+
+class SessionCapacityError(RuntimeError):
+    """Raised when a process already hosts as many calls as it may."""
+
+
+class SessionHost:
+    """
+    Admission control for a process that hosts several ``run_bot`` sessions.
+
+    Everything that is expensive and safe to share lives at module level and
+    is shared by every session in the process: the Mongo client (db.py), the
+    provider session pool (session_pool), the VAD and end-of-turn models
+    (audio_models), the tools schema and the inventory caches. Everything
+    that belongs to a call (HoldWakeProcessor, the LLM responding tracker,
+    ToolRuntime, context, pipeline) is created inside run_bot, so sessions
+    never see each other's state.
+
+    The host caps the number of concurrent sessions. A session that arrives
+    when the process is full waits up to ``admission_timeout_secs`` for a
+    slot, then is rejected with SessionCapacityError so the platform can
+    place the call elsewhere. Every log line written during a session
+    carries its ``session`` id.
+    """
+
+    def __init__(self, max_sessions: int = 0, admission_timeout_secs: float = 0.0):
+        """
+        Initialize the host.
+
+        Args:
+            max_sessions: Concurrent sessions allowed, or 0 for no cap
+            admission_timeout_secs: How long a session may wait for a slot
+        """
+        self.max_sessions = max_sessions
+        self.admission_timeout_secs = admission_timeout_secs
+        self._slots = asyncio.Semaphore(max_sessions) if max_sessions > 0 else None
+        self._ids = itertools.count(1)
+
+        self.active = 0
+        self.peak = 0
+        self.served = 0
+        self.rejected = 0
+        self.started_at = time.monotonic()
+
+    @asynccontextmanager
+    async def session(self, label: Optional[str] = None):
+        """
+        Hold a session slot for the duration of a call.
+
+        Args:
+            label: Name for the session in the logs (numbered if omitted)
+
+        Raises:
+            SessionCapacityError: If no slot frees up within the admission timeout
+        """
+        session_id = label or f"s{next(self._ids)}"
+        if self._slots is not None:
+            if self._slots.locked() and self.admission_timeout_secs <= 0:
+                self.rejected += 1
+                raise SessionCapacityError(
+                    f"{self.active}/{self.max_sessions} sessions active; rejecting {session_id}"
+                )
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.admission_timeout_secs or None)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise SessionCapacityError(
+                    f"{self.active}/{self.max_sessions} sessions active; rejecting {session_id}"
+                ) from None
+
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            with logger.contextualize(session=session_id):
+                logger.info(f"Session started ({self.active} active)")
+                yield session_id
+        finally:
+            self.active -= 1
+            self.served += 1
+            if self._slots is not None:
+                self._slots.release()
+            logger.info(f"Session {session_id} ended ({self.active} active)")
+
+    def stats(self) -> dict:
+        return {
+            "max_sessions": self.max_sessions,
+            "active": self.active,
+            "peak": self.peak,
+            "served": self.served,
+            "rejected": self.rejected,
+        }
+
+
+# One per process. SAMORA_MAX_SESSIONS=0 (default) leaves the process uncapped
+session_host = SessionHost(
+    max_sessions=int(os.getenv("SAMORA_MAX_SESSIONS", "0")),
+    admission_timeout_secs=float(os.getenv("SAMORA_SESSION_ADMISSION_SECS", "0")),
+)
@@ -0,0 +1,12 @@
+# Pre-connected provider sessions shared by the calls of a worker process.
+# The pooled services live in session_pool.cartesia and session_pool.deepgram
+# and are imported by providers.py only when a call selects them.
+
+from session_pool.pool import SessionFactory, SessionPool, SessionSpec, session_pool
+
+__all__ = [
+    "SessionFactory",
+    "SessionPool",
+    "SessionSpec",
+    "session_pool",
+]
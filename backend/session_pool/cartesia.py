@@ -0,0 +1,75 @@
+import json
+
+from loguru import logger
+from pipecat.services.cartesia.tts import CartesiaTTSService
+from websockets.asyncio.client import connect as websocket_connect
+from websockets.protocol import State
+
+from session_pool.pool import SessionFactory, SessionSpec, session_pool
+
+
+class CartesiaSessions(SessionFactory):
+    """
+    Cartesia TTS websockets.
+
+    Voice, model and output format are sent with every message, so a socket
+    only depends on the URL, API version and key and is reused across calls.
+    Audio for another call's contexts is ignored by the service. Cartesia
+    closes sockets after 5 minutes without traffic and has no keepalive, so
+    the pool's idle TTL must stay below that.
+    """
+
+    reusable = True
+
+    async def connect(self, spec: SessionSpec):
+        options = json.loads(spec.options)
+        return await websocket_connect(
+            f"{options['url']}?api_key={spec.api_key}&cartesia_version={options['version']}"
+        )
+
+    async def is_healthy(self, websocket) -> bool:
+        return websocket.state is State.OPEN
+
+    async def close(self, websocket):
+        await websocket.close()
+
+
+session_pool.register("cartesia", CartesiaSessions())
+
+
+class PooledCartesiaTTSService(CartesiaTTSService):
+    """CartesiaTTSService that leases its websocket from the session pool."""
+
+    def _session_spec(self) -> SessionSpec:
+        options = json.dumps({"url": self._url, "version": self._cartesia_version})
+        return SessionSpec("cartesia", self._api_key, options)
+
+    async def _connect_websocket(self):
+        if self._websocket and self._websocket.state is State.OPEN:
+            return
+        websocket = await session_pool.lease(self._session_spec())
+        if websocket is None:
+            await super()._connect_websocket()
+            return
+        logger.debug("Using a pooled Cartesia connection")
+        self._websocket = websocket
+        await self._call_event_handler("on_connected")
+
+    async def _disconnect_websocket(self):
+        websocket = self._websocket
+        reusable = True
+        try:
+            await self.stop_all_metrics()
+            # Stop generating audio nobody will play; the next call ignores
+            # whatever is already in flight for this context
+            if websocket and self._context_id:
+                await websocket.send(json.dumps({"context_id": self._context_id, "cancel": True}))
+        except Exception as e:
+            logger.debug(f"{self}: error cancelling the Cartesia context: {e}")
+            reusable = False
+        finally:
+            self._context_id = None
+            self._websocket = None
+            if websocket:
+                await session_pool.release(self._session_spec(), websocket, reusable=reusable)
+            await self._call_event_handler("on_disconnected")
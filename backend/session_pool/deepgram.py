@@ -0,0 +1,77 @@
+import json
+
+from deepgram import DeepgramClient, DeepgramClientOptions, LiveTranscriptionEvents
+from loguru import logger
+from pipecat.services.deepgram.stt import DeepgramSTTService
+
+from session_pool.pool import SessionFactory, SessionSpec, session_pool
+
+
+class DeepgramSessions(SessionFactory):
+    """
+    Deepgram live transcription streams.
+
+    Model, language and audio format are fixed when the stream opens, so they
+    are part of the spec. A stream carries one call's audio and transcripts
+    and is closed after the call ("recycled"); the pool replaces it with a
+    fresh one in the background. The SDK sends keepalives for idle streams.
+    """
+
+    reusable = False
+
+    async def connect(self, spec: SessionSpec):
+        options = json.loads(spec.options)
+        client = DeepgramClient(
+            spec.api_key,
+            config=DeepgramClientOptions(url=options["url"], options={"keepalive": "true"}),
+        )
+        connection = client.listen.asyncwebsocket.v("1")
+        if not await connection.start(options=options["settings"], addons=options["addons"]):
+            raise ConnectionError("Unable to connect to Deepgram")
+        return connection
+
+    async def is_healthy(self, connection) -> bool:
+        return await connection.is_connected()
+
+    async def close(self, connection):
+        if await connection.is_connected():
+            await connection.finish()
+
+
+session_pool.register("deepgram", DeepgramSessions())
+
+
+class PooledDeepgramSTTService(DeepgramSTTService):
+    """DeepgramSTTService that leases its stream from the session pool."""
+
+    def _session_spec(self) -> SessionSpec:
+        options = json.dumps(
+            {"url": self._client._config.url, "settings": self._settings, "addons": self._addons},
+            sort_keys=True,
+            default=str,
+        )
+        return SessionSpec("deepgram", self._client._config.api_key, options)
+
+    async def _connect(self):
+        connection = await session_pool.lease(self._session_spec())
+        if connection is None:
+            await super()._connect()
+            return
+        logger.debug("Using a pooled Deepgram connection")
+        self._connection = connection
+        connection.on(LiveTranscriptionEvents(LiveTranscriptionEvents.Transcript), self._on_message)
+        connection.on(LiveTranscriptionEvents(LiveTranscriptionEvents.Error), self._on_error)
+        if self.vad_enabled:
+            connection.on(
+                LiveTranscriptionEvents(LiveTranscriptionEvents.SpeechStarted),
+                self._on_speech_started,
+            )
+            connection.on(
+                LiveTranscriptionEvents(LiveTranscriptionEvents.UtteranceEnd),
+                self._on_utterance_end,
+            )
+
+    async def _disconnect(self):
+        # The pool closes the stream (see Deepgram's cancellation note in
+        # DeepgramSTTService._disconnect) and connects the next call's
+        await session_pool.release(self._session_spec(), self._connection)
@@ -0,0 +1,293 @@
+import os
+import time
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class SessionSpec:
+    """
+    What a provider session is for: sessions are only shared between equal specs.
+
+    ``options`` holds every connection setting that is fixed at connect time
+    (URL, API version, audio format, model...), serialized so it is hashable.
+    """
+
+    provider: str
+    api_key: str
+    options: str = ""
+
+    def __repr__(self) -> str:
+        # Never log API keys
+        return f"SessionSpec({self.provider}, key=...{self.api_key[-4:]})"
+
+
+class SessionFactory(ABC):
+    """How to open, check and close one provider's sessions."""
+
+    # Whether a session can serve another call after being released. Streams
+    # that carry per-call state are closed and replaced instead.
+    reusable: bool = False
+
+    @abstractmethod
+    async def connect(self, spec: SessionSpec) -> Any:
+        pass
+
+    @abstractmethod
+    async def is_healthy(self, session: Any) -> bool:
+        pass
+
+    @abstractmethod
+    async def close(self, session: Any):
+        pass
+
+    async def keepalive(self, session: Any):
+        """Called on idle sessions at every health check, for providers that need it."""
+
+
+@dataclass
+class _IdleSession:
+    session: Any
+    since: float
+
+
+class SessionPool:
+    """
+    Per-process pool of pre-connected provider sessions (STT/TTS websockets).
+
+    Services lease a session when the pipeline starts instead of doing the
+    TLS and protocol handshake then, and release it at teardown. For every
+    spec that has been leased recently the pool keeps ``size`` sessions
+    connected in the background:
+    - A lease takes a healthy idle session, or returns None on a miss (the
+      service then connects itself) and the pool connects one for next time
+    - A release returns reusable, healthy sessions to the pool; others are
+      closed and replaced ("recycled")
+    - Idle sessions older than ``idle_ttl_secs`` are closed, and specs not
+      leased for that long stop being refilled
+    - Every ``health_check_secs`` idle sessions are checked and kept alive
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_idle: int = 4,
+        idle_ttl_secs: float = 240.0,
+        health_check_secs: float = 15.0,
+        connect_timeout_secs: float = 10.0,
+    ):
+        """
+        Initialize an empty pool.
+
+        Args:
+            size: Idle sessions to keep ready per spec in use
+            max_idle: Idle sessions kept per spec at most (released ones included)
+            idle_ttl_secs: Lifetime of an idle session, and of a spec's refill
+                after its last lease. Keep it under the provider's idle timeout.
+            health_check_secs: Interval of health checks and keepalives
+            connect_timeout_secs: Timeout of background connects
+        """
+        self.size = size
+        self.max_idle = max_idle
+        self.idle_ttl_secs = idle_ttl_secs
+        self.health_check_secs = health_check_secs
+        self.connect_timeout_secs = connect_timeout_secs
+
+        self._factories: Dict[str, SessionFactory] = {}
+        self._idle: Dict[SessionSpec, Deque[_IdleSession]] = {}
+        self._connecting: Dict[SessionSpec, int] = {}
+        self._last_leased: Dict[SessionSpec, float] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.returned = 0
+        self.recycled = 0
+        self.expired = 0
+        self.unhealthy = 0
+        self.connect_errors = 0
+        self.connect_ms: Deque[float] = deque(maxlen=1000)
+
+    def register(self, provider: str, factory: SessionFactory):
+        self._factories[provider] = factory
+
+    # ============ LEASE / RELEASE ============
+
+    async def lease(self, spec: SessionSpec) -> Optional[Any]:
+        """Take a connected session for ``spec``, or None if none is ready."""
+        factory = self._factories[spec.provider]
+        self._ensure_maintenance()
+        now = time.monotonic()
+        self._last_leased[spec] = now
+
+        idle = self._idle.get(spec)
+        while idle:
+            entry = idle.popleft()
+            if now - entry.since > self.idle_ttl_secs:
+                self.expired += 1
+                self._close_later(spec, entry.session)
+            elif not await self._healthy(factory, entry.session):
+                self.unhealthy += 1
+                self._close_later(spec, entry.session)
+            else:
+                self.hits += 1
+                self._refill(spec)
+                return entry.session
+
+        self.misses += 1
+        self._refill(spec)
+        return None
+
+    async def release(self, spec: SessionSpec, session: Any, reusable: bool = True):
+        """
+        Give a session back at call teardown.
+
+        Args:
+            spec: Spec the session was connected with
+            session: The session
+            reusable: False if the caller knows the session must not be reused
+        """
+        factory = self._factories[spec.provider]
+        idle = self._idle.setdefault(spec, deque())
+        if (
+            factory.reusable
+            and reusable
+            and len(idle) < self.max_idle
+            and await self._healthy(factory, session)
+        ):
+            idle.append(_IdleSession(session, time.monotonic()))
+            self.returned += 1
+        else:
+            self.recycled += 1
+            await self._close(factory, session)
+        self._refill(spec)
+
+    async def prewarm(self, spec: SessionSpec, count: Optional[int] = None):
+        """Connect sessions for ``spec`` now (e.g. at worker start) and wait for them."""
+        self._ensure_maintenance()
+        self._last_leased.setdefault(spec, time.monotonic())
+        idle = len(self._idle.get(spec, ()))
+        missing = max(0, (count or self.size) - idle - self._connecting.get(spec, 0))
+        await asyncio.gather(*(self._connect_one(spec) for _ in range(missing)))
+
+    # ============ BACKGROUND WORK ============
+
+    def _refill(self, spec: SessionSpec):
+        idle = len(self._idle.get(spec, ()))
+        for _ in range(self.size - idle - self._connecting.get(spec, 0)):
+            self._spawn(self._connect_one(spec))
+
+    async def _connect_one(self, spec: SessionSpec):
+        factory = self._factories[spec.provider]
+        self._connecting[spec] = self._connecting.get(spec, 0) + 1
+        start = time.perf_counter()
+        try:
+            session = await asyncio.wait_for(factory.connect(spec), self.connect_timeout_secs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.connect_errors += 1
+            logger.warning(f"Session pool: connecting {spec} failed: {e}")
+            return
+        finally:
+            self._connecting[spec] -= 1
+
+        self.connect_ms.append((time.perf_counter() - start) * 1000)
+        idle = self._idle.setdefault(spec, deque())
+        if len(idle) < self.max_idle:
+            idle.append(_IdleSession(session, time.monotonic()))
+        else:
+            await self._close(factory, session)
+
+    def _ensure_maintenance(self):
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(self.health_check_secs)
+            now = time.monotonic()
+            for spec, idle in list(self._idle.items()):
+                factory = self._factories[spec.provider]
+                kept = deque()
+                while idle:
+                    entry = idle.popleft()
+                    if now - entry.since > self.idle_ttl_secs:
+                        self.expired += 1
+                        self._close_later(spec, entry.session)
+                    elif not await self._healthy(factory, entry.session):
+                        self.unhealthy += 1
+                        self._close_later(spec, entry.session)
+                    else:
+                        try:
+                            await factory.keepalive(entry.session)
+                            kept.append(entry)
+                        except Exception:
+                            self.unhealthy += 1
+                            self._close_later(spec, entry.session)
+                idle.extend(kept)
+
+                if now - self._last_leased.get(spec, 0) <= self.idle_ttl_secs:
+                    self._refill(spec)
+
+    async def _healthy(self, factory: SessionFactory, session: Any) -> bool:
+        try:
+            return await factory.is_healthy(session)
+        except Exception:
+            return False
+
+    async def _close(self, factory: SessionFactory, session: Any):
+        try:
+            await factory.close(session)
+        except Exception as e:
+            logger.debug(f"Session pool: error closing a session: {e}")
+
+    def _close_later(self, spec: SessionSpec, session: Any):
+        self._spawn(self._close(self._factories[spec.provider], session))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self):
+        """Close every idle session and stop background work."""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for spec, idle in self._idle.items():
+            factory = self._factories[spec.provider]
+            while idle:
+                await self._close(factory, idle.popleft().session)
+        self._last_leased.clear()
+
+    def stats(self) -> dict:
+        connect_ms = sorted(self.connect_ms)
+        return {
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "connecting": sum(self._connecting.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "returned": self.returned,
+            "recycled": self.recycled,
+            "expired": self.expired,
+            "unhealthy": self.unhealthy,
+            "connect_errors": self.connect_errors,
+            "connect_p50_ms": connect_ms[len(connect_ms) // 2] if connect_ms else None,
+        }
+
+
+# Shared by every call in the process
+session_pool = SessionPool(
+    size=int(os.getenv("SAMORA_SESSION_POOL_SIZE", "1")),
+    idle_ttl_secs=float(os.getenv("SAMORA_SESSION_IDLE_SECS", "240")),
+)
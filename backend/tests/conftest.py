@@ -0,0 +1,152 @@
+"""
+Shared fixtures for the backend tests.
+
+The tools bind ``db`` from db.py when they are imported, so the database is
+chosen here, before any test module imports them: a real mongod when
+SAMORA_TEST_MONGODB_URI is set or one answers on localhost:27017, the
+mongomock-motor stand-in otherwise. Either way the tests only touch the
+hotel_db_test database, never the one in MONGODB_URI.
+
+Tests that need a real server (round trips, cursor kills) use the ``mongod``
+fixture or marker and are skipped on the stand-in.
+"""
+
+import os
+from typing import List, Optional
+
+import pytest
+from pymongo import MongoClient, monitoring
+from pymongo.errors import OperationFailure, PyMongoError
+
+from benchmarks._support import CommandCounter, FakeParams
+
+TEST_DATABASE = "hotel_db_test"
+LOCAL_MONGOD = "mongodb://localhost:27017"
+
+
+class CommandRecorder(CommandCounter):
+    """Counts commands and remembers their names."""
+
+    def __init__(self):
+        super().__init__()
+        self.names: List[str] = []
+
+    def started(self, event):
+        super().started(event)
+        self.names.append(event.command_name)
+
+    def reset(self):
+        self.count = 0
+        self.names = []
+
+
+def _find_mongod() -> Optional[str]:
+    uri = os.getenv("SAMORA_TEST_MONGODB_URI")
+    if uri:
+        return uri
+    try:
+        with MongoClient(LOCAL_MONGOD, serverSelectionTimeoutMS=300) as probe:
+            probe.admin.command("ping")
+        return LOCAL_MONGOD
+    except PyMongoError:
+        return None
+
+
+MONGOD_URI = _find_mongod()
+
+# Must be registered before db.py creates the client
+recorder = CommandRecorder()
+monitoring.register(recorder)
+
+os.environ["MONGODB_URI"] = MONGOD_URI or LOCAL_MONGOD
+os.environ["MONGODB_TLS"] = "false"
+os.environ["MONGODB_DATABASE"] = TEST_DATABASE
+
+import db as db_module  # noqa: E402
+
+if not MONGOD_URI:
+    from mongomock_motor import AsyncMongoMockClient
+
+    class StandaloneMockClient(AsyncMongoMockClient):
+        """mongomock answering sessions the way a standalone mongod does."""
+
+        async def start_session(self, *args, **kwargs):
+            raise OperationFailure(
+                "Transaction numbers are only allowed on a replica set member or mongos", code=20
+            )
+
+    db_module.client = StandaloneMockClient()
+    db_module.db = db_module.client[TEST_DATABASE]
+
+
+def pytest_report_header(config):
+    return f"mongo: {MONGOD_URI or 'mongomock-motor stand-in'} ({TEST_DATABASE})"
+
+
+def pytest_collection_modifyitems(config, items):
+    replica_set = os.getenv("SAMORA_TEST_REPLICA_SET") == "1"
+    for item in items:
+        if "mongod" in item.keywords and not MONGOD_URI:
+            item.add_marker(pytest.mark.skip(reason="needs a mongod (SAMORA_TEST_MONGODB_URI)"))
+        if "replica_set" in item.keywords and not replica_set:
+            item.add_marker(pytest.mark.skip(reason="needs a replica set (SAMORA_TEST_REPLICA_SET=1)"))
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The test database, on a mongod or the stand-in."""
+    return db_module.db
+
+
+@pytest.fixture(scope="session")
+def mongod(database):
+    """The test database on a real mongod; skips the test on the stand-in."""
+    if not MONGOD_URI:
+        pytest.skip("needs a mongod (SAMORA_TEST_MONGODB_URI)")
+    return database
+
+
+@pytest.fixture
+def commands() -> CommandRecorder:
+    """Every command sent to the server since the test started."""
+    recorder.reset()
+    return recorder
+
+
+async def warm_caches(database):
+    """Reload the occupancy index and rate calendar, as an agent does at startup."""
+    from inventory import occupancy_index, rate_calendar
+
+    occupancy_index.invalidate()
+    rate_calendar.invalidate()
+    await occupancy_index.ensure_loaded(database)
+    await rate_calendar.ensure_loaded(database)
+
+
+@pytest.fixture
+async def hotel(database):
+    """A freshly seeded hotel (20 rooms per type, 200 bookings); returns (rooms, bookings)."""
+    from benchmarks._support import seed_hotel
+
+    await database.rate_rules.drop()
+    rooms, bookings = await seed_hotel(database, rooms_per_type=20, num_bookings=200)
+    await warm_caches(database)
+    return rooms, bookings
+
+
+@pytest.fixture
+def make_params():
+    """Factory for the FunctionCallParams stand-in that captures result_callback."""
+    return lambda function_name="", **arguments: FakeParams(function_name=function_name, arguments=arguments)
+
+
+@pytest.fixture
+def call_tool(make_params):
+    """Invoke a direct function the way Pipecat does and return its last result."""
+
+    async def call(func, **kwargs) -> Optional[dict]:
+        params = make_params(func.__name__, **kwargs)
+        await func(params, **kwargs)
+        return params.result
+
+    return call
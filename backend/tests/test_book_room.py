@@ -0,0 +1,88 @@
+"""Single bookings are numbered from the shared counter and re-checked like group bookings."""
+
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+
+from db_functions import book_room, book_rooms
+from tests.test_book_rooms import overlapping
+
+book_room_module = importlib.import_module("db_functions.book_room")
+
+GUEST = {
+    "guest_name": "Dana Whitfield",
+    "guest_phone": "520-555-0188",
+    "guest_email": "dana@example.com",
+}
+
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+async def test_concurrent_bookings_get_distinct_numbers(hotel, database, call_tool):
+    _, seeded = hotel
+    last_seeded = max(b["confirmation_number"] for b in seeded)
+
+    results = await asyncio.gather(
+        *(
+            call_tool(
+                book_room,
+                **GUEST,
+                room_type="standard",
+                check_in_date=day(360 + 3 * i),
+                check_out_date=day(362 + 3 * i),
+            )
+            for i in range(10)
+        )
+    )
+
+    numbers = [r["booking"]["confirmation_number"] for r in results]
+    assert len(set(numbers)) == 10
+    assert min(numbers) > last_seeded
+    assert await database.bookings.count_documents({"confirmation_number": {"$in": numbers}}) == 10
+
+
+async def test_room_taken_after_selection_books_nothing(hotel, database, call_tool, monkeypatch):
+    rooms, _ = hotel
+    check_in, check_out = day(370), day(372)
+    quote_stay = book_room_module.quote_stay
+
+    async def quote_after_a_group_books(database_, room_type, *args):
+        # A group booking takes every deluxe room once this one has chosen
+        await database.bookings.insert_many(
+            [
+                {
+                    **GUEST,
+                    "confirmation_number": f"GV-2025-{910000 + i:06d}",
+                    "room_number": room["room_number"],
+                    "room_type": "deluxe",
+                    "check_in_date": check_in,
+                    "check_out_date": check_out,
+                }
+                for i, room in enumerate(r for r in rooms if r["room_type"] == "deluxe")
+            ]
+        )
+        return await quote_stay(database_, room_type, *args)
+
+    monkeypatch.setattr(book_room_module, "quote_stay", quote_after_a_group_books)
+
+    result = await call_tool(
+        book_room, **GUEST, room_type="deluxe", check_in_date=check_in, check_out_date=check_out
+    )
+
+    assert result["success"] is False
+    assert "no longer available" in result["error"] and "Nothing was booked" in result["error"]
+    assert not await overlapping(database, check_in, check_out)
+
+
+async def test_single_and_group_bookings_never_share_a_room(hotel, database, call_tool):
+    check_in, check_out = day(380), day(383)
+    stay = {**GUEST, "check_in_date": check_in, "check_out_date": check_out}
+
+    await asyncio.gather(
+        *(call_tool(book_rooms, **stay, room_types=["suite"] * 4) for _ in range(4)),
+        *(call_tool(book_room, **stay, room_type="suite") for _ in range(8)),
+    )
+
+    assert not await overlapping(database, check_in, check_out)
@@ -0,0 +1,103 @@
+"""Group bookings stay all-or-nothing when other bookings land at the same time."""
+
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+
+from db_functions import book_rooms
+
+book_rooms_module = importlib.import_module("db_functions.book_rooms")
+
+GUEST = {
+    "guest_name": "Dana Whitfield",
+    "guest_phone": "520-555-0188",
+    "guest_email": "dana@example.com",
+}
+
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+async def overlapping(database, check_in: str, check_out: str) -> list:
+    """Pairs of bookings sharing a room on some night of the stay."""
+    stays = await database.bookings.find(
+        {"check_in_date": {"$lt": check_out}, "check_out_date": {"$gt": check_in}}
+    ).to_list(length=None)
+    return [
+        (a["confirmation_number"], b["confirmation_number"])
+        for i, a in enumerate(stays)
+        for b in stays[i + 1 :]
+        if a["room_number"] == b["room_number"]
+        and a["check_in_date"] < b["check_out_date"]
+        and b["check_in_date"] < a["check_out_date"]
+    ]
+
+
+async def test_room_taken_after_selection_books_nothing(hotel, database, call_tool, monkeypatch):
+    rooms, _ = hotel
+    check_in, check_out = day(340), day(342)
+    quote_stay = book_rooms_module.quote_stay
+
+    async def quote_after_another_agent_books(database_, room_type, *args):
+        # Another agent takes every suite once the rooms have been chosen
+        if room_type == "suite":
+            await database.bookings.insert_many(
+                [
+                    {
+                        **GUEST,
+                        "confirmation_number": f"GV-2025-{900000 + i:06d}",
+                        "room_number": room["room_number"],
+                        "room_type": "suite",
+                        "check_in_date": check_in,
+                        "check_out_date": check_out,
+                    }
+                    for i, room in enumerate(r for r in rooms if r["room_type"] == "suite")
+                ]
+            )
+        return await quote_stay(database_, room_type, *args)
+
+    monkeypatch.setattr(book_rooms_module, "quote_stay", quote_after_another_agent_books)
+    before = await database.bookings.count_documents({"guest_email": GUEST["guest_email"]})
+
+    result = await call_tool(
+        book_rooms,
+        **GUEST,
+        room_types=["standard", "suite"],
+        check_in_date=check_in,
+        check_out_date=check_out,
+    )
+
+    assert result["success"] is False
+    assert "no longer available" in result["error"] and "No rooms were booked" in result["error"]
+    # Only the other agent's suites are there
+    booked = await database.bookings.find({"check_in_date": check_in}).to_list(length=None)
+    assert {b["room_type"] for b in booked} == {"suite"}
+    assert await database.bookings.count_documents({"guest_email": GUEST["guest_email"]}) == before + len(booked)
+    assert not await overlapping(database, check_in, check_out)
+
+
+async def test_concurrent_group_bookings_never_share_a_room(hotel, database, call_tool):
+    check_in, check_out = day(350), day(353)
+
+    results = await asyncio.gather(
+        *(
+            call_tool(
+                book_rooms,
+                **GUEST,
+                room_types=["suite", "suite", "standard"],
+                check_in_date=check_in,
+                check_out_date=check_out,
+            )
+            for _ in range(8)
+        )
+    )
+
+    booked = [b for r in results if r["success"] for b in r["bookings"]]
+    assert booked
+    for r in results:
+        if not r["success"]:
+            assert "No rooms were booked" in r["error"]
+    numbers = [b["confirmation_number"] for b in booked]
+    assert len(numbers) == len(set(numbers))
+    assert not await overlapping(database, check_in, check_out)
@@ -0,0 +1,65 @@
+import orjson
+
+from utils import ChatTranscriptWriter
+
+
+def read_records(path):
+    with open(path, "rb") as f:
+        return [orjson.loads(line) for line in f]
+
+
+async def test_calls_starting_in_the_same_second_get_their_own_files(tmp_path):
+    first = ChatTranscriptWriter(output_dir=str(tmp_path), call_id="call-a")
+    second = ChatTranscriptWriter(output_dir=str(tmp_path), call_id="call-b")
+    for i in range(50):
+        first.append({"role": "user", "content": f"a{i}"})
+        second.append({"role": "user", "content": f"b{i}"})
+
+    [first_path] = await first.aclose()
+    [second_path] = await second.aclose()
+
+    assert first_path != second_path
+    assert "call-a" in first_path and "call-b" in second_path
+    for path, call_id, prefix in ((first_path, "call-a", "a"), (second_path, "call-b", "b")):
+        records = read_records(path)
+        assert records[0] == {**records[0], "type": "header", "call_id": call_id}
+        messages = [r["message"]["content"] for r in records if r["type"] == "message"]
+        assert messages == [f"{prefix}{i}" for i in range(50)]
+        assert records[-1]["type"] == "footer"
+
+
+async def test_writer_without_call_id_gets_a_unique_name(tmp_path):
+    writers = [ChatTranscriptWriter(output_dir=str(tmp_path)) for _ in range(3)]
+    paths = [(await writer.aclose())[0] for writer in writers]
+    assert len(set(paths)) == 3
+
+
+async def test_sync_does_not_rewrite_the_context_when_its_anchor_is_replaced(tmp_path):
+    writer = ChatTranscriptWriter(output_dir=str(tmp_path), call_id="call-c")
+    messages = [
+        {"role": "system", "content": "prompt"},
+        {"role": "user", "content": "Is the suite free on Friday?"},
+        {"role": "tool", "tool_call_id": "call_1", "content": '{"available": true}'},
+    ]
+    writer.sync(messages)
+
+    # Pipecat rebuilt the last message's dict; then the turn went on
+    messages[-1] = dict(messages[-1])
+    messages.append({"role": "assistant", "content": "Yes, it is."})
+    writer.sync(messages)
+
+    # The summarizer replaced everything but the last message with a summary
+    messages[:] = [{"role": "system", "content": "summary"}, messages[-1]]
+    messages[-1] = dict(messages[-1])
+    messages.append({"role": "user", "content": "Book it."})
+    writer.sync(messages)
+
+    [path] = await writer.aclose()
+    written = [r["message"]["content"] for r in read_records(path) if r["type"] == "message"]
+    assert written == [
+        "prompt",
+        "Is the suite free on Friday?",
+        '{"available": true}',
+        "Yes, it is.",
+        "Book it.",
+    ]
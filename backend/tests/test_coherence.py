@@ -0,0 +1,282 @@
+"""
+CoherenceBus over a scripted change stream, and the caches it feeds.
+
+The fake stream plays each connection from a script of change events and
+errors, as the server would; the last test runs the two-process
+benchmark against a real replica set.
+"""
+
+import sys
+import asyncio
+import subprocess
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from inventory import CoherenceBus, CollectionReset, DocumentChanged, OccupancyIndex
+from inventory.coherence import WATCHED_COLLECTIONS, bump_inventory_version
+
+TODAY = date.today()
+
+
+def night(offset: int) -> str:
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+def change(token: str, operation: str, booking_id, document=None, collection="bookings") -> dict:
+    event = {
+        "_id": {"_data": token},
+        "operationType": operation,
+        "ns": {"db": "hotel_db", "coll": collection},
+        "documentKey": {"_id": booking_id},
+        "wallTime": datetime.now(timezone.utc),
+    }
+    if document is not None:
+        event["fullDocument"] = document
+    return event
+
+
+class FakeChangeStream:
+    """One change stream connection: yields its script, then idles."""
+
+    def __init__(self, script):
+        # An exception instead of a script: the server refuses to open the stream
+        self._refused = script if isinstance(script, Exception) else None
+        self._script = deque(script if self._refused is None else [])
+        self.alive = True
+        self.resume_token = None
+
+    async def __aenter__(self):
+        if self._refused is not None:
+            raise self._refused
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.alive = False
+
+    async def try_next(self):
+        if not self._script:
+            await asyncio.sleep(0.005)
+            return None
+        item = self._script.popleft()
+        if isinstance(item, Exception):
+            raise item
+        self.resume_token = item["_id"]
+        return item
+
+
+class FakeDatabase:
+    """
+    Hands out one scripted connection per watch() and records where each resumed.
+
+    Each connection is a list of change events and errors raised mid-stream,
+    or an error raised when the stream is opened.
+    """
+
+    def __init__(self, *connections):
+        self._connections = deque(connections)
+        self.resumed_after = []
+
+    def watch(self, pipeline, full_document=None, resume_after=None):
+        self.resumed_after.append(resume_after)
+        return FakeChangeStream(self._connections.popleft() if self._connections else [])
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def on_invalidation(self, event):
+        self.events.append(event)
+
+
+async def run_until(bus: CoherenceBus, database, done, timeout: float = 2.0):
+    bus.start(database)
+    try:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not done():
+            assert asyncio.get_running_loop().time() < deadline, "timed out waiting for the bus"
+            await asyncio.sleep(0.005)
+    finally:
+        await bus.stop()
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def bus(recorder):
+    bus = CoherenceBus(mode="change_stream", reconnect_delay_secs=0.001)
+    bus.register(recorder)
+    return bus
+
+
+async def test_reconnect_resumes_after_the_last_event(bus, recorder):
+    database = FakeDatabase(
+        [
+            change("t1", "insert", 1, {"_id": 1}),
+            change("t2", "update", 1, {"_id": 1}),
+            AutoReconnect("dropped"),
+        ],
+        [change("t3", "delete", 1)],
+    )
+
+    await run_until(bus, database, lambda: len(recorder.events) == 3)
+
+    assert database.resumed_after[:2] == [None, {"_data": "t2"}]
+    assert [(e.operation, e.document_id) for e in recorder.events] == [
+        ("insert", 1),
+        ("update", 1),
+        ("delete", 1),
+    ]
+    assert bus.reconnects >= 1 and bus.resets == 0
+    assert bus.resume_token == {"_data": "t3"}
+
+
+async def test_lost_resume_token_resets_every_cache(bus, recorder):
+    database = FakeDatabase(
+        [change("t1", "insert", 1, {"_id": 1}), AutoReconnect("dropped")],
+        # ChangeStreamHistoryLost: the oplog rolled past our token
+        OperationFailure("history lost", 286),
+        [change("t9", "insert", 2, {"_id": 2})],
+    )
+
+    await run_until(
+        bus, database, lambda: any(getattr(e, "document_id", None) == 2 for e in recorder.events)
+    )
+
+    assert database.resumed_after[:3] == [None, {"_data": "t1"}, None]
+    resets = [e for e in recorder.events if isinstance(e, CollectionReset)]
+    assert sorted(e.collection for e in resets) == sorted(WATCHED_COLLECTIONS)
+    assert bus.resets == len(WATCHED_COLLECTIONS)
+    assert bus.resume_token == {"_data": "t9"}
+
+
+async def test_unsupported_change_streams_stop_the_bus_in_change_stream_mode(bus, recorder):
+    database = FakeDatabase(OperationFailure("not a replica set", 40573))
+
+    bus.start(database)
+    await asyncio.wait_for(bus._task, 1)
+
+    assert recorder.events == [] and bus.active_mode is None
+
+
+# ============ POLLING ============
+
+
+async def test_polling_reads_new_bookings_and_versions_not_whole_collections(database, recorder):
+    bus = CoherenceBus(mode="poll", poll_interval_secs=0.01)
+    bus.register(recorder)
+    booking = {
+        "_id": ObjectId(),
+        "room_number": "101",
+        "check_in_date": night(2),
+        "check_out_date": night(4),
+        "created_at": datetime.utcnow(),
+    }
+
+    async def write():
+        while bus.active_mode != "poll":
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.05)
+        await database.bookings.insert_one({**booking, "updated_at": datetime.utcnow()})
+        await bump_inventory_version(database, "rooms")
+
+    writer = asyncio.create_task(write())
+    await run_until(
+        bus,
+        database,
+        lambda: any(isinstance(e, CollectionReset) for e in recorder.events)
+        and any(isinstance(e, DocumentChanged) for e in recorder.events),
+    )
+    await writer
+
+    assert [e.document_id for e in recorder.events if isinstance(e, DocumentChanged)] == [booking["_id"]]
+    assert [e.collection for e in recorder.events if isinstance(e, CollectionReset)] == ["rooms"]
+    assert "updated_at_1" in await database.bookings.index_information()
+
+
+# ============ OCCUPANCY INDEX ============
+
+ROOMS = [
+    {"room_number": "101", "room_type": "standard", "price_per_night": 150},
+    {"room_number": "201", "room_type": "deluxe", "price_per_night": 250},
+]
+
+
+def free(index: OccupancyIndex, first: int, last: int) -> dict:
+    return index.free_counts(TODAY + timedelta(days=first), TODAY + timedelta(days=last))
+
+
+@pytest.fixture
+def index():
+    index = OccupancyIndex(horizon_days=30)
+    booking = {"_id": "a", "room_number": "101", "check_in_date": night(2), "check_out_date": night(4)}
+    index.load(ROOMS, [booking], TODAY)
+    return index
+
+
+def test_insert_event_books_the_nights(index):
+    booking = {"_id": "b", "room_number": "201", "check_in_date": night(5), "check_out_date": night(7)}
+    index.on_invalidation(
+        DocumentChanged(collection="bookings", operation="insert", document_id="b", document=booking)
+    )
+
+    assert free(index, 5, 7) == {"deluxe": 0, "standard": 1}
+    assert free(index, 7, 8) == {"deluxe": 1, "standard": 1}
+
+
+def test_update_event_moves_the_nights(index):
+    moved = {"_id": "a", "room_number": "101", "check_in_date": night(10), "check_out_date": night(12)}
+    index.on_invalidation(
+        DocumentChanged(collection="bookings", operation="update", document_id="a", document=moved)
+    )
+
+    assert free(index, 2, 4)["standard"] == 1
+    assert free(index, 10, 12)["standard"] == 0
+
+
+def test_delete_event_frees_the_nights_by_id(index):
+    # Deletes carry only the _id
+    index.on_invalidation(DocumentChanged(collection="bookings", operation="delete", document_id="a"))
+
+    assert free(index, 2, 4)["standard"] == 1
+
+
+def test_delete_of_unknown_booking_changes_nothing(index):
+    index.on_invalidation(DocumentChanged(collection="bookings", operation="delete", document_id="zz"))
+
+    assert free(index, 2, 4)["standard"] == 0
+
+
+def test_reset_and_room_changes_force_a_rebuild(index):
+    events = (CollectionReset(collection="bookings"), DocumentChanged(collection="rooms", document_id="101"))
+    for event in events:
+        index.load(ROOMS, [], TODAY)
+        assert not index.is_stale()
+        index.on_invalidation(event)
+        assert index.is_stale()
+
+
+# ============ TWO AGENT PROCESSES ============
+
+
+@pytest.mark.mongod
+@pytest.mark.replica_set
+def test_other_agent_sees_every_write_over_change_streams():
+    # The benchmark's processes inherit the test database from conftest
+    command = [sys.executable, "-m", "benchmarks.coherence_bench", "--mode", "change_stream"]
+    run = subprocess.run(
+        command + ["--writes", "12", "--interval", "0.05"],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert run.returncode == 0, run.stdout + run.stderr
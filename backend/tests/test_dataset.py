@@ -0,0 +1,46 @@
+from datetime import date, datetime
+
+from benchmarks.dataset import DatasetSpec, build_rooms, iter_bookings, shift_booking
+
+
+def generate(num_bookings=2000, **kwargs):
+    spec = DatasetSpec(rooms_per_type=10, num_bookings=num_bookings, seed=7)
+    return list(iter_bookings(build_rooms(spec.rooms_per_type), spec, **kwargs))
+
+
+def test_no_booking_is_stamped_in_the_future():
+    now = datetime.utcnow().replace(microsecond=0)
+    bookings = generate(now=now)
+
+    assert all(b["created_at"] <= now for b in bookings)
+    assert all(b["updated_at"] >= b["created_at"] for b in bookings)
+    # Never booked after check-in
+    assert all(b["created_at"].date() <= date.fromisoformat(b["check_in_date"]) for b in bookings)
+
+
+def test_same_seed_gives_the_same_bookings():
+    now = datetime(2026, 1, 1)
+    assert generate(500, now=now) == generate(500, now=now)
+
+
+def test_bookings_never_overlap_on_a_room():
+    stays = {}
+    for booking in generate():
+        stays.setdefault(booking["room_number"], []).append((booking["check_in_date"], booking["check_out_date"]))
+    for nights in stays.values():
+        nights.sort()
+        assert all(previous[1] <= current[0] for previous, current in zip(nights, nights[1:]))
+
+
+def test_shifted_export_stays_in_the_past():
+    now = datetime(2026, 3, 1, 12)
+    booking = {
+        "check_in_date": "2026-03-10",
+        "check_out_date": "2026-03-12",
+        "created_at": datetime(2026, 2, 27),
+        "updated_at": datetime(2026, 2, 27),
+    }
+    shifted = shift_booking(booking, 7, now)
+
+    assert shifted["check_in_date"] == "2026-03-17"
+    assert shifted["created_at"] == shifted["updated_at"] == now
@@ -0,0 +1,46 @@
+import threading
+
+import orjson
+
+from db_monitor import CommandMonitor, CommandRecord
+
+
+def record(call_id: str, duration_ms: float = 3.0) -> CommandRecord:
+    return CommandRecord(
+        call_id=call_id,
+        tool="check_availability",
+        command="find",
+        database="hotel_db_test",
+        started_at=0.0,
+        duration_ms=duration_ms,
+        documents=2,
+        request_bytes=0,
+        reply_bytes=0,
+        ok=True,
+    )
+
+
+def test_sizes_are_not_measured_by_default():
+    assert CommandMonitor().measure_bytes is False
+
+
+async def test_export_writes_the_summary_off_the_event_loop(tmp_path, monkeypatch):
+    monitor = CommandMonitor(slow_ms=100.0)
+    monitor.record(record("call-1"))
+    monitor.record(record("call-1", duration_ms=150.0))
+
+    writers = []
+    write_summary = monitor._write_summary
+
+    def recording_write(summary, output_dir):
+        writers.append(threading.current_thread())
+        write_summary(summary, output_dir)
+
+    monkeypatch.setattr(monitor, "_write_summary", recording_write)
+    summary = await monitor.aexport_call("call-1", output_dir=str(tmp_path))
+
+    assert writers and writers[0] is not threading.main_thread()
+    assert summary["commands"] == 2 and len(summary["slow"]) == 1
+    [written] = tmp_path.glob("db_commands_*_call-1.json")
+    assert orjson.loads(written.read_bytes())["commands"] == 2
+    assert monitor.records("call-1") == []
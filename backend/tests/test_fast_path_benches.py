@@ -0,0 +1,11 @@
+"""The fast path benchmarks evaluate on phrasings the matchers were not built from."""
+
+from benchmarks import faq_fast_path_bench, intent_fast_path_bench
+
+
+def test_faq_transcripts_are_held_out():
+    assert faq_fast_path_bench.held_out_overlap() == []
+
+
+def test_intent_phrases_are_held_out():
+    assert intent_fast_path_bench.held_out_overlap() == []
@@ -0,0 +1,36 @@
+from fast_path.intents import END_CALL, RESUME, IntentClassifier, final_check_asked
+
+MID_FLOW = "Before I confirm, is there anything else you'd like to add to the booking?"
+CLOSING = "You're all set! Your confirmation number is 1042. Is there anything else I can help you with?"
+
+
+def assistant(text: str) -> dict:
+    return {"role": "assistant", "content": text}
+
+
+def test_bare_negations_go_to_the_llm():
+    classifier = IntentClassifier()
+    for text in ("no", "Nope.", "nah"):
+        assert classifier.classify(text)[0] is None
+    assert classifier.classify("No, that's all, thanks.")[0] == END_CALL
+
+
+def test_only_the_closing_check_counts_as_the_final_check():
+    assert not final_check_asked([assistant(MID_FLOW)])
+    assert not final_check_asked([assistant("Shall I book it, or is there anything else I can help with?")])
+    assert final_check_asked([assistant(CLOSING)])
+
+
+def test_no_final_check_while_a_write_is_running():
+    call = {"id": "call_1", "type": "function", "function": {"name": "book_room", "arguments": "{}"}}
+    messages = [{"role": "assistant", "tool_calls": [call]}, assistant(CLOSING)]
+
+    assert not final_check_asked(messages, {"book_room"})
+    messages.append({"role": "tool", "tool_call_id": "call_1", "content": "{}"})
+    assert final_check_asked(messages, {"book_room"})
+
+
+def test_resume_phrasings_beyond_the_wake_prompts():
+    classifier = IntentClassifier()
+    for text in ("Are you still there?", "Sorry about the wait.", "Okay, let's keep going."):
+        assert classifier.classify(text)[0] == RESUME
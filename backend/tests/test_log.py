@@ -0,0 +1,47 @@
+import io
+
+import pytest
+from loguru import logger
+
+from utils import log
+from utils.log import configure_logging, get_logger
+
+
+@pytest.fixture
+def written():
+    """Lines written through configure_logging's sink, read after flushing it."""
+    stream = io.StringIO()
+
+    def read() -> list:
+        log._sink.close()
+        return stream.getvalue().splitlines()
+
+    yield stream, read
+    logger.remove()
+    log._sink = None
+
+
+def test_categories_are_not_sampled_by_default(written, monkeypatch):
+    stream, read = written
+    monkeypatch.delenv("SAMORA_LOG_SAMPLE", raising=False)
+    configure_logging(level="DEBUG", sink=stream, force=True)
+
+    for n in range(15):
+        get_logger("frames").debug("frame {}", n)
+
+    assert len(read()) == 15
+
+
+def test_sampling_and_rate_limits_apply_per_category(written):
+    stream, read = written
+    configure_logging(level="DEBUG", sink=stream, sample_rates={"frames": 0.1}, force=True)
+
+    for n in range(100):
+        get_logger("frames").debug("frame {}", n)
+    # "hold" keeps its default burst of 20
+    for n in range(100):
+        get_logger("hold").debug("hold {}", n)
+
+    lines = read()
+    assert sum("frame " in line for line in lines) == 10
+    assert sum("hold " in line for line in lines) == 20
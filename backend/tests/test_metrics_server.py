@@ -0,0 +1,60 @@
+import socket
+
+import pytest
+
+from metrics import server as metrics_server
+from metrics.server import MetricsServer, start_metrics
+
+
+@pytest.fixture
+async def fresh_process(monkeypatch):
+    """start_metrics as if nothing had started it in this process yet."""
+    monkeypatch.setattr(metrics_server, "_server", None)
+    monkeypatch.setattr(metrics_server, "_loop_lag", None)
+    monkeypatch.setattr(metrics_server, "_attempted", False)
+    yield
+    if metrics_server._loop_lag is not None:
+        await metrics_server._loop_lag.stop()
+    if metrics_server._server is not None:
+        await metrics_server._server.stop()
+
+
+@pytest.fixture
+def taken_port():
+    with socket.socket() as sock:
+        sock.bind(("0.0.0.0", 0))
+        sock.listen()
+        yield sock.getsockname()[1]
+
+
+async def test_taken_port_is_tried_once_and_the_lag_probe_still_runs(fresh_process, taken_port, monkeypatch):
+    attempts = []
+    start = MetricsServer.start
+
+    async def counted_start(self):
+        attempts.append(self.port)
+        await start(self)
+
+    monkeypatch.setattr(MetricsServer, "start", counted_start)
+
+    assert await start_metrics(taken_port) is None
+    assert await start_metrics(taken_port) is None
+
+    assert attempts == [taken_port]
+    assert metrics_server._loop_lag._task is not None and not metrics_server._loop_lag._task.done()
+
+
+async def test_disabled_endpoint_still_runs_the_lag_probe(fresh_process):
+    assert await start_metrics(0) is None
+    assert not metrics_server._loop_lag._task.done()
+
+
+async def test_running_server_is_shared(fresh_process):
+    with socket.socket() as sock:
+        sock.bind(("0.0.0.0", 0))
+        port = sock.getsockname()[1]
+
+    server = await start_metrics(port)
+
+    assert isinstance(server, MetricsServer) and server.port == port
+    assert await start_metrics() is server
@@ -0,0 +1,93 @@
+"""Every tool that quotes a stay quotes the rate calendar's price for it."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from db_functions import book_room, book_rooms, get_pricing, update_booking, check_availability
+from inventory import quote_stay, rate_calendar
+
+GUEST = {
+    "guest_name": "Dana Whitfield",
+    "guest_phone": "520-555-0188",
+    "guest_email": "dana@example.com",
+}
+
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+def later(stay_date: str, days: int) -> str:
+    return (date.fromisoformat(stay_date) + timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+async def suite_surge(hotel, database):
+    """Suites at 1.5x for two nights, well after the seeded bookings."""
+    await database.rate_rules.insert_one(
+        {"room_type": "suite", "start_date": day(401), "end_date": day(403), "multiplier": 1.5}
+    )
+    rate_calendar.invalidate()
+    await rate_calendar.ensure_loaded(database)
+    yield
+    await database.rate_rules.drop()
+    rate_calendar.invalidate()
+
+
+async def quotes_for(call_tool, database, room_type, check_in, check_out) -> dict:
+    """(price_per_night, total_price) of the stay as each tool reports it."""
+    stay = {"check_in_date": check_in, "check_out_date": check_out}
+    availability = await call_tool(check_availability, **stay)
+    option = next(o for o in availability["room_options"] if o["room_type"] == room_type)
+    single = (await call_tool(book_room, **GUEST, **stay, room_type=room_type))["booking"]
+    group = await call_tool(book_rooms, **GUEST, **stay, room_types=[room_type, room_type])
+    quote = await quote_stay(database, room_type, check_in, check_out)
+
+    # A booking of another type, on other dates, changed onto this stay
+    other_type = "deluxe" if room_type == "standard" else "standard"
+    other = await call_tool(
+        book_room,
+        **GUEST,
+        room_type=other_type,
+        check_in_date=later(check_in, 30),
+        check_out_date=later(check_out, 30),
+    )
+    moved = await call_tool(
+        update_booking,
+        confirmation_number=other["booking"]["confirmation_number"],
+        new_check_in_date=check_in,
+        new_check_out_date=check_out,
+        new_room_type=room_type,
+    )
+
+    quotes = {
+        "check_availability": option,
+        "book_room": single,
+        "update_booking": moved["updated_booking"],
+        "quote_stay": quote,
+        **{f"book_rooms[{i}]": booking for i, booking in enumerate(group["bookings"])},
+    }
+    return {tool: (q["price_per_night"], q["total_price"]) for tool, q in quotes.items()}
+
+
+@pytest.mark.parametrize("room_type", ["standard", "deluxe", "suite"])
+async def test_base_rate_stay_is_quoted_the_same_everywhere(hotel, database, call_tool, room_type):
+    check_in, check_out = day(380), day(383)
+
+    quotes = await quotes_for(call_tool, database, room_type, check_in, check_out)
+    pricing = await call_tool(get_pricing, room_type=room_type)
+
+    base = pricing["price_per_night"]
+    assert set(quotes.values()) == {(base, base * 3)}, quotes
+
+
+async def test_seasonal_stay_is_quoted_the_same_everywhere(suite_surge, database, call_tool):
+    check_in, check_out = day(400), day(404)
+
+    quotes = await quotes_for(call_tool, database, "suite", check_in, check_out)
+    base = (await call_tool(get_pricing, room_type="suite"))["price_per_night"]
+
+    assert len(set(quotes.values())) == 1, quotes
+    _, total = quotes["quote_stay"]
+    assert total == base * 2 + base * 1.5 * 2
@@ -0,0 +1,61 @@
+import json
+from datetime import date, datetime, timedelta
+
+from benchmarks.replay import build_turns, find_conversations, recorded_at, shift_dates
+
+
+def write_part(path, part: int, started_at: str, content: str):
+    header = {"type": "header", "call_id": "call-a", "started_at": started_at, "part": part}
+    message = {"type": "message", "index": part, "message": {"role": "user", "content": content}}
+    path.write_text(json.dumps(header) + "\n" + json.dumps(message) + "\n")
+
+
+def test_parts_are_replayed_in_numeric_order(tmp_path):
+    name = "conversation_20260301_101500_call-a"
+    for part in (1, 2, 3, 10, 11):
+        suffix = "" if part == 1 else f".part{part}"
+        write_part(tmp_path / f"{name}{suffix}.jsonl", part, "2026-03-01T10:15:00", f"m{part}")
+    write_part(tmp_path / "conversation_20260301_090000_call-b.jsonl", 1, "2026-03-01T09:00:00", "b")
+
+    found = [p.name for p in find_conversations([str(tmp_path)])]
+
+    assert found == [
+        "conversation_20260301_090000_call-b.jsonl",
+        f"{name}.jsonl",
+        f"{name}.part2.jsonl",
+        f"{name}.part3.jsonl",
+        f"{name}.part10.jsonl",
+        f"{name}.part11.jsonl",
+    ]
+    assert recorded_at(tmp_path / f"{name}.part10.jsonl") == datetime(2026, 3, 1, 10, 15)
+
+
+def test_recorded_tool_dates_move_with_the_recording():
+    arguments = {"room_type": "suite", "check_in_date": "2026-03-06", "check_out_date": "2026-03-08"}
+    group = {"rooms": [{"room_type": "deluxe", "check_in_date": "2026-03-06"}]}
+    messages = [
+        {"role": "system", "content": "prompt"},
+        {"role": "user", "content": "A suite next Friday for two nights."},
+        {
+            "role": "assistant",
+            "tool_calls": [
+                {"id": "call_1", "function": {"name": "book_room", "arguments": json.dumps(arguments)}},
+                {"id": "call_2", "function": {"name": "book_rooms", "arguments": group}},
+            ],
+        },
+    ]
+    turns = build_turns(messages)
+    days = (date.today() - date(2026, 3, 1)).days
+
+    shifted = shift_dates(turns, days)
+
+    [single, many] = shifted[1].responses[0].tool_calls
+    moved = json.loads(single["function"]["arguments"])
+    assert moved == {
+        "room_type": "suite",
+        "check_in_date": (date.today() + timedelta(days=5)).isoformat(),
+        "check_out_date": (date.today() + timedelta(days=7)).isoformat(),
+    }
+    assert many["function"]["arguments"]["rooms"][0]["check_in_date"] == moved["check_in_date"]
+    # The recorded turns are left as they were
+    assert json.loads(turns[1].responses[0].tool_calls[0]["function"]["arguments"]) == arguments
@@ -0,0 +1,156 @@
+"""
+Round-trip budget of every DB tool.
+
+Each scenario runs against a freshly seeded hotel with warm caches, as in a
+running agent, and counts the commands pymongo sends (getMore and
+transaction commands included). A change that adds a query to a tool fails
+that tool's test. Tools run without the per-call memo, so each budget is
+the cold-path cost; the last scenario covers the memo path.
+
+Needs a real mongod: the in-memory stand-in sends no commands.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from db_functions import (
+    ToolRuntime,
+    book_room,
+    book_rooms,
+    get_pricing,
+    get_amenities,
+    lookup_booking,
+    cancel_booking,
+    update_booking,
+    check_availability,
+    add_special_request,
+    find_available_dates,
+)
+
+pytestmark = pytest.mark.mongod
+
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+
+def confirmation(n: int) -> str:
+    """Confirmation number of the n-th seeded booking."""
+    return f"GV-2025-{1001 + n:06d}"
+
+
+GUEST = {
+    "guest_name": "Dana Whitfield",
+    "guest_phone": "520-555-0188",
+    "guest_email": "dana@example.com",
+}
+
+# (label, [(tool, kwargs), ...], maximum Mongo commands for the whole sequence)
+BUDGETS = [
+    ("get_pricing", [(get_pricing, {})], 0),
+    ("get_amenities", [(get_amenities, {"room_type": "suite"})], 1),
+    ("lookup_booking", [(lookup_booking, {"confirmation_number": confirmation(15)})], 1),
+    (
+        "check_availability",
+        [(check_availability, {"check_in_date": day(30), "check_out_date": day(33)})],
+        2,
+    ),
+    ("find_available_dates", [(find_available_dates, {"nights": 3})], 0),
+    (
+        "book_room",
+        [
+            (
+                book_room,
+                {
+                    **GUEST,
+                    "room_type": "deluxe",
+                    "check_in_date": day(300),
+                    "check_out_date": day(303),
+                },
+            )
+        ],
+        7,
+    ),
+    (
+        "book_rooms",
+        [
+            (
+                book_rooms,
+                {
+                    **GUEST,
+                    "room_types": ["standard", "standard", "suite"],
+                    "check_in_date": day(310),
+                    "check_out_date": day(312),
+                },
+            )
+        ],
+        7,
+    ),
+    (
+        "update_booking (guests)",
+        [(update_booking, {"confirmation_number": confirmation(10), "new_num_guests": 2})],
+        2,
+    ),
+    (
+        "update_booking (dates)",
+        [
+            (
+                update_booking,
+                {
+                    "confirmation_number": confirmation(11),
+                    "new_check_in_date": day(320),
+                    "new_check_out_date": day(323),
+                },
+            )
+        ],
+        3,
+    ),
+    (
+        "update_booking (room type)",
+        [
+            (
+                update_booking,
+                {"confirmation_number": confirmation(12), "new_room_type": "suite"},
+            )
+        ],
+        4,
+    ),
+    ("cancel_booking", [(cancel_booking, {"confirmation_number": confirmation(13)})], 1),
+    (
+        "add_special_request",
+        [
+            (
+                add_special_request,
+                {"confirmation_number": confirmation(14), "request": "late check-in"},
+            )
+        ],
+        1,
+    ),
+    (
+        "lookup + update (memo)",
+        [
+            (lookup_booking, {"confirmation_number": confirmation(16)}),
+            (lookup_booking, {"confirmation_number": confirmation(16)}),
+            (
+                update_booking,
+                {"confirmation_number": confirmation(16), "new_num_guests": 2},
+            ),
+        ],
+        2,
+    ),
+]
+
+
+@pytest.mark.parametrize("label, steps, budget", BUDGETS, ids=[label for label, _, _ in BUDGETS])
+async def test_round_trips_within_budget(hotel, commands, make_params, label, steps, budget):
+    runtime = ToolRuntime() if "memo" in label else None
+    commands.reset()
+    for tool, kwargs in steps:
+        params = make_params(tool.__name__, **kwargs)
+        func = runtime.wrap(tool) if runtime else tool
+        await func(params, **kwargs)
+        result = params.result or {}
+        assert result.get("success") is not False and "error" not in result, f"{tool.__name__} failed: {result}"
+
+    assert commands.count <= budget, f"{commands.count} commands over a budget of {budget}: {', '.join(commands.names)}"
@@ -0,0 +1,83 @@
+import importlib
+
+import pytest
+
+import providers
+from session_pool import SessionFactory, SessionPool, SessionSpec, session_pool
+
+
+class FakeSessions(SessionFactory):
+    reusable = True
+
+    def __init__(self):
+        self.opened = 0
+        self.closed = []
+
+    async def connect(self, spec):
+        self.opened += 1
+        return {"id": self.opened, "healthy": True}
+
+    async def is_healthy(self, session):
+        return session["healthy"]
+
+    async def close(self, session):
+        self.closed.append(session["id"])
+
+
+def test_factories_must_implement_connect_check_and_close():
+    class NoClose(SessionFactory):
+        async def connect(self, spec):
+            pass
+
+        async def is_healthy(self, session):
+            return True
+
+    with pytest.raises(TypeError, match="close"):
+        NoClose()
+    with pytest.raises(TypeError):
+        SessionFactory()
+
+
+async def test_released_session_serves_the_next_lease():
+    factory = FakeSessions()
+    pool = SessionPool(size=1)
+    pool.register("fake", factory)
+    spec = SessionSpec("fake", "key-1234")
+    try:
+        await pool.prewarm(spec)
+        session = await pool.lease(spec)
+        assert session == {"id": 1, "healthy": True}
+
+        await pool.release(spec, session)
+        assert await pool.lease(spec) is session
+
+        session["healthy"] = False
+        await pool.release(spec, session)
+        assert factory.closed == [1]
+        assert pool.stats()["recycled"] == 1
+    finally:
+        await pool.close()
+
+
+async def test_first_lease_after_warm_up_is_a_hit(monkeypatch):
+    # The real factories register on import; the fakes replace them
+    for module in ("session_pool.cartesia", "session_pool.deepgram"):
+        importlib.import_module(module)
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "dg-key-1234")
+    monkeypatch.setenv("CARTESIA_API_KEY", "ct-key-5678")
+    factories = dict(session_pool._factories)
+    fakes = {"deepgram": FakeSessions(), "cartesia": FakeSessions()}
+    for provider, factory in fakes.items():
+        session_pool.register(provider, factory)
+    hits, misses = session_pool.hits, session_pool.misses
+    try:
+        assert await providers.prewarm_sessions() == 2
+
+        stt = providers.get_provider({}, "stt_provider").create({})
+        tts = providers.get_provider({}, "tts_provider").create({})
+        assert await session_pool.lease(stt._session_spec()) is not None
+        assert await session_pool.lease(tts._session_spec()) is not None
+        assert (session_pool.hits - hits, session_pool.misses - misses) == (2, 0)
+    finally:
+        await session_pool.close()
+        session_pool._factories.update(factories)
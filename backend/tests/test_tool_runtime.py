@@ -0,0 +1,106 @@
+"""
+ToolRuntime under barge-ins and deadlines.
+
+The tools run against the interruption benchmark's SlowMongo: commands take
+a fixed round trip, finish even when their caller is cancelled (as on
+Motor's executor) and publish the same command events as pymongo, so the
+runtime tracks and kills cursors as it does against a real server.
+"""
+
+import time
+import asyncio
+
+import pytest
+
+from benchmarks.interruption_bench import SlowMongo, make_tools
+from db_functions import ToolRuntime
+from db_functions.turn_deadline import still_working_result
+
+STAY = {"check_in_date": "2026-11-01", "check_out_date": "2026-11-04"}
+
+
+async def eventually(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition never became true"
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def mongo():
+    return SlowMongo(2000, rtt_ms=20, doc_us=1)
+
+
+@pytest.fixture
+def tools(mongo):
+    delivered = {}
+    check_availability, update_booking = make_tools(mongo, delivered)
+    return check_availability, update_booking
+
+
+async def test_interrupted_read_kills_its_cursor(mongo, tools, make_params):
+    check_availability, _ = tools
+    runtime = ToolRuntime(memo_ttl_secs=None, database=mongo, tool_budgets=None)
+    params = make_params("check_availability", **STAY)
+
+    read = asyncio.create_task(runtime.wrap(check_availability)(params, **STAY))
+    # The first batch is in: a cursor is open on the server, streaming the rest
+    await eventually(lambda: mongo.cursors)
+    runtime.interrupted()
+    read.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await read
+
+    await eventually(lambda: runtime.cursors_closed)
+    assert mongo.cursors == {}
+    assert params.results == []
+    stats = runtime.interruption_stats()
+    assert (stats["reads_cancelled"], stats["cursors_closed"]) == (1, 1)
+
+
+async def test_interrupted_write_finishes_without_running_the_llm(mongo, tools, make_params):
+    _, update_booking = tools
+    runtime = ToolRuntime(memo_ttl_secs=None, database=mongo, tool_budgets=None)
+    params = make_params("update_booking", booking_id=3)
+
+    write = asyncio.create_task(runtime.wrap(update_booking)(params, booking_id=3))
+    await asyncio.sleep(0.01)
+    runtime.interrupted()
+    await asyncio.wait_for(write, 2)
+
+    assert mongo.updates == [3]
+    assert params.result == {"success": True, "booking_id": 3}
+    assert params.properties[-1].run_llm is False
+    stats = runtime.interruption_stats()
+    assert (stats["writes_finished_after_interruption"], stats["llm_runs_suppressed"]) == (1, 1)
+
+
+async def test_uninterrupted_write_lets_the_llm_run(mongo, tools, make_params):
+    _, update_booking = tools
+    runtime = ToolRuntime(memo_ttl_secs=None, database=mongo, tool_budgets=None)
+    params = make_params("update_booking", booking_id=4)
+
+    await runtime.wrap(update_booking)(params, booking_id=4)
+
+    assert params.properties == [None]
+    assert runtime.interruption_stats()["llm_runs_suppressed"] == 0
+
+
+async def test_read_over_the_turn_budget_returns_still_working(make_params):
+    # One round trip outlasts the turn and the smallest tool budget (0.5 s)
+    mongo = SlowMongo(2000, rtt_ms=1000, doc_us=1)
+    check_availability, _ = make_tools(mongo, {})
+    runtime = ToolRuntime(memo_ttl_secs=None, database=mongo, turn_budget_secs=0.05)
+    runtime.turn_ended()
+    params = make_params("check_availability", **STAY)
+
+    started = time.perf_counter()
+    await asyncio.wait_for(runtime.wrap(check_availability)(params, **STAY), 2)
+    elapsed = time.perf_counter() - started
+
+    assert params.results == [still_working_result("check_availability")]
+    assert elapsed < 1.0
+    assert runtime.deadline_stats()["overruns"] == {"check_availability": 1}
+    # The abandoned find still lands; its cursor is killed, not left open
+    await eventually(lambda: runtime.cursors_closed, timeout=3)
+    assert mongo.cursors == {}
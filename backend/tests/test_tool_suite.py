@@ -0,0 +1,61 @@
+"""
+Latency, round trips and failures of every DB tool, per dataset scale.
+
+Runs the scenarios of benchmarks.tool_suite. Every call must succeed; when
+the baseline (SAMORA_TOOL_BASELINE, default benchmarks/baselines/tool_suite.json)
+was recorded on the same kind of server, p50/p95 growth beyond the tolerance,
+extra round trips or new failures fail the test. Record or refresh the
+baseline with ``python -m benchmarks.tool_suite --update``.
+
+SAMORA_SUITE_SCALES (default "100,10000") and SAMORA_SUITE_ITERATIONS
+(default 20) size the run; add 1000000 on a real mongod.
+"""
+
+import os
+from pathlib import Path
+
+import orjson
+import pytest
+
+from benchmarks.tool_suite import DEFAULT_BASELINE, compare, measure, scenarios, seed
+
+SCALES = [int(scale) for scale in os.getenv("SAMORA_SUITE_SCALES", "100,10000").split(",")]
+ITERATIONS = int(os.getenv("SAMORA_SUITE_ITERATIONS", "20"))
+WARMUP = 3
+TOLERANCE = float(os.getenv("SAMORA_SUITE_TOLERANCE", "0.25"))
+MIN_DELTA_MS = 1.0
+BASELINE = Path(os.getenv("SAMORA_TOOL_BASELINE", DEFAULT_BASELINE))
+
+LABELS = [label for label, _, _ in scenarios(1, [])]
+
+
+@pytest.fixture(scope="session")
+async def baseline(database):
+    """The recorded baseline, if it comes from the same kind of server as this run."""
+    if not BASELINE.exists():
+        return None
+    recorded = orjson.loads(BASELINE.read_bytes())
+    server = await database.client.server_info()
+    backend = "mongomock" if server.get("sysInfo") == "Mock" else "mongod"
+    if recorded.get("environment", {}).get("backend", "mongod") != backend:
+        return None
+    return recorded
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda scale: f"{scale}-bookings")
+async def seeded(request, database):
+    _, names = await seed(request.param)
+    return request.param, names
+
+
+@pytest.mark.parametrize("label", LABELS)
+async def test_tool(seeded, label, baseline, commands):
+    scale, names = seeded
+    _, tool, make_kwargs = next(s for s in scenarios(scale, names) if s[0] == label)
+
+    result = await measure(tool, make_kwargs, ITERATIONS, WARMUP, commands)
+
+    assert result["failed"] == 0, f"{result['failed']} of {ITERATIONS} calls failed"
+    if baseline is not None:
+        regressions = compare(baseline, {"scales": {str(scale): {label: result}}}, TOLERANCE, MIN_DELTA_MS)
+        assert not regressions, "\n".join(regressions)
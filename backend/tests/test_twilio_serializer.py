@@ -0,0 +1,81 @@
+"""FastTwilioFrameSerializer against pipecat's TwilioFrameSerializer."""
+
+import base64
+import warnings
+
+import pytest
+from pipecat.frames.frames import OutputAudioRawFrame
+from pipecat.serializers.twilio import TwilioFrameSerializer
+
+from benchmarks.audio_codec_bench import (
+    TWILIO_RATE,
+    check_serializers,
+    make_serializer,
+    media_messages,
+    speech_like,
+)
+from utils.twilio_serializer import FastTwilioFrameSerializer
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import audioop
+
+
+def media_message(ulaw: bytes) -> str:
+    return '{"event": "media", "streamSid": "MZ00", "media": {"payload": "%s"}}' % base64.b64encode(
+        ulaw
+    ).decode("ascii")
+
+
+async def serializers(pipeline_rate: int = TWILIO_RATE):
+    return (
+        await make_serializer(TwilioFrameSerializer, pipeline_rate),
+        await make_serializer(FastTwilioFrameSerializer, pipeline_rate),
+    )
+
+
+async def test_decodes_every_ulaw_byte_like_pipecat():
+    stock, fast = await serializers()
+    message = media_message(bytes(range(256)))
+
+    expected = await stock.deserialize(message)
+    actual = await fast.deserialize(message)
+
+    assert actual.audio == expected.audio == audioop.ulaw2lin(bytes(range(256)), 2)
+    assert (actual.sample_rate, actual.num_channels) == (expected.sample_rate, expected.num_channels)
+
+
+async def test_encodes_every_sample_value_like_pipecat():
+    stock, fast = await serializers()
+    every_sample = b"".join(value.to_bytes(2, "little", signed=True) for value in range(-32768, 32768))
+    frame = OutputAudioRawFrame(audio=every_sample, sample_rate=TWILIO_RATE, num_channels=1)
+
+    assert await fast.serialize(frame) == await stock.serialize(frame)
+
+
+async def test_unresampled_streams_are_byte_identical():
+    stock, fast = await serializers()
+
+    for message in media_messages(500):
+        expected = await stock.deserialize(message)
+        actual = await fast.deserialize(message)
+        assert (actual and actual.audio) == (expected and expected.audio)
+
+    for chunk in speech_like(TWILIO_RATE, 500):
+        frame = OutputAudioRawFrame(audio=chunk, sample_rate=TWILIO_RATE, num_channels=1)
+        assert await fast.serialize(frame) == await stock.serialize(frame)
+
+
+@pytest.mark.parametrize("event", ['{"event": "start", "start": {}}', '{"event": "dtmf", "dtmf": {"digit": "5"}}'])
+async def test_other_events_go_to_pipecat(event):
+    stock, fast = await serializers()
+    expected = await stock.deserialize(event)
+    actual = await fast.deserialize(event)
+    assert type(actual) is type(expected)
+    assert getattr(actual, "button", None) == getattr(expected, "button", None)
+
+
+async def test_resampled_streams_within_resampler_jitter():
+    # soxr is not bit-reproducible between stream instances; the bench's
+    # bounds hold every path, and the unresampled ones to zero
+    assert await check_serializers(300) == 0
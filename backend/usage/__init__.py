@@ -0,0 +1,18 @@
+# Per-call usage of the paid services (LLM tokens, TTS characters, STT
+# seconds), tagged by stage and priced. The aggregation CLI is usage.report.
+
+from usage.ledger import UsageLedger, TURN, GREETING, IDLE_NUDGE, SUMMARIZER, LISTENING
+from usage.prices import PriceTable
+from usage.store import UsageStore, usage_store
+
+__all__ = [
+    "UsageLedger",
+    "TURN",
+    "GREETING",
+    "IDLE_NUDGE",
+    "SUMMARIZER",
+    "LISTENING",
+    "PriceTable",
+    "UsageStore",
+    "usage_store",
+]
@@ -0,0 +1,175 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pipecat.frames.frames import (
+    Frame,
+    MetricsFrame,
+    InputAudioRawFrame,
+    LLMFullResponseEndFrame,
+)
+from pipecat.metrics.metrics import LLMUsageMetricsData, TTSUsageMetricsData
+
+from usage.prices import PriceTable
+
+# Stages usage is tagged with
+TURN = "turn"  # answering the caller, tool follow-ups included
+GREETING = "greeting"  # the opening response when the caller connects
+IDLE_NUDGE = "idle_nudge"  # "are you still there?" prompts from the idle handler
+SUMMARIZER = "summarizer"  # rolling context summaries, out of band
+LISTENING = "listening"  # audio streamed to STT
+
+# For providers that only return text (run_inference): rough tokens per character
+CHARS_PER_TOKEN = 4
+
+
+class UsageLedger:
+    """
+    What one call used of each paid service, tagged by stage.
+
+    Fed from the pipeline like CallMetrics: ``on_frame()`` on the last
+    processor collects the LLM and TTS usage MetricsFrames, and
+    ``on_audio()`` on the STT counts the seconds of audio streamed to it.
+    LLM responses belong to the turn unless ``next_response_stage()`` tagged
+    the next one otherwise (the greeting, an idle nudge); the tag lasts
+    until that response ends. Out-of-band inference (the summarizer) is
+    recorded directly with ``record_llm()``.
+    """
+
+    def __init__(self, call_id: str, stt_service: str = "", stt_model: str = ""):
+        self.call_id = call_id
+        self.started_at = datetime.now()
+        self._started = time.monotonic()
+        self._stage = TURN
+        self._stt = (stt_service.partition("#")[0], stt_model or "")
+        self._audio_bytes_per_sec: Optional[int] = None
+        self._audio_bytes = 0
+
+        self.llm_calls: List[dict] = []
+        # (service, model, stage) -> characters
+        self.tts_characters: Dict[Tuple[str, str, str], int] = {}
+
+    def next_response_stage(self, stage: str):
+        """Tag the next LLM response (and what TTS speaks of it) with stage."""
+        self._stage = stage
+
+    def on_frame(self, frame: Frame):
+        if isinstance(frame, MetricsFrame):
+            for data in frame.data:
+                if isinstance(data, LLMUsageMetricsData):
+                    usage = data.value
+                    self.record_llm(
+                        self._stage,
+                        data.processor,
+                        data.model or "",
+                        usage.prompt_tokens,
+                        usage.completion_tokens,
+                        cached=usage.cache_read_input_tokens or 0,
+                        reasoning=usage.reasoning_tokens or 0,
+                    )
+                elif isinstance(data, TTSUsageMetricsData):
+                    key = (data.processor.partition("#")[0], data.model or "", self._stage)
+                    self.tts_characters[key] = self.tts_characters.get(key, 0) + data.value
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            self._stage = TURN
+
+    def on_audio(self, frame: Frame):
+        if isinstance(frame, InputAudioRawFrame):
+            if self._audio_bytes_per_sec is None:
+                self._audio_bytes_per_sec = frame.sample_rate * frame.num_channels * 2
+            self._audio_bytes += len(frame.audio)
+
+    def record_llm(
+        self,
+        stage: str,
+        service: str,
+        model: str,
+        prompt: int,
+        completion: int,
+        cached: int = 0,
+        reasoning: int = 0,
+        estimated: bool = False,
+    ):
+        self.llm_calls.append(
+            {
+                "stage": stage,
+                "service": service.partition("#")[0],
+                "model": model,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "cached_tokens": cached,
+                "reasoning_tokens": reasoning,
+                "estimated": estimated,
+            }
+        )
+
+    def record_text_llm(self, stage: str, service: str, model: str, prompt: str, completion: str):
+        """Record an inference whose provider returned no usage, estimating tokens from its text."""
+        self.record_llm(
+            stage,
+            service,
+            model,
+            len(prompt) // CHARS_PER_TOKEN,
+            len(completion) // CHARS_PER_TOKEN,
+            estimated=True,
+        )
+
+    @property
+    def stt_seconds(self) -> float:
+        return self._audio_bytes / self._audio_bytes_per_sec if self._audio_bytes_per_sec else 0.0
+
+    def summary(self, prices: Optional[PriceTable] = None) -> dict:
+        """Per-call totals: every LLM call, TTS characters and STT seconds, stage totals and cost."""
+        stt_service, stt_model = self._stt
+        summary = {
+            "call_id": self.call_id,
+            "started_at": self.started_at.isoformat(),
+            "ended_at": datetime.now().isoformat(),
+            "duration_secs": round(time.monotonic() - self._started, 1),
+            "llm_calls": self.llm_calls,
+            "tts": [
+                {"service": service, "model": model, "stage": stage, "characters": characters}
+                for (service, model, stage), characters in self.tts_characters.items()
+            ],
+            "stt": (
+                [{"service": stt_service, "model": stt_model, "stage": LISTENING, "seconds": round(self.stt_seconds, 1)}]
+                if stt_service
+                else []
+            ),
+        }
+        summary["stages"] = stage_totals(summary)
+        costs = (prices or PriceTable()).costs(summary)
+        summary["cost_usd"] = {
+            "by_stage": {stage: round(usd, 6) for stage, usd in costs["by_stage"].items()},
+            **{kind: round(costs[kind], 6) for kind in ("llm", "tts", "stt", "total")},
+        }
+        return summary
+
+
+def stage_totals(summary: dict) -> Dict[str, dict]:
+    """Token, character and second totals of a usage summary, by stage."""
+    stages: Dict[str, dict] = {}
+
+    def totals(stage: str) -> dict:
+        if stage not in stages:
+            stages[stage] = {
+                "llm_calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cached_tokens": 0,
+                "reasoning_tokens": 0,
+                "tts_characters": 0,
+                "stt_seconds": 0.0,
+            }
+        return stages[stage]
+
+    for call in summary.get("llm_calls", []):
+        stage = totals(call["stage"])
+        stage["llm_calls"] += 1
+        for key in ("prompt_tokens", "completion_tokens", "cached_tokens", "reasoning_tokens"):
+            stage[key] += call[key]
+    for entry in summary.get("tts", []):
+        totals(entry["stage"])["tts_characters"] += entry["characters"]
+    for entry in summary.get("stt", []):
+        totals(entry["stage"])["stt_seconds"] += entry["seconds"]
+    return stages
@@ -0,0 +1,118 @@
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+# List prices in USD. Override them with a JSON file of the same shape
+# (usage.report --prices) rather than editing old reports by hand.
+
+# Per 1M tokens: (prompt, completion, cached prompt), by model
+LLM_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gemini-2.5-flash": (0.30, 2.50, 0.075),
+    "gpt-4o-mini": (0.15, 0.60, 0.075),
+    "llama-3.3-70b": (0.85, 1.20, 0.85),
+    "llama-3.3-70b-versatile": (0.59, 0.79, 0.59),
+}
+
+# Per 1M characters, by provider
+TTS_PRICES: Dict[str, float] = {
+    "cartesia": 40.0,
+    "deepgram": 30.0,
+}
+
+# Per minute of audio streamed, by provider
+STT_PRICES: Dict[str, float] = {
+    "deepgram": 0.0092,
+    "elevenlabs": 0.0067,
+}
+
+PROVIDERS = ("cartesia", "deepgram", "elevenlabs", "google", "openai", "cerebras", "groq")
+
+
+def provider_of(service: str) -> str:
+    """Provider of a Pipecat service name (e.g. "PooledCartesiaTTSService#2" -> "cartesia")."""
+    name = service.lower()
+    for provider in PROVIDERS:
+        if provider in name:
+            return provider
+    return name.partition("#")[0]
+
+
+class PriceTable:
+    """Prices used to turn a usage summary into dollars."""
+
+    def __init__(
+        self,
+        llm: Optional[Dict[str, Tuple[float, float, float]]] = None,
+        tts: Optional[Dict[str, float]] = None,
+        stt: Optional[Dict[str, float]] = None,
+    ):
+        self.llm = dict(LLM_PRICES if llm is None else llm)
+        self.tts = dict(TTS_PRICES if tts is None else tts)
+        self.stt = dict(STT_PRICES if stt is None else stt)
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "PriceTable":
+        """Defaults, overridden by the "llm", "tts" and "stt" tables of a JSON file."""
+        if not path:
+            return cls()
+        with open(path, "rb") as f:
+            overrides = orjson.loads(f.read())
+        return cls(
+            llm={**LLM_PRICES, **{k: tuple(v) for k, v in overrides.get("llm", {}).items()}},
+            tts={**TTS_PRICES, **overrides.get("tts", {})},
+            stt={**STT_PRICES, **overrides.get("stt", {})},
+        )
+
+    def llm_cost(self, model: str, prompt: int, completion: int, cached: int = 0, reasoning: int = 0) -> float:
+        """
+        Cached prompt tokens are billed at the cached rate instead of the prompt
+        rate. Reasoning tokens are billed as output: Gemini reports its
+        thinking tokens apart from the completion tokens.
+        """
+        prompt_price, completion_price, cached_price = self.llm.get(model, (0.0, 0.0, 0.0))
+        output = completion + reasoning
+        return (
+            (prompt - cached) * prompt_price + cached * cached_price + output * completion_price
+        ) / 1_000_000
+
+    def tts_cost(self, service: str, characters: int) -> float:
+        return characters * self.tts.get(provider_of(service), 0.0) / 1_000_000
+
+    def stt_cost(self, service: str, seconds: float) -> float:
+        return seconds / 60 * self.stt.get(provider_of(service), 0.0)
+
+    def costs(self, summary: dict) -> dict:
+        """Dollars of a call's usage summary (see UsageLedger.summary), by stage and by kind."""
+        by_stage: Dict[str, float] = {}
+        by_kind = {"llm": 0.0, "tts": 0.0, "stt": 0.0}
+
+        def add(stage: str, kind: str, usd: float):
+            by_stage[stage] = by_stage.get(stage, 0.0) + usd
+            by_kind[kind] += usd
+
+        for call in summary.get("llm_calls", []):
+            usd = self.llm_cost(
+                call["model"],
+                call["prompt_tokens"],
+                call["completion_tokens"],
+                call["cached_tokens"],
+                call["reasoning_tokens"],
+            )
+            add(call["stage"], "llm", usd)
+        for entry in summary.get("tts", []):
+            add(entry["stage"], "tts", self.tts_cost(entry["service"], entry["characters"]))
+        for entry in summary.get("stt", []):
+            add(entry["stage"], "stt", self.stt_cost(entry["service"], entry["seconds"]))
+        return {"by_stage": by_stage, **by_kind, "total": sum(by_kind.values())}
+
+    def unpriced(self, summary: dict) -> set:
+        """Models and services in a usage summary that have no price (counted as free)."""
+        missing = set()
+        for call in summary.get("llm_calls", []):
+            if call["model"] not in self.llm:
+                missing.add(call["model"] or call["service"])
+        for kind, prices in (("tts", self.tts), ("stt", self.stt)):
+            for entry in summary.get(kind, []):
+                if provider_of(entry["service"]) not in prices:
+                    missing.add(entry["service"])
+        return missing
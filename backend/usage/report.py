@@ -0,0 +1,194 @@
+"""
+Cost of calls and of each stage, from the usage ledger.
+
+Reads the per-call summaries run_bot saves (JSONL files under logs/usage,
+or the call_usage collection with --mongo), prices them with the current
+PriceTable (or a --prices JSON override) and prints:
+
+- cost per call: total, mean, p50/p95, per minute of call
+- cost per stage (turn, greeting, idle_nudge, summarizer, listening) with
+  their tokens, characters and seconds
+- cost per model or service
+- the most expensive calls and the most expensive single LLM requests
+
+Summarizer tokens are estimated from text (run_inference returns no
+usage); they are marked with "~".
+
+Usage:
+    python -m usage.report logs/usage --since 2025-01-01 --top 10
+    MONGODB_URI=... python -m usage.report --mongo --json
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import orjson
+
+from usage.ledger import stage_totals
+from usage.prices import PriceTable, provider_of
+from usage.store import USAGE_COLLECTION
+
+
+def read_files(paths: Iterable[str]) -> List[dict]:
+    """Summaries from JSONL files, or every usage_*.jsonl in a directory."""
+    summaries = []
+    for path in map(Path, paths):
+        if not path.exists():
+            print(f"{path}: not found", file=sys.stderr)
+            continue
+        files = sorted(path.glob("usage_*.jsonl")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, "rb") as f:
+                summaries.extend(orjson.loads(line) for line in f if line.strip())
+    return summaries
+
+
+async def read_mongo(since: Optional[str]) -> List[dict]:
+    from db import db
+
+    query = {"started_at": {"$gte": since}} if since else {}
+    return await db[USAGE_COLLECTION].find(query, {"_id": 0}).to_list(None)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def build_report(summaries: List[dict], prices: PriceTable, top: int) -> dict:
+    calls = []
+    stages: Dict[str, dict] = {}
+    by_model: Dict[str, float] = {}
+    requests = []
+    unpriced = set()
+
+    for summary in summaries:
+        costs = prices.costs(summary)
+        unpriced |= prices.unpriced(summary)
+        calls.append(
+            {
+                "call_id": summary["call_id"],
+                "started_at": summary["started_at"],
+                "duration_secs": summary["duration_secs"],
+                "cost_usd": costs["total"],
+                "by_stage": costs["by_stage"],
+            }
+        )
+        for stage, totals in stage_totals(summary).items():
+            merged = stages.setdefault(stage, {**{k: 0 for k in totals}, "cost_usd": 0.0})
+            for key, value in totals.items():
+                merged[key] += value
+            merged["cost_usd"] += costs["by_stage"].get(stage, 0.0)
+
+        for call in summary.get("llm_calls", []):
+            usd = prices.llm_cost(
+                call["model"],
+                call["prompt_tokens"],
+                call["completion_tokens"],
+                call["cached_tokens"],
+                call["reasoning_tokens"],
+            )
+            name = call["model"] or call["service"]
+            by_model[name] = by_model.get(name, 0.0) + usd
+            requests.append({**call, "call_id": summary["call_id"], "cost_usd": usd})
+        for entry in summary.get("tts", []):
+            name = f"{provider_of(entry['service'])} tts"
+            by_model[name] = by_model.get(name, 0.0) + prices.tts_cost(entry["service"], entry["characters"])
+        for entry in summary.get("stt", []):
+            name = f"{provider_of(entry['service'])} stt"
+            by_model[name] = by_model.get(name, 0.0) + prices.stt_cost(entry["service"], entry["seconds"])
+
+    costs = [call["cost_usd"] for call in calls]
+    minutes = sum(call["duration_secs"] for call in calls) / 60
+    total = sum(costs)
+    return {
+        "calls": len(calls),
+        "total_usd": total,
+        "mean_usd": total / len(calls) if calls else 0.0,
+        "p50_usd": percentile(costs, 50),
+        "p95_usd": percentile(costs, 95),
+        "usd_per_minute": total / minutes if minutes else 0.0,
+        "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["cost_usd"])),
+        "by_model": dict(sorted(by_model.items(), key=lambda item: -item[1])),
+        "top_calls": sorted(calls, key=lambda call: -call["cost_usd"])[:top],
+        "top_requests": sorted(requests, key=lambda request: -request["cost_usd"])[:top],
+        "unpriced": sorted(unpriced),
+    }
+
+
+def print_report(report: dict):
+    total = report["total_usd"] or 1.0
+    print(
+        f"\n{report['calls']} calls, ${report['total_usd']:.4f} total: ${report['mean_usd']:.4f} mean, "
+        f"${report['p50_usd']:.4f} p50, ${report['p95_usd']:.4f} p95, ${report['usd_per_minute']:.4f}/min"
+    )
+
+    print(
+        f"\n{'stage':<12}{'LLM calls':>10}{'prompt':>11}{'cached':>10}{'output':>10}"
+        f"{'TTS chars':>11}{'STT min':>9}{'cost':>11}{'share':>7}"
+    )
+    for stage, totals in report["stages"].items():
+        output = totals["completion_tokens"] + totals["reasoning_tokens"]
+        print(
+            f"{stage:<12}{totals['llm_calls']:>10}{totals['prompt_tokens']:>11}{totals['cached_tokens']:>10}"
+            f"{output:>10}{totals['tts_characters']:>11}{totals['stt_seconds'] / 60:>9.1f}"
+            f"{'$' + format(totals['cost_usd'], '.4f'):>11}{totals['cost_usd'] / total:>7.0%}"
+        )
+
+    print(f"\n{'model / service':<28}{'cost':>11}{'share':>7}")
+    for name, usd in report["by_model"].items():
+        print(f"{name:<28}{'$' + format(usd, '.4f'):>11}{usd / total:>7.0%}")
+
+    print(f"\nMost expensive calls\n{'call':<38}{'minutes':>8}{'cost':>11}  top stage")
+    for call in report["top_calls"]:
+        stage = max(call["by_stage"], key=call["by_stage"].get) if call["by_stage"] else "-"
+        print(
+            f"{call['call_id']:<38}{call['duration_secs'] / 60:>8.1f}"
+            f"{'$' + format(call['cost_usd'], '.4f'):>11}  {stage}"
+        )
+
+    print(f"\nMost expensive LLM requests\n{'stage':<12}{'model':<26}{'prompt':>9}{'output':>8}{'cost':>11}  call")
+    for request in report["top_requests"]:
+        mark = "~" if request["estimated"] else " "
+        output = request["completion_tokens"] + request["reasoning_tokens"]
+        print(
+            f"{request['stage']:<12}{request['model'] or request['service']:<26}"
+            f"{mark}{request['prompt_tokens']:>8}{output:>8}"
+            f"{'$' + format(request['cost_usd'], '.5f'):>11}  {request['call_id']}"
+        )
+
+    if report["unpriced"]:
+        print(f"\nNo price for {', '.join(report['unpriced'])} (counted as $0); add them with --prices")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="*", default=["logs/usage"], help="JSONL files or directories")
+    parser.add_argument("--mongo", action="store_true", help=f"Read the {USAGE_COLLECTION} collection instead")
+    parser.add_argument("--since", help="Only calls started on or after this ISO date")
+    parser.add_argument("--prices", help="JSON file overriding the llm/tts/stt price tables")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    summaries = asyncio.run(read_mongo(args.since)) if args.mongo else read_files(args.paths)
+    if args.since:
+        summaries = [s for s in summaries if s["started_at"] >= args.since]
+    if not summaries:
+        print("No usage recorded")
+        sys.exit(1)
+
+    report = build_report(summaries, PriceTable.load(args.prices), args.top)
+    if args.json:
+        sys.stdout.buffer.write(orjson.dumps(report, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
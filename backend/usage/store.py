@@ -0,0 +1,101 @@
+import os
+import asyncio
+from pathlib import Path
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import orjson
+from loguru import logger
+
+USAGE_COLLECTION = "call_usage"
+
+
+class UsageStore:
+    """
+    Persists per-call usage summaries in batches.
+
+    Summaries go to ``sinks``: "file" appends them as JSON lines to a daily
+    file under ``output_dir`` (off the event loop), "mongo" inserts them
+    into the call_usage collection with one insert_many per batch. A batch
+    is written when it holds ``batch_size`` summaries or ``flush_after_secs``
+    after its first one, whichever comes first; ``flush()`` writes it now
+    (run_bot does once the process has no call left).
+    """
+
+    def __init__(
+        self,
+        sinks: Iterable[str] = ("file",),
+        output_dir: str = "logs/usage",
+        database=None,
+        batch_size: int = 20,
+        flush_after_secs: float = 30.0,
+    ):
+        self.sinks = frozenset(sinks)
+        self.output_dir = Path(output_dir)
+        self.batch_size = batch_size
+        self.flush_after_secs = flush_after_secs
+        self._database = database
+        self._pending: List[dict] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: set = set()
+        self.written = 0
+        self.failed = 0
+
+    def add(self, summary: dict):
+        """Queue a call's summary; written with its batch."""
+        if not self.sinks:
+            return
+        self._pending.append(summary)
+        if len(self._pending) >= self.batch_size:
+            self._start_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(self.flush_after_secs, self._start_flush)
+
+    def _start_flush(self):
+        task = asyncio.create_task(self.flush())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def flush(self):
+        """Write every queued summary."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            if "file" in self.sinks:
+                await asyncio.to_thread(self._append_lines, batch)
+            if "mongo" in self.sinks:
+                await self._insert(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Failed to save usage of {len(batch)} calls: {e}")
+
+    def _append_lines(self, batch: List[dict]):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"usage_{datetime.now():%Y%m%d}.jsonl"
+        with open(path, "ab") as f:
+            f.write(b"".join(orjson.dumps(summary) + b"\n" for summary in batch))
+
+    async def _insert(self, batch: List[dict]):
+        if self._database is None:
+            from db import db
+
+            self._database = db
+        # insert_many adds an _id to each document; keep the caller's dicts as they were
+        await self._database[USAGE_COLLECTION].insert_many([dict(s) for s in batch], ordered=False)
+
+
+def _sinks(spec: str) -> List[str]:
+    return [sink.strip() for sink in spec.split(",") if sink.strip() in ("file", "mongo")]
+
+
+# One per process, shared by every call. SAMORA_USAGE_SINKS: "file" (default), "mongo",
+# "file,mongo", or empty to keep usage in the logs only
+usage_store = UsageStore(
+    sinks=_sinks(os.getenv("SAMORA_USAGE_SINKS", "file")),
+    batch_size=int(os.getenv("SAMORA_USAGE_BATCH", "20")),
+)
@@ -1,5 +1,19 @@
 # Utils package for Samora AI
 
-from utils.chat_logger import save_chat_history
+from utils.chat_logger import save_chat_history, ChatTranscriptWriter
+from utils.audio_codec import UlawStream, StreamResampler
+from utils.twilio_serializer import FastTwilioFrameSerializer, use_fast_twilio_serializer
+from utils.log import CallContext, configure_logging, get_logger, tool_context
 
-__all__ = ["save_chat_history"]
+__all__ = [
+    "save_chat_history",
+    "ChatTranscriptWriter",
+    "UlawStream",
+    "StreamResampler",
+    "FastTwilioFrameSerializer",
+    "use_fast_twilio_serializer",
+    "CallContext",
+    "configure_logging",
+    "get_logger",
+    "tool_context",
+]
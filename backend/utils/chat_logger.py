@@ -1,6 +1,17 @@
+import re
+import gzip
 import json
+import time
+import queue
+import asyncio
+import threading
+from collections import deque
 from pathlib import Path
+from uuid import uuid4
 from datetime import datetime
+from typing import Optional, List
+
+import orjson
 from loguru import logger
 
 
@@ -48,3 +59,255 @@ def save_chat_history(
     except Exception as e:
         logger.error(f"Failed to save chat history: {e}")
         return None
+
+
+# Sentinel pushed onto the writer queue to stop the background thread
+_CLOSE = object()
+
+# Messages remembered by sync() to find its place when the anchor is gone
+_RECENT_SYNCED = 32
+
+
+class ChatTranscriptWriter:
+    """
+    Append-only JSONL transcript writer for a single call.
+
+    Each message is serialized with orjson and handed to a background thread,
+    so the event loop only pays for a queue put. The thread owns the file
+    handle, optionally gzip-compresses the output and rotates to a new part
+    file once the current one exceeds a size or age limit.
+
+    Every line is one record: a header (``"type": "header"``), one record per
+    message (``"type": "message"``) and a footer (``"type": "footer"``) written
+    by ``aclose()``.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "logs/chats",
+        filename_prefix: str = "conversation",
+        compress: bool = False,
+        max_bytes: Optional[int] = None,
+        max_age_secs: Optional[float] = None,
+        call_id: Optional[str] = None,
+    ):
+        """
+        Initialize the transcript writer and start its background thread.
+
+        Args:
+            output_dir: Directory to save transcripts (default: logs/chats).
+            filename_prefix: Prefix for the filename (default: conversation).
+            compress: Write gzip-compressed ``.jsonl.gz`` files.
+            max_bytes: Rotate to a new part once a file reaches this many bytes.
+            max_age_secs: Rotate to a new part once a file is this many seconds old.
+            call_id: Identifier of the call, part of the file name and recorded in
+                the header of every part (a random one if not provided).
+        """
+        self._output_path = Path(output_dir)
+        self._compress = compress
+        self._max_bytes = max_bytes
+        self._max_age_secs = max_age_secs
+        self._call_id = call_id
+
+        # Several calls share a process and can start in the same second
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name_id = re.sub(r"[^A-Za-z0-9_-]", "-", call_id) if call_id else uuid4().hex[:12]
+        self._basename = f"{filename_prefix}_{timestamp}_{name_id}"
+        self._started_at = datetime.now().isoformat()
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._part = 0
+        self._file = None
+        self._file_bytes = 0
+        self._file_opened_at = 0.0
+        self._paths: List[str] = []
+
+        self._total_messages = 0
+        self._last_synced = None
+        self._recent_synced: deque = deque(maxlen=_RECENT_SYNCED)
+        self._synced_len = 0
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="chat-transcript-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def paths(self) -> List[str]:
+        """Paths of every part file written so far."""
+        return list(self._paths)
+
+    @property
+    def total_messages(self) -> int:
+        """Number of messages queued for writing."""
+        return self._total_messages
+
+    def append(self, message: dict):
+        """Queue a single message for writing. Never blocks on disk I/O."""
+        if self._closed:
+            return
+        self._total_messages += 1
+        record = {
+            "type": "message",
+            "index": self._total_messages - 1,
+            "logged_at": time.time(),
+            "message": message,
+        }
+        self._queue.put(_dumps(record))
+
+    def sync(self, messages: list):
+        """
+        Append any messages added to ``messages`` since the previous sync.
+
+        The last written message is located by identity rather than by index,
+        so the writer keeps working after the rolling summarizer replaces the
+        head of the context with a summary. If that message is gone (the
+        summarizer dropped it, or pipecat rebuilt its dict), the newest
+        message equal to one of the last ones written takes its place; only
+        when none is left are as many messages skipped as the last sync saw.
+        """
+        start = 0
+        if self._last_synced is not None:
+            start = self._resume_index(messages)
+
+        for message in messages[start:]:
+            self.append(message)
+            self._recent_synced.append(message)
+
+        if messages:
+            self._last_synced = messages[-1]
+        self._synced_len = len(messages)
+
+    def _resume_index(self, messages: list) -> int:
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i] is self._last_synced:
+                return i + 1
+
+        # Serialized lazily: only needed once the anchor is gone
+        written = {_dumps(message) for message in self._recent_synced}
+        for i in range(len(messages) - 1, -1, -1):
+            if _dumps(messages[i]) in written:
+                return i + 1
+        return min(self._synced_len, len(messages))
+
+    async def aclose(self) -> List[str]:
+        """Write the footer and wait for the background thread without blocking the loop."""
+        if self._closed:
+            return self.paths
+        self._closed = True
+        self._queue.put(_CLOSE)
+        await asyncio.to_thread(self._thread.join)
+        self._last_synced = None
+        self._recent_synced.clear()
+        return self.paths
+
+    def close(self) -> List[str]:
+        """Synchronous variant of ``aclose()`` for use outside the event loop."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+            self._thread.join()
+            self._last_synced = None
+            self._recent_synced.clear()
+        return self.paths
+
+    def _run(self):
+        """Background thread: drain the queue and write records to disk."""
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _CLOSE:
+                    break
+                batch = [item]
+                # Drain whatever else is ready so bursts become a single write
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _CLOSE:
+                        self._write(batch)
+                        batch = None
+                        break
+                    batch.append(item)
+                if batch is None:
+                    break
+                self._write(batch)
+
+            self._write_footer()
+            logger.info(
+                f"Chat transcript saved to {', '.join(self._paths)} ({self._total_messages} messages)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to write chat transcript: {e}")
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write(self, lines: List[bytes]):
+        if self._file is None or self._should_rotate():
+            self._open_next_part()
+        data = b"".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        self._file_bytes += len(data)
+
+    def _write_footer(self):
+        if self._file is None:
+            self._open_next_part()
+        footer = {
+            "type": "footer",
+            "saved_at": datetime.now().isoformat(),
+            "total_messages": self._total_messages,
+            "parts": self._part,
+        }
+        self._file.write(_dumps(footer))
+        self._file.flush()
+
+    def _should_rotate(self) -> bool:
+        if self._max_bytes is not None and self._file_bytes >= self._max_bytes:
+            return True
+        if self._max_age_secs is not None:
+            return time.monotonic() - self._file_opened_at >= self._max_age_secs
+        return False
+
+    def _open_next_part(self):
+        if self._file is not None:
+            self._file.close()
+
+        self._output_path.mkdir(parents=True, exist_ok=True)
+        self._part += 1
+        suffix = ".jsonl.gz" if self._compress else ".jsonl"
+        part = "" if self._part == 1 else f".part{self._part}"
+        filepath = self._output_path / f"{self._basename}{part}{suffix}"
+
+        if self._compress:
+            self._file = gzip.open(filepath, "ab", compresslevel=5)
+        else:
+            self._file = open(filepath, "ab")
+        self._file_bytes = 0
+        self._file_opened_at = time.monotonic()
+        self._paths.append(str(filepath))
+
+        header = {
+            "type": "header",
+            "call_id": self._call_id,
+            "started_at": self._started_at,
+            "part": self._part,
+        }
+        self._write_raw(_dumps(header))
+
+    def _write_raw(self, data: bytes):
+        self._file.write(data)
+        self._file_bytes += len(data)
+
+
+def _dumps(record: dict) -> bytes:
+    """Serialize a record as one JSONL line, stringifying unknown types."""
+    return orjson.dumps(
+        record,
+        default=str,
+        option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+    )
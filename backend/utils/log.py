@@ -0,0 +1,301 @@
+"""
+Logging facade for the backend.
+
+Loguru as used so far had three costs on the event loop: f-string messages
+are formatted even when their level is filtered out, every sink writes
+synchronously from the logging call, and per-frame debug lines scale with
+the number of calls in the process. The facade keeps loguru (and Pipecat's
+own logging through it) but:
+
+- ``configure_logging()`` replaces the synchronous stderr sink with a
+  QueuedSink: the loop only formats the line, a writer thread writes it
+- ``get_logger(category)`` returns a CategoryLogger whose messages take
+  ``str.format`` arguments and are only formatted when they will be written,
+  sampled and rate-limited per category before loguru sees them
+- ``CallContext`` and ``tool_context()`` attach call_id, turn and tool to
+  every record logged inside them, Pipecat's included
+
+A line that is written costs more through the facade than through plain
+loguru (about 21 us against 15 us with DEBUG on, benchmarks/logging_bench.py):
+the gain is in lines never formatted (about 0.2 us when filtered out) and
+in the write leaving the loop.
+
+Usage:
+    log = get_logger("hold")
+    log.debug("On hold - received transcription: {!r}", text)
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from loguru import logger
+
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "{extra[call_id]}:{extra[turn]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+# Messages per second each category may write (bursts up to the same count)
+DEFAULT_RATE_LIMITS: Dict[str, float] = {"hold": 20.0}
+
+# Fraction of DEBUG and INFO messages written per category; none sampled
+# unless SAMORA_LOG_SAMPLE says so
+DEFAULT_SAMPLE_RATES: Dict[str, float] = {}
+
+_min_level = 0
+_sample_every: Dict[str, int] = {}
+_rate_limits: Dict[str, float] = {}
+_configured = False
+
+
+def _parse(spec: Optional[str]) -> Dict[str, float]:
+    """Parse "category=value,category=value" from an environment variable."""
+    values = {}
+    for item in (spec or "").split(","):
+        category, _, value = item.partition("=")
+        if category.strip() and value.strip():
+            values[category.strip()] = float(value)
+    return values
+
+
+class CallContext:
+    """
+    Structured fields of a call: attaches call_id and turn to every record
+    logged inside ``with CallContext(call_id):``.
+
+    Tasks created inside the block (the whole pipeline, when the runner is
+    started in it) inherit it. The turn is shared by all of them and
+    advanced with ``next_turn()``.
+    """
+
+    __slots__ = ("call_id", "turn", "_scope")
+
+    def __init__(self, call_id: str):
+        self.call_id = call_id
+        self.turn = 0
+        self._scope = None
+
+    def next_turn(self):
+        self.turn += 1
+
+    def __enter__(self) -> "CallContext":
+        self._scope = logger.contextualize(call=self)
+        self._scope.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._scope.__exit__(*exc_info)
+        self._scope = None
+
+
+def _patch(record):
+    """Expand the call context into flat fields; fill them for records outside a call."""
+    extra = record["extra"]
+    call = extra.pop("call", None)
+    extra["call_id"] = call.call_id if call else "-"
+    extra["turn"] = call.turn if call else "-"
+
+
+@contextmanager
+def tool_context(tool: str):
+    """Attach the tool name to every record logged inside the block."""
+    with logger.contextualize(tool=tool):
+        yield
+
+
+class QueuedSink:
+    """
+    Loguru sink that hands formatted lines to a writer thread.
+
+    loguru's own ``enqueue=True`` pickles every record through a
+    multiprocessing queue, which costs more per line on the loop than
+    writing it. This queue stays in-process: ``write()`` is a put, and the
+    thread writes whatever has accumulated in one go. Past ``max_backlog``
+    queued lines (a stalled stderr pipe), lines are dropped and counted.
+    """
+
+    def __init__(self, stream, max_backlog: int = 100_000):
+        self._stream = open(stream, "a", encoding="utf-8") if isinstance(stream, str) else stream
+        self._owns_stream = isinstance(stream, str)
+        self._queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._max_backlog = max_backlog
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str):
+        if self._queue.qsize() >= self._max_backlog:
+            self.dropped += 1
+            return
+        self._queue.put(message)
+
+    def _run(self):
+        while True:
+            lines = [self._queue.get()]
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in lines
+            self._stream.write("".join(line for line in lines if line is not None))
+            self._stream.flush()
+            if stop:
+                return
+
+    def close(self):
+        """Write out everything queued and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+        if self._owns_stream:
+            self._stream.close()
+
+
+_sink: Optional[QueuedSink] = None
+
+
+def _close_sink():
+    if _sink is not None:
+        _sink.close()
+
+
+atexit.register(_close_sink)
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    serialize: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    rate_limits: Optional[Dict[str, float]] = None,
+    sink=sys.stderr,
+    force: bool = False,
+):
+    """
+    Install the backend's log sink, once per process.
+
+    Removes every existing sink (including the synchronous stderr one the
+    Pipecat runner adds) and writes through a QueuedSink instead.
+    Defaults come from the environment: SAMORA_LOG_LEVEL (DEBUG),
+    SAMORA_LOG_JSON, SAMORA_LOG_SAMPLE and SAMORA_LOG_RATE_LIMIT (both
+    "category=value,...").
+    """
+    global _min_level, _configured, _sink
+    if _configured and not force:
+        return
+    level = level or os.getenv("SAMORA_LOG_LEVEL", "DEBUG")
+    if serialize is None:
+        serialize = os.getenv("SAMORA_LOG_JSON", "").lower() in ("1", "true", "yes")
+    sample_rates = {**DEFAULT_SAMPLE_RATES, **_parse(os.getenv("SAMORA_LOG_SAMPLE")), **(sample_rates or {})}
+    rate_limits = {**DEFAULT_RATE_LIMITS, **_parse(os.getenv("SAMORA_LOG_RATE_LIMIT")), **(rate_limits or {})}
+
+    logger.remove()
+    _close_sink()
+    _sink = QueuedSink(sink)
+    logger.configure(patcher=_patch)
+    logger.add(
+        _sink.write,
+        level=level,
+        format=LOG_FORMAT,
+        serialize=serialize,
+        colorize=_sink._stream.isatty() if hasattr(_sink._stream, "isatty") else False,
+        backtrace=False,
+    )
+
+    _min_level = logger.level(level).no
+    _sample_every.clear()
+    _sample_every.update({c: max(1, round(1 / r)) for c, r in sample_rates.items() if 0 < r < 1})
+    _rate_limits.clear()
+    _rate_limits.update({c: r for c, r in rate_limits.items() if r > 0})
+    for category_logger in _loggers.values():
+        category_logger._reset()
+    _configured = True
+
+
+class CategoryLogger:
+    """
+    Logger for one category of messages.
+
+    Messages are format strings with positional or keyword arguments,
+    formatted only when written. Below WARNING, one message in
+    1 / sample rate is written; at every level, at most the category's
+    rate limit per second, with the count of dropped messages added to the
+    next one written (``extra["suppressed"]``).
+    """
+
+    def __init__(self, category: str):
+        self.category = category
+        self._logger = logger.bind(category=category)
+        self._reset()
+
+    def _reset(self):
+        self._seen = 0
+        self._sample_every = _sample_every.get(self.category, 1)
+        self._rate = _rate_limits.get(self.category)
+        self._tokens = self._rate or 0.0
+        self._refilled_at = time.monotonic()
+        self.suppressed = 0
+
+    def _admit(self, level_no: int) -> bool:
+        if level_no < _min_level:
+            return False
+        if level_no < logging.WARNING and self._sample_every > 1:
+            self._seen += 1
+            if self._seen % self._sample_every:
+                return False
+        if self._rate is not None:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._refilled_at) * self._rate)
+            self._refilled_at = now
+            if self._tokens < 1:
+                self.suppressed += 1
+                return False
+            self._tokens -= 1
+        return True
+
+    def _log(self, level: str, level_no: int, message: str, args, kwargs):
+        if not self._admit(level_no):
+            return
+        target = self._logger
+        if self.suppressed:
+            target = target.bind(suppressed=self.suppressed)
+            self.suppressed = 0
+        target.opt(depth=2).log(level, message, *args, **kwargs)
+
+    def trace(self, message: str, *args, **kwargs):
+        self._log("TRACE", 5, message, args, kwargs)
+
+    def debug(self, message: str, *args, **kwargs):
+        self._log("DEBUG", logging.DEBUG, message, args, kwargs)
+
+    def info(self, message: str, *args, **kwargs):
+        self._log("INFO", logging.INFO, message, args, kwargs)
+
+    def warning(self, message: str, *args, **kwargs):
+        self._log("WARNING", logging.WARNING, message, args, kwargs)
+
+    def error(self, message: str, *args, **kwargs):
+        self._log("ERROR", logging.ERROR, message, args, kwargs)
+
+    def exception(self, message: str, *args, **kwargs):
+        if self._admit(logging.ERROR):
+            self._logger.opt(depth=1, exception=True).error(message, *args, **kwargs)
+
+
+_loggers: Dict[str, CategoryLogger] = {}
+
+
+def get_logger(category: str) -> CategoryLogger:
+    """The shared CategoryLogger of a category."""
+    category_logger = _loggers.get(category)
+    if category_logger is None:
+        category_logger = _loggers[category] = CategoryLogger(category)
+    return category_logger
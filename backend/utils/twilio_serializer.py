@@ -0,0 +1,86 @@
+import base64
+import json
+
+import orjson
+from loguru import logger
+from pipecat.frames.frames import AudioRawFrame, Frame, InputAudioRawFrame
+from pipecat.serializers.twilio import TwilioFrameSerializer
+
+from utils.audio_codec import UlawStream
+
+
+class FastTwilioFrameSerializer(TwilioFrameSerializer):
+    """
+    Twilio serializer with a low-copy fast path for media events.
+
+    Produces the same frames and messages as TwilioFrameSerializer. Media
+    audio goes through UlawStream (buffer views between codec and resampler,
+    no per-frame ``astype`` copy), inbound events are parsed with orjson, and
+    outbound media messages are built from a prefix serialized once per
+    call. Everything else (DTMF, interruptions, hang-up) is handled by the
+    base class.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._ulaw = UlawStream(ulaw_rate=self._twilio_sample_rate)
+        # Same separators as json.dumps(), so messages are byte-identical
+        self._media_prefix = (
+            '{"event": "media", "streamSid": '
+            + json.dumps(self._stream_sid)
+            + ', "media": {"payload": "'
+        )
+
+    @classmethod
+    def from_serializer(cls, serializer: TwilioFrameSerializer) -> "FastTwilioFrameSerializer":
+        """Create a fast serializer with the same call details and params."""
+        return cls(
+            stream_sid=serializer._stream_sid,
+            call_sid=serializer._call_sid,
+            account_sid=serializer._account_sid,
+            auth_token=serializer._auth_token,
+            region=serializer._region,
+            edge=serializer._edge,
+            params=serializer._params,
+        )
+
+    async def serialize(self, frame: Frame) -> str | bytes | None:
+        if not isinstance(frame, AudioRawFrame):
+            return await super().serialize(frame)
+
+        ulaw = self._ulaw.encode(frame.audio, frame.sample_rate)
+        if ulaw is None:
+            return None
+        return self._media_prefix + base64.b64encode(ulaw).decode("ascii") + '"}}'
+
+    async def deserialize(self, data: str | bytes) -> Frame | None:
+        message = orjson.loads(data)
+        if message.get("event") != "media":
+            return await super().deserialize(data)
+
+        payload = base64.b64decode(message["media"]["payload"])
+        if not payload:
+            return None
+        audio = self._ulaw.decode(payload, self._sample_rate)
+        if not audio:
+            return None
+        return InputAudioRawFrame(audio=audio, num_channels=1, sample_rate=self._sample_rate)
+
+
+def use_fast_twilio_serializer(transport) -> bool:
+    """
+    Swap a transport's TwilioFrameSerializer for FastTwilioFrameSerializer.
+
+    Call after create_transport() and before the pipeline starts. Transports
+    without a Twilio serializer are left untouched.
+
+    Returns:
+        True if the serializer was replaced.
+    """
+    params = getattr(transport, "_params", None)
+    serializer = getattr(params, "serializer", None)
+    if type(serializer) is not TwilioFrameSerializer:
+        return False
+    params.serializer = FastTwilioFrameSerializer.from_serializer(serializer)
+    logger.info("Twilio audio: fast μ-law serializer")
+    return True